@@ -14,6 +14,7 @@ Usage:
     python -m rpi5 audio                # Test audio I/O only
     python -m rpi5 connect              # Connect to laptop dashboard
     python -m rpi5 status               # Check system status
+    python -m rpi5 traces               # Voice latency traces (p50/p95 per segment)
     python -m rpi5 test                 # Run self-test diagnostics
 
 Options:
@@ -48,6 +49,7 @@ Examples:
   python -m rpi5 test                 Run self-test diagnostics
   python -m rpi5 all --offline        Run without cloud APIs
   python -m rpi5 connect --laptop 192.168.1.100  # Connect to custom laptop IP
+  python -m rpi5 traces --last 10     Show the last 10 voice interaction traces
         """
     )
     parser.add_argument(
@@ -154,6 +156,29 @@ Examples:
         help="Check system status"
     )
 
+    # traces command
+    traces_parser = subparsers.add_parser(
+        "traces",
+        help="Dump voice interaction traces",
+        description="Show recent voice interaction spans and p50/p95 latency per segment"
+    )
+    traces_parser.add_argument(
+        "--file",
+        default="logs/voice_traces.jsonl",
+        help="Trace log (default: logs/voice_traces.jsonl)"
+    )
+    traces_parser.add_argument(
+        "--last",
+        type=int,
+        default=20,
+        help="Number of recent traces to show (default: 20)"
+    )
+    traces_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print raw trace records as JSON"
+    )
+
     return parser
 
 
@@ -213,6 +238,10 @@ def run_command(args: argparse.Namespace) -> int:
         from rpi5.cli.commands import check_status
         return check_status()
 
+    elif command == "traces":
+        from rpi5.cli.commands import dump_traces
+        return dump_traces(path=args.file, last=args.last, as_json=args.json)
+
     else:
         # No command specified, show help
         args.parser.print_help()
@@ -0,0 +1,306 @@
+"""
+Alert Bank - Pre-rendered Binaural Safety Alerts
+================================================
+
+Safety sounds used to be generated and spatialized when the hazard was
+already in front of the user: play_directional_alert synthesized a tone
+and ran the binaural renderer for the threat position, and the spoken
+AudioAlertManager clips were played flat (no direction at all).
+
+The bank renders everything once (at startup, or offline) and stores it
+as one int16 stereo PCM file that is memory-mapped at runtime:
+
+- Sounds:    every ALERT_TEXTS clip ("Wall ahead!", ...) plus the
+             directional tone types ("chirp", "tone")
+- Grid:      azimuth every 30 deg (full circle) x urgency
+             (notice / warning / critical: level, and pitch for tones)
+- Layout:    per (sound, urgency) one block of same-length renders, one per
+             azimuth, so a trigger is index arithmetic + a slice of the map
+- Rebuilt:   only when the clips, sample rate, grid or HRTF table change
+             (signature stored next to the PCM file)
+- Trigger:   lookup + enqueue on the mixer safety channel; trigger-to-sound
+             latency (trigger call -> first sample in the device buffer)
+             is measured per alert
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import wave
+from collections import deque
+from math import gcd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.signal import resample_poly
+
+try:
+    from .audio_mixer import get_mixer
+    from .layer1_reflex.audio_ring import LatencyRing
+    from .layer3_guide.spatial_audio.binaural_engine import (
+        compute_azimuth_elevation, generate_chirp, generate_continuous_tone, get_hrtf_table, render_binaural,
+    )
+except ImportError:
+    from audio_mixer import get_mixer
+    from layer1_reflex.audio_ring import LatencyRing
+    from layer3_guide.spatial_audio.binaural_engine import (
+        compute_azimuth_elevation, generate_chirp, generate_continuous_tone, get_hrtf_table, render_binaural,
+    )
+
+logger = logging.getLogger(__name__)
+
+BANK_VERSION = 2
+
+URGENCIES = ("notice", "warning", "critical")
+TONES = ("chirp", "tone")
+
+# Same levels / pitches as SpatialAudioManager.play_directional_alert
+TONE_FREQ = {"notice": 660.0, "warning": 880.0, "critical": 1100.0}
+TONE_GAIN = {"notice": 0.5, "warning": 0.7, "critical": 0.9}
+CLIP_GAIN = {"notice": 0.6, "warning": 0.8, "critical": 1.0}
+TONE_DURATION_S = 0.2
+
+
+def _read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Mono float64 samples and rate of a 16-bit WAV."""
+    with wave.open(path, "rb") as wf:
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+    audio = pcm.astype(np.float64) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    return audio, rate
+
+
+class AlertBank:
+    """Memory-mapped bank of pre-spatialized safety sounds."""
+
+    def __init__(
+        self,
+        bank_dir: str = "cache/alert_bank",
+        clips: Optional[Dict[str, str]] = None,
+        sample_rate: int = 48000,
+        azimuth_step: float = 30.0,
+    ):
+        """
+        Args:
+            bank_dir: Where the PCM file and its index live
+            clips: Spoken alert clips, alert key -> WAV path
+                   (AudioAlertManager.clip_paths)
+            sample_rate: Render rate (use the mixer rate: no SRC at trigger time)
+            azimuth_step: Grid spacing in degrees
+        """
+        self.bank_dir = Path(bank_dir)
+        self.clips = dict(clips or {})
+        self.sample_rate = sample_rate
+        self.azimuths = np.arange(0.0, 360.0, azimuth_step)
+        self.azimuth_step = azimuth_step
+
+        self._pcm: Optional[np.memmap] = None
+        self._index: Dict[Tuple[str, str], Tuple[int, int]] = {}  # (sound, urgency) -> (offset, frames)
+        self._build_lock = threading.Lock()
+
+        self._pending: deque = deque(maxlen=32)   # (trigger time, playback) not yet started
+        self.trigger_to_sound = LatencyRing(256)
+        self.triggers = 0
+        self.misses = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._pcm is not None
+
+    @property
+    def sounds(self) -> List[str]:
+        return sorted(self.clips) + list(TONES)
+
+    @property
+    def _pcm_path(self) -> Path:
+        return self.bank_dir / "alert_bank.pcm"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.bank_dir / "alert_bank.json"
+
+    def _signature(self) -> dict:
+        clips = {}
+        for key, path in sorted(self.clips.items()):
+            st = os.stat(path)
+            clips[key] = [st.st_size, int(st.st_mtime)]
+        return {
+            "version": BANK_VERSION,
+            "sample_rate": self.sample_rate,
+            "azimuths": self.azimuths.tolist(),
+            "urgencies": list(URGENCIES),
+            "tones": list(TONES),
+            "hrtf": get_hrtf_table(self.sample_rate).signature,
+            "clips": clips,
+        }
+
+    # ------------------------------------------------------------------
+    # Build / load
+    # ------------------------------------------------------------------
+
+    def build(self, force: bool = False) -> bool:
+        """
+        Load the bank, rendering it first if missing or stale.
+
+        Returns:
+            True once the bank is mapped and ready to trigger
+        """
+        with self._build_lock:
+            try:
+                signature = self._signature()
+            except OSError as e:
+                logger.error(f"❌ Alert bank: clip missing ({e})")
+                return False
+            if not force and self._load(signature):
+                return True
+            start = time.perf_counter()
+            self.bank_dir.mkdir(parents=True, exist_ok=True)
+            self._render(signature)
+            loaded = self._load(signature)
+            if loaded:
+                logger.info(f"🔔 Alert bank rendered: {len(self.sounds)} sounds x {len(URGENCIES)} urgencies x "
+                            f"{len(self.azimuths)} azimuths, "
+                            f"{self._pcm.nbytes / 1024 / 1024:.1f}MB in {time.perf_counter() - start:.1f}s")
+            return loaded
+
+    def _load(self, signature: dict) -> bool:
+        try:
+            meta = json.loads(self._index_path.read_text())
+        except (OSError, ValueError):
+            return False
+        if meta.get("signature") != signature or not self._pcm_path.exists():
+            return False
+        frames_total = self._pcm_path.stat().st_size // 4
+        if frames_total != meta.get("frames"):
+            return False
+        self._pcm = np.memmap(self._pcm_path, dtype=np.int16, mode="r", shape=(frames_total, 2))
+        self._index = {tuple(k.split("/", 1)): tuple(v) for k, v in meta["index"].items()}
+        return True
+
+    def _mono(self, sound: str, urgency: str) -> np.ndarray:
+        """Unspatialized source for one (sound, urgency) at the bank rate."""
+        if sound == "chirp":
+            return generate_chirp(TONE_DURATION_S, sr=self.sample_rate) * TONE_GAIN[urgency]
+        if sound == "tone":
+            return generate_continuous_tone(TONE_DURATION_S, TONE_FREQ[urgency], self.sample_rate) * TONE_GAIN[urgency]
+        audio, rate = _read_wav(self.clips[sound])
+        if rate != self.sample_rate:
+            g = gcd(rate, self.sample_rate)
+            audio = resample_poly(audio, self.sample_rate // g, rate // g)
+        return audio * CLIP_GAIN[urgency]
+
+    def _render(self, signature: dict):
+        """Render every (sound, urgency, azimuth) into a fresh PCM file."""
+        sources = {(s, u): self._mono(s, u) for s in self.sounds for u in URGENCIES}
+        n_az = len(self.azimuths)
+        frames_total = sum(len(m) for m in sources.values()) * n_az
+        tmp = self._pcm_path.with_suffix(".pcm.tmp")
+        pcm = np.memmap(tmp, dtype=np.int16, mode="w+", shape=(frames_total, 2))
+
+        index = {}
+        offset = 0
+        for (sound, urgency), mono in sources.items():
+            frames = len(mono)
+            index[f"{sound}/{urgency}"] = [offset, frames]
+            for az in self.azimuths:
+                signed = az - 360.0 if az > 180.0 else az
+                stereo = render_binaural(mono, signed, 0.0, self.sample_rate)
+                pcm[offset:offset + frames] = np.clip(stereo * 32767, -32768, 32767).astype(np.int16)
+                offset += frames
+        pcm.flush()
+        del pcm
+        os.replace(tmp, self._pcm_path)
+        meta = {"signature": signature, "frames": frames_total, "index": index}
+        self._index_path.write_text(json.dumps(meta))
+
+    # ------------------------------------------------------------------
+    # Trigger
+    # ------------------------------------------------------------------
+
+    def get(self, sound: str, azimuth_deg: float = 0.0, urgency: str = "warning") -> Optional[np.ndarray]:
+        """Pre-rendered stereo int16 for the nearest grid azimuth (a view of the map)."""
+        pcm = self._pcm
+        entry = self._index.get((sound, urgency))
+        if pcm is None or entry is None:
+            return None
+        offset, frames = entry
+        az_idx = int(round((azimuth_deg % 360.0) / self.azimuth_step)) % len(self.azimuths)
+        start = offset + az_idx * frames
+        return pcm[start:start + frames]
+
+    def trigger(self, sound: str, azimuth_deg: float = 0.0, urgency: str = "warning",
+                preempt: bool = True):
+        """
+        Play a pre-rendered alert on the mixer safety channel.
+
+        Args:
+            sound: Alert key ("wall", ...) or tone type ("chirp", "tone")
+            azimuth_deg: Direction (0 = front, +90 = right)
+            urgency: "notice", "warning" or "critical"
+            preempt: Cut off the safety sound currently playing
+
+        Returns:
+            Mixer Playback handle, or None if not in the bank / no mixer
+            (callers then use their old path)
+        """
+        t0 = time.perf_counter()
+        self._harvest()
+        mixer = get_mixer()
+        audio = self.get(sound, azimuth_deg, urgency) if mixer is not None else None
+        if audio is None:
+            self.misses += 1
+            return None
+        playback = mixer.play("safety", audio, self.sample_rate, preempt=preempt)
+        self._pending.append((t0, playback, mixer.output_latency_s))
+        self.triggers += 1
+        return playback
+
+    def trigger_at(self, sound: str, position: Tuple[float, float, float], urgency: str = "warning",
+                   preempt: bool = True):
+        """trigger() for an OpenAL (x, y, z) threat position."""
+        azimuth, _ = compute_azimuth_elevation(*position)
+        return self.trigger(sound, azimuth, urgency, preempt)
+
+    def _harvest(self):
+        """Record trigger-to-sound for alerts that have started playing."""
+        for _ in range(len(self._pending)):
+            t0, playback, out_latency = self._pending.popleft()
+            if playback.started is not None:
+                self.trigger_to_sound.record((playback.started - t0 + out_latency) * 1000)
+            elif not playback.done:
+                self._pending.append((t0, playback, out_latency))
+
+    def get_stats(self) -> Dict[str, float]:
+        self._harvest()
+        stats = {
+            "ready": self.ready,
+            "triggers": self.triggers,
+            "misses": self.misses,
+            "size_mb": round(self._pcm.nbytes / 1024 / 1024, 1) if self.ready else 0.0,
+        }
+        if self.trigger_to_sound.count:
+            stats.update({f"trigger_to_sound_{k}": v for k, v in self.trigger_to_sound.summary().items()})
+        return stats
+
+
+def create_alert_bank(config: Optional[dict], clips: Dict[str, str],
+                      sample_rate: int = 48000) -> Optional[AlertBank]:
+    """Bank from the audio.alert_bank config block (None if disabled)."""
+    config = config or {}
+    if not config.get("enabled", True):
+        return None
+    return AlertBank(
+        bank_dir=config.get("dir", "cache/alert_bank"),
+        clips=clips,
+        sample_rate=sample_rate,
+        azimuth_step=config.get("azimuth_step", 30.0),
+    )
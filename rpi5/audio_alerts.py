@@ -2,7 +2,10 @@
 Audio Alert Manager — Pre-recorded Safety Alerts
 
 Manages pre-recorded WAV audio clips for instant hazard alerts.
-Clips are played non-blocking via PipeWire/paplay for <50ms latency.
+Clips are played on the audio mixer's safety channel (decoded once,
+pausing speech and ducking everything else), from the pre-spatialized
+AlertBank when one is attached, falling back to PipeWire/paplay when the
+mixer is not running.
 
 On first run, generates all alert clips using Kokoro TTS if they don't exist.
 
@@ -15,9 +18,17 @@ import os
 import subprocess
 import threading
 import time
+import wave
 from pathlib import Path
 from typing import Dict, Optional
 
+import numpy as np
+
+try:
+    from .audio_mixer import get_mixer
+except ImportError:
+    from audio_mixer import get_mixer
+
 logger = logging.getLogger(__name__)
 
 # Alert definitions: alert_key -> spoken text
@@ -36,7 +47,7 @@ class AudioAlertManager:
     Plays pre-recorded WAV clips for instant hazard alerts.
     
     Features:
-    - Non-blocking playback via paplay (PipeWire/PulseAudio)
+    - Non-blocking playback on the mixer safety channel (paplay fallback)
     - Per-alert cooldown to prevent spam
     - Auto-generates clips via Kokoro TTS on first run
     """
@@ -61,6 +72,8 @@ class AudioAlertManager:
         self.cooldown = cooldown
         self._last_played: Dict[str, float] = {}
         self._clips: Dict[str, str] = {}  # alert_key -> full path to WAV
+        self._pcm: Dict[str, tuple] = {}  # alert_key -> (int16 samples, sample rate)
+        self.bank = None  # AlertBank: directional pre-rendered clips when ready
         self._play_lock = threading.Lock()
         
         # Ensure directory exists
@@ -151,13 +164,16 @@ class AudioAlertManager:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
-    def play(self, alert_key: str, blocking: bool = False) -> bool:
+    def play(self, alert_key: str, blocking: bool = False,
+             azimuth_deg: float = 0.0, urgency: str = "warning") -> bool:
         """
         Play an alert clip if not on cooldown.
         
         Args:
             alert_key: Alert type (e.g., "wall", "stairs_down", "dropoff")
             blocking: If True, wait for playback to complete
+            azimuth_deg: Hazard direction (bank only; 0 = ahead, +90 = right)
+            urgency: "notice", "warning" or "critical" (bank only)
             
         Returns:
             True if clip was played, False if on cooldown or unavailable
@@ -178,6 +194,21 @@ class AudioAlertManager:
 
         self._last_played[alert_key] = now
 
+        # Queued behind the directional tone that usually precedes it
+        playback = self.bank.trigger(alert_key, azimuth_deg, urgency, preempt=False) if self.bank else None
+        if playback is not None:
+            if blocking:
+                playback.wait(timeout=10)
+            return True
+
+        mixer = get_mixer()
+        pcm = self._load_pcm(alert_key, clip_path) if mixer is not None else None
+        if pcm is not None:
+            playback = mixer.play("safety", pcm[0], pcm[1], preempt=True)
+            if blocking:
+                playback.wait(timeout=10)
+            return True
+
         if blocking:
             return self._play_sync(clip_path)
         else:
@@ -190,6 +221,22 @@ class AudioAlertManager:
             thread.start()
             return True
 
+    def _load_pcm(self, alert_key: str, clip_path: str) -> Optional[tuple]:
+        """Decoded clip for the mixer (cached after the first play)."""
+        pcm = self._pcm.get(alert_key)
+        if pcm is None:
+            try:
+                with wave.open(clip_path, "rb") as wf:
+                    samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+                    if wf.getnchannels() > 1:
+                        samples = samples.reshape(-1, wf.getnchannels())
+                    pcm = (samples, wf.getframerate())
+            except (wave.Error, OSError) as e:
+                logger.warning(f"Alert clip unreadable for mixer: {e}")
+                return None
+            self._pcm[alert_key] = pcm
+        return pcm
+
     def _play_sync(self, clip_path: str) -> bool:
         """Play a WAV file synchronously via paplay (PipeWire/PulseAudio)."""
         with self._play_lock:
@@ -215,6 +262,11 @@ class AudioAlertManager:
         """Check if a clip exists for the given alert type."""
         return alert_key in self._clips
 
+    @property
+    def clip_paths(self) -> Dict[str, str]:
+        """Alert key -> WAV path of every available clip."""
+        return dict(self._clips)
+
     @property
     def available_alerts(self) -> list:
         """List of alert types with available clips."""
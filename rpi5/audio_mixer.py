@@ -0,0 +1,518 @@
+"""
+Audio Mixer - One Output Stream for Every Sound the Device Makes
+=================================================================
+
+Audio output used to be spread over aplay subprocesses per TTS utterance,
+paplay for safety clips and separate sounddevice streams for Gemini Live,
+the binaural engine and the wall hum: process-spawn latency, device
+contention and no way to put one source under another.
+
+AudioMixer owns a single long-lived stereo output stream. Sources write
+into named channels; the audio callback mixes them every block:
+
+    channel   priority  under a higher channel
+    safety       100    -
+    speech        60    paused (resumes where it left off)
+    gemini        50    paused
+    beacon        30    ducked to 0.25
+    ambient       10    ducked to 0.15
+
+- Ingress: int16/float, mono/stereo, any sample rate -> float32 stereo
+  at the device rate (polyphase SRC) before it is queued
+- Lock-free callback: producers only append to per-channel deques and
+  bump a generation counter to flush (preempt) a channel; the callback
+  never takes a lock, and gains / ramps are applied in place into
+  preallocated scratch buffers (no per-block temporaries in the mix)
+- Ducking ramps gain per block (fast attack, slower release)
+- Continuous sources (hum, head-tracked beacons) register a render
+  function that fills the channel block by block
+- Onset latency (submit -> first sample in the device buffer) is recorded
+  per channel
+- start(offline=True) runs without a device: the caller pulls mix_block()
+  (offline render harness, CI)
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from math import gcd
+from typing import Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+try:
+    from scipy.signal import resample_poly
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    resample_poly = None
+
+try:
+    from .layer1_reflex.audio_ring import LatencyRing, PolyphaseResampler
+except ImportError:
+    from layer1_reflex.audio_ring import LatencyRing, PolyphaseResampler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 48000
+
+
+@dataclass
+class ChannelConfig:
+    """Static behavior of one mixer channel."""
+    name: str
+    priority: int
+    gain: float = 1.0
+    duck_gain: float = 0.3      # Gain while a higher-priority channel plays
+    pause: bool = False         # Hold position instead of ducking (speech)
+
+
+DEFAULT_CHANNELS = [
+    ChannelConfig("safety", 100, gain=1.0),
+    ChannelConfig("speech", 60, gain=1.0, pause=True),
+    ChannelConfig("gemini", 50, gain=1.0, pause=True),
+    ChannelConfig("beacon", 30, gain=0.8, duck_gain=0.25),
+    ChannelConfig("ambient", 10, gain=0.6, duck_gain=0.15),
+]
+
+
+def to_stereo_float(pcm: np.ndarray, in_rate: int, out_rate: int) -> np.ndarray:
+    """
+    Convert a clip to the mixer format: float32 (n, 2) at out_rate.
+
+    Args:
+        pcm: int16 or float samples, shape (n,) or (n, 2)
+        in_rate: Sample rate of pcm
+        out_rate: Mixer sample rate
+    """
+    audio = np.asarray(pcm)
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    else:
+        audio = audio.astype(np.float32, copy=False)
+    if audio.ndim == 1:
+        audio = audio[:, None]
+    if in_rate != out_rate and len(audio):
+        if SCIPY_AVAILABLE:
+            g = gcd(int(in_rate), int(out_rate))
+            audio = resample_poly(audio, out_rate // g, in_rate // g, axis=0).astype(np.float32)
+        else:
+            n_out = int(round(len(audio) * out_rate / in_rate))
+            x = np.linspace(0, len(audio) - 1, n_out)
+            audio = np.stack([np.interp(x, np.arange(len(audio)), audio[:, c])
+                              for c in range(audio.shape[1])], axis=1).astype(np.float32)
+    if audio.shape[1] == 1:
+        audio = np.repeat(audio, 2, axis=1)
+    return np.ascontiguousarray(audio[:, :2])
+
+
+class Playback:
+    """Handle of one queued clip."""
+
+    def __init__(self, channel: str, audio: np.ndarray, generation: int):
+        self.channel = channel
+        self.audio = audio
+        self.generation = generation
+        self.position = 0
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None   # perf_counter of the first mixed block
+        self.cancelled = False
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until played out (or flushed); False on timeout."""
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _Channel:
+    """Runtime state of one channel (written by producers, read by the callback)."""
+
+    def __init__(self, config: ChannelConfig):
+        self.config = config
+        self.queue: Deque[Playback] = deque()
+        self.current: Optional[Playback] = None
+        self.generation = 0
+        self.source: Optional[Callable[[int], Optional[np.ndarray]]] = None
+        self.level = config.gain    # Current (ramped) gain
+        self.onset = LatencyRing(256)
+
+    def active(self) -> bool:
+        return self.current is not None or bool(self.queue) or self.source is not None
+
+
+class _OfflineStream:
+    """Stand-in for the device stream when the caller pulls mix_block() itself."""
+
+    latency = 0.0
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class AudioMixer:
+    """Single output stream with prioritized, ducking channels."""
+
+    def __init__(
+        self,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        blocksize: int = 480,
+        channels: Optional[List[ChannelConfig]] = None,
+        device=None,
+        attack_ms: float = 20.0,
+        release_ms: float = 250.0,
+    ):
+        """
+        Args:
+            sample_rate: Device sample rate (every clip is converted to it)
+            blocksize: Frames per callback (480 = 10ms at 48kHz)
+            channels: Channel table (default: safety/speech/gemini/beacon/ambient)
+            device: sounddevice output device (None = default)
+            attack_ms: Duck ramp time when a higher channel starts
+            release_ms: Recovery ramp time after it ends
+        """
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.device = device
+        self.attack_ms = attack_ms
+        self.release_ms = release_ms
+        configs = sorted(channels or DEFAULT_CHANNELS, key=lambda c: -c.priority)
+        self._channels: Dict[str, _Channel] = {c.name: _Channel(c) for c in configs}
+        self._order = [self._channels[c.name] for c in configs]  # Highest priority first
+
+        self._alloc(blocksize)
+        self._stream = None
+        self.output_latency_s = 0.0
+        self.underruns = 0
+
+    @property
+    def running(self) -> bool:
+        return self._stream is not None
+
+    @property
+    def channel_names(self) -> List[str]:
+        return [c.config.name for c in self._order]
+
+    def _alloc(self, frames: int):
+        """Output block plus the scratch buffers the mix writes into in place."""
+        self._out = np.zeros((frames, 2), dtype=np.float32)
+        self._scratch = np.zeros((frames, 2), dtype=np.float32)
+        self._ramp = np.zeros(frames, dtype=np.float32)
+        self._unit_ramp = np.linspace(0.0, 1.0, frames, dtype=np.float32)
+
+    def _channel(self, name: str) -> _Channel:
+        try:
+            return self._channels[name]
+        except KeyError:
+            raise ValueError(f"Unknown mixer channel '{name}'") from None
+
+    # ------------------------------------------------------------------
+    # Device
+    # ------------------------------------------------------------------
+
+    def start(self, offline: bool = False) -> bool:
+        """
+        Open the output stream (False if sounddevice / the device is unavailable).
+
+        Args:
+            offline: No device; the mixer counts as running and the caller
+                renders by pulling mix_block() (offline render harness)
+        """
+        if self._stream is not None:
+            return True
+        if offline:
+            self._stream = _OfflineStream()
+            logger.info(f"🎚️ Audio mixer running offline ({self.sample_rate}Hz, {self.blocksize}-frame blocks)")
+            return True
+        try:
+            import sounddevice as sd
+            stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=2,
+                dtype="float32",
+                blocksize=self.blocksize,
+                latency="low",
+                device=self.device,
+                callback=self._callback,
+            )
+            stream.start()
+        except Exception as e:
+            logger.warning(f"⚠️ Audio mixer unavailable ({e}), players fall back to their own output")
+            return False
+        self._stream = stream
+        self.output_latency_s = float(getattr(stream, "latency", 0.0) or 0.0)
+        logger.info(f"🎚️ Audio mixer started ({self.sample_rate}Hz, {self.blocksize}-frame blocks, "
+                    f"output latency {self.output_latency_s * 1000:.0f}ms)")
+        return True
+
+    def stop(self):
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Mixer stream close: {e}")
+        for channel in self._order:
+            self.flush(channel.config.name)
+
+    def _callback(self, outdata, frames, time_info, status):
+        if status:
+            self.underruns += 1
+        outdata[:] = self.mix_block(frames)
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def play(self, channel: str, pcm: np.ndarray, sample_rate: int, preempt: bool = False) -> Playback:
+        """
+        Queue a clip on a channel.
+
+        Args:
+            channel: Channel name
+            pcm: int16 / float samples, mono or stereo
+            sample_rate: Sample rate of pcm (converted at ingress)
+            preempt: Drop whatever the channel is playing / has queued first
+
+        Returns:
+            Playback handle (wait() blocks until it has been played)
+        """
+        ch = self._channel(channel)
+        if preempt:
+            self.flush(channel)
+        playback = Playback(channel, to_stereo_float(pcm, sample_rate, self.sample_rate), ch.generation)
+        playback.submitted = time.perf_counter()  # Onset is measured from here, after SRC
+        ch.queue.append(playback)
+        return playback
+
+    def flush(self, channel: str):
+        """Stop the current clip and drop the queue (the callback discards old generations)."""
+        ch = self._channel(channel)
+        ch.generation += 1
+        if self._stream is None:
+            # No callback will discard them: release their waiters now
+            self._release(ch)
+
+    @staticmethod
+    def _release(ch: _Channel):
+        """Mark the current and queued clips done (only while no callback runs)."""
+        clip, ch.current = ch.current, None
+        if clip is not None:
+            clip._done.set()
+        while ch.queue:
+            ch.queue.popleft()._done.set()
+
+    def set_source(self, channel: str, render: Optional[Callable[[int], Optional[np.ndarray]]]):
+        """
+        Attach a continuous source: render(frames) -> float32 (frames, 2) or None.
+
+        It runs inside the audio callback, so it must be quick and must not
+        block. None detaches it.
+        """
+        self._channel(channel).source = render
+
+    def is_active(self, channel: str) -> bool:
+        return self._channel(channel).active()
+
+    def wait_idle(self, channel: str, timeout: float = 60.0) -> bool:
+        """Block until the channel has nothing left to play."""
+        ch = self._channel(channel)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if ch.current is None and not ch.queue:
+                return True
+            time.sleep(0.01)
+        return False
+
+    # ------------------------------------------------------------------
+    # Mixing (audio thread)
+    # ------------------------------------------------------------------
+
+    def _next_clip(self, ch: _Channel) -> Optional[Playback]:
+        while ch.queue:
+            clip = ch.queue.popleft()
+            if clip.generation == ch.generation and not clip.cancelled:
+                return clip
+            clip._done.set()
+        return None
+
+    def _fill(self, ch: _Channel, out: np.ndarray, gain_start: float, gain_end: float):
+        """Mix this channel's clips into out with a linear gain ramp."""
+        frames = len(out)
+        ramp = None
+        if gain_start != gain_end:
+            ramp = self._ramp[:frames, None]
+            np.multiply(self._unit_ramp[:frames], gain_end - gain_start, out=self._ramp[:frames])
+            ramp += gain_start
+        written = 0
+        while written < frames:
+            clip = ch.current
+            if clip is not None and (clip.generation != ch.generation or clip.cancelled):
+                clip._done.set()
+                clip = ch.current = None
+            if clip is None:
+                clip = ch.current = self._next_clip(ch)
+                if clip is None:
+                    break
+            if clip.started is None:
+                clip.started = time.perf_counter()
+                ch.onset.record((clip.started - clip.submitted + self.output_latency_s) * 1000)
+            n = min(frames - written, len(clip.audio) - clip.position)
+            seg = clip.audio[clip.position:clip.position + n]
+            scratch = self._scratch[:n]
+            if ramp is None:
+                np.multiply(seg, gain_end, out=scratch)
+            else:
+                np.multiply(seg, ramp[written:written + n], out=scratch)
+            out[written:written + n] += scratch
+            clip.position += n
+            written += n
+            if clip.position >= len(clip.audio):
+                clip._done.set()
+                ch.current = None
+
+    def mix_block(self, frames: int) -> np.ndarray:
+        """Render one output block (the device callback; also usable offline)."""
+        if len(self._out) != frames:
+            self._alloc(frames)
+        out = self._out
+        out.fill(0.0)
+        block_s = frames / self.sample_rate
+        top = -1  # Priority of the highest channel with sound this block
+
+        for ch in self._order:
+            cfg = ch.config
+            ducked = top > cfg.priority
+            if ducked and cfg.pause:
+                ch.level = 0.0
+                continue  # Hold position until the higher channel is done
+            target = cfg.gain * (cfg.duck_gain if ducked else 1.0)
+            # Paused channels come back with a short fade-in, not the slow release
+            ramp_ms = self.attack_ms if target < ch.level or cfg.pause else self.release_ms
+            step = cfg.gain * block_s * 1000 / max(ramp_ms, 1e-3)
+            start = ch.level
+            end = start + float(np.clip(target - start, -step, step))
+            ch.level = end
+
+            had_sound = ch.current is not None or bool(ch.queue)
+            if had_sound:
+                self._fill(ch, out, start, end)
+            if ch.source is not None:
+                try:
+                    block = ch.source(frames)
+                except Exception as e:
+                    logger.debug(f"Mixer source on '{cfg.name}' failed: {e}")
+                    block = None
+                if block is not None:
+                    out += np.multiply(block, end, out=self._scratch)
+                    had_sound = True
+            if had_sound:
+                top = max(top, cfg.priority)
+
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Onset latency (submit -> device output) per channel."""
+        stats = {}
+        for ch in self._order:
+            if ch.onset.count:
+                stats[ch.config.name] = {"count": ch.onset.count, **ch.onset.summary()}
+        return stats
+
+
+class MixerStreamPlayer:
+    """
+    StreamingAudioPlayer-compatible front end for one mixer channel.
+
+    Lets the Gemini Live audio path and streaming TTS push PCM chunks into
+    the shared mixer with the API they already use. Chunks go through one
+    stateful resampler, so chunk boundaries stay seamless.
+    """
+
+    MAX_BLOCK = 4800
+
+    def __init__(self, mixer: AudioMixer, channel: str, sample_rate: int = 24000):
+        self.mixer = mixer
+        self.channel = channel
+        self.sample_rate = sample_rate
+        self.is_playing = True
+        self._resampler = PolyphaseResampler(sample_rate, mixer.sample_rate, self.MAX_BLOCK)
+
+    def start(self):
+        self.is_playing = True
+
+    def stop(self, interrupted: bool = False):
+        self.mixer.flush(self.channel)
+        self._resampler.reset()
+
+    def add_audio_chunk(self, audio_bytes: bytes):
+        pcm = np.frombuffer(audio_bytes, dtype=np.int16)
+        pieces = [self._resampler.process(pcm[i:i + self.MAX_BLOCK]).copy()
+                  for i in range(0, len(pcm), self.MAX_BLOCK)]
+        if pieces:
+            self.mixer.play(self.channel, np.concatenate(pieces), self.mixer.sample_rate)
+
+    def wait_drained(self, timeout: float = 60.0) -> bool:
+        return self.mixer.wait_idle(self.channel, timeout)
+
+    @property
+    def is_queue_empty(self) -> bool:
+        return not self.mixer.is_active(self.channel)
+
+
+_mixer: Optional[AudioMixer] = None
+
+
+def get_mixer() -> Optional[AudioMixer]:
+    """The process-wide mixer if it is running, else None (callers use their fallback)."""
+    return _mixer if _mixer is not None and _mixer.running else None
+
+
+def set_mixer(mixer: Optional[AudioMixer]) -> Optional[AudioMixer]:
+    """Install mixer as the process-wide one (offline rendering); returns the previous one."""
+    global _mixer
+    previous, _mixer = _mixer, mixer
+    return previous
+
+
+def configure_mixer(config: Optional[dict] = None) -> Optional[AudioMixer]:
+    """Create and start the process-wide mixer from the audio.mixer config block."""
+    global _mixer
+    config = config or {}
+    if not config.get("enabled", True):
+        return None
+    channels = None
+    if config.get("channels"):
+        channels = [ChannelConfig(name, **settings) for name, settings in config["channels"].items()]
+    mixer = AudioMixer(
+        sample_rate=config.get("sample_rate", DEFAULT_SAMPLE_RATE),
+        blocksize=config.get("blocksize", 480),
+        channels=channels,
+        device=config.get("device"),
+        attack_ms=config.get("attack_ms", 20.0),
+        release_ms=config.get("release_ms", 250.0),
+    )
+    if not mixer.start():
+        return None
+    _mixer = mixer
+    return mixer
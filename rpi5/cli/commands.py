@@ -341,3 +341,37 @@ def check_status() -> int:
     print(f"  SUPABASE_URL: {supabase_url}")
 
     return 0
+
+
+def dump_traces(path: str = "logs/voice_traces.jsonl", last: int = 20, as_json: bool = False) -> int:
+    """Print recent voice interaction traces and p50/p95 per segment"""
+    from rpi5.voice_trace import load_traces, summarize
+
+    traces = load_traces(path, last=last)
+    if not traces:
+        print(f"No voice traces in {path}")
+        return 1
+
+    if as_json:
+        import json
+        print(json.dumps({"summary": summarize(traces), "traces": traces}, indent=2))
+        return 0
+
+    print(f"Voice Interaction Traces ({len(traces)} from {path})")
+    print("=" * 60)
+    for record in traces:
+        stamp = time.strftime("%H:%M:%S", time.localtime(record["time"]))
+        text = record.get("attrs", {}).get("text", "")
+        print(f"\n{stamp} [{record['source']}] {record['trace_id']}  '{text}'")
+        for span in record["spans"]:
+            attrs = " ".join(f"{k}={v}" for k, v in span["attrs"].items())
+            print(f"  {span['start_ms']:>8.0f}ms  {span['name']:<13} {span['duration_ms']:>8.0f}ms  {attrs}")
+        for name, offset in record["marks"].items():
+            print(f"  {offset:>8.0f}ms  @{name}")
+
+    print(f"\n{'Segment':<13} {'n':>4} {'p50':>9} {'p95':>9} {'max':>9}")
+    print("-" * 48)
+    for name, stats in summarize(traces).items():
+        print(f"{name:<13} {stats['count']:>4} {stats['p50_ms']:>7.0f}ms "
+              f"{stats['p95_ms']:>7.0f}ms {stats['max_ms']:>7.0f}ms")
+    return 0
@@ -23,6 +23,19 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from uuid import uuid4
 
+try:
+    from .layer4_memory.frame_store import FrameStore
+except ImportError:
+    try:
+        from layer4_memory.frame_store import FrameStore
+    except ImportError:
+        FrameStore = None
+
+try:
+    from .layer4_memory.sqlite_access import get_database
+except ImportError:
+    from layer4_memory.sqlite_access import get_database
+
 logger = logging.getLogger(__name__)
 
 # Default system instruction (overridden by personalization if available)
@@ -110,6 +123,7 @@ class ConversationManager:
         logger.info("Initializing ConversationManager...")
         
         self.db_path = db_path
+        self.db = get_database(db_path)  # Shared writer thread + read pool
         self.session_timeout = session_timeout
         self.max_turns = max_turns
         self.config = config or {}
@@ -150,6 +164,23 @@ class ConversationManager:
         self.memory_images_dir = Path(self.config.get('memory_images_dir', 'memory_images'))
         self.memory_images_dir.mkdir(parents=True, exist_ok=True)
         
+        # Content-addressed frame store (dedup + thumbnail/full-res tiers)
+        self.frame_store = None
+        fs_config = self.config.get('frame_store', {})
+        if fs_config.get('enabled', True) and FrameStore:
+            try:
+                self.frame_store = FrameStore(
+                    root_dir=str(self.memory_images_dir),
+                    max_full_bytes=int(fs_config.get('max_full_mb', 200) * 1024 * 1024),
+                    max_full_age_days=fs_config.get('max_full_age_days', 7),
+                    max_thumb_bytes=int(fs_config.get('max_thumb_mb', 20) * 1024 * 1024),
+                    thumb_size=fs_config.get('thumb_size', 160),
+                    full_max_side=fs_config.get('full_max_side', 1280),
+                    dedup_distance=fs_config.get('dedup_distance', 4),
+                )
+            except Exception as e:
+                logger.error(f"FrameStore init failed, saving frames directly: {e}")
+        
         # Context compression threshold (chars, ~1MB = ~250K chars in UTF-8)
         self.compression_threshold = self.config.get('context_compression_threshold_chars', 250000)
         
@@ -170,67 +201,60 @@ class ConversationManager:
     def _init_db(self):
         """Initialize SQLite tables for conversations and user profile."""
         try:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.execute("PRAGMA journal_mode=WAL")
-            
-            # Conversations table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS conversations_local (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT NOT NULL,
-                    role TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    query_type TEXT,
-                    timestamp REAL NOT NULL,
-                    image_path TEXT,
-                    full_response TEXT
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_conversations_session
-                ON conversations_local(session_id, timestamp)
-            """)
-            
-            # Migration: add image_path and full_response columns if missing
-            # (for existing databases created before this update)
-            try:
-                conn.execute("ALTER TABLE conversations_local ADD COLUMN image_path TEXT")
-                logger.info("Migrated: added image_path column")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-            try:
-                conn.execute("ALTER TABLE conversations_local ADD COLUMN full_response TEXT")
-                logger.info("Migrated: added full_response column")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-            
-            # Full-text search index on full_response for object recall
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_conversations_content
-                ON conversations_local(content)
-            """)
-            
-            # User profile table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS user_profile (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    key TEXT UNIQUE NOT NULL,
-                    value TEXT NOT NULL,
-                    updated_at REAL NOT NULL
-                )
-            """)
-            
-            conn.commit()
-            conn.close()
+            self.db.transaction(self._create_schema)
             logger.info("Conversation tables initialized in SQLite")
         except Exception as e:
             logger.error(f"Failed to initialize conversation tables: {e}")
 
-    def _get_db(self) -> sqlite3.Connection:
-        """Get a SQLite connection (short-lived, for thread safety)."""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """Create tables and run migrations (runs on the writer connection)."""
+        # Conversations table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS conversations_local (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                query_type TEXT,
+                timestamp REAL NOT NULL,
+                image_path TEXT,
+                full_response TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_session
+            ON conversations_local(session_id, timestamp)
+        """)
+        
+        # Migration: add image_path and full_response columns if missing
+        # (for existing databases created before this update)
+        try:
+            conn.execute("ALTER TABLE conversations_local ADD COLUMN image_path TEXT")
+            logger.info("Migrated: added image_path column")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        try:
+            conn.execute("ALTER TABLE conversations_local ADD COLUMN full_response TEXT")
+            logger.info("Migrated: added full_response column")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        
+        # Full-text search index on full_response for object recall
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_content
+            ON conversations_local(content)
+        """)
+        
+        # User profile table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_profile (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT UNIQUE NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
 
     def _check_session_timeout(self):
         """Check if session has timed out and start a new one if needed."""
@@ -255,12 +279,19 @@ class ConversationManager:
         """
         Save a camera frame as JPEG for visual memory.
         
+        With the frame store enabled, near-duplicate frames resolve to the
+        existing file and encoding happens in the background, so the returned
+        path may not exist on disk for a few milliseconds.
+        
         Args:
             pil_image: PIL Image object (camera frame)
             
         Returns:
             Saved file path relative to project root, or None on failure
         """
+        if self.frame_store:
+            return self.frame_store.put(pil_image)
+        
         try:
             # Create session subdirectory
             session_dir = self.memory_images_dir / self.session_id[:8]
@@ -278,6 +309,35 @@ class ConversationManager:
             logger.error(f"Failed to save memory image: {e}")
             return None
 
+    def get_image_bytes(self, image_path: str, max_side: Optional[int] = None) -> Optional[bytes]:
+        """
+        Get ready-to-send JPEG bytes for a memory image.
+        
+        Args:
+            image_path: Path returned by save_image() (or a legacy image path)
+            max_side: Longest side in pixels (None = stored resolution)
+            
+        Returns:
+            JPEG bytes, or None if the image no longer exists
+        """
+        if self.frame_store:
+            return self.frame_store.get_jpeg(image_path, max_side=max_side)
+        try:
+            if not image_path or not os.path.exists(image_path):
+                return None
+            from PIL import Image
+            import io
+            with Image.open(image_path) as img:
+                img = img.convert("RGB")
+                if max_side and max(img.size) > max_side:
+                    img.thumbnail((max_side, max_side))
+                buf = io.BytesIO()
+                img.save(buf, "JPEG", quality=80)
+                return buf.getvalue()
+        except Exception as e:
+            logger.error(f"Failed to load memory image {image_path}: {e}")
+            return None
+
     def add_turn(
         self,
         role: str,
@@ -317,15 +377,12 @@ class ConversationManager:
         
         # Persist to SQLite immediately
         try:
-            conn = self._get_db()
-            conn.execute(
+            self.db.execute(
                 """INSERT INTO conversations_local 
                    (session_id, role, content, query_type, timestamp, image_path, full_response)
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (self.session_id, role, content, query_type, now, image_path, full_response)
             )
-            conn.commit()
-            conn.close()
         except Exception as e:
             logger.error(f"Failed to persist conversation turn: {e}")
         
@@ -567,62 +624,61 @@ class ConversationManager:
         started during runtime if the user is silent for session_timeout seconds.
         """
         try:
-            conn = self._get_db()
-            cursor = conn.execute("""
-                SELECT session_id, MAX(timestamp) as last_ts
+            with self.db.reader() as conn:
+                self._restore_last_session(conn)
+        except Exception as e:
+            logger.warning(f"Could not restore session: {e}")
+
+    def _restore_last_session(self, conn: sqlite3.Connection):
+        """Load the most recent session's turns using a pooled read connection."""
+        cursor = conn.execute("""
+            SELECT session_id, MAX(timestamp) as last_ts
+            FROM conversations_local
+            GROUP BY session_id
+            ORDER BY last_ts DESC
+            LIMIT 1
+        """)
+        row = cursor.fetchone()
+        
+        if row:
+            last_session_id = row['session_id']
+            last_timestamp = row['last_ts']
+            age = time.time() - last_timestamp
+            
+            # Always restore — sessions persist indefinitely
+            self.session_id = last_session_id
+            self.session_start = last_timestamp  # Approximate
+            self.last_activity = time.time()  # Reset activity to NOW so timeout starts fresh
+            
+            # Load turns (including image_path and full_response)
+            turns_cursor = conn.execute("""
+                SELECT role, content, query_type, timestamp, image_path, full_response
                 FROM conversations_local
-                GROUP BY session_id
-                ORDER BY last_ts DESC
-                LIMIT 1
-            """)
-            row = cursor.fetchone()
+                WHERE session_id = ?
+                ORDER BY timestamp ASC
+            """, (last_session_id,))
             
-            if row:
-                last_session_id = row['session_id']
-                last_timestamp = row['last_ts']
-                age = time.time() - last_timestamp
-                
-                # Always restore — sessions persist indefinitely
-                self.session_id = last_session_id
-                self.session_start = last_timestamp  # Approximate
-                self.last_activity = time.time()  # Reset activity to NOW so timeout starts fresh
-                
-                # Load turns (including image_path and full_response)
-                turns_cursor = conn.execute("""
-                    SELECT role, content, query_type, timestamp, image_path, full_response
-                    FROM conversations_local
-                    WHERE session_id = ?
-                    ORDER BY timestamp ASC
-                """, (last_session_id,))
-                
-                for turn_row in turns_cursor:
-                    self.turns.append({
-                        "role": turn_row['role'],
-                        "content": turn_row['content'],
-                        "query_type": turn_row['query_type'],
-                        "timestamp": turn_row['timestamp'],
-                        "image_path": turn_row['image_path'],
-                        "full_response": turn_row['full_response'],
-                    })
-                
-                logger.info(
-                    f"Restored session {last_session_id[:8]}... "
-                    f"({len(self.turns)} turns, {age:.0f}s old)"
-                )
+            for turn_row in turns_cursor:
+                self.turns.append({
+                    "role": turn_row['role'],
+                    "content": turn_row['content'],
+                    "query_type": turn_row['query_type'],
+                    "timestamp": turn_row['timestamp'],
+                    "image_path": turn_row['image_path'],
+                    "full_response": turn_row['full_response'],
+                })
             
-            conn.close()
-        except Exception as e:
-            logger.warning(f"Could not restore session: {e}")
+            logger.info(
+                f"Restored session {last_session_id[:8]}... "
+                f"({len(self.turns)} turns, {age:.0f}s old)"
+            )
 
     def load_user_profile(self):
         """Load user profile from SQLite."""
         try:
-            conn = self._get_db()
-            cursor = conn.execute("SELECT key, value FROM user_profile")
             self.user_profile = {}
-            for row in cursor:
+            for row in self.db.query("SELECT key, value FROM user_profile"):
                 self.user_profile[row['key']] = row['value']
-            conn.close()
             
             if self.user_profile:
                 logger.info(f"User profile loaded: {list(self.user_profile.keys())}")
@@ -638,15 +694,12 @@ class ConversationManager:
             value: Profile value
         """
         try:
-            conn = self._get_db()
-            conn.execute(
+            self.db.execute(
                 """INSERT INTO user_profile (key, value, updated_at)
                    VALUES (?, ?, ?)
                    ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = ?""",
                 (key, value, time.time(), value, time.time())
             )
-            conn.commit()
-            conn.close()
             
             # Update in-memory cache
             self.user_profile[key] = value
@@ -663,20 +716,28 @@ class ConversationManager:
         """
         cutoff = time.time() - (days * 86400)
         try:
-            conn = self._get_db()
-            cursor = conn.execute(
+            deleted = self.db.execute(
                 "DELETE FROM conversations_local WHERE timestamp < ?",
                 (cutoff,)
-            )
-            deleted = cursor.rowcount
-            conn.commit()
-            conn.close()
+            ).rowcount
             
             if deleted > 0:
                 logger.info(f"Cleaned up {deleted} conversation turns older than {days} days")
         except Exception as e:
             logger.error(f"Failed to cleanup old conversations: {e}")
 
+    def close(self):
+        """
+        Shut down: write out queued frames (their paths are already in the
+        history) and release the database. Call before the databases close.
+        """
+        if self.frame_store:
+            self.frame_store.close()
+            self.frame_store = None
+        if self.db is not None:
+            self.db.release()
+            self.db = None
+
     # =================================================================
     # Object Recall — Search & Spatial Memory
     # =================================================================
@@ -742,8 +803,7 @@ class ConversationManager:
         search_term = f"%{object_name}%"
         
         try:
-            conn = self._get_db()
-            cursor = conn.execute("""
+            rows = self.db.query("""
                 SELECT session_id, role, content, full_response, image_path, timestamp
                 FROM conversations_local
                 WHERE (content LIKE ? OR full_response LIKE ?)
@@ -752,7 +812,7 @@ class ConversationManager:
                 LIMIT ?
             """, (search_term, search_term, limit))
             
-            for row in cursor:
+            for row in rows:
                 results.append({
                     "session_id": row['session_id'],
                     "content": row['content'],
@@ -761,8 +821,6 @@ class ConversationManager:
                     "timestamp": row['timestamp'],
                 })
             
-            conn.close()
-            
             if results:
                 logger.info(
                     f"Object recall: found {len(results)} mentions of '{object_name}' "
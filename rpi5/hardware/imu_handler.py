@@ -133,6 +133,7 @@ class IMUHandler:
         # Event callbacks (optional)
         self.on_fall_detected = None       # callable() — called on free-fall
         self.on_impact_detected = None     # callable(accel_mag: float)
+        self.on_reading = None             # callable(IMUReading) — every sample (head tracking)
         self._start_time = 0.0             # suppress false falls during init
 
         self._sensor = None  # adafruit_bno055.BNO055_I2C instance
@@ -329,6 +330,12 @@ class IMUHandler:
         with self._lock:
             self._reading = reading
 
+        if self.on_reading:
+            try:
+                self.on_reading(reading)
+            except Exception as exc:
+                logger.error(f"on_reading callback error: {exc}")
+
         self._check_events(ax, ay, az)
 
     def _check_events(self, ax: float, ay: float, az: float) -> None:
@@ -0,0 +1,323 @@
+"""
+Layer 1: Audio Ring Buffers - Allocation-Free Capture Path for VAD
+
+The microphone callback runs every ~32ms for as long as Cortex is on, so the
+capture path must not allocate per chunk (GC pauses and allocator churn show
+up as callback jitter and dropped audio on the Pi). Everything here works on
+buffers preallocated at startup:
+
+- AudioRingBuffer: single-producer/single-consumer float32 ring between the
+  PyAudio callback and the VAD thread, with an overrun counter instead of an
+  unbounded Queue
+- PolyphaseResampler: stateful windowed-sinc polyphase resampler (48k/44.1k
+  -> 16k) that keeps its filter history across chunks, writing into a
+  preallocated output (replaces per-chunk linspace + interp)
+- SpeechCapture: contiguous capture buffers; pre-speech padding and the
+  speech segment are one slice of the same array, so a finished segment is a
+  VIEW instead of an np.concatenate of chunk lists
+- LatencyRing: fixed-size timing history for callback/VAD latency stats
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+from math import gcd
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+class AudioRingBuffer:
+    """
+    Lock-free SPSC float32 ring (one writer thread, one reader thread).
+
+    The writer only advances the write counter after copying, the reader only
+    advances the read counter after copying, so each side sees consistent
+    data without a lock. A write that does not fit is dropped and counted as
+    an overrun (the consumer fell behind).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self._write = 0  # Absolute sample counters (never wrap)
+        self._read = 0
+
+        self.overruns = 0
+        self.dropped_samples = 0
+        self.high_water = 0
+
+    @property
+    def available(self) -> int:
+        """Samples ready to read."""
+        return self._write - self._read
+
+    def write(self, samples: np.ndarray) -> bool:
+        """Append samples; returns False (overrun) if the ring is too full."""
+        n = len(samples)
+        fill = self._write - self._read
+        if n > self.capacity - fill:
+            self.overruns += 1
+            self.dropped_samples += n
+            return False
+        start = self._write % self.capacity
+        first = min(n, self.capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        if first < n:
+            self._buf[:n - first] = samples[first:]
+        self._write += n
+        if fill + n > self.high_water:
+            self.high_water = fill + n
+        return True
+
+    def read_into(self, out: np.ndarray) -> bool:
+        """Fill `out` with the next len(out) samples; False if not enough data yet."""
+        n = len(out)
+        if self._write - self._read < n:
+            return False
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._buf[start:start + first]
+        if first < n:
+            out[first:] = self._buf[:n - first]
+        self._read += n
+        return True
+
+    def clear(self):
+        """Drop unread samples (reader side)."""
+        self._read = self._write
+
+
+class PolyphaseResampler:
+    """
+    Stateful rational-ratio resampler for int16 PCM -> float32.
+
+    A Kaiser-windowed sinc low-pass is split into `up` phases. Each output
+    sample is one dot product between a phase and the most recent input
+    samples; the tail of every chunk is kept as history for the next one, so
+    chunk boundaries are seamless.
+
+    For a fixed input block length the gather indices and coefficients repeat
+    from chunk to chunk. They are computed once per (phase offset, length)
+    and cached, after which process() only does np.take/multiply/sum into
+    preallocated buffers. preferred_block() picks a device buffer size with a
+    single repeating pattern.
+    """
+
+    MAX_PATTERNS = 4
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int,
+        max_block: int,
+        half_width: int = 8,
+        rolloff: float = 0.9,
+        beta: float = 8.6,
+    ):
+        """
+        Args:
+            in_rate: Device sample rate (e.g. 48000, 44100)
+            out_rate: Target rate (16000 for Silero/Whisper)
+            max_block: Largest input block passed to process()
+            half_width: Filter half-length in output-rate zero crossings
+            rolloff: Cutoff as a fraction of the output Nyquist frequency
+            beta: Kaiser window beta (8.6 ~ 80 dB stopband)
+        """
+        g = gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.max_block = max_block
+        self.passthrough = self.up == self.down
+
+        if self.passthrough:
+            self.taps = 1
+            self._phases = None
+        else:
+            factor = max(self.up, self.down)
+            n_taps = 2 * half_width * factor + 1
+            cutoff = rolloff * 0.5 / factor  # cycles per upsampled sample
+            t = np.arange(n_taps) - (n_taps - 1) / 2
+            h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(n_taps, beta)
+            h *= self.up / h.sum()
+            self.taps = -(-n_taps // self.up)
+            h = np.concatenate([h, np.zeros(self.taps * self.up - n_taps)])
+            # phases[p, k] = h[k * up + p] applies to input x[n - k]
+            self._phases = h.reshape(self.taps, self.up).T.astype(np.float32)
+
+        self._hist = self.taps - 1
+        self._ext = np.zeros(self._hist + max_block, dtype=np.float32)
+        max_out = max_block * self.up // self.down + 2
+        self._out = np.zeros(max_out, dtype=np.float32)
+        self._gather = np.zeros((max_out, self.taps), dtype=np.float32)
+        self._patterns: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+        self._offset = 0  # Next output position (upsampled domain) relative to chunk start
+        self.uncached_blocks = 0
+
+    def preferred_block(self, target: int) -> int:
+        """Input block near `target` samples whose resampling pattern repeats every chunk."""
+        if self.passthrough:
+            return target
+        return max(self.down, int(round(target / self.down)) * self.down)
+
+    def _pattern(self, offset: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        key = (offset, n)
+        pattern = self._patterns.get(key)
+        if pattern is not None:
+            return pattern
+        count = -(-(n * self.up - offset) // self.down)
+        t = offset + self.down * np.arange(count)
+        n_in, phase = np.divmod(t, self.up)
+        # Input x[n_in - k] lives at ext[hist + n_in - k]
+        idx = (self._hist + n_in)[:, None] - np.arange(self.taps)[None, :]
+        pattern = (idx.astype(np.intp), self._phases[phase])
+        if len(self._patterns) < self.MAX_PATTERNS:
+            self._patterns[key] = pattern
+        else:
+            self.uncached_blocks += 1
+        return pattern
+
+    @staticmethod
+    def _to_float(pcm: np.ndarray, out: np.ndarray) -> np.ndarray:
+        # copyto + in-place scale: a mixed-dtype ufunc would allocate a cast buffer
+        np.copyto(out, pcm, casting='unsafe')
+        np.multiply(out, INT16_SCALE, out=out)
+        return out
+
+    def process(self, pcm: np.ndarray) -> np.ndarray:
+        """
+        Resample one int16 block.
+
+        Returns:
+            float32 view into an internal buffer, valid until the next call
+        """
+        n = len(pcm)
+        if self.passthrough:
+            return self._to_float(pcm, self._out[:n])
+
+        hist = self._hist
+        ext = self._ext[:hist + n]
+        self._to_float(pcm, ext[hist:])
+
+        idx, coef = self._pattern(self._offset, n)
+        count = len(idx)
+        gather = self._gather[:count]
+        np.take(ext, idx, out=gather, mode='clip')
+        np.multiply(gather, coef, out=gather)
+        out = self._out[:count]
+        np.sum(gather, axis=1, out=out)
+
+        # Keep the newest `hist` inputs for the next chunk
+        self._ext[:hist] = ext[n:]
+        self._offset += count * self.down - n * self.up
+        return out
+
+    def reset(self):
+        self._ext[:] = 0
+        self._offset = 0
+
+
+class SpeechCapture:
+    """
+    Contiguous audio capture with zero-copy speech segments.
+
+    Chunks are written back to back into a preallocated buffer. Outside
+    speech the buffer is compacted (only the padding tail is kept) when it
+    fills. A segment starts `lookback` samples before the current position,
+    so pre-speech padding and speech are one contiguous slice. end_segment()
+    returns that slice as a view and moves writing to the next buffer, so the
+    view stays valid while the consumer (STT) works on it. With n_buffers=3
+    a segment view is valid until two more segments have ended.
+    """
+
+    def __init__(self, capacity: int, padding: int, n_buffers: int = 3):
+        self.capacity = capacity
+        self.padding = padding
+        self._buffers = [np.zeros(capacity, dtype=np.float32) for _ in range(n_buffers)]
+        self._index = 0
+        self._buf = self._buffers[0]
+        self._pos = 0
+        self._seg_start: Optional[int] = None
+
+    @property
+    def in_segment(self) -> bool:
+        return self._seg_start is not None
+
+    @property
+    def segment_samples(self) -> int:
+        return 0 if self._seg_start is None else self._pos - self._seg_start
+
+    def remaining(self) -> int:
+        return self.capacity - self._pos
+
+    def next_chunk(self, n: int) -> np.ndarray:
+        """
+        Writable view for the next n samples (fill it, e.g. via ring.read_into).
+
+        Raises:
+            BufferError: if a segment is open and the buffer is full
+        """
+        if self._pos + n > self.capacity:
+            if self._seg_start is not None:
+                raise BufferError("speech segment exceeds capture capacity")
+            keep = min(self.padding, self._pos)
+            self._buf[:keep] = self._buf[self._pos - keep:self._pos]
+            self._pos = keep
+        view = self._buf[self._pos:self._pos + n]
+        self._pos += n
+        return view
+
+    def begin_segment(self, lookback: int) -> np.ndarray:
+        """Open a segment starting `lookback` samples back; returns the audio so far (view)."""
+        self._seg_start = max(self._pos - lookback, 0)
+        return self._buf[self._seg_start:self._pos]
+
+    def end_segment(self) -> np.ndarray:
+        """Close the segment; returns it as a view and switches to the next buffer."""
+        segment = self._buf[self._seg_start:self._pos]
+        self._seg_start = None
+        self._index = (self._index + 1) % len(self._buffers)
+        self._buf = self._buffers[self._index]
+        self._pos = 0
+        return segment
+
+    def discard_segment(self):
+        """Close the segment without handing it out (keeps writing in place)."""
+        self._seg_start = None
+
+    def reset(self):
+        self._seg_start = None
+        self._pos = 0
+
+
+class LatencyRing:
+    """Fixed-size history of timings in ms (no per-sample allocation)."""
+
+    def __init__(self, size: int = 1024):
+        self._values = np.zeros(size, dtype=np.float64)
+        self.count = 0
+
+    def record(self, value_ms: float):
+        self._values[self.count % len(self._values)] = value_ms
+        self.count += 1
+
+    def values(self) -> np.ndarray:
+        return self._values[:min(self.count, len(self._values))]
+
+    def summary(self) -> Dict[str, float]:
+        values = self.values()
+        if len(values) == 0:
+            return {"p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+            "max_ms": float(values.max()),
+        }
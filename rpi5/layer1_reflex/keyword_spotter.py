@@ -0,0 +1,320 @@
+"""
+Layer 1: Keyword Spotter - Cheap Command Recognition Between VAD and Whisper
+
+Every VAD segment used to go through full Whisper, including coughs, street
+noise and the handful of commands users say all day. This stage runs first
+(~10-20ms on the Pi 5) and decides per segment:
+
+- NOISE:   too little voiced (periodic) audio -> dropped, no STT at all
+- WAKE:    just the wake phrase -> acknowledged, no STT
+- COMMAND: one of the enrolled high-frequency commands ("stop", "where am I",
+           "what's ahead", "repeat") -> its canonical text goes straight to
+           the command handler
+- PASS:    anything else (open queries) -> Whisper / Cartesia as before
+
+Recognition is template matching, the classic small-vocabulary approach
+that needs no model download: each command is enrolled from a few
+recordings of the user saying it, stored as WAV files in
+<templates_dir>/<label>/*.wav. A segment is compared to all templates with
+dynamic time warping over mean-normalized MFCCs (all templates in one
+batched DP pass). It is accepted only when the best distance is under the
+threshold AND beats the best other command by a margin; otherwise it is
+passed on, so the cost of a miss is just the usual Whisper latency.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import time
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+PASS = "pass"
+COMMAND = "command"
+WAKE = "wake"
+NOISE = "noise"
+
+WAKE_LABEL = "wake"
+
+DEFAULT_COMMANDS = {
+    WAKE_LABEL: "",
+    "stop": "stop",
+    "where_am_i": "where am i",
+    "whats_ahead": "what's ahead",
+    "repeat": "repeat",
+}
+
+
+@dataclass
+class SpotResult:
+    """Decision for one VAD segment."""
+    kind: str                          # PASS, COMMAND, WAKE or NOISE
+    label: Optional[str] = None        # Best matching template label
+    text: str = ""                     # Canonical command text (COMMAND)
+    distance: float = float("inf")     # Best DTW distance
+    margin: float = 0.0                # Distance gap to the best other label
+    voiced_ratio: float = 0.0
+    elapsed_ms: float = 0.0
+    scores: Dict[str, float] = field(default_factory=dict)  # Best distance per label
+
+
+class FeatureExtractor:
+    """Log-mel MFCCs with per-utterance mean normalization (numpy only)."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, n_fft: int = 512, win: int = 400,
+                 hop: int = 160, n_mels: int = 40, n_mfcc: int = 13):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.win = win
+        self.hop = hop
+        self.window = np.hanning(win).astype(np.float32)
+        self.mel = self._mel_filterbank(n_mels)
+        # DCT-II basis (orthonormal), skipping c0 (loudness)
+        k = np.arange(1, n_mfcc + 1)[:, None]
+        n = np.arange(n_mels)[None, :]
+        self.dct = (np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)).astype(np.float32)
+
+    def _mel_filterbank(self, n_mels: int) -> np.ndarray:
+        def hz_to_mel(hz):
+            return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+        def mel_to_hz(mel):
+            return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+        mels = np.linspace(hz_to_mel(60.0), hz_to_mel(self.sample_rate / 2 * 0.95), n_mels + 2)
+        bins = np.floor((self.n_fft + 1) * mel_to_hz(mels) / self.sample_rate).astype(int)
+        fb = np.zeros((n_mels, self.n_fft // 2 + 1), dtype=np.float32)
+        for m in range(1, n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            center = max(center, left + 1)
+            right = max(right, center + 1)
+            fb[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            fb[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+        return fb
+
+    def frames(self, audio: np.ndarray) -> np.ndarray:
+        """(n_frames, win) windowed frames (audio shorter than a window is padded)."""
+        audio = np.asarray(audio, dtype=np.float32)
+        if len(audio) < self.win:
+            audio = np.pad(audio, (0, self.win - len(audio)))
+        n = 1 + (len(audio) - self.win) // self.hop
+        idx = np.arange(self.win)[None, :] + self.hop * np.arange(n)[:, None]
+        return audio[idx]
+
+    def mfcc(self, audio: np.ndarray) -> np.ndarray:
+        """(n_frames, n_mfcc) mean-normalized MFCCs."""
+        frames = self.frames(audio) * self.window
+        power = np.abs(np.fft.rfft(frames, n=self.n_fft)) ** 2
+        logmel = np.log(power @ self.mel.T + 1e-8)
+        feats = logmel @ self.dct.T
+        return feats - feats.mean(axis=0)
+
+    def voiced_ratio(self, audio: np.ndarray, min_rms: float = 0.005) -> float:
+        """
+        Fraction of frames with pitch-like periodicity (70-400 Hz).
+
+        Speech is mostly voiced; coughs, clatter and traffic noise are not.
+        """
+        frames = self.frames(audio)
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        rms = np.sqrt((frames ** 2).mean(axis=1))
+        spec = np.fft.rfft(frames, n=2 * self.n_fft)
+        ac = np.fft.irfft(np.abs(spec) ** 2)[:, :self.win]
+        lo, hi = self.sample_rate // 400, self.sample_rate // 70
+        peak = ac[:, lo:hi].max(axis=1) / np.maximum(ac[:, 0], 1e-12)
+        voiced = (peak > 0.45) & (rms > min_rms)
+        return float(voiced.mean())
+
+
+class KeywordSpotter:
+    """
+    DTW template matcher for the wake phrase and a small command set.
+
+    All templates are padded into one (T, m, d) array so a segment is
+    scored against every template in a single row-by-row DP pass with
+    steps (1,0), (1,1), (1,2) (each segment frame advances; the template
+    may be stretched up to 2x or compressed to 0.5x).
+    """
+
+    def __init__(
+        self,
+        commands: Optional[Dict[str, str]] = None,
+        threshold: float = 0.35,
+        margin: float = 0.03,
+        max_command_s: float = 2.0,
+        min_voiced_ratio: float = 0.15,
+    ):
+        """
+        Args:
+            commands: label -> canonical command text ("" for the wake label)
+            threshold: Accept when the best DTW distance is below this
+            margin: ...and at least this much lower than any other label's best
+            max_command_s: Longer segments are open queries (skip matching)
+            min_voiced_ratio: Below this the segment is treated as noise
+        """
+        self.commands = dict(commands) if commands is not None else dict(DEFAULT_COMMANDS)
+        self.threshold = threshold
+        self.margin = margin
+        self.max_command_s = max_command_s
+        self.min_voiced_ratio = min_voiced_ratio
+        self.features = FeatureExtractor()
+
+        self._templates: List[Tuple[str, np.ndarray]] = []
+        self._bank: Optional[np.ndarray] = None      # (T, m_max, d), unit-norm frames
+        self._lengths: Optional[np.ndarray] = None   # (T,) template frame counts
+        self._labels: List[str] = []
+
+        self.stats = {PASS: 0, COMMAND: 0, WAKE: 0, NOISE: 0}
+        self.spot_times: List[float] = []
+
+    # ------------------------------------------------------------------
+    # Enrollment
+    # ------------------------------------------------------------------
+
+    @property
+    def n_templates(self) -> int:
+        return len(self._templates)
+
+    def add_template(self, label: str, audio: np.ndarray):
+        """Enroll one recording of a command (16 kHz float32)."""
+        if label not in self.commands:
+            raise ValueError(f"Unknown command label '{label}'")
+        self._templates.append((label, self.features.mfcc(audio)))
+        self._bank = None
+
+    def load_templates(self, templates_dir: str) -> int:
+        """
+        Enroll every <templates_dir>/<label>/*.wav for the configured labels.
+
+        Returns:
+            Number of templates loaded
+        """
+        root = Path(templates_dir)
+        count = 0
+        for label in self.commands:
+            for path in sorted((root / label).glob("*.wav")):
+                try:
+                    self.add_template(label, load_wav(path))
+                    count += 1
+                except Exception as e:
+                    logger.warning(f"⚠️ KWS template {path} skipped: {e}")
+        missing = [label for label in self.commands if not any(l == label for l, _ in self._templates)]
+        if missing:
+            logger.warning(f"⚠️ KWS: no templates for {missing} in {templates_dir}")
+        logger.info(f"✅ KWS: {count} templates for {len(self.commands) - len(missing)} commands")
+        return count
+
+    def _build_bank(self):
+        m_max = max(len(f) for _, f in self._templates)
+        dim = self._templates[0][1].shape[1]
+        bank = np.zeros((len(self._templates), m_max, dim), dtype=np.float32)
+        for i, (_, feats) in enumerate(self._templates):
+            bank[i, :len(feats)] = feats / (np.linalg.norm(feats, axis=1, keepdims=True) + 1e-8)
+        self._bank = bank
+        self._lengths = np.array([len(f) for _, f in self._templates])
+        self._labels = [label for label, _ in self._templates]
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def distances(self, audio: np.ndarray) -> np.ndarray:
+        """Length-normalized DTW distance (cosine frame cost) to every template."""
+        if self._bank is None:
+            self._build_bank()
+        q = self.features.mfcc(audio)
+        q = q / (np.linalg.norm(q, axis=1, keepdims=True) + 1e-8)
+        cost = 1.0 - np.einsum("nd,tmd->tnm", q, self._bank)  # (T, n, m)
+
+        n = len(q)
+        n_t, m_max = self._bank.shape[:2]
+        inf = np.float32(np.inf)
+        acc = np.full((n_t, m_max + 2), inf, dtype=np.float32)  # Two pad columns for the j-2 step
+        acc[:, 2] = cost[:, 0, 0]
+        for i in range(1, n):
+            prev = acc
+            acc = np.full_like(prev, inf)
+            best = np.minimum(np.minimum(prev[:, 2:], prev[:, 1:-1]), prev[:, :-2])
+            acc[:, 2:] = cost[:, i, :] + best
+        final = acc[np.arange(n_t), self._lengths + 1] / n
+
+        # Outside the warp range the path cannot exist (inf); keep it explicit
+        ratio = n / self._lengths
+        final[(ratio < 0.5) | (ratio > 2.0)] = np.inf
+        return final
+
+    def spot(self, audio: np.ndarray) -> SpotResult:
+        """Classify one VAD segment (16 kHz float32)."""
+        start = time.perf_counter()
+        voiced = self.features.voiced_ratio(audio)
+        if voiced < self.min_voiced_ratio:
+            result = SpotResult(NOISE, voiced_ratio=voiced)
+        elif not self._templates or len(audio) > self.max_command_s * SAMPLE_RATE:
+            result = SpotResult(PASS, voiced_ratio=voiced)
+        else:
+            result = self._match(audio, voiced)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats[result.kind] += 1
+        self.spot_times.append(result.elapsed_ms)
+        return result
+
+    def _match(self, audio: np.ndarray, voiced: float) -> SpotResult:
+        dist = self.distances(audio)
+        scores: Dict[str, float] = {}
+        for label, d in zip(self._labels, dist):
+            scores[label] = min(scores.get(label, np.inf), float(d))
+        ranked = sorted(scores.items(), key=lambda item: item[1])
+        label, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else np.inf
+        margin = runner_up - best
+
+        kind = PASS
+        if best < self.threshold and margin >= self.margin:
+            kind = WAKE if label == WAKE_LABEL else COMMAND
+        return SpotResult(
+            kind, label=label, text=self.commands.get(label, "") if kind == COMMAND else "",
+            distance=best, margin=margin, voiced_ratio=voiced, scores=scores,
+        )
+
+    def get_stats(self) -> Dict[str, float]:
+        total = sum(self.stats.values())
+        return {
+            **self.stats,
+            "templates": self.n_templates,
+            "stt_skipped_ratio": (total - self.stats[PASS]) / total if total else 0.0,
+            "avg_spot_ms": float(np.mean(self.spot_times)) if self.spot_times else 0.0,
+        }
+
+
+def load_wav(path) -> np.ndarray:
+    """16 kHz mono 16-bit WAV -> float32 [-1, 1]."""
+    with wave.open(str(path), "rb") as wf:
+        if wf.getframerate() != SAMPLE_RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{Path(path).name}: expected 16 kHz mono 16-bit PCM")
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    return data.astype(np.float32) / 32768.0
+
+
+def create_keyword_spotter(config: Optional[dict]) -> Optional[KeywordSpotter]:
+    """Spotter from the audio.kws config block; None if disabled or nothing enrolled."""
+    config = config or {}
+    if not config.get("enabled", False):
+        return None
+    spotter = KeywordSpotter(
+        commands=config.get("commands", DEFAULT_COMMANDS),
+        threshold=config.get("threshold", 0.35),
+        margin=config.get("margin", 0.03),
+        max_command_s=config.get("max_command_s", 2.0),
+        min_voiced_ratio=config.get("min_voiced_ratio", 0.15),
+    )
+    spotter.load_templates(config.get("templates_dir", "data/kws"))
+    return spotter
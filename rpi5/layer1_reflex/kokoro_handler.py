@@ -66,6 +66,11 @@ except ImportError:
     KOKORO_AVAILABLE = False
     Kokoro = None
 
+try:
+    from .tts_streaming import split_clauses
+except ImportError:
+    from layer1_reflex.tts_streaming import split_clauses
+
 logger = logging.getLogger(__name__)
 
 
@@ -367,8 +372,9 @@ class KokoroTTS:
         """
         Generate speech with streaming output (for low-latency playback).
         
-        This yields audio chunks as they're generated, allowing playback
-        to start before the entire audio is generated.
+        The text is split into clauses (short first clause) and each one is
+        synthesized separately, so playback can start after the first
+        clause while the rest is still being generated.
         
         Args:
             text: Text to convert to speech
@@ -376,7 +382,7 @@ class KokoroTTS:
             speed: Speech speed multiplier (uses default if None)
             
         Yields:
-            Audio chunks as numpy arrays
+            Audio chunks as float32 numpy arrays (24kHz), one per clause
         """
         if self.pipeline is None:
             logger.error("❌ Pipeline not loaded. Call load_pipeline() first.")
@@ -388,9 +394,14 @@ class KokoroTTS:
             
             logger.info(f"🔊 Streaming TTS: '{text[:50]}...'")
             
-            # Yield chunks as they're generated
-            for chunk in self.pipeline(text, voice=voice, speed=speed):
-                yield chunk
+            for clause in split_clauses(text):
+                start_time = time.time()
+                audio_data, _sample_rate = self.pipeline.create(
+                    clause, voice=voice, speed=speed, lang="en-us", trim=True
+                )
+                self.generation_times.append((time.time() - start_time) * 1000)
+                if audio_data is not None and len(audio_data) > 0:
+                    yield np.asarray(audio_data, dtype=np.float32)
                 
         except Exception as e:
             logger.error(f"❌ Streaming generation failed: {e}")
@@ -0,0 +1,294 @@
+"""
+Layer 1: Streaming STT - Incremental Transcription While the User Speaks
+
+The batch path waits for the VAD end event, concatenates the whole segment
+and only then runs Whisper, so the full STT time is added after every
+utterance. StreamingTranscriber instead decodes the audio received so far
+every step_s while speech is still active and emits partial transcripts.
+
+Stability (LocalAgreement-2):
+- Each decode produces a hypothesis for the current window.
+- Words on which two consecutive hypotheses agree (common prefix) become
+  STABLE and are never revised; the rest of the hypothesis is UNSTABLE.
+- Downstream consumers (speculative routing, UI) can act on stable text.
+
+Windows:
+- The window grows with the utterance up to max_window_s. Past that, stable
+  words are committed, the window slides forward keeping overlap_s of audio,
+  and the committed tail is passed as the decoder prompt. Words re-decoded in
+  the overlap are removed by suffix/prefix matching.
+
+Finalization:
+- The VAD end event fires after min_silence_duration_ms of silence. If the
+  last partial decode already covered everything except that silence tail,
+  its hypothesis IS the final transcript (no decode after end of speech).
+- Otherwise one decode of the current (short) window runs, not a decode of
+  the whole utterance.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD_NORMALIZE = re.compile(r"[^\w']+")
+
+
+def _norm(word: str) -> str:
+    return _WORD_NORMALIZE.sub("", word.lower())
+
+
+def _common_prefix(a: List[str], b: List[str]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if _norm(x) != _norm(y):
+            break
+        n += 1
+    return n
+
+
+def _overlap(committed: List[str], words: List[str], max_words: int = 12) -> int:
+    """Length of the longest suffix of committed that equals a prefix of words."""
+    limit = min(len(committed), len(words), max_words)
+    for k in range(limit, 0, -1):
+        if [_norm(w) for w in committed[-k:]] == [_norm(w) for w in words[:k]]:
+            return k
+    return 0
+
+
+@dataclass
+class PartialTranscript:
+    """A (partial or final) transcript with stability markers."""
+    stable: str                 # Words that will not change
+    unstable: str               # Tentative tail (may be revised)
+    is_final: bool = False
+    revision: int = 0           # Increments with every emitted hypothesis
+    audio_s: float = 0.0        # Utterance audio covered by this hypothesis
+    decode_ms: float = 0.0      # Decoder time for this hypothesis (0 if reused)
+
+    @property
+    def text(self) -> str:
+        return " ".join(part for part in (self.stable, self.unstable) if part)
+
+    @property
+    def stability(self) -> float:
+        """Fraction of words that are stable (1.0 for final transcripts)."""
+        stable_words = len(self.stable.split())
+        total = stable_words + len(self.unstable.split())
+        return 1.0 if total == 0 else stable_words / total
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcriber for ONE utterance.
+
+    Create at VAD speech start, feed() every chunk, finish() at VAD end.
+    Decoding runs on a background thread; feed() never blocks on the model.
+    If the decoder is slower than step_s, steps are skipped (the next decode
+    simply covers more audio).
+    """
+
+    def __init__(
+        self,
+        decode_fn: Callable[[np.ndarray, Optional[str]], str],
+        sample_rate: int = 16000,
+        step_s: float = 0.8,
+        min_first_s: float = 0.8,
+        max_window_s: float = 12.0,
+        overlap_s: float = 3.0,
+        max_utterance_s: float = 60.0,
+        on_partial: Optional[Callable[[PartialTranscript], None]] = None,
+    ):
+        """
+        Args:
+            decode_fn: fn(audio float32 16 kHz, prompt) -> text for one window
+            sample_rate: Audio sample rate
+            step_s: New audio between partial decodes
+            min_first_s: Audio needed before the first partial decode
+            max_window_s: Longest window decoded at once
+            overlap_s: Audio kept when the window slides
+            max_utterance_s: Capture buffer capacity (longer speech is truncated)
+            on_partial: Called with every new PartialTranscript (decoder thread)
+        """
+        self.decode_fn = decode_fn
+        self.sample_rate = sample_rate
+        self.step = int(step_s * sample_rate)
+        self.min_first = int(min_first_s * sample_rate)
+        self.max_window = int(max_window_s * sample_rate)
+        self.overlap = int(min(overlap_s, max_window_s / 2) * sample_rate)
+        self.on_partial = on_partial
+
+        self._buf = np.zeros(int(max_utterance_s * sample_rate), dtype=np.float32)
+        self._n = 0
+        self._truncated = False
+
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._finished = False
+
+        self._window_start = 0
+        self._committed: List[str] = []     # Words from windows that slid away
+        self._frozen: List[str] = []        # Stable words in the current window
+        self._hypothesis: List[str] = []    # Last full hypothesis for the window
+        self._decoded_to = 0                # Sample index covered by _hypothesis
+        self._revision = 0
+        self.latest: Optional[PartialTranscript] = None
+
+        # Stats
+        self.partial_decodes = 0
+        self.final_decode_ms = 0.0
+        self.final_reused = False
+        self.speech_start_time = time.time()
+
+    # ------------------------------------------------------------------
+    # Input
+    # ------------------------------------------------------------------
+
+    def feed(self, chunk: np.ndarray):
+        """Append audio (float32, any length) and schedule a partial decode if due."""
+        if self._finished:
+            return
+        free = len(self._buf) - self._n
+        if len(chunk) > free:
+            if not self._truncated:
+                logger.warning("⚠️ Streaming STT buffer full, truncating utterance")
+                self._truncated = True
+            chunk = chunk[:free]
+        self._buf[self._n:self._n + len(chunk)] = chunk
+        self._n += len(chunk)
+
+        with self._lock:
+            busy = self._worker is not None and self._worker.is_alive()
+            due = self._n >= self.min_first and self._n - self._decoded_to >= self.step
+            if busy or not due:
+                return
+            self._worker = threading.Thread(
+                target=self._partial_decode, args=(self._n,), name="StreamingSTT", daemon=True
+            )
+            self._worker.start()
+
+    # ------------------------------------------------------------------
+    # Decoding
+    # ------------------------------------------------------------------
+
+    def _prompt(self) -> Optional[str]:
+        return " ".join(self._committed[-30:]) or None
+
+    def _decode(self, end: int) -> List[str]:
+        # Slide the window first so a decode never exceeds max_window
+        if end - self._window_start > self.max_window:
+            self._slide(end)
+        audio = self._buf[self._window_start:end]
+        words = (self.decode_fn(audio, self._prompt()) or "").split()
+        if self._committed and self._window_start > 0:
+            words = words[_overlap(self._committed, words):]
+        return words
+
+    def _slide(self, end: int):
+        """Commit stable words and move the window forward, keeping overlap audio."""
+        self._committed.extend(self._frozen)
+        self._frozen = []
+        self._hypothesis = []
+        self._window_start = max(end - self.overlap, 0)
+        logger.debug(f"Streaming STT window slid to {self._window_start / self.sample_rate:.1f}s")
+
+    def _partial_decode(self, end: int):
+        start = time.perf_counter()
+        try:
+            words = self._decode(end)
+        except Exception as e:
+            logger.error(f"❌ Streaming STT decode failed: {e}")
+            return
+        decode_ms = (time.perf_counter() - start) * 1000
+        self.partial_decodes += 1
+
+        # LocalAgreement-2: words two consecutive hypotheses agree on are stable
+        agreed = _common_prefix(self._hypothesis, words)
+        if agreed > len(self._frozen) and _common_prefix(self._frozen, words) == len(self._frozen):
+            self._frozen = words[:agreed]
+        self._hypothesis = words
+        self._decoded_to = end
+        self._emit(words, end, decode_ms, final=False)
+
+    def _emit(self, words: List[str], end: int, decode_ms: float, final: bool):
+        frozen = len(self._frozen)
+        if final:
+            stable_words, unstable_words = self._committed + self._frozen + words[frozen:], []
+        else:
+            stable_words, unstable_words = self._committed + self._frozen, words[frozen:]
+        self._revision += 1
+        partial = PartialTranscript(
+            stable=" ".join(stable_words),
+            unstable=" ".join(unstable_words),
+            is_final=final,
+            revision=self._revision,
+            audio_s=end / self.sample_rate,
+            decode_ms=decode_ms,
+        )
+        self.latest = partial
+        if self.on_partial:
+            try:
+                self.on_partial(partial)
+            except Exception as e:
+                logger.debug(f"on_partial callback error: {e}")
+
+    # ------------------------------------------------------------------
+    # Finalization
+    # ------------------------------------------------------------------
+
+    def finish(self, silence_tail_s: float = 0.0, timeout: float = 30.0) -> PartialTranscript:
+        """
+        Finalize after the VAD end event.
+
+        Args:
+            silence_tail_s: Trailing audio known to be silence (VAD min silence)
+            timeout: Max seconds to wait for an in-flight partial decode
+
+        Returns:
+            Final PartialTranscript (is_final=True, all words stable)
+        """
+        self._finished = True
+        with self._lock:
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout=timeout)
+
+        end = self._n
+        speech_end = max(end - int(silence_tail_s * self.sample_rate), 0)
+        decode_ms = 0.0
+        if self._hypothesis and self._decoded_to >= speech_end:
+            # Everything after the last decode is silence: reuse it
+            words = self._hypothesis
+            self.final_reused = True
+        else:
+            start = time.perf_counter()
+            try:
+                words = self._decode(end)
+            except Exception as e:
+                logger.error(f"❌ Streaming STT final decode failed: {e}")
+                words = self._hypothesis
+            decode_ms = (time.perf_counter() - start) * 1000
+            if self._frozen and _common_prefix(self._frozen, words) < len(self._frozen):
+                # Keep the stable promise: frozen words stay, new tail follows
+                words = self._frozen + words[len(self._frozen):]
+        self.final_decode_ms = decode_ms
+        self._emit(words, end, decode_ms, final=True)
+        logger.info(
+            f"🎤 Streaming STT final: '{self.latest.text}' "
+            f"({self.partial_decodes} partials, final {'reused' if self.final_reused else f'{decode_ms:.0f}ms'})"
+        )
+        return self.latest
+
+    @property
+    def audio(self) -> np.ndarray:
+        """The utterance captured so far (view, no copy)."""
+        return self._buf[:self._n]
@@ -0,0 +1,474 @@
+"""
+Layer 1: STT Backends - Pluggable Local Speech Recognition + Warm Worker
+
+The offline STT path used to be hard-wired to the reference openai-whisper
+PyTorch model, and the VAD dropped a segment ("STT still processing
+previous segment") whenever one was still being transcribed. This module
+adds:
+
+- STTBackend: the interface VoiceCoordinator and StreamingTranscriber use
+  (load_model / transcribe / transcribe_window / get_stats)
+- FasterWhisperSTT: CTranslate2 int8 CPU backend (faster-whisper), ~4x
+  faster than PyTorch fp32 on the Pi 5 at the same model size
+- DecodeSettings: beam size + temperature fallback, shared by backends
+  (decode at the first temperature; retry at the next one when the result
+  looks like a hallucination: compression ratio too high or mean log
+  probability too low)
+- create_stt_backend(): backend selection from config
+- STTWorker: one persistent transcription thread with a bounded FIFO job
+  queue. Segments that arrive while the model is busy wait instead of being
+  dropped; only when the queue is full is the OLDEST waiting job dropped
+- word_error_rate(): WER for the backend benchmark
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from .audio_ring import LatencyRing
+except ImportError:
+    from layer1_reflex.audio_ring import LatencyRing
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+    WhisperModel = None
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+BACKENDS = ("whisper", "faster_whisper")
+
+
+@dataclass
+class DecodeSettings:
+    """Beam search and temperature fallback for local Whisper decoding."""
+    beam_size: int = 1                                # 1 = greedy
+    temperatures: Sequence[float] = (0.0,)            # Fallback schedule
+    compression_ratio_threshold: float = 2.0          # Higher = repetitive hallucination
+    logprob_threshold: float = -0.5                   # Lower = low-confidence result
+    no_speech_threshold: float = 0.8                  # Above = noise-only segment
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "DecodeSettings":
+        """Build from the audio.stt.decoding config block (missing keys keep defaults)."""
+        config = config or {}
+        defaults = cls()
+        temperatures = config.get("temperatures", defaults.temperatures)
+        if isinstance(temperatures, (int, float)):
+            temperatures = (temperatures,)
+        return cls(
+            beam_size=max(1, int(config.get("beam_size", defaults.beam_size))),
+            temperatures=tuple(float(t) for t in temperatures),
+            compression_ratio_threshold=config.get(
+                "compression_ratio_threshold", defaults.compression_ratio_threshold),
+            logprob_threshold=config.get("logprob_threshold", defaults.logprob_threshold),
+            no_speech_threshold=config.get("no_speech_threshold", defaults.no_speech_threshold),
+        )
+
+
+class STTBackend:
+    """
+    Interface for local STT engines.
+
+    transcribe() takes a whole VAD segment (16 kHz float32) and returns the
+    text, or None on failure. transcribe_window() decodes one window for
+    streaming STT (single pass, prompt = committed text). `model` is None
+    until load_model() succeeded.
+    """
+
+    name = "base"
+    model = None
+
+    def load_model(self) -> bool:
+        raise NotImplementedError
+
+    def transcribe(self, audio: np.ndarray, log_latency: bool = True) -> Optional[str]:
+        raise NotImplementedError
+
+    def transcribe_window(
+        self,
+        audio: np.ndarray,
+        prompt: Optional[str] = None,
+        no_speech_threshold: float = 0.8
+    ) -> str:
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+
+    def unload_model(self):
+        self.model = None
+
+
+class FasterWhisperSTT(STTBackend):
+    """
+    Whisper on CTranslate2 (faster-whisper) with int8 weights on the CPU.
+
+    Same models as openai-whisper, converted once and cached by
+    faster-whisper; int8 matrix multiplies and no PyTorch runtime make it
+    the better fit for the Pi 5's Cortex-A76 cores.
+    """
+
+    name = "faster_whisper"
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        language: str = "en",
+        compute_type: str = "int8",
+        cpu_threads: int = 4,
+        decode: Optional[DecodeSettings] = None,
+    ):
+        """
+        Args:
+            model_size: Whisper model size or path to a converted model
+            language: Target language code
+            compute_type: CTranslate2 weight type ('int8', 'int8_float32', 'float32')
+            cpu_threads: Threads used by one decode
+            decode: Beam / temperature fallback settings
+        """
+        self.model_size = model_size
+        self.language = language
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.decode = decode or DecodeSettings()
+        self.model = None
+        self.device = "cpu"
+
+        self.inference_times: List[float] = []
+        self.realtime_factors: List[float] = []
+        self.window_decode_times: List[float] = []
+        self.fallbacks = 0  # Decodes that needed a temperature above the first
+        self._decode_lock = threading.Lock()
+
+    def load_model(self) -> bool:
+        """Load and warm up the CTranslate2 model."""
+        if self.model is not None:
+            return True
+        if not FASTER_WHISPER_AVAILABLE:
+            logger.error("❌ faster-whisper not installed (pip install faster-whisper)")
+            return False
+        try:
+            logger.info(f"⏳ Loading faster-whisper '{self.model_size}' ({self.compute_type}, "
+                        f"{self.cpu_threads} threads)...")
+            start_time = time.time()
+            self.model = WhisperModel(
+                self.model_size,
+                device="cpu",
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+            )
+            logger.info(f"✅ faster-whisper model loaded in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.error(f"❌ Failed to load faster-whisper model: {e}")
+            self.model = None
+            return False
+
+        # First decode allocates the CTranslate2 buffers: do it now, not on the first command
+        try:
+            self.transcribe_window(np.zeros(SAMPLE_RATE, dtype=np.float32))
+            self.window_decode_times.clear()
+            logger.info("✅ faster-whisper warm-up complete")
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up failed: {e} (non-critical)")
+        return True
+
+    def _decode(self, audio: np.ndarray, beam_size: int, temperatures: Sequence[float],
+                prompt: Optional[str] = None, no_speech_threshold: Optional[float] = None):
+        decode = self.decode
+        with self._decode_lock:
+            segments, _info = self.model.transcribe(
+                audio,
+                language=self.language,
+                beam_size=beam_size,
+                temperature=list(temperatures),
+                compression_ratio_threshold=decode.compression_ratio_threshold,
+                log_prob_threshold=decode.logprob_threshold,
+                no_speech_threshold=(no_speech_threshold if no_speech_threshold is not None
+                                     else decode.no_speech_threshold),
+                condition_on_previous_text=False,
+                initial_prompt=prompt,
+                without_timestamps=True,
+                vad_filter=False,  # Silero already cut the segment
+            )
+            # segments is a generator: decoding happens while iterating
+            return list(segments)
+
+    def transcribe(self, audio: np.ndarray, log_latency: bool = True) -> Optional[str]:
+        if self.model is None:
+            logger.error("❌ Model not loaded. Call load_model() first.")
+            return None
+        try:
+            start_time = time.time()
+            segments = self._decode(audio, self.decode.beam_size, self.decode.temperatures)
+            inference_time = (time.time() - start_time) * 1000
+            audio_s = len(audio) / SAMPLE_RATE
+            self.inference_times.append(inference_time)
+            if audio_s > 0:
+                self.realtime_factors.append(inference_time / 1000 / audio_s)
+            if any(s.temperature > self.decode.temperatures[0] for s in segments):
+                self.fallbacks += 1
+
+            text = "".join(s.text for s in segments).strip()
+            if log_latency:
+                logger.info(f"🎤 STT (faster-whisper): '{text}' "
+                            f"(latency: {inference_time:.0f}ms for {audio_s:.1f}s audio)")
+            return text
+        except Exception as e:
+            logger.error(f"❌ Transcription failed: {e}")
+            return None
+
+    def transcribe_window(
+        self,
+        audio: np.ndarray,
+        prompt: Optional[str] = None,
+        no_speech_threshold: float = 0.8
+    ) -> str:
+        """Greedy single-temperature decode of one streaming window."""
+        if self.model is None:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
+        start_time = time.time()
+        segments = self._decode(audio, 1, (0.0,), prompt=prompt,
+                                no_speech_threshold=no_speech_threshold)
+        self.window_decode_times.append((time.time() - start_time) * 1000)
+        return "".join(s.text for s in segments if s.no_speech_prob <= no_speech_threshold).strip()
+
+    def get_stats(self) -> Dict[str, Any]:
+        if not self.inference_times:
+            return {"count": 0, "avg_latency_ms": 0, "min_latency_ms": 0, "max_latency_ms": 0}
+        return {
+            "count": len(self.inference_times),
+            "avg_latency_ms": np.mean(self.inference_times),
+            "min_latency_ms": np.min(self.inference_times),
+            "max_latency_ms": np.max(self.inference_times),
+            "avg_rtf": np.mean(self.realtime_factors) if self.realtime_factors else 0.0,
+            "fallbacks": self.fallbacks,
+            "device": f"cpu/{self.compute_type}",
+            "model_size": self.model_size,
+        }
+
+
+def create_stt_backend(
+    backend: str = "whisper",
+    model_size: str = "base",
+    language: str = "en",
+    decode: Optional[DecodeSettings] = None,
+    **options
+) -> STTBackend:
+    """
+    Build the local STT backend named in config (model not loaded yet).
+
+    Args:
+        backend: 'whisper' (openai-whisper, PyTorch) or 'faster_whisper'
+            (CTranslate2 int8); faster_whisper falls back to whisper when
+            the package is missing
+        model_size: Whisper model size
+        language: Target language code
+        decode: Beam / temperature fallback settings
+        **options: Backend options (compute_type, cpu_threads for faster_whisper)
+
+    Raises:
+        ValueError: for an unknown backend name
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown STT backend '{backend}' (expected one of {BACKENDS})")
+
+    if backend == "faster_whisper":
+        if FASTER_WHISPER_AVAILABLE:
+            return FasterWhisperSTT(
+                model_size=model_size,
+                language=language,
+                compute_type=options.get("compute_type", "int8"),
+                cpu_threads=options.get("cpu_threads", 4),
+                decode=decode,
+            )
+        logger.warning("⚠️ faster-whisper not installed, using openai-whisper backend")
+
+    try:
+        from .whisper_handler import WhisperSTT
+    except ImportError:
+        from layer1_reflex.whisper_handler import WhisperSTT
+    return WhisperSTT(model_size=model_size, language=language, decode=decode)
+
+
+# =============================================================================
+# Warm transcription worker
+# =============================================================================
+
+@dataclass
+class STTJob:
+    """One speech segment waiting for transcription."""
+    audio: np.ndarray
+    context: Any = None                                   # Caller state (trace, stream)
+    queued: float = field(default_factory=time.perf_counter)
+
+
+class STTWorker:
+    """
+    Persistent transcription thread with a bounded FIFO queue.
+
+    submit() never blocks the caller (the VAD thread). Jobs run one at a
+    time in arrival order on the same thread, so the loaded model stays
+    warm and there is no per-segment thread start. When max_queue jobs are
+    already waiting the oldest one is dropped (on_drop is called with it):
+    under sustained overload the newest utterance is the one to answer.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[STTJob], None],
+        max_queue: int = 4,
+        on_drop: Optional[Callable[[STTJob], None]] = None,
+        name: str = "STTWorker",
+    ):
+        """
+        Args:
+            handler: Called with each job on the worker thread
+            max_queue: Jobs allowed to wait while one is being processed
+            on_drop: Called with jobs dropped because the queue was full
+            name: Thread name
+        """
+        self.handler = handler
+        self.max_queue = max(1, max_queue)
+        self.on_drop = on_drop
+        self.name = name
+
+        self._jobs: Deque[STTJob] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.busy = False
+
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.high_water = 0
+        self.wait_times = LatencyRing(256)  # Queue wait per job (ms)
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop after the current job; waiting jobs are discarded."""
+        with self._cond:
+            self._running = False
+            self._jobs.clear()
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def submit(self, audio: np.ndarray, context: Any = None) -> bool:
+        """
+        Queue a segment (the audio must stay valid: pass a copy of VAD views).
+
+        Returns:
+            False if an older job had to be dropped to make room
+        """
+        job = STTJob(audio, context)
+        dropped = None
+        with self._cond:
+            if len(self._jobs) >= self.max_queue:
+                dropped = self._jobs.popleft()
+                self.dropped += 1
+            self._jobs.append(job)
+            self.submitted += 1
+            self.high_water = max(self.high_water, len(self._jobs))
+            self._cond.notify()
+        if dropped is not None:
+            logger.warning(f"⚠️ STT queue full ({self.max_queue}), dropped oldest segment")
+            self._notify_drop(dropped)
+        elif self.busy or len(self._jobs) > 1:
+            logger.info(f"⏳ STT busy, segment queued ({len(self._jobs)} waiting)")
+        return dropped is None
+
+    def _notify_drop(self, job: STTJob):
+        if self.on_drop:
+            try:
+                self.on_drop(job)
+            except Exception as e:
+                logger.debug(f"STT on_drop callback error: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._jobs:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                job = self._jobs.popleft()
+                self.busy = True
+            self.wait_times.record((time.perf_counter() - job.queued) * 1000)
+            try:
+                self.handler(job)
+            except Exception as e:
+                logger.error(f"❌ STT job failed: {e}")
+            finally:
+                self.processed += 1
+                self.busy = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        wait = self.wait_times.summary()
+        return {
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "pending": self.pending,
+            "queue_high_water": self.high_water,
+            "queue_wait_p50_ms": wait["p50_ms"],
+            "queue_wait_p95_ms": wait["p95_ms"],
+        }
+
+
+# =============================================================================
+# Accuracy metric
+# =============================================================================
+
+def _normalize_words(text: str) -> List[str]:
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    WER = (substitutions + deletions + insertions) / reference words.
+
+    Case and punctuation are ignored. An empty reference gives 0.0 for an
+    empty hypothesis and 1.0 otherwise.
+    """
+    ref = _normalize_words(reference)
+    hyp = _normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    # Levenshtein distance over words, one row at a time
+    prev = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        row = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (ref_word != hyp_word))
+        prev = row
+    return prev[-1] / len(ref)
@@ -0,0 +1,199 @@
+"""
+Layer 1: Streaming TTS - Clause-by-Clause Synthesis Into a Live Player
+
+Kokoro used to synthesize the whole response, wrap it in a WAV, write a
+temp file and spawn aplay, so the user heard nothing until the last word
+was rendered (seconds for a long Gemini answer). Here the text is split
+into clauses, each clause is synthesized on its own and its PCM is pushed
+straight into a persistent output stream (StreamingAudioPlayer). Playback
+starts after the first clause; later clauses are synthesized while the
+earlier ones play.
+
+- split_clauses(): sentence split, long sentences cut at , ; : (then at
+  word boundaries), a deliberately short first clause for time-to-first-
+  audio, short sentences packed together to save per-call overhead
+- StreamingSynthesizer: drives any chunk generator into a sink with an
+  add_audio_chunk(bytes) method, records TTFA, supports interrupt()
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    from .audio_ring import LatencyRing
+except ImportError:
+    from layer1_reflex.audio_ring import LatencyRing
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+
+def _split_words(text: str, max_chars: int) -> List[str]:
+    """Cut text at word boundaries into pieces of at most max_chars."""
+    pieces, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Sentence -> clauses of at most max_chars (at , ; : first, then words)."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces = []
+    for clause in _CLAUSE_END.split(sentence):
+        pieces.extend(_split_words(clause, max_chars) if len(clause) > max_chars else [clause])
+    return _pack(pieces, max_chars)
+
+
+def _pack(pieces: List[str], max_chars: int) -> List[str]:
+    """Join consecutive short pieces while they fit in max_chars."""
+    packed: List[str] = []
+    for piece in pieces:
+        if packed and len(packed[-1]) + 1 + len(piece) <= max_chars:
+            packed[-1] = f"{packed[-1]} {piece}"
+        else:
+            packed.append(piece)
+    return packed
+
+
+def split_clauses(text: str, first_max_chars: int = 80, max_chars: int = 220) -> List[str]:
+    """
+    Split text into synthesis units.
+
+    Args:
+        text: Full response text
+        first_max_chars: Cap for the first unit (it alone sets time-to-first-audio)
+        max_chars: Cap for every later unit
+
+    Returns:
+        Clauses in speaking order (empty list for blank text)
+    """
+    text = " ".join(text.split())
+    if not text:
+        return []
+    sentences = [s for s in _SENTENCE_END.split(text) if s]
+
+    first = _split_long(sentences[0], first_max_chars)
+    rest: List[str] = first[1:]
+    for sentence in sentences[1:]:
+        rest.extend(_split_long(sentence, max_chars))
+    return first[:1] + _pack(rest, max_chars)
+
+
+@dataclass
+class StreamingResult:
+    """Outcome of one streamed utterance."""
+    text: str
+    ttfa_ms: float = 0.0              # speak() call -> first PCM chunk in the player
+    synth_ms: float = 0.0             # Total synthesis time over all clauses
+    audio_s: float = 0.0
+    chunks: int = 0
+    interrupted: bool = False
+    audio: Optional[np.ndarray] = field(default=None, repr=False)  # Full float32 audio
+
+
+class StreamingSynthesizer:
+    """
+    Push clause-wise synthesized audio into a live player as it is produced.
+
+    The chunk generator (e.g. KokoroTTS.generate_speech_streaming) runs in
+    the calling thread, which is a background thread for the event loop
+    (TTSRouter calls speak() via asyncio.to_thread); the player's audio
+    thread plays chunk N while chunk N+1 is synthesized.
+    """
+
+    def __init__(
+        self,
+        stream_fn: Callable[[str], Iterable[np.ndarray]],
+        sink,
+        sample_rate: int = 24000,
+        on_first_audio: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+            stream_fn: text -> iterator of float32 [-1, 1] chunks
+            sink: Player with add_audio_chunk(int16 bytes) and optionally
+                  wait_drained(timeout) -> bool
+            sample_rate: Sample rate of the generated audio
+            on_first_audio: Called when the first chunk reaches the sink
+        """
+        self.stream_fn = stream_fn
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.on_first_audio = on_first_audio
+        self._interrupt = threading.Event()
+        self.ttfa = LatencyRing(256)
+
+    def interrupt(self):
+        """Stop after the clause currently being synthesized."""
+        self._interrupt.set()
+
+    def speak(self, text: str, wait: bool = True, timeout: float = 60.0) -> StreamingResult:
+        """
+        Synthesize and play text clause by clause.
+
+        Args:
+            text: Text to speak
+            wait: Block until the player has drained (like aplay did)
+            timeout: Max seconds to wait for the drain
+
+        Returns:
+            StreamingResult with TTFA and the full audio (for recordings)
+        """
+        self._interrupt.clear()
+        result = StreamingResult(text)
+        parts: List[np.ndarray] = []
+        start = time.perf_counter()
+        synth_start = start
+
+        chunks: Iterator[np.ndarray] = iter(self.stream_fn(text))
+        for chunk in chunks:
+            result.synth_ms += (time.perf_counter() - synth_start) * 1000
+            if self._interrupt.is_set():
+                result.interrupted = True
+                break
+            chunk = np.asarray(chunk, dtype=np.float32)
+            if len(chunk) == 0:
+                synth_start = time.perf_counter()
+                continue
+            self.sink.add_audio_chunk((np.clip(chunk, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+            if result.chunks == 0:
+                result.ttfa_ms = (time.perf_counter() - start) * 1000
+                self.ttfa.record(result.ttfa_ms)
+                if self.on_first_audio:
+                    self.on_first_audio()
+            result.chunks += 1
+            parts.append(chunk)
+            synth_start = time.perf_counter()
+        if hasattr(chunks, "close"):
+            chunks.close()  # Interrupted: let the generator clean up
+
+        if parts:
+            result.audio = np.concatenate(parts)
+            result.audio_s = len(result.audio) / self.sample_rate
+        if wait and parts and not result.interrupted and hasattr(self.sink, "wait_drained"):
+            self.sink.wait_drained(timeout=timeout)
+
+        logger.info(
+            f"🔊 Streaming TTS: {result.chunks} clauses, {result.audio_s:.1f}s audio, "
+            f"TTFA {result.ttfa_ms:.0f}ms (synth {result.synth_ms:.0f}ms total)"
+        )
+        return result
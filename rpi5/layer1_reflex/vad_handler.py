@@ -9,6 +9,8 @@ Key Features:
 - Streaming audio processing with VADIterator
 - PyAudio callback integration for non-blocking capture
 - Speech buffer management with start/end timestamps
+- Allocation-free capture path: ring buffer + polyphase resampler, speech
+  segments are contiguous views (see audio_ring.py)
 - Thread-safe singleton pattern
 
 Author: Haziq (@IRSPlays)
@@ -22,9 +24,13 @@ import os
 import sys
 import contextlib
 from typing import Optional, Callable, List, Dict, Any
-from queue import Queue
 import numpy as np
 
+try:
+    from .audio_ring import AudioRingBuffer, LatencyRing, PolyphaseResampler, SpeechCapture
+except ImportError:
+    from layer1_reflex.audio_ring import AudioRingBuffer, LatencyRing, PolyphaseResampler, SpeechCapture
+
 # Context manager to suppress ALSA/JACK error noise
 @contextlib.contextmanager
 def suppress_alsa_errors():
@@ -83,7 +89,9 @@ class VADHandler:
         min_silence_duration_ms: int = 300,  # Silence duration to end speech
         padding_duration_ms: int = 100,  # Add padding before/after speech
         on_speech_start: Optional[Callable] = None,
-        on_speech_end: Optional[Callable[[np.ndarray], None]] = None
+        on_speech_end: Optional[Callable[[np.ndarray], None]] = None,
+        max_segment_s: float = 30.0,  # Longest speech segment (capture buffer size)
+        ring_buffer_s: float = 2.0  # Callback -> VAD thread backlog before overruns
     ):
         """
         Initialize VAD handler.
@@ -99,7 +107,13 @@ class VADHandler:
             min_silence_duration_ms: Silence duration to consider speech ended
             padding_duration_ms: Padding to add before/after detected speech
             on_speech_start: Callback when speech starts (no arguments)
-            on_speech_end: Callback when speech ends (receives audio numpy array)
+            on_speech_end: Callback when speech ends (receives audio numpy array,
+                a view that stays valid until two more segments have ended).
+                Runs on the VAD thread: queue the work (STTWorker), don't
+                transcribe inline
+            max_segment_s: Longest speech segment; longer speech is cut here
+            ring_buffer_s: Audio the VAD thread may fall behind before chunks
+                are dropped (counted as overruns)
         """
         if self._initialized:
             logger.debug("VADHandler already initialized, skipping...")
@@ -131,7 +145,7 @@ class VADHandler:
         self.on_speech_start = on_speech_start
         self.on_speech_end = on_speech_end
         self.on_audio_chunk: Optional[Callable] = None  # Every chunk (for Gemini continuous stream)
-        self._stt_lock = threading.Lock()  # Prevent overlapping STT calls
+        self.on_speech_chunk: Optional[Callable] = None  # Audio added to the speech segment (streaming STT)
         
         # VAD model and iterator
         self.vad_model = None
@@ -142,20 +156,29 @@ class VADHandler:
         self.audio_stream = None
         self._device_sample_rate = sample_rate  # Actual device rate (may differ)
         self._resample_ratio = 1.0  # device_rate / vad_rate
+        self.resampler: Optional[PolyphaseResampler] = None  # Created per stream in start_listening()
         
         # State management
         self.is_listening = False
         self.is_speech_active = False
-        self.speech_buffer = []
-        self.padding_buffer = []  # Pre-speech padding
+        self.max_segment_s = max_segment_s
+        self._padding_samples = max(int(padding_duration_ms * sample_rate / 1000), chunk_size)
+        
+        # Preallocated audio path: callback -> ring -> capture (no per-chunk allocation)
+        self.ring_buffer = AudioRingBuffer(int(ring_buffer_s * sample_rate))
+        self.capture = SpeechCapture(
+            capacity=int(max_segment_s * sample_rate) + self._padding_samples,
+            padding=self._padding_samples,
+        )
         
         # Threading
-        self.audio_queue = Queue()
+        self._data_ready = threading.Event()
         self.processing_thread = None
         self.stop_event = threading.Event()
         
         # Performance tracking
-        self.detection_times = []
+        self.detection_times = LatencyRing(1024)
+        self.callback_times = LatencyRing(1024)
         self.total_chunks_processed = 0
         self.total_speech_segments = 0
         
@@ -227,170 +250,184 @@ class VADHandler:
         Returns:
             Tuple (None, paContinue)
         """
+        start_time = time.perf_counter()
         if status_flags:
             logger.debug(f"⚠️ Audio callback status flags: {status_flags}")
         
-        # Convert bytes to numpy array (at device sample rate)
-        audio_chunk = np.frombuffer(in_data, dtype=np.int16).astype(np.float32) / 32768.0
-        
-        # Resample to VAD rate (16kHz) if device runs at a different rate
-        if self._resample_ratio > 1.01:
-            # Simple linear interpolation resample (low-latency, good enough for VAD)
-            target_len = int(len(audio_chunk) / self._resample_ratio)
-            indices = np.linspace(0, len(audio_chunk) - 1, target_len)
-            audio_chunk = np.interp(indices, np.arange(len(audio_chunk)), audio_chunk).astype(np.float32)
+        # int16 view of the device buffer -> float32 at 16kHz (preallocated output)
+        pcm = np.frombuffer(in_data, dtype=np.int16)
+        audio_chunk = self.resampler.process(pcm)
         
-        # Add to processing queue
-        self.audio_queue.put(audio_chunk)
+        # Hand off to the VAD thread; a full ring means it fell behind (overrun)
+        if not self.ring_buffer.write(audio_chunk) and self.ring_buffer.overruns % 50 == 1:
+            logger.warning(f"⚠️ VAD ring buffer overrun #{self.ring_buffer.overruns} (processing too slow)")
+        self._data_ready.set()
         
+        self.callback_times.record((time.perf_counter() - start_time) * 1000)
         return (None, pyaudio.paContinue)
 
     def _safe_speech_end_callback(self, speech_audio: np.ndarray):
-        """Run on_speech_end in a background thread with a lock to prevent overlap."""
-        if not self._stt_lock.acquire(blocking=False):
-            logger.warning("⚠️ STT still processing previous segment, skipping")
-            return
+        """Hand the segment to on_speech_end (which queues it for STT)."""
         try:
             self.on_speech_end(speech_audio)
-            logger.info("✅ on_speech_end callback completed")
         except Exception as e:
             logger.error(f"❌ Error in on_speech_end callback: {e}")
-        finally:
-            self._stt_lock.release()
+
+    def _forward_speech_chunk(self, chunk: np.ndarray):
+        """Forward audio added to the current speech segment to on_speech_chunk (streaming STT)."""
+        if self.on_speech_chunk:
+            try:
+                self.on_speech_chunk(chunk)
+            except Exception as e:
+                logger.debug(f"on_speech_chunk callback error: {e}")
 
     def _process_audio_chunks(self):
         """
-        Process audio chunks from the queue in a separate thread.
+        Process audio chunks from the ring buffer in a separate thread.
         
-        This performs VAD inference and manages speech buffers.
+        This performs VAD inference and manages the speech capture buffer.
         """
         logger.info("🔄 Audio processing thread started")
         
-        padding_chunks = int(self.padding_duration_ms / (self.chunk_size / self.sample_rate * 1000))
-        min_speech_chunks = int(self.min_speech_duration_ms / (self.chunk_size / self.sample_rate * 1000))
-        
         while not self.stop_event.is_set():
+            if not self._data_ready.wait(timeout=0.1):
+                continue
+            self._data_ready.clear()
+            while self.ring_buffer.available >= self.chunk_size and not self.stop_event.is_set():
+                try:
+                    self._process_chunk()
+                except Exception as e:
+                    if not self.stop_event.is_set():
+                        logger.error(f"❌ Error processing audio chunk: {e}")
+        
+        logger.info("🛑 Audio processing thread stopped")
+
+    def _process_chunk(self):
+        """Run VAD on the next chunk from the ring and update the speech segment."""
+        split = self.capture.in_segment and self.capture.remaining() < self.chunk_size
+        if split:
+            logger.warning(f"⚠️ Speech longer than {self.max_segment_s:.0f}s, splitting segment")
+            self._finish_segment()
+        
+        # The chunk is read straight into its place in the capture buffer
+        audio_chunk = self.capture.next_chunk(self.chunk_size)
+        self.ring_buffer.read_into(audio_chunk)
+        
+        if split:
+            # Silero is still inside speech: continue in a fresh segment
+            self.is_speech_active = True
+            self.capture.begin_segment(self.chunk_size)
+            if self.on_speech_start:
+                try:
+                    self.on_speech_start()
+                except Exception as e:
+                    logger.error(f"❌ Error in on_speech_start callback: {e}")
+        
+        start_time = time.time()
+        
+        # Forward every chunk for continuous audio streaming (Gemini Live)
+        if self.on_audio_chunk:
             try:
-                # Get audio chunk from queue (with timeout)
-                audio_chunk = self.audio_queue.get(timeout=0.1)
-                
-                start_time = time.time()
-                
-                # Forward every chunk for continuous audio streaming (Gemini Live)
-                if self.on_audio_chunk:
-                    try:
-                        self.on_audio_chunk(audio_chunk)
-                    except Exception:
-                        pass  # Don't block VAD for forwarding errors
+                self.on_audio_chunk(audio_chunk)
+            except Exception:
+                pass  # Don't block VAD for forwarding errors
 
-                # Run VAD inference
-                speech_dict = self.vad_iterator(audio_chunk, return_seconds=True)
+        # Run VAD inference
+        speech_dict = self.vad_iterator(audio_chunk, return_seconds=True)
+        
+        detection_time = (time.time() - start_time) * 1000
+        self.detection_times.record(detection_time)
+        self.total_chunks_processed += 1
+        
+        # DEBUG: Log chunk processing details
+        logger.debug(
+            f"📊 Chunk #{self.total_chunks_processed}: "
+            f"VAD latency={detection_time:.1f}ms, "
+            f"Backlog={self.ring_buffer.available} samples, "
+            f"Speech active={self.is_speech_active}, "
+            f"Segment={self.capture.segment_samples} samples"
+        )
+        
+        # VADIterator State Machine:
+        # - Returns None: Continue current state (speech or silence)
+        # - Returns {'start': timestamp}: Speech just started
+        # - Returns {'end': timestamp}: Speech just ended
+        
+        if speech_dict and 'start' in speech_dict:
+            # SPEECH START EVENT
+            if not self.is_speech_active:
+                self.is_speech_active = True
+                self.total_speech_segments += 1
                 
-                detection_time = (time.time() - start_time) * 1000
-                self.detection_times.append(detection_time)
-                self.total_chunks_processed += 1
+                # Segment begins with the pre-speech padding (incl. this chunk)
+                padded = self.capture.begin_segment(self._padding_samples)
                 
-                # DEBUG: Log chunk processing details
-                logger.debug(
-                    f"📊 Chunk #{self.total_chunks_processed}: "
-                    f"VAD latency={detection_time:.1f}ms, "
-                    f"Queue size={self.audio_queue.qsize()}, "
-                    f"Speech active={self.is_speech_active}, "
-                    f"Buffer size={len(self.speech_buffer)} chunks"
+                logger.info(
+                    f"🗣️ SPEECH START (Segment #{self.total_speech_segments}): "
+                    f"Chunk #{self.total_chunks_processed}, "
+                    f"Event: {speech_dict}, "
+                    f"Padding added: {len(padded)} samples"
                 )
                 
-                # Manage padding buffer (for pre-speech audio)
-                self.padding_buffer.append(audio_chunk)
-                if len(self.padding_buffer) > padding_chunks:
-                    self.padding_buffer.pop(0)
-                
-                # VADIterator State Machine:
-                # - Returns None: Continue current state (speech or silence)
-                # - Returns {'start': timestamp}: Speech just started
-                # - Returns {'end': timestamp}: Speech just ended
-                
-                if speech_dict and 'start' in speech_dict:
-                    # SPEECH START EVENT
-                    if not self.is_speech_active:
-                        self.is_speech_active = True
-                        self.total_speech_segments += 1
-                        
-                        # Add padding from before speech started
-                        self.speech_buffer.extend(self.padding_buffer)
-                        
-                        logger.info(
-                            f"🗣️ SPEECH START (Segment #{self.total_speech_segments}): "
-                            f"Chunk #{self.total_chunks_processed}, "
-                            f"Event: {speech_dict}, "
-                            f"Padding added: {len(self.padding_buffer)} chunks"
-                        )
-                        
-                        # Trigger callback
-                        if self.on_speech_start:
-                            try:
-                                self.on_speech_start()
-                            except Exception as e:
-                                logger.error(f"❌ Error in on_speech_start callback: {e}")
-                
-                elif speech_dict and 'end' in speech_dict:
-                    # SPEECH END EVENT
-                    if self.is_speech_active:
-                        logger.info(
-                            f"🔇 SPEECH END DETECTED: "
-                            f"VAD triggered end event, "
-                            f"Buffer has {len(self.speech_buffer)} chunks"
-                        )
-                        self.is_speech_active = False
-                        
-                        # Check if speech duration meets minimum
-                        speech_duration_ms = len(self.speech_buffer) * (self.chunk_size / self.sample_rate * 1000)
-                        
-                        if speech_duration_ms >= self.min_speech_duration_ms:
-                            # Valid speech segment
-                            speech_audio = np.concatenate(self.speech_buffer)
-                            
-                            logger.info(
-                                f"✅ VALID SPEECH SEGMENT: "
-                                f"Duration={speech_duration_ms:.0f}ms, "
-                                f"Samples={len(speech_audio)}, "
-                                f"Min required={self.min_speech_duration_ms}ms, "
-                                f"Status=SENDING_TO_PIPELINE"
-                            )
-                            
-                            # Trigger callback in background thread to avoid blocking VAD
-                            if self.on_speech_end:
-                                try:
-                                    logger.info("📤 Calling on_speech_end callback...")
-                                    threading.Thread(
-                                        target=self._safe_speech_end_callback,
-                                        args=(speech_audio,),
-                                        daemon=True
-                                    ).start()
-                                except Exception as e:
-                                    logger.error(f"❌ Error launching on_speech_end thread: {e}")
-                        else:
-                            logger.warning(
-                                f"⚠️ REJECTED SHORT SEGMENT: "
-                                f"Duration={speech_duration_ms:.0f}ms < "
-                                f"Minimum={self.min_speech_duration_ms}ms, "
-                                f"Status=DISCARDED"
-                            )
-                        
-                        # Clear speech buffer
-                        logger.debug(f"🧹 Clearing speech buffer ({len(self.speech_buffer)} chunks)")
-                        self.speech_buffer = []
-                
-                # Continue accumulating chunks if speech is active (even when speech_dict is None)
-                if self.is_speech_active:
-                    self.speech_buffer.append(audio_chunk)
-                
-                self.audio_queue.task_done()
-                
-            except Exception as e:
-                if not self.stop_event.is_set():
-                    logger.error(f"❌ Error processing audio chunk: {e}")
+                # Trigger callback
+                if self.on_speech_start:
+                    try:
+                        self.on_speech_start()
+                    except Exception as e:
+                        logger.error(f"❌ Error in on_speech_start callback: {e}")
+
+                # Streaming consumers see the padding after on_speech_start
+                self._forward_speech_chunk(padded)
+                return
         
-        logger.info("🛑 Audio processing thread stopped")
+        elif speech_dict and 'end' in speech_dict:
+            # SPEECH END EVENT
+            if self.is_speech_active:
+                logger.info(
+                    f"🔇 SPEECH END DETECTED: "
+                    f"VAD triggered end event, "
+                    f"Segment has {self.capture.segment_samples} samples"
+                )
+                self._finish_segment()
+                return
+        
+        # Continue the segment if speech is active (even when speech_dict is None)
+        if self.is_speech_active:
+            self._forward_speech_chunk(audio_chunk)
+
+    def _finish_segment(self):
+        """Close the speech segment and hand it to on_speech_end (zero-copy view)."""
+        self.is_speech_active = False
+        
+        # Check if speech duration meets minimum
+        speech_duration_ms = self.capture.segment_samples / self.sample_rate * 1000
+        
+        if speech_duration_ms < self.min_speech_duration_ms:
+            logger.warning(
+                f"⚠️ REJECTED SHORT SEGMENT: "
+                f"Duration={speech_duration_ms:.0f}ms < "
+                f"Minimum={self.min_speech_duration_ms}ms, "
+                f"Status=DISCARDED"
+            )
+            self.capture.discard_segment()
+            return
+        
+        # Valid speech segment: a view of the capture buffer, no concatenation
+        speech_audio = self.capture.end_segment()
+        
+        logger.info(
+            f"✅ VALID SPEECH SEGMENT: "
+            f"Duration={speech_duration_ms:.0f}ms, "
+            f"Samples={len(speech_audio)}, "
+            f"Min required={self.min_speech_duration_ms}ms, "
+            f"Status=SENDING_TO_PIPELINE"
+        )
+        
+        # The consumer queues the segment (STTWorker): no thread per segment,
+        # and segments arriving while STT is busy wait instead of being skipped
+        if self.on_speech_end:
+            logger.info("📤 Calling on_speech_end callback...")
+            self._safe_speech_end_callback(speech_audio)
     
     def _probe_device_rate(self, device_index: int) -> int:
         """
@@ -522,8 +559,15 @@ class VADHandler:
                     self._device_sample_rate = self._probe_device_rate(device_index)
                     self._resample_ratio = self._device_sample_rate / self.sample_rate
 
-                # Scale buffer size to match device rate so callback duration stays the same
-                device_chunk_size = int(self.chunk_size * self._resample_ratio)
+                # Scale buffer size to match device rate so callback duration stays the same,
+                # rounded so the resampler reuses one precomputed pattern every callback
+                probe = PolyphaseResampler(self._device_sample_rate, self.sample_rate, max_block=1)
+                device_chunk_size = probe.preferred_block(int(self.chunk_size * self._resample_ratio))
+                self.resampler = PolyphaseResampler(
+                    self._device_sample_rate, self.sample_rate, max_block=device_chunk_size
+                )
+                self.ring_buffer.clear()
+                self.capture.reset()
 
                 logger.info(
                     f"🎤 Opening stream: device_rate={self._device_sample_rate}Hz, "
@@ -594,10 +638,8 @@ class VADHandler:
                 logger.info("✅ VAD iterator states reset complete")
             
             # Clear buffers
-            self.speech_buffer = []
-            self.padding_buffer = []
-            while not self.audio_queue.empty():
-                self.audio_queue.get_nowait()
+            self.ring_buffer.clear()
+            self.capture.reset()
             
             self.is_listening = False
             self.is_speech_active = False
@@ -621,26 +663,40 @@ class VADHandler:
         Get performance statistics.
         
         Returns:
-            Dictionary with detection latency, chunk count, and segment count
+            Dictionary with detection/callback latency, chunk and segment
+            counts, and ring buffer overruns
         """
-        if not self.detection_times:
+        callback = self.callback_times.summary()
+        capture_stats = {
+            "callback_p50_ms": callback["p50_ms"],
+            "callback_p95_ms": callback["p95_ms"],
+            "callback_max_ms": callback["max_ms"],
+            "overruns": self.ring_buffer.overruns,
+            "dropped_samples": self.ring_buffer.dropped_samples,
+            "ring_high_water": self.ring_buffer.high_water,
+            "device_sample_rate": self._device_sample_rate,
+        }
+        detection_times = self.detection_times.values()
+        if len(detection_times) == 0:
             return {
                 "total_chunks": self.total_chunks_processed,
                 "total_segments": self.total_speech_segments,
                 "avg_detection_ms": 0,
                 "min_detection_ms": 0,
-                "max_detection_ms": 0
+                "max_detection_ms": 0,
+                **capture_stats
             }
         
         return {
             "total_chunks": self.total_chunks_processed,
             "total_segments": self.total_speech_segments,
-            "avg_detection_ms": np.mean(self.detection_times),
-            "min_detection_ms": np.min(self.detection_times),
-            "max_detection_ms": np.max(self.detection_times),
+            "avg_detection_ms": np.mean(detection_times),
+            "min_detection_ms": np.min(detection_times),
+            "max_detection_ms": np.max(detection_times),
             "sample_rate": self.sample_rate,
             "chunk_size": self.chunk_size,
-            "threshold": self.threshold
+            "threshold": self.threshold,
+            **capture_stats
         }
 
 
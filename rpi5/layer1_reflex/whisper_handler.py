@@ -8,6 +8,7 @@ Key Features:
 - GPU-accelerated inference with automatic CPU fallback
 - Multiple model sizes (tiny, base, small for speed vs accuracy)
 - Real-time audio chunk processing
+- Configurable beam size + temperature fallback (DecodeSettings)
 - Thread-safe singleton pattern
 
 Author: Haziq (@IRSPlays)
@@ -16,16 +17,22 @@ Project: Cortex v2.0 - YIA 2026
 
 import logging
 import os
+import threading
 import time
 from typing import Optional, Dict, Any
 import torch
 import whisper
 import numpy as np
 
+try:
+    from .stt_backends import DecodeSettings, STTBackend
+except ImportError:
+    from layer1_reflex.stt_backends import DecodeSettings, STTBackend
+
 logger = logging.getLogger(__name__)
 
 
-class WhisperSTT:
+class WhisperSTT(STTBackend):
     """
     GPU-accelerated speech-to-text handler using OpenAI Whisper.
     
@@ -34,6 +41,7 @@ class WhisperSTT:
     """
     
     _instance = None  # Singleton pattern
+    name = "whisper"
     
     def __new__(cls, *args, **kwargs):
         """Singleton pattern to prevent multiple model loads."""
@@ -46,7 +54,8 @@ class WhisperSTT:
         self,
         model_size: str = "base",  # tiny, base, small, medium, large, turbo
         device: Optional[str] = None,
-        language: str = "en"
+        language: str = "en",
+        decode: Optional[DecodeSettings] = None
     ):
         """
         Initialize Whisper STT engine.
@@ -60,6 +69,7 @@ class WhisperSTT:
                 - 'turbo' (809M params, ~6GB VRAM, ~8x speed) - Fast + accurate
             device: Inference device ('cuda' or 'cpu'). Auto-detected if None.
             language: Target language code (default: 'en' for English)
+            decode: Beam size / temperature fallback (default: greedy at 0.0)
         """
         if self._initialized:
             logger.debug("WhisperSTT already initialized, skipping...")
@@ -82,15 +92,19 @@ class WhisperSTT:
         self.language = language
         self.model = None
         self.fp16 = self.device == "cuda"  # Use FP16 only on GPU
+        self.decode = decode or DecodeSettings()
         
         # Performance tracking
         self.inference_times = []
+        self.window_decode_times = []
+        self._decode_lock = threading.Lock()  # Streaming partials vs full transcribe
         
         logger.info(f"📋 Whisper Config:")
         logger.info(f"   Model Size: {model_size}")
         logger.info(f"   Device: {self.device}")
         logger.info(f"   FP16 Enabled: {self.fp16}")
         logger.info(f"   Language: {language}")
+        logger.info(f"   Beam: {self.decode.beam_size}, Temperatures: {list(self.decode.temperatures)}")
         
         if self.device == "cuda":
             gpu_name = torch.cuda.get_device_name(0)
@@ -204,17 +218,22 @@ class WhisperSTT:
         try:
             start_time = time.time()
             
-            # Transcribe using high-level API for better accuracy
-            result = self.model.transcribe(
-                audio,
-                language=self.language,
-                fp16=self.fp16,
-                verbose=False,  # Suppress Whisper's verbose output
-                temperature=0.0,  # Greedy decoding — more deterministic
-                no_speech_threshold=0.8,  # Higher = filter out noise-only segments
-                compression_ratio_threshold=2.0,  # Lower = catch more hallucinated repetitive text
-                logprob_threshold=-0.5,  # Higher = reject low-confidence transcriptions
-            )
+            # Transcribe using high-level API for better accuracy.
+            # Whisper retries at the next temperature when a decode fails the
+            # compression-ratio / log-prob checks (hallucination fallback).
+            decode = self.decode
+            with self._decode_lock:
+                result = self.model.transcribe(
+                    audio,
+                    language=self.language,
+                    fp16=self.fp16,
+                    verbose=False,  # Suppress Whisper's verbose output
+                    temperature=tuple(decode.temperatures),  # (0.0,) = greedy only
+                    beam_size=decode.beam_size if decode.beam_size > 1 else None,
+                    no_speech_threshold=decode.no_speech_threshold,  # Higher = filter out noise-only segments
+                    compression_ratio_threshold=decode.compression_ratio_threshold,  # Lower = catch more hallucinated repetitive text
+                    logprob_threshold=decode.logprob_threshold,  # Higher = reject low-confidence transcriptions
+                )
             
             inference_time = (time.time() - start_time) * 1000  # Convert to ms
             self.inference_times.append(inference_time)
@@ -235,6 +254,46 @@ class WhisperSTT:
             logger.error(f"❌ Transcription failed: {e}")
             return None
     
+    def transcribe_window(
+        self,
+        audio: np.ndarray,
+        prompt: Optional[str] = None,
+        no_speech_threshold: float = 0.8
+    ) -> str:
+        """
+        Decode one audio window (<=30s) for streaming STT.
+
+        A single encoder pass + greedy decode (no 30s sliding loop, no
+        timestamps), with the previously committed text as prompt.
+
+        Args:
+            audio: Audio window (16kHz float32)
+            prompt: Previously committed transcript for context
+            no_speech_threshold: Return '' above this no-speech probability
+
+        Returns:
+            Transcribed text ('' for silence/noise)
+        """
+        if self.model is None:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
+
+        start_time = time.time()
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio)).to(self.device)
+        options = whisper.DecodingOptions(
+            language=self.language,
+            fp16=self.fp16,
+            temperature=0.0,
+            prompt=prompt,
+            without_timestamps=True
+        )
+        with self._decode_lock:
+            result = whisper.decode(self.model, mel, options)
+        self.window_decode_times.append((time.time() - start_time) * 1000)
+
+        if result.no_speech_prob > no_speech_threshold:
+            return ""
+        return result.text.strip()
+
     def transcribe_file(self, audio_path: str) -> Optional[str]:
         """
         Transcribe audio from a file.
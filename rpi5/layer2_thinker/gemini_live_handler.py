@@ -120,6 +120,8 @@ class GeminiLiveHandler:
 
         # Tool callback for function calling (set by main.py)
         self._tool_callback: Optional[Callable] = None
+        # Called with the full transcript of each finished model turn (set by main.py)
+        self._response_callback: Optional[Callable[[str], None]] = None
 
         logger.info(f"✅ GeminiLiveHandler initialized (model={model})")
     
@@ -569,6 +571,11 @@ Remember: silence is fine. Only speak when it adds value. Safety always comes fi
                             full_response = "".join(self._current_model_response_parts)
                             self._add_to_history("model", full_response)
                             self._current_model_response_parts.clear()
+                            if self._response_callback:
+                                try:
+                                    self._response_callback(full_response)
+                                except Exception as e:
+                                    logger.error(f"Response callback error: {e}")
                         continue
 
                     if not getattr(sc, 'interrupted', False) and not ot and not model_turn:
@@ -879,6 +886,10 @@ Remember: silence is fine. Only speak when it adds value. Safety always comes fi
         self._tool_callback = callback
         logger.info("✅ Tool callback registered on GeminiLiveHandler")
 
+    def set_response_callback(self, callback: Callable[[str], None]):
+        """Set callback for the transcript of each completed model turn."""
+        self._response_callback = callback
+
 
 class GeminiLiveManager:
     """
@@ -917,6 +928,10 @@ class GeminiLiveManager:
     def set_tool_callback(self, callback: Callable):
         """Set callback for Gemini function calling (thread-safe passthrough)."""
         self.handler.set_tool_callback(callback)
+
+    def set_response_callback(self, callback: Callable[[str], None]):
+        """Set callback for completed model turn transcripts (passthrough)."""
+        self.handler.set_response_callback(callback)
     
     def start(self):
         """Start background thread with asyncio event loop."""
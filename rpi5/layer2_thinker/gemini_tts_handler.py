@@ -528,6 +528,7 @@ class GeminiTTS:
         enable_code_execution: bool = False,
         max_response_chars: int = 150,
         reference_images: list = None,
+        image_jpeg: Optional[bytes] = None,
     ) -> Optional[str]:
         """
         Generate TEXT ONLY from image + prompt (no TTS).
@@ -547,7 +548,10 @@ class GeminiTTS:
             enable_code_execution: Enable Gemini code execution for agentic vision
             max_response_chars: Max response length in chars (0 = no limit)
             reference_images: Optional list of historical images for object recall.
-                Each item: {"image": PIL.Image, "context": str}
+                Each item: {"image": PIL.Image, "context": str}, or
+                {"jpeg_bytes": bytes, "context": str} for pre-encoded frames
+            image_jpeg: Pre-encoded JPEG of `image` (e.g. prefetched while the
+                user was still speaking); skips the PNG encode
         
         Returns:
             Text description from Gemini vision model, or None if failed
@@ -569,24 +573,30 @@ class GeminiTTS:
             
             # Convert PIL Image to bytes for Gemini API
             import io
-            buffered = io.BytesIO()
-            image.save(buffered, format="PNG")
-            image_bytes = buffered.getvalue()
+            if image_jpeg is not None:
+                image_bytes, image_mime = image_jpeg, 'image/jpeg'
+            else:
+                buffered = io.BytesIO()
+                image.save(buffered, format="PNG")
+                image_bytes, image_mime = buffered.getvalue(), 'image/png'
             
             # Build image part
             image_part = types.Part.from_bytes(
                 data=image_bytes,
-                mime_type='image/png'
+                mime_type=image_mime
             )
             
             # Build reference image parts (for object recall)
             ref_parts = []
             if has_references:
                 for ref in reference_images:
-                    ref_buf = io.BytesIO()
-                    ref["image"].save(ref_buf, format="JPEG")
+                    ref_jpeg = ref.get("jpeg_bytes")
+                    if ref_jpeg is None:
+                        ref_buf = io.BytesIO()
+                        ref["image"].save(ref_buf, format="JPEG")
+                        ref_jpeg = ref_buf.getvalue()
                     ref_image_part = types.Part.from_bytes(
-                        data=ref_buf.getvalue(),
+                        data=ref_jpeg,
                         mime_type='image/jpeg'
                     )
                     ref_context_part = types.Part.from_text(
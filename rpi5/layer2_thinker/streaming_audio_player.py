@@ -17,6 +17,7 @@ import numpy as np
 import logging
 import threading
 import queue
+import time
 from typing import Optional, Callable
 
 logger = logging.getLogger(__name__)
@@ -40,7 +41,8 @@ class StreamingAudioPlayer:
         channels: int = 1,
         dtype: str = 'int16',
         device: Optional[int] = None,
-        blocksize: int = 4800  # 200ms blocks @ 24kHz
+        blocksize: int = 4800,  # 200ms blocks @ 24kHz
+        silence_timeout: float = 3.0
     ):
         """
         Initialize streaming audio player.
@@ -51,6 +53,8 @@ class StreamingAudioPlayer:
             dtype: Audio data type ('int16' for PCM)
             device: Output device ID (None = default)
             blocksize: Audio block size in samples (4800 = 200ms @ 24kHz)
+            silence_timeout: Auto-stop after this many seconds of empty queue
+                             (keep it long for a persistent TTS player)
         """
         self.sample_rate = sample_rate
         self.channels = channels
@@ -71,7 +75,7 @@ class StreamingAudioPlayer:
         self._last_logged_chunks = -1  # Prevent log spam at same chunk count
         self._leftover: Optional[np.ndarray] = None  # Leftover samples from previous callback
         self._queue_full_count = 0  # Debounce queue-full warnings
-        self._silence_timeout = 3.0  # Auto-stop after N seconds of empty queue
+        self._silence_timeout = silence_timeout  # Auto-stop after N seconds of empty queue
         
         # Callback for playback events
         self.on_start_callback: Optional[Callable] = None
@@ -309,6 +313,22 @@ class StreamingAudioPlayer:
         self.on_stop_callback = on_stop
         self.on_interrupt_callback = on_interrupt
     
+    def wait_drained(self, timeout: float = 60.0) -> bool:
+        """
+        Block until everything queued so far has been played.
+        
+        Returns:
+            True if drained, False on timeout or if playback stopped
+        """
+        deadline = time.monotonic() + timeout
+        while self.is_playing and time.monotonic() < deadline:
+            if self.audio_queue.empty() and self._leftover is None:
+                # The last block is in the device buffer: let it play out
+                time.sleep(self.blocksize / self.sample_rate)
+                return True
+            time.sleep(0.02)
+        return False
+    
     @property
     def queue_size(self) -> int:
         """Get current audio queue size."""
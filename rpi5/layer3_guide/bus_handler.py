@@ -22,7 +22,6 @@ import asyncio
 import json
 import logging
 import math
-import sqlite3
 import time
 import urllib.request
 import urllib.parse
@@ -30,6 +29,11 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+try:
+    from ..layer4_memory.sqlite_access import get_database
+except ImportError:
+    from layer4_memory.sqlite_access import get_database
+
 logger = logging.getLogger(__name__)
 
 
@@ -127,6 +131,7 @@ class BusHandler:
         self.lta_api_key = lta_api_key
         self.tts = tts
         self.db_path = db_path
+        self.db = get_database(db_path)
         self.proximity_radius_m = proximity_radius_m
         self.arrival_refresh_s = arrival_refresh_s
         self.announce_interval_s = announce_interval_s
@@ -157,8 +162,7 @@ class BusHandler:
     def _init_db(self):
         """Create bus stops table if it doesn't exist."""
         try:
-            db = sqlite3.connect(self.db_path)
-            db.execute("""
+            self.db.execute("""
                 CREATE TABLE IF NOT EXISTS bus_stops (
                     code TEXT PRIMARY KEY,
                     description TEXT,
@@ -167,18 +171,18 @@ class BusHandler:
                     longitude REAL
                 )
             """)
-            db.commit()
-            db.close()
+            # Bounding-box lookups in find_nearest_stop (covering index)
+            self.db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_bus_stops_geo
+                ON bus_stops(latitude, longitude, code, description, road_name)
+            """)
         except Exception as e:
             logger.warning(f"Failed to init bus stops DB: {e}")
 
     def get_bus_stop_count(self) -> int:
         """Get number of bus stops in the database."""
         try:
-            db = sqlite3.connect(self.db_path)
-            count = db.execute("SELECT COUNT(*) FROM bus_stops").fetchone()[0]
-            db.close()
-            return count
+            return self.db.query_one("SELECT COUNT(*) FROM bus_stops")[0]
         except Exception:
             return 0
 
@@ -200,8 +204,6 @@ class BusHandler:
         total = 0
         skip = 0
 
-        db = sqlite3.connect(self.db_path)
-
         while True:
             url = f"{self.LTA_BUS_STOPS_URL}?$skip={skip}"
             req = urllib.request.Request(url, headers={
@@ -219,26 +221,26 @@ class BusHandler:
             if not stops:
                 break
 
-            for s in stops:
-                db.execute(
-                    "INSERT OR REPLACE INTO bus_stops (code, description, road_name, latitude, longitude) "
-                    "VALUES (?, ?, ?, ?, ?)",
+            self.db.executemany(
+                "INSERT OR REPLACE INTO bus_stops (code, description, road_name, latitude, longitude) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
                     (
                         s.get("BusStopCode", ""),
                         s.get("Description", ""),
                         s.get("RoadName", ""),
                         s.get("Latitude", 0.0),
                         s.get("Longitude", 0.0),
-                    ),
-                )
-            db.commit()
+                    )
+                    for s in stops
+                ],
+            )
             total += len(stops)
             skip += 500
 
             if len(stops) < 500:
                 break
 
-        db.close()
         logger.info(f"Downloaded {total} bus stops")
         return total
 
@@ -251,13 +253,12 @@ class BusHandler:
         # Approximate bounding box (±0.005° ≈ ±500m)
         delta = 0.005
         try:
-            db = sqlite3.connect(self.db_path)
-            rows = db.execute(
+            # Pooled read connection — no connect/PRAGMA/prepare per nav tick
+            rows = self.db.query(
                 "SELECT code, description, road_name, latitude, longitude FROM bus_stops "
                 "WHERE latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?",
                 (lat - delta, lat + delta, lng - delta, lng + delta),
-            ).fetchall()
-            db.close()
+            )
         except Exception as e:
             logger.warning(f"Bus stop lookup failed: {e}")
             return None
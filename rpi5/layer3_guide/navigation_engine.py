@@ -13,7 +13,6 @@ import asyncio
 import json
 import logging
 import math
-import sqlite3
 import threading
 import time
 import urllib.request
@@ -25,10 +24,18 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
-    from rpi5.layer3_guide.spatial_audio.position_calculator import Position3D
+    from .spatial_audio.position_calculator import Position3D
 except ImportError:
     Position3D = None
 
+try:
+    from ..layer4_memory.sqlite_access import get_database
+except ImportError:
+    from layer4_memory.sqlite_access import get_database
+
+from .route_geometry import RouteGeometry, decode_polyline_array
+from .route_matcher import RouteMatch, RouteMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,6 +112,7 @@ class NavRoute:
     polyline: str = ""          # encoded polyline from Google
     fetched_at: float = 0.0     # timestamp
     is_transit: bool = False    # True if route uses public transport
+    geometry: Optional[RouteGeometry] = field(default=None, repr=False, compare=False)  # of waypoints
 
 
 @dataclass
@@ -120,6 +128,7 @@ class RouteLeg:
     end_lat: float = 0.0
     end_lng: float = 0.0
     instruction: str = ""       # human-readable (e.g., "Walk to bus stop Opp Blk 831")
+    geometry: Optional[RouteGeometry] = field(default=None, repr=False, compare=False)  # walking legs
 
 
 # =====================================================
@@ -130,39 +139,10 @@ def decode_polyline(encoded: str) -> List[Tuple[float, float]]:
     """
     Decode a Google Maps encoded polyline into (lat, lng) pairs.
     
+    Vectorized (see route_geometry.decode_polyline_array).
     Reference: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
     """
-    points = []
-    index = 0
-    lat = 0
-    lng = 0
-    while index < len(encoded):
-        # Decode latitude
-        shift = 0
-        result = 0
-        while True:
-            b = ord(encoded[index]) - 63
-            index += 1
-            result |= (b & 0x1F) << shift
-            shift += 5
-            if b < 0x20:
-                break
-        lat += (~(result >> 1) if (result & 1) else (result >> 1))
-
-        # Decode longitude
-        shift = 0
-        result = 0
-        while True:
-            b = ord(encoded[index]) - 63
-            index += 1
-            result |= (b & 0x1F) << shift
-            shift += 5
-            if b < 0x20:
-                break
-        lng += (~(result >> 1) if (result & 1) else (result >> 1))
-
-        points.append((lat / 1e5, lng / 1e5))
-    return points
+    return [(lat, lng) for lat, lng in decode_polyline_array(encoded).tolist()]
 
 
 # =====================================================
@@ -262,6 +242,12 @@ class NavigationEngine:
     ROAD_CROSSING_KEYWORDS = {"crossing", "crosswalk", "cross", "road"}
     # GPS quality threshold for outdoor mode (satellites)
     GPS_MIN_SATELLITES = 4
+    # Resync the waypoint index when it is this far (m, along the route) ahead of the user
+    RESYNC_AHEAD_M = 50.0
+    # Minimum interval between reroute attempts (seconds)
+    REROUTE_COOLDOWN = 30.0
+    # Cached routes to the same destination younger than this are reused for reroutes (seconds)
+    REROUTE_CACHE_MAX_AGE_S = 6 * 3600
 
     def __init__(
         self,
@@ -316,7 +302,7 @@ class NavigationEngine:
         self._transit_arrival_pos = None    # (lat, lng) of transit arrival stop
         self._on_vehicle_announced = False
         self._alight_announced = False
-        self._leg_waypoints = None  # Current leg's waypoints (for transit walking legs)
+        self._leg_geometry: Optional[RouteGeometry] = None  # Current walking leg (transit routes)
         self.bus_handler = None  # Set externally when bus_handler is available
 
         # Breadcrumb trail — GPS position log for "retrace steps" / "I'm lost"
@@ -333,12 +319,18 @@ class NavigationEngine:
         self._last_known_heading: float = 0.0
         self._last_waypoint_advance_time: float = 0.0  # Rate-limit waypoint advancement
 
+        # Map-matching onto the active route geometry (rebuilt when the route or leg changes)
+        self._matcher: Optional[RouteMatcher] = None
+        self._off_route_announced = False
+        self._last_reroute_time = 0.0
+
         # Vision context from YOLO + depth (updated each frame by main loop)
         self._latest_detections: List[Dict[str, Any]] = []
         self._latest_depth_map: Optional[Any] = None  # numpy array
 
         # Route cache database
         self._cache_db_path = cache_db_path
+        self._cache_db = get_database(cache_db_path)
         self._init_cache_db()
 
         # Persistent event loop for the navigation loop task
@@ -372,8 +364,7 @@ class NavigationEngine:
     def _init_cache_db(self):
         """Create route cache table if it doesn't exist."""
         try:
-            db = sqlite3.connect(self._cache_db_path)
-            db.execute("""
+            self._cache_db.execute("""
                 CREATE TABLE IF NOT EXISTS route_cache (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     origin TEXT NOT NULL,
@@ -382,15 +373,16 @@ class NavigationEngine:
                     fetched_at REAL NOT NULL
                 )
             """)
-            db.commit()
-            db.close()
+            self._cache_db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_route_cache_lookup
+                ON route_cache(origin, destination, fetched_at DESC)
+            """)
         except Exception as e:
             logger.warning(f"Failed to init route cache DB: {e}")
 
     def _cache_route(self, route: NavRoute):
-        """Save route to SQLite cache."""
+        """Save route to SQLite cache (queued on the writer thread, non-blocking)."""
         try:
-            db = sqlite3.connect(self._cache_db_path)
             waypoints_json = json.dumps([
                 {
                     "lat": w.lat, "lng": w.lng, "instruction": w.instruction,
@@ -406,43 +398,58 @@ class NavigationEngine:
                 "total_duration_s": route.total_duration_s,
                 "polyline": route.polyline,
             })
-            db.execute(
+            self._cache_db.execute(
                 "INSERT INTO route_cache (origin, destination, route_json, fetched_at) VALUES (?, ?, ?, ?)",
                 (route.origin, route.destination, route_data, time.time()),
+                wait=False,
             )
-            db.commit()
-            db.close()
             logger.info(f"Route cached: {route.origin} → {route.destination}")
         except Exception as e:
             logger.warning(f"Failed to cache route: {e}")
 
+    @staticmethod
+    def _route_from_cache_row(row) -> NavRoute:
+        """Rebuild a NavRoute from a (route_json, fetched_at) cache row."""
+        data = json.loads(row[0])
+        waypoints_raw = json.loads(data["waypoints"])
+        waypoints = [Waypoint(**w) for w in waypoints_raw]
+        return NavRoute(
+            origin=data["origin"],
+            destination=data["destination"],
+            waypoints=waypoints,
+            total_distance_m=data.get("total_distance_m", 0),
+            total_duration_s=data.get("total_duration_s", 0),
+            polyline=data.get("polyline", ""),
+            fetched_at=row[1],
+        )
+
     def _load_cached_route(self, origin: str, destination: str) -> Optional[NavRoute]:
         """Load most recent cached route matching origin/destination."""
         try:
-            db = sqlite3.connect(self._cache_db_path)
-            row = db.execute(
+            row = self._cache_db.query_one(
                 "SELECT route_json, fetched_at FROM route_cache "
                 "WHERE origin = ? AND destination = ? ORDER BY fetched_at DESC LIMIT 1",
                 (origin, destination),
-            ).fetchone()
-            db.close()
+            )
             if row:
-                data = json.loads(row[0])
-                waypoints_raw = json.loads(data["waypoints"])
-                waypoints = [Waypoint(**w) for w in waypoints_raw]
-                return NavRoute(
-                    origin=data["origin"],
-                    destination=data["destination"],
-                    waypoints=waypoints,
-                    total_distance_m=data.get("total_distance_m", 0),
-                    total_duration_s=data.get("total_duration_s", 0),
-                    polyline=data.get("polyline", ""),
-                    fetched_at=row[1],
-                )
+                return self._prepare_route(self._route_from_cache_row(row))
         except Exception as e:
             logger.warning(f"Failed to load cached route: {e}")
         return None
 
+    def _load_cached_routes_to(self, destination: str, max_age_s: float, limit: int = 5) -> List[NavRoute]:
+        """Recent cached routes to destination from any origin (newest first)."""
+        try:
+            rows = self._cache_db.query(
+                "SELECT route_json, fetched_at FROM route_cache "
+                "WHERE destination = ? AND fetched_at >= ? ORDER BY fetched_at DESC LIMIT ?",
+                (destination, time.time() - max_age_s, limit),
+            )
+            return [self._prepare_route(self._route_from_cache_row(row)) for row in rows]
+        except Exception as e:
+            logger.warning(f"Failed to load cached routes: {e}")
+        return []
+
     # -------------------------------------------------
     # GOOGLE MAPS API
     # -------------------------------------------------
@@ -602,8 +609,30 @@ class NavigationEngine:
             f"Route fetched: {len(waypoints)} waypoints, "
             f"{route.total_distance_m:.0f}m, ~{route.total_duration_s / 60:.0f}min"
         )
+        return self._prepare_route(route)
+
+    def _prepare_route(self, route: NavRoute) -> NavRoute:
+        """
+        Precompute the geometry of the route and of each walking leg, once
+        per fetch / load, so navigation ticks are array lookups.
+        """
+        if route.waypoints and route.geometry is None:
+            route.geometry = RouteGeometry.from_waypoints(
+                route.waypoints, self.TURN_ANNOUNCE_DISTANCE, self.ROAD_CROSSING_KEYWORDS
+            )
+        for leg in route.legs:
+            if leg.leg_type == LegType.WALKING and leg.waypoints and leg.geometry is None:
+                leg.geometry = RouteGeometry.from_waypoints(
+                    leg.waypoints, self.TURN_ANNOUNCE_DISTANCE, self.ROAD_CROSSING_KEYWORDS
+                )
         return route
 
+    def _active_geometry(self) -> RouteGeometry:
+        """Geometry being walked: the current walking leg on transit routes, else the whole route."""
+        if self._leg_geometry:
+            return self._leg_geometry
+        return self._prepare_route(self.route).geometry
+
     def _interpolate_waypoints(self, waypoints: List[Waypoint]) -> List[Waypoint]:
         """Insert extra waypoints where gaps exceed MAX_WAYPOINT_SPACING."""
         if len(waypoints) < 2:
@@ -821,7 +850,7 @@ class NavigationEngine:
             f"🧭 [NAV] Transit route: {' → '.join(leg_summary)}, "
             f"{route.total_distance_m:.0f}m total, ~{route.total_duration_s / 60:.0f}min"
         )
-        return route
+        return self._prepare_route(route)
 
     # -------------------------------------------------
     # NAVIGATION CONTROL
@@ -872,9 +901,11 @@ class NavigationEngine:
             logger.warning(f"🧭 [NAV] Route fetch FAILED: origin='{origin}', destination='{destination}'")
             return False
 
-        self.route = route
+        self.route = self._prepare_route(route)
         self.current_waypoint_idx = 0
         self._turn_announced.clear()
+        self._off_route_announced = False
+        self._last_reroute_time = 0.0
         self._road_crossing_active = False
         self._road_crossing_pos = None
         self._approaching_dest_announced = False
@@ -888,17 +919,16 @@ class NavigationEngine:
             self._current_leg = route.legs[0]
             self._on_vehicle_announced = False
             self._alight_announced = False
-            # Set walking waypoints to first walking leg's waypoints
+            # Walk the first leg's precomputed geometry instead of the flat waypoints
             if self._current_leg.leg_type == LegType.WALKING and self._current_leg.waypoints:
                 self.current_waypoint_idx = 0
-                # Replace flat waypoints with first leg's waypoints for the nav loop
-                self._leg_waypoints = self._current_leg.waypoints
+                self._leg_geometry = self._current_leg.geometry
             else:
-                self._leg_waypoints = None
+                self._leg_geometry = None
         else:
             self.current_leg_idx = 0
             self._current_leg = None
-            self._leg_waypoints = None
+            self._leg_geometry = None
 
         self.state = NavState.NAVIGATING
 
@@ -1028,7 +1058,7 @@ class NavigationEngine:
             self.state = NavState.NAVIGATING
             self._set_mode(NavMode.OUTDOOR)
             self.current_waypoint_idx = 0
-            self._leg_waypoints = leg.waypoints if leg.waypoints else None
+            self._leg_geometry = leg.geometry if leg.waypoints else None
             if self.spatial_audio:
                 self.spatial_audio.start_beacon("navigation_target")
             walk_min = leg.duration_s / 60 if leg.duration_s else 0
@@ -1193,7 +1223,7 @@ class NavigationEngine:
                             self._alight_announced = True
                             leg = self._current_leg
                             stop_name = leg.transit_info.arrival_stop if leg and leg.transit_info else "your stop"
-                            await self._speak(f"Approaching {stop_name}. Prepare to alight.")
+                            await self._speak("Approaching {stop}. Prepare to alight.", stop=stop_name)
                             self._fire_nav_event("approaching_alight", {
                                 "stop": stop_name,
                                 "distance_m": round(dist_to_alight, 0),
@@ -1267,17 +1297,33 @@ class NavigationEngine:
                 # 2. Get current heading from IMU
                 user_heading = self._get_user_heading()
 
-                # 3. Current waypoint (use leg-specific waypoints for transit routes)
-                active_wps = self._leg_waypoints if self._leg_waypoints else self.route.waypoints
+                # 3. Current waypoint, on the precomputed route geometry (the
+                # current walking leg's on transit routes) in its local ENU frame
+                geometry = self._active_geometry()
+                active_wps = geometry.waypoints
+                x, y = (float(v) for v in geometry.to_xy(current_pos[0], current_pos[1]))
+
+                # 3b. Map-match onto the route: keep the waypoint index in step
+                # with progress along it, reroute once confirmed off route.
+                # Last-known positions (accuracy 9999) are not matched; 999
+                # means the fix reports no accuracy. Not while riding a vehicle
+                # on a walking route (TRANSIT mode): leaving the route is expected.
+                if self._gps_accuracy < 9999 and self.mode != NavMode.TRANSIT:
+                    match = self._route_matcher(geometry).match_xy(
+                        x, y, accuracy_m=self._gps_accuracy if self._gps_accuracy < 999 else 0.0,
+                    )
+                    if match.off_route:
+                        if await self._handle_off_route(current_pos, match):
+                            await asyncio.sleep(interval)  # New route installed
+                            continue
+                    else:
+                        self._off_route_announced = False
+                        self._resync_waypoint(match)
+
                 wp = active_wps[self.current_waypoint_idx]
 
-                # 4. Distance and bearing to waypoint
-                dist_to_wp = haversine_distance(
-                    current_pos[0], current_pos[1], wp.lat, wp.lng
-                )
-                target_bearing = bearing_between(
-                    current_pos[0], current_pos[1], wp.lat, wp.lng
-                )
+                # 4. Distance and bearing to waypoint (flat-earth in the route frame)
+                dist_to_wp, target_bearing = geometry.vector_to(self.current_waypoint_idx, x, y)
 
                 # 5. Relative angle from user heading
                 rel_angle = relative_angle(target_bearing, user_heading)
@@ -1313,14 +1359,15 @@ class NavigationEngine:
                                 )
 
                 # 7. Check for upcoming turn announcement
-                await self._check_turn_announcement(current_pos, dist_to_wp)
+                await self._check_turn_announcement(geometry, dist_to_wp)
 
-                # 8. Check road crossing
-                await self._check_road_crossing(wp)
+                # 8. Check road crossing (instructions flagged when the route was prepared)
+                if geometry.is_crossing[self.current_waypoint_idx]:
+                    await self._check_road_crossing(wp)
 
                 # 9. Determine if current waypoint is the final one
-                # For transit routes with leg waypoints, check against the leg's waypoints
-                active_waypoints = self._leg_waypoints if self._leg_waypoints else self.route.waypoints
+                # For transit routes this is the end of the current walking leg
+                active_waypoints = active_wps
                 is_leg_final = self.current_waypoint_idx >= len(active_waypoints) - 1
                 is_route_final = (
                     is_leg_final
@@ -1330,10 +1377,7 @@ class NavigationEngine:
 
                 # 10. Check approaching destination (within 50m) — only for truly final destination
                 if is_route_final and not self._approaching_dest_announced:
-                    final_wp = active_waypoints[-1]
-                    dist_to_dest = haversine_distance(
-                        current_pos[0], current_pos[1], final_wp.lat, final_wp.lng
-                    )
+                    dist_to_dest = geometry.vector_to(-1, x, y)[0]
                     if dist_to_dest < 50.0:
                         self._approaching_dest_announced = True
                         self._fire_nav_event("approaching_destination", {
@@ -1415,6 +1459,108 @@ class NavigationEngine:
 
         logger.info("Navigation loop ended")
 
+    # -------------------------------------------------
+    # MAP-MATCHING & REROUTE
+    # -------------------------------------------------
+
+    def _route_matcher(self, geometry: RouteGeometry) -> RouteMatcher:
+        """Matcher for the active route geometry (built once per route / leg)."""
+        if self._matcher is None or self._matcher.geometry is not geometry:
+            self._matcher = RouteMatcher(geometry)
+        return self._matcher
+
+    def _resync_waypoint(self, match: RouteMatch):
+        """
+        Move the waypoint index to the matched progress when it fell behind
+        (waypoints passed without arriving, e.g. a missed turn rejoined
+        further on) or ran ahead (jitter advanced it past where the user is).
+        """
+        cum_m = self._matcher.cum_m
+        idx = self.current_waypoint_idx
+        target = match.waypoint_idx
+        passed = idx < target and cum_m[idx] < match.progress_m - self.ARRIVAL_THRESHOLD
+        ahead = idx > target and cum_m[idx] - match.progress_m > self.RESYNC_AHEAD_M
+        if passed or ahead:
+            logger.info(
+                f"🧭 [NAV] Waypoint resync {idx} → {target} "
+                f"({match.progress_m:.0f}m / {self._matcher.total_m:.0f}m along route)"
+            )
+            self.current_waypoint_idx = target
+
+    async def _handle_off_route(self, current_pos: Tuple[float, float], match: RouteMatch) -> bool:
+        """Announce leaving the route and reroute (rate-limited). Returns True if a new route is active."""
+        if not self._off_route_announced:
+            self._off_route_announced = True
+            self._fire_nav_event("off_route", {
+                "distance_m": round(match.cross_track_m, 0),
+                "progress_m": round(match.progress_m, 0),
+            })
+            await self._speak("You're off the route. Finding a new way.")
+
+        now = time.monotonic()
+        if now - self._last_reroute_time < self.REROUTE_COOLDOWN:
+            return False
+        self._last_reroute_time = now
+        return await self._reroute(current_pos)
+
+    def _find_cached_reroute(self, current_pos: Tuple[float, float],
+                             destination: str) -> Optional[Tuple[NavRoute, RouteMatcher, RouteMatch]]:
+        """A recently cached route to destination that passes the current position."""
+        for route in self._load_cached_routes_to(destination, self.REROUTE_CACHE_MAX_AGE_S):
+            if not route.waypoints:
+                continue
+            matcher = RouteMatcher(route.geometry)
+            match = matcher.locate(current_pos[0], current_pos[1], RouteMatcher.OFF_ROUTE_EXIT_M)
+            if match:
+                return route, matcher, match
+        return None
+
+    async def _reroute(self, current_pos: Tuple[float, float]) -> bool:
+        """
+        Replace the active route (or walking leg) with one from the current position.
+
+        Reuses a cached route to the same destination that passes the user
+        (e.g. the way back onto a route fetched earlier) before asking the
+        Directions API.
+        """
+        on_leg = self._leg_geometry is not None
+        final = self._active_geometry().waypoints[-1]
+        destination = f"{final.lat},{final.lng}" if on_leg else self.route.destination
+        origin = f"{current_pos[0]:.6f},{current_pos[1]:.6f}"
+
+        cached = self._find_cached_reroute(current_pos, destination)
+        if cached:
+            route, matcher, match = cached
+            start_idx = match.waypoint_idx
+            matcher.reset(match.progress_m)
+            logger.info(f"🧭 [NAV] Rerouting via cached route ({match.remaining_m:.0f}m remaining)")
+        else:
+            route = await asyncio.get_running_loop().run_in_executor(
+                None, self.fetch_route, origin, destination
+            )
+            self.state = NavState.NAVIGATING  # fetch_route marks LOADING_ROUTE / ERROR
+            if not route or not route.waypoints:
+                logger.warning("🧭 [NAV] Reroute failed — keeping the current route")
+                return False
+            route = self._prepare_route(route)
+            matcher = RouteMatcher(route.geometry)
+            start_idx = 0
+
+        if on_leg:
+            self._leg_geometry = route.geometry
+        else:
+            self.route = route
+        self._matcher = matcher
+        self.current_waypoint_idx = start_idx
+        self._turn_announced.clear()
+        self._off_route_announced = False
+        self._fire_nav_event("rerouted", {
+            "distance_m": round(matcher.total_m - matcher.progress_m, 0),
+            "waypoints": len(route.waypoints),
+            "cached": cached is not None,
+        })
+        return True
+
     # -------------------------------------------------
     # POSITION & HEADING
     # -------------------------------------------------
@@ -1482,8 +1628,12 @@ class NavigationEngine:
     # VOICE ANNOUNCEMENTS
     # -------------------------------------------------
 
-    async def _speak(self, text: str):
-        """Speak text via TTS with cooldown."""
+    async def _speak(self, text: str, **slots):
+        """Speak text via TTS with cooldown.
+
+        With slots, text is a template spoken from cached fragments
+        (e.g. "Approaching {stop}. Prepare to alight.", stop=name).
+        """
         now = time.time()
         if now - self._last_voice_time < self.VOICE_COOLDOWN:
             # Queue instead of dropping — but respect cooldown
@@ -1492,11 +1642,14 @@ class NavigationEngine:
         self._last_voice_time = time.time()
         if self.tts:
             try:
-                await self.tts.speak_async(text)
+                if slots:
+                    await self.tts.speak_template_async(text, **slots)
+                else:
+                    await self.tts.speak_async(text)
             except Exception as e:
                 logger.warning(f"TTS failed: {e}")
         else:
-            logger.info(f"NAV VOICE: {text}")
+            logger.info(f"NAV VOICE: {text.format(**slots) if slots else text}")
 
     async def _speak_turn(self, wp: Waypoint):
         """Handle a turn waypoint.
@@ -1523,36 +1676,35 @@ class NavigationEngine:
             })
             logger.debug(f"Turn {direction} — beam redirected (silent)")
 
-    async def _check_turn_announcement(
-        self, current_pos: Tuple[float, float], dist_to_current: float
-    ):
-        """Announce upcoming turns before reaching the waypoint."""
+    async def _check_turn_announcement(self, geometry: RouteGeometry, dist_to_current: float):
+        """Announce the next turn once progress passes its precomputed trigger distance."""
         if not self.route:
             return
 
-        # Look ahead for turns (use leg waypoints for transit routes)
-        active_wps = self._leg_waypoints if self._leg_waypoints else self.route.waypoints
-        for i in range(self.current_waypoint_idx, min(
-            self.current_waypoint_idx + 3, len(active_wps)
-        )):
-            wp = active_wps[i]
-            if not wp.is_turn or i in self._turn_announced:
-                continue
+        # Progress along the route: map-matched, else estimated from the current waypoint
+        matcher = self._matcher
+        if matcher is not None and matcher.geometry is geometry and matcher.last_match is not None:
+            progress = matcher.progress_m
+        else:
+            progress = float(geometry.cum_m[self.current_waypoint_idx]) - dist_to_current
 
-            dist = haversine_distance(current_pos[0], current_pos[1], wp.lat, wp.lng)
-            if dist < self.TURN_ANNOUNCE_DISTANCE:
-                self._turn_announced.add(i)
-                maneuver = wp.maneuver
-                direction = "left" if "left" in maneuver else "right" if "right" in maneuver else maneuver
-                # No voice — beam direction change IS the guidance.
-                # Fire event so Gemini receives context and can speak if needed.
-                self._fire_nav_event("approaching_turn", {
-                    "direction": direction,
-                    "distance_m": round(dist, 0),
-                    "instruction": wp.instruction,
-                })
-                logger.debug(f"Approaching turn: {direction} in {dist:.0f}m (beam guides)")
-                break  # One announcement at a time
+        i = geometry.turn_due(self.current_waypoint_idx, progress)
+        if i < 0 or i in self._turn_announced:
+            return
+
+        wp = geometry.waypoints[i]
+        dist = max(float(geometry.cum_m[i]) - progress, 0.0)
+        self._turn_announced.add(i)
+        maneuver = wp.maneuver
+        direction = "left" if "left" in maneuver else "right" if "right" in maneuver else maneuver
+        # No voice — beam direction change IS the guidance.
+        # Fire event so Gemini receives context and can speak if needed.
+        self._fire_nav_event("approaching_turn", {
+            "direction": direction,
+            "distance_m": round(dist, 0),
+            "instruction": wp.instruction,
+        })
+        logger.debug(f"Approaching turn: {direction} in {dist:.0f}m (beam guides)")
 
     async def _check_road_crossing(self, wp: Waypoint):
         """Check if current waypoint indicates a road crossing.
@@ -1683,13 +1835,15 @@ class NavigationEngine:
             return {"state": self.state.value, "mode": self.mode.value}
 
         current_pos = self._get_current_position()
-        wp = self.route.waypoints[self.current_waypoint_idx] if self.route.waypoints else None
+        geometry = self._active_geometry() if self.route.waypoints else None
+        idx = min(self.current_waypoint_idx, geometry.num_points - 1) if geometry else 0
+        wp = geometry.waypoints[idx] if geometry else None
 
         dist_to_wp = 0.0
         bearing = 0.0
-        if current_pos and wp:
-            dist_to_wp = haversine_distance(current_pos[0], current_pos[1], wp.lat, wp.lng)
-            bearing = bearing_between(current_pos[0], current_pos[1], wp.lat, wp.lng)
+        if current_pos and geometry:
+            x, y = (float(v) for v in geometry.to_xy(current_pos[0], current_pos[1]))
+            dist_to_wp, bearing = geometry.vector_to(idx, x, y)
 
         # Distance to final destination
         dist_to_dest = 0.0
@@ -1699,7 +1853,7 @@ class NavigationEngine:
                 current_pos[0], current_pos[1], final.lat, final.lng
             )
 
-        return {
+        status = {
             "state": self.state.value,
             "mode": self.mode.value,
             "waypoint_index": self.current_waypoint_idx,
@@ -1710,6 +1864,12 @@ class NavigationEngine:
             "destination": self.route.destination,
             "next_instruction": wp.instruction if wp else "",
         }
+        match = self._matcher.last_match if self._matcher else None
+        if match:
+            status["route_progress_m"] = round(match.progress_m, 1)
+            status["route_remaining_m"] = round(match.remaining_m, 1)
+            status["off_route"] = match.off_route
+        return status
 
     def get_breadcrumbs(self) -> List[Tuple[float, float, float]]:
         """Return recorded breadcrumb trail [(lat, lng, timestamp), ...]."""
@@ -1753,14 +1913,15 @@ class NavigationEngine:
             return False
 
         # Create a synthetic route from breadcrumbs
-        self.route = NavRoute(
+        self.route = self._prepare_route(NavRoute(
             origin="current",
             destination="starting point",
             waypoints=waypoints,
             total_distance_m=0.0,
             total_duration_s=0.0,
             polyline="",
-        )
+        ))
+        self._leg_geometry = None
         self.current_waypoint_idx = 0
         self.state = NavState.NAVIGATING
         self._running = True
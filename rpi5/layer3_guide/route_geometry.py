@@ -0,0 +1,198 @@
+"""
+Route Geometry — Precomputed route shape for constant-time navigation ticks
+
+Everything about a route that does not depend on where the user is gets
+computed once, when the route (or a walking leg) is fetched or loaded:
+
+- Local ENU projection (east, north metres about the first point) so
+  per-tick distance / bearing is flat-earth math instead of haversine
+- Segment vectors, lengths and compass bearings, cumulative distance
+- Turn angles at each point, turn announcement trigger distances along
+  the route and the next turn ahead of every point
+- Road-crossing flags from the step instructions
+
+A nav tick is then one projection of the GPS fix plus array lookups.
+The Google polyline decoder is vectorized with numpy.
+
+Author: Haziq (@IRSPlays)
+Date: October 18, 2026
+"""
+
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+
+# =====================================================
+# POLYLINE CODEC
+# =====================================================
+
+def decode_polyline_array(encoded: str) -> np.ndarray:
+    """
+    Decode a Google Maps encoded polyline into an (N, 2) array of (lat, lng).
+
+    Each value is a run of 5-bit chunks (char - 63), the last one below
+    0x20; values are zigzag-encoded deltas. All of it is array operations.
+
+    Reference: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
+    """
+    if not encoded:
+        return np.zeros((0, 2))
+    chunks = np.frombuffer(encoded.encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    ends = np.flatnonzero(chunks < 0x20)
+    if len(ends) % 2 or len(ends) == 0 or ends[-1] != len(chunks) - 1:
+        raise ValueError("Malformed encoded polyline")
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    value_of_chunk = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shifts = 5 * (np.arange(len(chunks)) - starts[value_of_chunk])
+    values = np.add.reduceat((chunks & 0x1F) << shifts, starts)
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+    return np.cumsum(deltas.reshape(-1, 2), axis=0) / 1e5
+
+
+def encode_polyline(points: Iterable[Tuple[float, float]]) -> str:
+    """Encode (lat, lng) pairs as a Google Maps polyline (inverse of decode_polyline_array)."""
+    out = []
+    prev_lat = prev_lng = 0
+    for lat, lng in points:
+        ilat, ilng = int(round(lat * 1e5)), int(round(lng * 1e5))
+        for delta in (ilat - prev_lat, ilng - prev_lng):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                out.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            out.append(chr(value + 63))
+        prev_lat, prev_lng = ilat, ilng
+    return "".join(out)
+
+
+# =====================================================
+# ROUTE GEOMETRY
+# =====================================================
+
+class RouteGeometry:
+    """
+    Immutable per-route arrays for navigation ticks.
+
+    Usage:
+        geometry = RouteGeometry.from_waypoints(route.waypoints)
+        x, y = geometry.to_xy(lat, lng)
+        distance_m, bearing = geometry.vector_to(idx, x, y)
+    """
+
+    def __init__(
+        self,
+        points: Sequence[Tuple[float, float]],
+        turn_flags: Optional[Sequence[bool]] = None,
+        crossing_flags: Optional[Sequence[bool]] = None,
+        announce_distance_m: float = 25.0,
+        waypoints: Optional[List] = None,
+    ):
+        """
+        Args:
+            points: Route polyline as (lat, lng) pairs, in travel order
+            turn_flags: Per point, True where a turn is announced (Waypoint.is_turn)
+            crossing_flags: Per point, True where the instruction is a road crossing
+            announce_distance_m: Announce a turn this far before it (along the route)
+            waypoints: The Waypoint objects the points came from (kept for instructions)
+        """
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(pts) == 0:
+            raise ValueError("Route has no points")
+        n = len(pts)
+        self.waypoints = waypoints
+        self.latlng = pts
+
+        # Local ENU projection (equirectangular about the first point)
+        self.lat0, self.lng0 = float(pts[0, 0]), float(pts[0, 1])
+        self._ky = math.radians(1.0) * EARTH_RADIUS_M
+        self._kx = self._ky * math.cos(math.radians(self.lat0))
+        self.xy = np.stack(self.to_xy(pts[:, 0], pts[:, 1]), axis=1)
+
+        # Segments (a single-point route gets one zero-length segment)
+        seg_xy = self.xy if n > 1 else np.vstack([self.xy, self.xy])
+        self.seg_start = seg_xy[:-1]
+        self.seg_vec = seg_xy[1:] - seg_xy[:-1]
+        self.seg_len2 = (self.seg_vec ** 2).sum(axis=1)
+        self.seg_m = np.sqrt(self.seg_len2)
+        self.cum_m = np.concatenate([[0.0], np.cumsum(self.seg_m)])[:n]   # Per point
+        self.total_m = float(self.cum_m[-1])
+
+        # Compass bearing per segment; zero-length segments keep the previous one
+        bearing = np.degrees(np.arctan2(self.seg_vec[:, 0], self.seg_vec[:, 1])) % 360.0
+        moving = np.flatnonzero(self.seg_m > 1e-6)
+        if len(moving):
+            fill = np.maximum.accumulate(np.where(self.seg_m > 1e-6, np.arange(len(bearing)), -1))
+            bearing = bearing[np.where(fill < 0, moving[0], fill)]
+        self.seg_bearing_deg = bearing
+
+        # Turn angle at each point: change of bearing (-180..180, + = right)
+        self.turn_deg = np.zeros(n)
+        if n > 2:
+            self.turn_deg[1:-1] = (bearing[1:] - bearing[:-1] + 180.0) % 360.0 - 180.0
+
+        # Turn announcements: trigger distance along the route and next turn ahead of each point
+        self.is_turn = np.zeros(n, dtype=bool) if turn_flags is None else np.asarray(turn_flags, dtype=bool)
+        self.announce_at_m = np.where(self.is_turn, self.cum_m - announce_distance_m, np.nan)
+        turns = np.flatnonzero(self.is_turn)
+        self.next_turn = np.append(turns, -1)[np.searchsorted(turns, np.arange(n))]
+
+        self.is_crossing = np.zeros(n, dtype=bool) if crossing_flags is None else np.asarray(crossing_flags, dtype=bool)
+
+        # Plain-list copies for per-tick scalar lookups (numpy scalar indexing is slower than math)
+        self._xy = self.xy.tolist()
+        self._cum = self.cum_m.tolist()
+        self._next_turn = self.next_turn.tolist()
+        self._announce_at = self.announce_at_m.tolist()
+
+    @classmethod
+    def from_waypoints(cls, waypoints: List, announce_distance_m: float = 25.0,
+                       crossing_keywords: Iterable[str] = ()) -> "RouteGeometry":
+        """Build from Waypoint objects (lat, lng, is_turn, instruction)."""
+        keywords = tuple(crossing_keywords)
+        return cls(
+            [(w.lat, w.lng) for w in waypoints],
+            turn_flags=[w.is_turn for w in waypoints],
+            crossing_flags=[bool(w.instruction) and any(kw in w.instruction.lower() for kw in keywords)
+                            for w in waypoints],
+            announce_distance_m=announce_distance_m,
+            waypoints=waypoints,
+        )
+
+    @property
+    def num_points(self) -> int:
+        return len(self.cum_m)
+
+    # -------------------------------------------------
+    # PROJECTION
+    # -------------------------------------------------
+
+    def to_xy(self, lat, lng) -> Tuple[np.ndarray, np.ndarray]:
+        """(east, north) metres from the route's first point (floats for a single fix)."""
+        if isinstance(lat, float) and isinstance(lng, float):
+            return (lng - self.lng0) * self._kx, (lat - self.lat0) * self._ky
+        return ((np.asarray(lng, dtype=np.float64) - self.lng0) * self._kx,
+                (np.asarray(lat, dtype=np.float64) - self.lat0) * self._ky)
+
+    def to_latlng(self, x: float, y: float) -> Tuple[float, float]:
+        return self.lat0 + y / self._ky, self.lng0 + x / self._kx
+
+    # -------------------------------------------------
+    # PER-TICK LOOKUPS
+    # -------------------------------------------------
+
+    def vector_to(self, idx: int, x: float, y: float) -> Tuple[float, float]:
+        """(distance m, compass bearing deg) from projected position (x, y) to point idx."""
+        px, py = self._xy[idx]
+        dx, dy = px - x, py - y
+        return math.hypot(dx, dy), math.degrees(math.atan2(dx, dy)) % 360.0
+
+    def turn_due(self, idx: int, progress_m: float) -> int:
+        """Next turn at or after point idx if progress is between its trigger point and the turn, else -1."""
+        turn = self._next_turn[idx]
+        if turn >= 0 and self._announce_at[turn] <= progress_m <= self._cum[turn]:
+            return turn
+        return -1
@@ -0,0 +1,249 @@
+"""
+Route Matcher — Map-matching GPS fixes onto the navigation route
+
+Projects each fused position onto the route polyline instead of only
+measuring the distance to the current waypoint, so a missed turn or a
+waypoint index that ran ahead is noticed within seconds:
+
+- Segment vectors, lengths and cumulative distances in the route's local
+  ENU frame come precomputed from RouteGeometry
+- Each tick projects onto the segments within a window around the last
+  progress only (binary search on cumulative distance: O(log n) + window)
+- A uniform grid index over the segments re-acquires the route after a
+  detour or when starting mid-route
+- Off-route needs OFF_ROUTE_ENTER_M cross-track error held for
+  OFF_ROUTE_CONFIRM_S; back on route below OFF_ROUTE_EXIT_M (hysteresis
+  against GPS jitter)
+
+Author: Haziq (@IRSPlays)
+Date: October 18, 2026
+"""
+
+import bisect
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .route_geometry import RouteGeometry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteMatch:
+    """A GPS fix snapped onto the route."""
+    segment_idx: int        # Route segment (points[i] → points[i + 1])
+    progress_m: float       # Distance along the route of the snapped point
+    cross_track_m: float    # Distance from the fix to the route
+    lat: float              # Snapped position
+    lng: float
+    waypoint_idx: int       # Next route point ahead of the snapped point
+    remaining_m: float      # Distance along the route to its end
+    off_route: bool = False
+
+
+class RouteMatcher:
+    """
+    Snaps GPS fixes onto a route polyline and tracks progress along it.
+
+    Usage:
+        matcher = RouteMatcher(RouteGeometry.from_waypoints(route.waypoints))
+        match = matcher.match(lat, lng)
+        if match.off_route:
+            ...  # reroute from (lat, lng)
+    """
+
+    # Cross-track error (m) that starts the off-route timer
+    OFF_ROUTE_ENTER_M = 30.0
+    # Cross-track error (m) below which the user is back on route
+    OFF_ROUTE_EXIT_M = 15.0
+    # How long (s) the error must stay above OFF_ROUTE_ENTER_M
+    OFF_ROUTE_CONFIRM_S = 5.0
+    # Tracking window around the last progress (m)
+    SEARCH_BEHIND_M = 30.0
+    SEARCH_AHEAD_M = 120.0
+    # Segment grid index cell size (m)
+    GRID_CELL_M = 50.0
+
+    def __init__(self, route: Union[RouteGeometry, Sequence[Tuple[float, float]]]):
+        """
+        Args:
+            route: RouteGeometry, or the route polyline as (lat, lng) pairs in travel order
+        """
+        self.geometry = route if isinstance(route, RouteGeometry) else RouteGeometry(route)
+        geometry = self.geometry
+        self._a = geometry.seg_start                    # Segment starts
+        self._d = geometry.seg_vec                      # Segment vectors
+        self._len2 = geometry.seg_len2
+        self.segment_m = geometry.seg_m
+        self.cum_m = geometry.cum_m                     # Per point
+        self._cum = self.cum_m.tolist()                 # For bisect (per-tick window lookups)
+        self.total_m = geometry.total_m
+        self.to_xy = geometry.to_xy
+        self.to_latlng = geometry.to_latlng
+        self._grid = self._build_grid()
+
+        # Tracking state
+        self.progress_m = 0.0
+        self.off_route = False
+        self._off_since: Optional[float] = None
+        self.last_match: Optional[RouteMatch] = None
+
+    @property
+    def num_points(self) -> int:
+        return len(self.cum_m)
+
+    # -------------------------------------------------
+    # SPATIAL INDEX
+    # -------------------------------------------------
+
+    def _build_grid(self) -> Dict[Tuple[int, int], List[int]]:
+        """Cell → segments passing through it (sampled every half cell)."""
+        cell = self.GRID_CELL_M
+        steps = (self.segment_m / (cell / 2)).astype(np.int64) + 1
+        seg = np.repeat(np.arange(len(steps)), steps + 1)
+        k = np.arange(len(seg)) - np.repeat(np.cumsum(steps + 1) - (steps + 1), steps + 1)
+        samples = self._a[seg] + self._d[seg] * k[:, None] / steps[seg, None]
+        cells = np.floor(samples / cell).astype(np.int64)
+        # Unique (cell, segment) packed into one key, sorted by cell then segment
+        lo = cells.min(axis=0)
+        span = cells.max(axis=0) - lo + 1
+        n_seg = len(steps)
+        cell_id = (cells[:, 0] - lo[0]) * span[1] + (cells[:, 1] - lo[1])
+        keys = np.unique(cell_id * n_seg + seg)
+        cell_id, seg = np.divmod(keys, n_seg)
+        bounds = np.flatnonzero(np.diff(cell_id)) + 1
+        starts = np.concatenate([[0], bounds]).tolist()
+        cx, cy = np.divmod(cell_id[starts], span[1])
+        return {(x, y): segments.tolist()
+                for x, y, segments in zip((cx + lo[0]).tolist(), (cy + lo[1]).tolist(),
+                                          np.split(seg, bounds))}
+
+    def _grid_candidates(self, x: float, y: float, radius_m: float) -> np.ndarray:
+        cell = self.GRID_CELL_M
+        x0, x1 = int(math.floor((x - radius_m) / cell)), int(math.floor((x + radius_m) / cell))
+        y0, y1 = int(math.floor((y - radius_m) / cell)), int(math.floor((y + radius_m) / cell))
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                found.update(self._grid.get((cx, cy), ()))
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def _project(self, x: float, y: float, segments: np.ndarray) -> Tuple[int, float, float, float, float]:
+        """Best of the candidate segments: (segment, t, cross-track m, along m, cost)."""
+        a, d, len2 = self._a[segments], self._d[segments], self._len2[segments]
+        px, py = x - a[:, 0], y - a[:, 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(len2 > 0, (px * d[:, 0] + py * d[:, 1]) / len2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        cross = np.hypot(px - t * d[:, 0], py - t * d[:, 1])
+        along = self.cum_m[segments] + t * self.segment_m[segments]
+        # Where the route passes the same spot twice (out and back), prefer
+        # the pass consistent with the current progress, moving forward
+        delta = along - self.progress_m
+        cost = cross + 0.05 * np.abs(delta) + 0.25 * np.maximum(-delta, 0.0)
+        k = int(np.argmin(cost))
+        return int(segments[k]), float(t[k]), float(cross[k]), float(along[k]), float(cost[k])
+
+    def locate(self, lat: float, lng: float, radius_m: Optional[float] = None) -> Optional[RouteMatch]:
+        """Nearest point of the whole route within radius_m (no tracking state), or None."""
+        x, y = (float(v) for v in self.to_xy(lat, lng))
+        radius_m = self.OFF_ROUTE_ENTER_M if radius_m is None else radius_m
+        segments = self._grid_candidates(x, y, radius_m)
+        if len(segments) == 0:
+            return None
+        seg, t, cross, along, _ = self._project(x, y, segments)
+        if cross > radius_m:
+            return None
+        return self._result(seg, t, cross, along)
+
+    def _result(self, seg: int, t: float, cross: float, along: float) -> RouteMatch:
+        sx, sy = self._a[seg] + t * self._d[seg]
+        lat, lng = self.to_latlng(float(sx), float(sy))
+        return RouteMatch(
+            segment_idx=seg,
+            progress_m=along,
+            cross_track_m=cross,
+            lat=lat,
+            lng=lng,
+            waypoint_idx=self.waypoint_index(along),
+            remaining_m=self.total_m - along,
+            off_route=self.off_route,
+        )
+
+    def waypoint_index(self, progress_m: float) -> int:
+        """Index of the first route point beyond progress_m (the last point at the end)."""
+        return min(bisect.bisect_right(self._cum, progress_m), self.num_points - 1)
+
+    # -------------------------------------------------
+    # TRACKING
+    # -------------------------------------------------
+
+    def match(self, lat: float, lng: float, now: Optional[float] = None,
+              accuracy_m: float = 0.0) -> RouteMatch:
+        """
+        Snap a fix onto the route, update progress and the off-route state.
+
+        Args:
+            lat, lng: Fused position
+            now: Fix time in seconds (default: time.monotonic())
+            accuracy_m: Reported horizontal accuracy; widens the off-route
+                threshold by up to OFF_ROUTE_ENTER_M
+
+        Returns:
+            RouteMatch (progress is only advanced while near the route)
+        """
+        x, y = (float(v) for v in self.to_xy(lat, lng))
+        return self.match_xy(x, y, now, accuracy_m)
+
+    def match_xy(self, x: float, y: float, now: Optional[float] = None,
+                 accuracy_m: float = 0.0) -> RouteMatch:
+        """match() for a position already projected with to_xy()."""
+        now = time.monotonic() if now is None else now
+        n_seg = len(self.segment_m)
+
+        # Segments overlapping [progress - behind, progress + ahead]
+        lo = bisect.bisect_right(self._cum, self.progress_m - self.SEARCH_BEHIND_M) - 1
+        hi = bisect.bisect_left(self._cum, self.progress_m + self.SEARCH_AHEAD_M)
+        lo, hi = max(lo, 0), min(max(hi, lo + 1), n_seg)
+        seg, t, cross, along, _ = self._project(x, y, np.arange(lo, hi))
+
+        enter_m = self.OFF_ROUTE_ENTER_M + min(max(accuracy_m, 0.0), self.OFF_ROUTE_ENTER_M)
+        if cross > self.OFF_ROUTE_EXIT_M:
+            # Lost the window (detour, skipped ahead, started mid-route):
+            # look the whole route up through the grid
+            segments = self._grid_candidates(x, y, enter_m)
+            if len(segments):
+                g_seg, g_t, g_cross, g_along, _ = self._project(x, y, segments)
+                if g_cross < cross:
+                    seg, t, cross, along = g_seg, g_t, g_cross, g_along
+
+        # Off-route hysteresis
+        if cross > enter_m:
+            if self._off_since is None:
+                self._off_since = now
+            if not self.off_route and now - self._off_since >= self.OFF_ROUTE_CONFIRM_S:
+                self.off_route = True
+                logger.info(f"🧭 [NAV] Off route: {cross:.0f}m from the route at {self.progress_m:.0f}m")
+        else:
+            self._off_since = None
+            if self.off_route and cross < self.OFF_ROUTE_EXIT_M:
+                self.off_route = False
+                logger.info(f"🧭 [NAV] Back on route at {along:.0f}m")
+
+        if cross <= enter_m:
+            self.progress_m = along
+
+        self.last_match = self._result(seg, t, cross, along)
+        return self.last_match
+
+    def reset(self, progress_m: float = 0.0) -> None:
+        """Restart tracking at progress_m along the route."""
+        self.progress_m = progress_m
+        self.off_route = False
+        self._off_since = None
+        self.last_match = None
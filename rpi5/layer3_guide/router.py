@@ -18,7 +18,7 @@ Project: Cortex v2.0 - YIA 2026
 
 import logging
 import re
-from typing import Dict, Any, Set
+from typing import Dict, Any, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -212,16 +212,22 @@ class IntentRouter:
                     return True
         return False
 
-    def route(self, text: str) -> str:
+    # Log label per classify() reason
+    _REASON_LABELS = {
+        "negated_nav": "Layer 2 (negated nav)",
+        "guide": "Layer 3 (Guide)",
+        "thinker": "Layer 2 (Thinker)",
+        "reflex": "Layer 1 (Reflex)",
+        "default": "Layer 2 (default/Gemini)",
+    }
+
+    def classify(self, text: str) -> Tuple[str, str]:
         """
-        Route a voice command to the appropriate layer.
+        Classify a command without logging (safe to call on partial transcripts).
         
-        Priority order:
-        1. Filler/hallucination → "ignore"
-        2. Layer 3 phrase/word match → "layer3" (navigation/bus/memory)
-        3. Layer 2 phrase/word match → "layer2" (Gemini analysis/OCR)
-        4. Layer 1 phrase/word match → "layer1" (YOLO detection)
-        5. Default → "layer2" (Gemini handles everything else)
+        Returns:
+            (layer, reason) where reason is "filler", "negated_nav", "guide",
+            "thinker", "reflex" or "default" ("default" = no keyword matched)
         """
         cleaned = self._clean(text)
         text_lower = text.lower().strip()
@@ -229,8 +235,7 @@ class IntentRouter:
 
         # Phase 0: Reject filler/noise/hallucinations
         if self.is_filler(text):
-            logger.debug(f"[ROUTER] Filler/noise, ignoring: '{text}'")
-            return "ignore"
+            return "ignore", "filler"
 
         # Phase 1: Layer 3 (Navigation/Bus/Memory) — most specific actions
         if self._has_phrase(text_lower, self._l3_phrases) or \
@@ -238,30 +243,43 @@ class IntentRouter:
            self._has_stem(words, self._l3_stems):
             # Check negation — "I don't want to go", "don't navigate" etc.
             if self._is_negated_nav(text_lower):
-                logger.info(f"🎯 [ROUTER] → Layer 2 (negated nav): '{text[:60]}'")
-                return "layer2"
+                return "layer2", "negated_nav"
             # But check if L2 phrase also matches — L2 phrases take priority
             # e.g. "describe the scene at the bus stop" → L2 not L3
             if not self._has_phrase(text_lower, self._l2_phrases):
-                logger.info(f"🎯 [ROUTER] → Layer 3 (Guide): '{text[:60]}'")
-                return "layer3"
+                return "layer3", "guide"
 
         # Phase 2: Layer 2 (Gemini) — explicit analysis/OCR/describe commands
         if self._has_phrase(text_lower, self._l2_phrases) or \
            self._has_word(words, self._l2_words):
-            logger.info(f"🎯 [ROUTER] → Layer 2 (Thinker): '{text[:60]}'")
-            return "layer2"
+            return "layer2", "thinker"
 
         # Phase 3: Layer 1 (YOLO detection) — explicit detection commands only
         if self._has_phrase(text_lower, self._l1_phrases) or \
            self._has_word(words, self._l1_words):
-            logger.info(f"🎯 [ROUTER] → Layer 1 (Reflex): '{text[:60]}'")
-            return "layer1"
+            return "layer1", "reflex"
 
         # Phase 4: DEFAULT → Layer 2 (Gemini)
         # Gemini can handle any question — conversational, knowledge, ambiguous
-        logger.info(f"🎯 [ROUTER] → Layer 2 (default/Gemini): '{text[:60]}'")
-        return "layer2"
+        return "layer2", "default"
+
+    def route(self, text: str) -> str:
+        """
+        Route a voice command to the appropriate layer.
+        
+        Priority order:
+        1. Filler/hallucination → "ignore"
+        2. Layer 3 phrase/word match → "layer3" (navigation/bus/memory)
+        3. Layer 2 phrase/word match → "layer2" (Gemini analysis/OCR)
+        4. Layer 1 phrase/word match → "layer1" (YOLO detection)
+        5. Default → "layer2" (Gemini handles everything else)
+        """
+        layer, reason = self.classify(text)
+        if reason == "filler":
+            logger.debug(f"[ROUTER] Filler/noise, ignoring: '{text}'")
+        else:
+            logger.info(f"🎯 [ROUTER] → {self._REASON_LABELS[reason]}: '{text[:60]}'")
+        return layer
     
     def get_recommended_mode(self, query: str, current_detections: str = "") -> str:
         """
@@ -311,7 +329,7 @@ class IntentRouter:
             return "Layer 3: Guide (Navigation/Spatial Audio)"
         return "Unknown Layer"
     
-    def route_with_flags(self, text: str) -> Dict[str, Any]:
+    def route_with_flags(self, text: str, quiet: bool = False) -> Dict[str, Any]:
         """
         Route a voice command and return detailed routing information.
         
@@ -320,6 +338,7 @@ class IntentRouter:
         
         Args:
             text: Transcribed user command
+            quiet: Don't log (speculative routing on partial transcripts)
             
         Returns:
             Dict with:
@@ -331,7 +350,7 @@ class IntentRouter:
                 - query_type: "detection", "analysis", "navigation", "memory"
                 - description: Human-readable description
         """
-        layer = self.route(text)
+        layer = self.classify(text)[0] if quiet else self.route(text)
         text_lower = text.lower().strip()
         
         # Handle filler/ignored utterances — return immediately with all flags off
@@ -433,6 +452,8 @@ class IntentRouter:
             if any(kw in text_lower for kw in location_keywords):
                 result["query_type"] = "navigation_gps"
         
+        if quiet:
+            return result
         logger.info(f"🎯 [ROUTER] Flags: L0={result['use_layer0']}, L1={result['use_layer1']}, "
                    f"Gemini={result['use_gemini']}, Spatial={result['use_spatial_audio']}, "
                    f"CodeExec={result['enable_code_execution']}, Type={result['query_type']}")
@@ -63,7 +63,11 @@ from .proximity_alert import ProximityAlertSystem
 from .object_sounds import ObjectSoundMapper
 from .object_tracker import ObjectTracker
 from .sound_generator import ProceduralSoundGenerator, get_sound_generator
-from .binaural_engine import BinauralEngine, render_binaural, compute_azimuth_elevation
+from .binaural_engine import (
+    BinauralEngine, BinauralBlockRenderer, HRTFTable, get_hrtf_table, render_binaural, compute_azimuth_elevation,
+)
+from .binaural_mixer import BinauralMixer, Voice, get_binaural_mixer
+from .head_tracker import HeadTracker
 
 __all__ = [
     'SpatialAudioManager',
@@ -79,8 +83,15 @@ __all__ = [
     'ProceduralSoundGenerator',
     'get_sound_generator',
     'BinauralEngine',
+    'BinauralBlockRenderer',
+    'HRTFTable',
+    'get_hrtf_table',
     'render_binaural',
     'compute_azimuth_elevation',
+    'BinauralMixer',
+    'Voice',
+    'get_binaural_mixer',
+    'HeadTracker',
 ]
 
 # Body-Relative Navigation Notice
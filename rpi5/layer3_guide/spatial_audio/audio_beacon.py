@@ -10,6 +10,9 @@ Features:
 - Distance-based ping rate (closer = faster)
 - Success chime when target is reached
 - Configurable sound profiles
+- Plays through OpenAL, or as beacon-priority voices of a BinauralMixer
+  when one is passed (no OpenAL needed; used by the offline render
+  harness together with an injected clock and tick())
 
 Author: Haziq (@IRSPlays)
 """
@@ -22,6 +25,8 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 
+import numpy as np
+
 logger = logging.getLogger("AudioBeacon")
 
 # Try to import PyOpenAL
@@ -88,7 +93,9 @@ class AudioBeacon:
         ping_sound_path: Optional[str] = None,
         success_sound_path: Optional[str] = None,
         config: Optional[BeaconConfig] = None,
-        on_target_reached: Optional[Callable] = None
+        on_target_reached: Optional[Callable] = None,
+        voices=None,
+        clock: Callable[[], float] = time.time
     ):
         """
         Initialize the Audio Beacon.
@@ -98,11 +105,15 @@ class AudioBeacon:
             success_sound_path: Path to success chime sound file (WAV)
             config: Beacon configuration (optional)
             on_target_reached: Callback when target is reached (optional)
+            voices: BinauralMixer to ping on instead of OpenAL (optional)
+            clock: Time source for ping timing (virtual when offline)
         """
         self.ping_sound_path = ping_sound_path
         self.success_sound_path = success_sound_path
         self.config = config or BeaconConfig()
         self.on_target_reached = on_target_reached
+        self.voices = voices
+        self._clock = clock
         
         # State
         self._state = BeaconState.INACTIVE
@@ -113,11 +124,14 @@ class AudioBeacon:
         self._ping_source: Optional[Source] = None
         self._ping_buffer: Optional[Buffer] = None
         self._success_buffer: Optional[Buffer] = None
+        self._ping_audio: dict = {}   # Pitch -> mono samples for voices
+        self._success_audio = None
         
         # Ping thread
         self._ping_thread: Optional[threading.Thread] = None
         self._running = False
         self._lock = threading.Lock()
+        self._next_ping_time = 0.0
         
         # Current ping parameters
         self._current_ping_rate = self.config.ping_rate_far
@@ -151,7 +165,8 @@ class AudioBeacon:
     def start(
         self,
         target_position: Optional[Tuple[float, float, float]] = None,
-        ping_sound_path: Optional[str] = None
+        ping_sound_path: Optional[str] = None,
+        threaded: bool = True
     ) -> bool:
         """
         Start the audio beacon.
@@ -159,6 +174,8 @@ class AudioBeacon:
         Args:
             target_position: Initial (x, y, z) position of target
             ping_sound_path: Override ping sound file
+            threaded: Run the ping thread; False when the caller drives
+                tick() itself (offline rendering)
             
         Returns:
             True if started successfully
@@ -194,10 +211,12 @@ class AudioBeacon:
             except Exception as e:
                 logger.error(f"Failed to create beacon source: {e}")
         
-        # Start ping thread
+        # Start ping thread (first ping immediately)
+        self._next_ping_time = 0.0
         self._running = True
-        self._ping_thread = threading.Thread(target=self._ping_loop, daemon=True)
-        self._ping_thread.start()
+        if threaded:
+            self._ping_thread = threading.Thread(target=self._ping_loop, daemon=True)
+            self._ping_thread.start()
         
         logger.info(f"🎯 Beacon started, state: {self._state.value}")
         return True
@@ -306,21 +325,77 @@ class AudioBeacon:
     def _ping_loop(self) -> None:
         """Background thread that emits pings at the current rate."""
         while self._running:
-            # Calculate sleep time based on ping rate
-            if self._current_ping_rate > 0:
-                sleep_time = 1.0 / self._current_ping_rate
-            else:
-                sleep_time = 1.0
+            # Sleep until next ping
+            time.sleep(self.tick())
+    
+    def tick(self, now: Optional[float] = None) -> float:
+        """
+        Emit a ping if one is due at the current rate.
+        
+        Called by the ping thread, or by the offline render harness once
+        per audio block on its virtual clock.
+        
+        Returns:
+            Seconds until the next ping is due
+        """
+        now = self._clock() if now is None else now
+        if now < self._next_ping_time:
+            return self._next_ping_time - now
+        
+        # Calculate interval based on ping rate
+        if self._current_ping_rate > 0:
+            interval = 1.0 / self._current_ping_rate
+        else:
+            interval = 1.0
+        
+        # Emit ping if tracking
+        if self._state == BeaconState.TRACKING and (self._ping_source or self.voices is not None):
+            self._emit_ping()
+        
+        self._next_ping_time = now + interval
+        return interval
+    
+    def _load_voice_audio(self, path: Optional[str], generate: Callable[[], bytes]) -> Optional[np.ndarray]:
+        """Sound file (or the procedural fallback) as mono samples at the voice mixer rate."""
+        try:
+            from .binaural_mixer import load_mono
             
-            # Emit ping if tracking
-            if self._state == BeaconState.TRACKING and self._ping_source:
-                self._emit_ping()
+            if path and os.path.exists(path):
+                return load_mono(path, self.voices.sr)
+            return load_mono(generate(), self.voices.sr)
+        except Exception as e:
+            logger.error(f"Failed to load beacon sound: {e}")
+            return None
+    
+    def _get_ping_audio(self, pitch: float) -> Optional[np.ndarray]:
+        """Ping resampled to the given pitch factor (cached per 0.01 step)."""
+        key = round(pitch, 2)
+        if key not in self._ping_audio:
+            from .sound_generator import get_sound_generator
             
-            # Sleep until next ping
-            time.sleep(sleep_time)
+            base = self._ping_audio.get(1.0)
+            if base is None:
+                base = self._load_voice_audio(self.ping_sound_path, get_sound_generator().generate_beacon_ping)
+                if base is None:
+                    return None
+                self._ping_audio[1.0] = base
+            if key != 1.0:
+                n = int(len(base) / key)
+                self._ping_audio[key] = np.interp(np.arange(n) * key, np.arange(len(base)), base)
+        return self._ping_audio[key]
     
     def _emit_ping(self) -> None:
         """Emit a single ping sound."""
+        if self.voices is not None:
+            with self._lock:
+                position = self._position
+                volume = self._current_volume
+                pitch = self._current_pitch
+            audio = self._get_ping_audio(pitch)
+            if position and audio is not None:
+                self.voices.play(audio, position=position, priority="beacon", gain=volume, name="beacon_ping")
+            return
+        
         if not self._ping_source:
             return
         
@@ -345,7 +420,16 @@ class AudioBeacon:
         logger.info("✅ Target reached!")
         
         # Play success sound
-        if OPENAL_AVAILABLE and self._success_buffer:
+        if self.voices is not None:
+            if self._success_audio is None:
+                from .sound_generator import get_sound_generator
+                
+                self._success_audio = self._load_voice_audio(self.success_sound_path,
+                                                             get_sound_generator().generate_beacon_success)
+            if self._success_audio is not None:
+                self.voices.play(self._success_audio, position=(0, 0, -0.5), priority="beacon",
+                                 name="beacon_success")
+        elif OPENAL_AVAILABLE and self._success_buffer:
             try:
                 success_source = Source(self._success_buffer)
                 success_source.set_position((0, 0, -0.5))  # In front
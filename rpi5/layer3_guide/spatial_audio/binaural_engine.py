@@ -16,13 +16,25 @@ HOW IT WORKS:
        - ITD: Interaural Time Delay (sound arrives earlier at near ear)
        - ILD: Interaural Level Difference (sound is louder in near ear)
        - Head Shadow: high frequencies attenuated on far ear (low-pass)
-    4. Outputs stereo via sounddevice (direct ALSA, no OpenAL)
+    4. Outputs stereo on the shared AudioMixer beacon channel when the
+       app runs one, else via sounddevice (direct ALSA, no OpenAL)
+
+Continuous sources use BinauralBlockRenderer: filter coefficients are
+precomputed per lateral-angle bin, filter state and a fractional ITD
+delay line carry across blocks (no clicks at block boundaries) and a
+position change cross-fades between the old and new bin within one block.
 
 For full HRTF fidelity, a KEMAR/CIPIC database can be loaded.
 The built-in model uses physics-based ITD/ILD/head-shadow which
 gives very convincing L/R separation (the most critical for navigation).
 
-Dependencies: numpy, scipy, sounddevice
+HRTFTable precomputes the model on an azimuth x elevation grid (ITD,
+ILD gains, shadow cutoff and ready-made filter sections) with bilinear
+lookup and a batched API for many sources; measured HRIRs from a SOFA
+file (e.g. KEMAR/CIPIC) can replace the model. render_binaural() and
+everything built on it (pings, alerts, guide_beam_binaural) use it.
+
+Dependencies: numpy, scipy, sounddevice (h5py optional, for SOFA files)
     pip install numpy scipy sounddevice
 
 Author: Haziq (@IRSPlays)
@@ -35,6 +47,7 @@ import threading
 import time
 import logging
 import os
+import sys
 import tempfile
 from typing import Optional, Tuple, Dict
 from dataclasses import dataclass
@@ -42,6 +55,12 @@ from dataclasses import dataclass
 import numpy as np
 from scipy import signal as sig
 
+try:
+    import h5py  # SOFA files are HDF5 (netCDF-4)
+    H5PY_AVAILABLE = True
+except ImportError:
+    H5PY_AVAILABLE = False
+
 logger = logging.getLogger("BinauralEngine")
 
 # ============================================================================
@@ -60,6 +79,22 @@ MAX_ITD_SAMPLES = int(HEAD_RADIUS_M * 3.0 / SPEED_OF_SOUND * SAMPLE_RATE)  # ~8
 # Sound Generators — pleasant, HRTF-localizable sounds
 # ============================================================================
 
+def shared_mixer():
+    """
+    The running AudioMixer, if the app started one.
+
+    Looked up in sys.modules rather than imported: this module is also
+    loaded standalone by the HRTF test scripts, where importing the rpi5
+    package would pull in the whole app.
+    """
+    for name in ("rpi5.audio_mixer", "audio_mixer"):
+        module = sys.modules.get(name)
+        mixer = module.get_mixer() if module is not None else None
+        if mixer is not None:
+            return mixer
+    return None
+
+
 def generate_chirp(duration_s: float = 0.3, f_start: float = 400,
                    f_end: float = 1200, sr: int = SAMPLE_RATE) -> np.ndarray:
     """
@@ -138,6 +173,7 @@ class BinauralParams:
     azimuth_deg: float     # Source azimuth in degrees
     elevation_deg: float   # Source elevation in degrees
     shadow_cutoff_hz: float  # Head shadow low-pass cutoff for far ear
+    itd_s: float = 0.0     # Unrounded ITD in seconds (same sign as itd_samples)
 
 
 def compute_azimuth_elevation(x: float, y: float, z: float) -> Tuple[float, float]:
@@ -191,6 +227,7 @@ def compute_binaural_params(azimuth_deg: float, elevation_deg: float = 0.0) -> B
     itd_samples = int(round(itd_seconds * SAMPLE_RATE))
     if azimuth_deg < 0:  # Source on left → left ear leads → negative ITD
         itd_samples = -itd_samples
+        itd_seconds = -itd_seconds
 
     # --- ILD: Head shadow intensity difference ---
     # Simplified model: ILD increases with frequency and azimuth
@@ -222,30 +259,304 @@ def compute_binaural_params(azimuth_deg: float, elevation_deg: float = 0.0) -> B
         azimuth_deg=azimuth_deg,
         elevation_deg=elevation_deg,
         shadow_cutoff_hz=shadow_cutoff,
+        itd_s=itd_seconds,
     )
 
 
+# ============================================================================
+# HRTF Parameter Table — precomputed azimuth x elevation grid
+# ============================================================================
+
+_IDENTITY_SOS = np.array([[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]])
+
+
+def wrap_azimuth(azimuth_deg):
+    """Azimuth(s) wrapped to [-180, 180)."""
+    return (np.asarray(azimuth_deg, dtype=np.float64) + 180.0) % 360.0 - 180.0
+
+
+def positions_to_azimuth_elevation(positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched compute_azimuth_elevation for an (N, 3) array of OpenAL positions."""
+    p = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    x, y, z = p[:, 0], p[:, 1], p[:, 2]
+    azimuth = np.degrees(np.arctan2(x, -z))
+    dist = np.sqrt(x * x + y * y + z * z)
+    elevation = np.degrees(np.arcsin(np.divide(y, dist, out=np.zeros_like(y), where=dist > 1e-9)))
+    return azimuth, elevation
+
+
+def load_sofa(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Read measured HRIRs from a SOFA (SimpleFreeFieldHRIR) file.
+
+    Returns:
+        (hrirs (M, 2, taps), azimuth_deg (M,), elevation_deg (M,), sample_rate)
+        with azimuth converted to this module's convention (+90 = right;
+        SOFA counts counter-clockwise, +90 = left)
+    """
+    if not H5PY_AVAILABLE:
+        raise ImportError("h5py not installed! pip install h5py")
+    with h5py.File(path, "r") as f:
+        hrirs = np.asarray(f["Data.IR"][:], dtype=np.float64)
+        positions = np.asarray(f["SourcePosition"][:], dtype=np.float64)
+        rate = int(np.asarray(f["Data.SamplingRate"][:]).ravel()[0])
+        pos_type = f["SourcePosition"].attrs.get("Type", b"spherical")
+    if isinstance(pos_type, bytes):
+        pos_type = pos_type.decode()
+    if str(pos_type).lower() == "cartesian":
+        x, y, z = positions[:, 0], positions[:, 1], positions[:, 2]
+        sofa_az = np.degrees(np.arctan2(y, x))
+        elevation = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    else:
+        sofa_az, elevation = positions[:, 0], positions[:, 1]
+    return hrirs[:, :2], wrap_azimuth(-sofa_az), elevation, rate
+
+
+class HRTFTable:
+    """
+    Binaural parameters precomputed on an azimuth x elevation grid.
+
+    compute_binaural_params() does the Woodworth / ILD / head-shadow trig
+    per call and render_binaural() used to design a Butterworth filter per
+    call. The table does both once per grid point:
+    - ITD (seconds), per-ear ILD gain and shadow cutoff, bilinearly
+      interpolated by lookup() / lookup_batch() (O(1): index arithmetic)
+    - Head-shadow SOS per grid point (nearest point; filter coefficients
+      are not interpolated)
+    - Optional measured HRIRs from a SOFA file, resampled to the table
+      rate, nearest measurement per grid point, bilinearly blended on lookup
+    """
+
+    def __init__(self, sr: int = SAMPLE_RATE, az_step: float = 5.0, el_step: float = 10.0,
+                 sofa_path: Optional[str] = None):
+        """
+        Args:
+            sr: Sample rate the ITDs and filters are designed for
+            az_step: Azimuth grid spacing (degrees, -180..180)
+            el_step: Elevation grid spacing (degrees, -90..90)
+            sofa_path: Optional SOFA file with measured HRIRs
+        """
+        self.sr = sr
+        self.az_step = az_step
+        self.el_step = el_step
+        self.sofa_path = sofa_path
+        self.azimuths = np.linspace(-180.0, 180.0, int(round(360.0 / az_step)) + 1)
+        self.elevations = np.linspace(-90.0, 90.0, int(round(180.0 / el_step)) + 1)
+        shape = (len(self.azimuths), len(self.elevations))
+
+        self.itd_s = np.empty(shape)          # Signed, positive = right ear leads
+        self.gain = np.empty(shape + (2,))    # Linear ILD gain per ear
+        self.cutoff_hz = np.empty(shape)
+        self.shadow_sos = np.empty(shape + (1, 6))
+        designs: Dict[float, np.ndarray] = {}   # Mirrored / equal-lateral points share a cutoff
+        for i, az in enumerate(self.azimuths):
+            for j, el in enumerate(self.elevations):
+                p = compute_binaural_params(float(az), float(el))
+                self.itd_s[i, j] = p.itd_s
+                self.gain[i, j] = (10 ** (p.ild_left_db / 20), 10 ** (p.ild_right_db / 20))
+                self.cutoff_hz[i, j] = p.shadow_cutoff_hz
+                key = round(p.shadow_cutoff_hz, 3)
+                if key not in designs:
+                    designs[key] = (sig.butter(2, p.shadow_cutoff_hz, btype='low', fs=sr, output='sos')
+                                    if p.shadow_cutoff_hz < (sr / 2 - 100) else _IDENTITY_SOS)
+                self.shadow_sos[i, j] = designs[key]
+        # Scalar lookups read plain lists: numpy scalar indexing would cost
+        # more than the trig the table replaces
+        self._rows = np.dstack([self.itd_s, self.gain, self.cutoff_hz]).tolist()
+
+        self.hrir: Optional[np.ndarray] = None   # (n_az, n_el, 2, taps)
+        if sofa_path:
+            try:
+                self.set_hrirs(*load_sofa(sofa_path))
+                logger.info(f"HRTF table: {len(self.azimuths)}x{len(self.elevations)} grid with "
+                            f"measured HRIRs from {os.path.basename(sofa_path)}")
+            except Exception as e:
+                logger.warning(f"SOFA load failed ({e}) — using the parametric HRTF model")
+
+    @property
+    def signature(self) -> dict:
+        """Identifies what renders from this table sound like (for caches of rendered audio)."""
+        sofa = None
+        if self.hrir is not None:
+            sofa = [os.path.basename(self.sofa_path or ""), self.hrir.shape[-1]]
+        return {"az_step": self.az_step, "el_step": self.el_step, "sofa": sofa}
+
+    def set_hrirs(self, hrirs: np.ndarray, azimuth_deg: np.ndarray, elevation_deg: np.ndarray,
+                  rate: int):
+        """
+        Use measured HRIRs: each grid point takes the nearest measurement.
+
+        Args:
+            hrirs: (M, 2, taps) impulse responses, [left, right]
+            azimuth_deg: (M,) measurement azimuths (+90 = right)
+            elevation_deg: (M,) measurement elevations
+            rate: Sample rate of the HRIRs
+        """
+        hrirs = np.asarray(hrirs, dtype=np.float64)
+        if rate != self.sr:
+            g = math.gcd(int(rate), int(self.sr))
+            hrirs = sig.resample_poly(hrirs, self.sr // g, rate // g, axis=-1)
+
+        def unit(az, el):
+            az, el = np.radians(az), np.radians(el)
+            return np.stack([np.cos(el) * np.sin(az), np.sin(el), np.cos(el) * np.cos(az)], axis=-1)
+
+        measured = unit(np.asarray(azimuth_deg, dtype=np.float64), np.asarray(elevation_deg, dtype=np.float64))
+        grid_az, grid_el = np.meshgrid(self.azimuths, self.elevations, indexing="ij")
+        grid = unit(grid_az, grid_el)
+        nearest = np.empty(grid.shape[:2], dtype=np.int64)
+        for i in range(len(self.azimuths)):   # One row at a time keeps the distance matrix small
+            nearest[i] = np.argmax(grid[i] @ measured.T, axis=1)
+        self.hrir = hrirs[nearest]
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _corners(self, azimuth_deg, elevation_deg):
+        """Grid indices (i0, j0) and fractions (fa, fe) for bilinear lookup."""
+        fa = (wrap_azimuth(azimuth_deg) + 180.0) / self.az_step
+        fe = (np.clip(elevation_deg, -90.0, 90.0) + 90.0) / self.el_step
+        i0 = np.minimum(np.floor(fa).astype(np.int64), len(self.azimuths) - 2)
+        j0 = np.minimum(np.floor(fe).astype(np.int64), len(self.elevations) - 2)
+        return i0, j0, fa - i0, fe - j0
+
+    def _bilinear(self, field: np.ndarray, i0, j0, fa, fe) -> np.ndarray:
+        extra = (slice(None),) + (None,) * (field.ndim - 2)
+        fa, fe = np.asarray(fa)[extra], np.asarray(fe)[extra]
+        return ((field[i0, j0] * (1 - fa) + field[i0 + 1, j0] * fa) * (1 - fe)
+                + (field[i0, j0 + 1] * (1 - fa) + field[i0 + 1, j0 + 1] * fa) * fe)
+
+    def _nearest(self, i0, j0, fa, fe):
+        return i0 + (np.asarray(fa) >= 0.5), j0 + (np.asarray(fe) >= 0.5)
+
+    def _corner(self, azimuth_deg: float, elevation_deg: float) -> Tuple[int, int, float, float]:
+        """Scalar _corners() in plain Python."""
+        fa = ((azimuth_deg + 180.0) % 360.0) / self.az_step
+        fe = (min(max(elevation_deg, -90.0), 90.0) + 90.0) / self.el_step
+        i0 = min(int(fa), len(self.azimuths) - 2)
+        j0 = min(int(fe), len(self.elevations) - 2)
+        return i0, j0, fa - i0, fe - j0
+
+    def lookup(self, azimuth_deg: float, elevation_deg: float = 0.0) -> BinauralParams:
+        """Interpolated parameters for one direction (itd_samples at the table rate)."""
+        i0, j0, fa, fe = self._corner(azimuth_deg, elevation_deg)
+        r0, r1 = self._rows[i0], self._rows[i0 + 1]
+        w00, w10, w01, w11 = (1 - fa) * (1 - fe), fa * (1 - fe), (1 - fa) * fe, fa * fe
+        itd_s, gain_l, gain_r, cutoff = (
+            a * w00 + b * w10 + c * w01 + d * w11
+            for a, b, c, d in zip(r0[j0], r1[j0], r0[j0 + 1], r1[j0 + 1])
+        )
+        return BinauralParams(
+            itd_samples=int(round(itd_s * self.sr)),
+            ild_left_db=20 * math.log10(max(gain_l, 1e-9)),
+            ild_right_db=20 * math.log10(max(gain_r, 1e-9)),
+            azimuth_deg=azimuth_deg,
+            elevation_deg=elevation_deg,
+            shadow_cutoff_hz=cutoff,
+            itd_s=itd_s,
+        )
+
+    def sos(self, azimuth_deg: float, elevation_deg: float = 0.0) -> np.ndarray:
+        """Head-shadow SOS (1, 6) for the far ear at the nearest grid point."""
+        i0, j0, fa, fe = self._corner(azimuth_deg, elevation_deg)
+        return self.shadow_sos[i0 + (fa >= 0.5), j0 + (fe >= 0.5)]
+
+    def hrir_at(self, azimuth_deg: float, elevation_deg: float = 0.0) -> Optional[np.ndarray]:
+        """Blended measured HRIR pair (2, taps), or None without a SOFA file."""
+        if self.hrir is None:
+            return None
+        i0, j0, fa, fe = self._corner(azimuth_deg, elevation_deg)
+        return ((self.hrir[i0, j0] * (1 - fa) + self.hrir[i0 + 1, j0] * fa) * (1 - fe)
+                + (self.hrir[i0, j0 + 1] * (1 - fa) + self.hrir[i0 + 1, j0 + 1] * fa) * fe)
+
+    def lookup_batch(self, azimuth_deg: np.ndarray, elevation_deg: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Parameters for N directions at once (multi-source rendering).
+
+        Returns:
+            itd_s (N,), gain (N, 2), cutoff_hz (N,), far_ear (N,) (0 = left),
+            sos (N, 2, 1, 6) ready to filter [left, right] (identity on the
+            near ear), and hrir (N, 2, taps) when measured HRIRs are loaded
+        """
+        az = wrap_azimuth(azimuth_deg).ravel()
+        el = np.broadcast_to(np.asarray(elevation_deg, dtype=np.float64), az.shape)
+        i0, j0, fa, fe = self._corners(az, el)
+        ni, nj = self._nearest(i0, j0, fa, fe)
+        far_ear = (az < 0).astype(np.int64)
+        sos = np.broadcast_to(_IDENTITY_SOS, (len(az), 2, 1, 6)).copy()
+        sos[np.arange(len(az)), far_ear] = self.shadow_sos[ni, nj]
+        result = {
+            "itd_s": self._bilinear(self.itd_s, i0, j0, fa, fe),
+            "gain": self._bilinear(self.gain, i0, j0, fa, fe),
+            "cutoff_hz": self._bilinear(self.cutoff_hz, i0, j0, fa, fe),
+            "far_ear": far_ear,
+            "sos": sos,
+        }
+        if self.hrir is not None:
+            result["hrir"] = self._bilinear(self.hrir, i0, j0, fa, fe)
+        return result
+
+    def lookup_positions(self, positions: np.ndarray) -> Dict[str, np.ndarray]:
+        """lookup_batch() for an (N, 3) array of OpenAL (x, y, z) positions."""
+        return self.lookup_batch(*positions_to_azimuth_elevation(positions))
+
+
+_hrtf_options = {"az_step": 5.0, "el_step": 10.0, "sofa_path": None}
+_hrtf_tables: Dict[int, HRTFTable] = {}
+_hrtf_lock = threading.Lock()
+
+
+def configure_hrtf(config: Optional[dict]):
+    """Set the grid / SOFA file from the spatial_audio.hrtf config block (tables rebuild lazily)."""
+    config = config or {}
+    with _hrtf_lock:
+        _hrtf_options.update({k: config[k] for k in ("az_step", "el_step", "sofa_path") if k in config})
+        _hrtf_tables.clear()
+
+
+def get_hrtf_table(sr: int = SAMPLE_RATE) -> HRTFTable:
+    """Shared table for a sample rate (built on first use)."""
+    table = _hrtf_tables.get(sr)
+    if table is None:
+        with _hrtf_lock:
+            table = _hrtf_tables.get(sr)
+            if table is None:
+                table = _hrtf_tables[sr] = HRTFTable(sr, **_hrtf_options)
+    return table
+
+
 # ============================================================================
 # Binaural Renderer — applies HRTF cues to mono signal
 # ============================================================================
 
 def render_binaural(mono: np.ndarray, azimuth_deg: float,
                     elevation_deg: float = 0.0,
-                    sr: int = SAMPLE_RATE) -> np.ndarray:
+                    sr: int = SAMPLE_RATE,
+                    table: Optional[HRTFTable] = None) -> np.ndarray:
     """
     Render a mono signal to binaural stereo using physics-based HRTF.
 
+    Parameters and the head-shadow filter come from the precomputed
+    HRTFTable for sr; with measured HRIRs loaded, the signal is convolved
+    with them instead.
+
     Args:
         mono: 1D float64 array, mono audio signal
         azimuth_deg: source azimuth (-180 to +180, 0=front, +90=right)
         elevation_deg: source elevation (-90 to +90)
         sr: sample rate
+        table: HRTF table designed for sr (the shared one if None)
 
     Returns:
         2D float64 array of shape (n_samples, 2) — [left, right] channels
     """
-    params = compute_binaural_params(azimuth_deg, elevation_deg)
+    table = table or get_hrtf_table(sr)
     n = len(mono)
+    hrir = table.hrir_at(azimuth_deg, elevation_deg)
+    if hrir is not None:
+        return np.column_stack([sig.oaconvolve(mono, hrir[0])[:n], sig.oaconvolve(mono, hrir[1])[:n]])
+    params = table.lookup(azimuth_deg, elevation_deg)
 
     # Start with copies for each ear
     left = mono.copy()
@@ -267,10 +578,9 @@ def render_binaural(mono: np.ndarray, azimuth_deg: float,
 
     # --- Apply Head Shadow (low-pass on far ear) ---
     if params.shadow_cutoff_hz < (sr / 2 - 100):
-        # Design a gentle low-pass (2nd order Butterworth)
-        sos = sig.butter(2, params.shadow_cutoff_hz, btype='low',
-                         fs=sr, output='sos')
-        if azimuth_deg >= 0:
+        # Gentle low-pass (2nd order Butterworth), designed when the table was built
+        sos = table.sos(azimuth_deg, elevation_deg)
+        if wrap_azimuth(azimuth_deg) >= 0:
             # Source on right → filter left (far) ear
             left = sig.sosfilt(sos, left)
         else:
@@ -282,6 +592,131 @@ def render_binaural(mono: np.ndarray, azimuth_deg: float,
     return stereo
 
 
+# ============================================================================
+# Block Renderer — stateful, vectorized rendering for continuous sources
+# ============================================================================
+
+def lateral_angle(azimuth_deg: float, elevation_deg: float = 0.0) -> float:
+    """
+    Effective lateral angle in degrees [-90, 90].
+
+    compute_binaural_params depends on the source position only through
+    this angle (elevation folded in), so it is the key for precomputed bins.
+    """
+    s = math.cos(math.radians(elevation_deg)) * math.sin(math.radians(azimuth_deg))
+    return math.degrees(math.asin(max(-1.0, min(1.0, s))))
+
+
+class BinauralBlockRenderer:
+    """
+    Renders a mono stream block by block with state carried between blocks.
+
+    render_binaural() is for one-shot sounds: per call it designs a new
+    Butterworth filter, pads the ITD delay with zeros and filters from a
+    zero state, so rendering a stream in blocks clicks at every boundary.
+    Here:
+    - ITD / ILD gains / head-shadow SOS are precomputed per lateral-angle bin
+    - The head-shadow filter state (zi) of each ear carries across blocks
+    - ITD is a fractional delay line (linear interpolation into the tail of
+      the previous block), not whole-sample zero padding
+    - When the bin changes, the block is rendered with both bins and
+      cross-faded; the new filter starts from its steady state
+    """
+
+    def __init__(self, sr: int = SAMPLE_RATE, bin_deg: float = 2.0, max_block: int = 8192):
+        """
+        Args:
+            sr: Sample rate of the stream
+            bin_deg: Lateral-angle resolution of the precomputed bins
+            max_block: Largest block process() will be given
+        """
+        self.sr = sr
+        self.bin_deg = bin_deg
+        self.max_block = max_block
+
+        angles = np.arange(-90.0, 90.0 + bin_deg / 2, bin_deg)
+        n_bins = len(angles)
+        self._gains = np.ones((n_bins, 2))
+        self._delays = np.zeros((n_bins, 2))          # Samples, per ear
+        self._sos = np.empty((n_bins, 2, 1, 6))
+        self._zi_unit = np.empty((n_bins, 2, 1, 2))   # Steady state for a unit input
+        for b, angle in enumerate(angles):
+            params = compute_binaural_params(float(angle))
+            far = 0 if angle >= 0 else 1               # Source on the right -> left ear is far
+            self._gains[b] = (10 ** (params.ild_left_db / 20), 10 ** (params.ild_right_db / 20))
+            self._delays[b, far] = abs(params.itd_s) * sr
+            self._sos[b] = _IDENTITY_SOS
+            if params.shadow_cutoff_hz < (sr / 2 - 100):
+                self._sos[b, far] = sig.butter(2, params.shadow_cutoff_hz, btype='low', fs=sr, output='sos')
+            for ear in range(2):
+                self._zi_unit[b, ear] = sig.sosfilt_zi(self._sos[b, ear])
+
+        self._hist_len = int(math.ceil(self._delays.max())) + 2
+        self._buf = np.zeros(self._hist_len + max_block)
+        self._buf_idx = np.arange(self._hist_len + max_block, dtype=np.float64)
+        self._frame_idx = np.arange(max_block, dtype=np.float64)
+        self._bin: Optional[int] = None
+        self._zi = np.zeros((2, 1, 2))
+        self.crossfades = 0
+
+    def bin_for(self, azimuth_deg: float, elevation_deg: float = 0.0) -> int:
+        return int(round((lateral_angle(azimuth_deg, elevation_deg) + 90.0) / self.bin_deg))
+
+    def reset(self):
+        """Forget the stream history (start of a new, unrelated stream)."""
+        self._buf[:self._hist_len] = 0.0
+        self._bin = None
+        self._zi[:] = 0.0
+
+    def _render(self, n: int, b: int, zi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Both ears of the current block for bin b (input already in _buf)."""
+        out = np.empty((n, 2))
+        zf = np.empty_like(zi)
+        buf = self._buf[:self._hist_len + n]
+        idx = self._buf_idx[:self._hist_len + n]
+        for ear in range(2):
+            pos = self._frame_idx[:n] + (self._hist_len - self._delays[b, ear])
+            delayed = np.interp(pos, idx, buf)
+            out[:, ear], zf[ear] = sig.sosfilt(self._sos[b, ear], delayed * self._gains[b, ear], zi=zi[ear])
+        return out, zf
+
+    def process(self, mono: np.ndarray, azimuth_deg: float, elevation_deg: float = 0.0) -> np.ndarray:
+        """
+        Render the next block of the stream.
+
+        Args:
+            mono: 1D block (at most max_block samples)
+            azimuth_deg: Source azimuth for this block
+            elevation_deg: Source elevation for this block
+
+        Returns:
+            (len(mono), 2) float64 stereo block
+        """
+        n = len(mono)
+        if n > self.max_block:
+            return np.concatenate([self.process(mono[i:i + self.max_block], azimuth_deg, elevation_deg)
+                                   for i in range(0, n, self.max_block)])
+        h = self._hist_len
+        self._buf[h:h + n] = mono
+        b = self.bin_for(azimuth_deg, elevation_deg)
+        if self._bin is None:
+            self._bin = b
+
+        out, zf = self._render(n, self._bin, self._zi)
+        if b != self._bin:
+            zi_new = self._zi_unit[b] * self._buf[h]
+            new, zf = self._render(n, b, zi_new)
+            fade = self._frame_idx[:n] / n
+            out += (new - out) * fade[:, None]
+            self._bin = b
+            self.crossfades += 1
+        self._zi = zf
+
+        # Keep the tail for the next block's delay line
+        self._buf[:h] = self._buf[n:n + h]
+        return out
+
+
 # ============================================================================
 # Binaural Audio Engine — manages playback via sounddevice
 # ============================================================================
@@ -312,6 +747,8 @@ class BinauralEngine:
         self._sr = sr
         self._gain = gain
         self._sd = None  # sounddevice module (lazy import)
+        self._mixer = None  # Shared AudioMixer (beacon channel) when running
+        self.voices = None  # BinauralMixer rendering every positioned source, when attached
         self._stream = None
         self._lock = threading.Lock()
 
@@ -321,10 +758,28 @@ class BinauralEngine:
         self._cont_azimuth = 0.0
         self._cont_elevation = 0.0
         self._cont_pos = 0       # playback position in mono buffer
+        self._cont_rate = sr     # rate the loop is rendered at (mixer rate when on the mixer)
+        self._cont_world = False # position is world-anchored (head-tracked)
         self._cont_params: Optional[BinauralParams] = None
+        self._renderer: Optional[BinauralBlockRenderer] = None
+
+        # Continuous render timing (per audio block) and device underruns
+        self._block_ms = np.zeros(512)
+        self._blocks = 0
+        self._block_frames = 0
+        self.late_blocks = 0     # Blocks that took longer to render than to play
+        self.underruns = 0
 
     def start(self) -> bool:
         """Initialize the audio engine."""
+        get_hrtf_table(self._sr)  # Build now rather than on the first ping
+        if self.voices is not None:
+            logger.info(f"BinauralEngine started on the voice mixer (sr={self.voices.sr})")
+            return True
+        self._mixer = shared_mixer()
+        if self._mixer is not None:
+            logger.info(f"BinauralEngine started on the audio mixer beacon channel (sr={self._sr})")
+            return True
         try:
             import sounddevice as sd
             self._sd = sd
@@ -345,10 +800,12 @@ class BinauralEngine:
         """Shut down the engine."""
         self.stop_continuous()
         self._sd = None
+        self._mixer = None
         logger.info("BinauralEngine stopped")
 
     def play_at(self, azimuth_deg: float, elevation_deg: float = 0.0,
-                sound: str = "chirp", duration_s: float = 0.3):
+                sound: str = "chirp", duration_s: float = 0.3, priority: str = "beacon",
+                world: bool = False):
         """
         Play a one-shot ping at a 3D position.
 
@@ -357,84 +814,114 @@ class BinauralEngine:
             elevation_deg: +90=above, -90=below
             sound: "chirp", "melody", or "tone"
             duration_s: duration of the ping
+            priority: Voice priority when rendered by the voice mixer
+            world: Direction is world-anchored (held in place by head tracking)
         """
+        if self.voices is not None:
+            self._play_voice(azimuth_deg, elevation_deg, sound, duration_s, priority,
+                             world).wait(timeout=duration_s + 2.0)
+            return
+        if self._mixer is not None:
+            stereo = self._render_ping(azimuth_deg, elevation_deg, sound, duration_s)
+            self._mixer.play("beacon", stereo, self._sr).wait(timeout=duration_s + 2.0)
+            return
         if not self._sd:
             return
 
-        # Generate sound
-        if sound == "melody":
-            mono = generate_melody_ping(duration_s)
-        elif sound == "tone":
-            mono = generate_continuous_tone(duration_s)
-        else:
-            mono = generate_chirp(duration_s)
-
-        # Render binaural
-        stereo = render_binaural(mono, azimuth_deg, elevation_deg, self._sr)
-        stereo *= self._gain
+        stereo = self._render_ping(azimuth_deg, elevation_deg, sound, duration_s)
 
         # Play (blocking for one-shot)
-        self._sd.play(stereo.astype(np.float32), self._sr)
+        self._sd.play(stereo, self._sr)
         self._sd.wait()
 
+    @staticmethod
+    def _ping_mono(sound: str, duration_s: float, sr: int) -> np.ndarray:
+        if sound == "melody":
+            return generate_melody_ping(duration_s, sr=sr)
+        if sound == "tone":
+            return generate_continuous_tone(duration_s, sr=sr)
+        return generate_chirp(duration_s, sr=sr)
+
+    def _play_voice(self, azimuth_deg: float, elevation_deg: float, sound: str,
+                    duration_s: float, priority: str, world: bool = False):
+        """Hand a ping to the voice mixer (mixed with every other positioned source)."""
+        mono = self._ping_mono(sound, duration_s, self.voices.sr)
+        return self.voices.play(mono, azimuth_deg, elevation_deg, priority=priority,
+                                gain=self._gain, name=sound, world=world)
+
+    def _render_ping(self, azimuth_deg: float, elevation_deg: float,
+                     sound: str, duration_s: float) -> np.ndarray:
+        """Generate a ping and render it binaurally (float32 stereo)."""
+        mono = self._ping_mono(sound, duration_s, self._sr)
+        stereo = render_binaural(mono, azimuth_deg, elevation_deg, self._sr)
+        stereo *= self._gain
+        return stereo.astype(np.float32)
+
     def play_at_nonblocking(self, azimuth_deg: float, elevation_deg: float = 0.0,
-                            sound: str = "chirp", duration_s: float = 0.3):
+                            sound: str = "chirp", duration_s: float = 0.3, priority: str = "beacon",
+                            world: bool = False):
         """Non-blocking version of play_at — fire and forget."""
+        if self.voices is not None:
+            self._play_voice(azimuth_deg, elevation_deg, sound, duration_s, priority, world)
+            return
+        if self._mixer is not None:
+            self._mixer.play("beacon", self._render_ping(azimuth_deg, elevation_deg, sound, duration_s), self._sr)
+            return
         if not self._sd:
             return
 
-        if sound == "melody":
-            mono = generate_melody_ping(duration_s)
-        elif sound == "tone":
-            mono = generate_continuous_tone(duration_s)
-        else:
-            mono = generate_chirp(duration_s)
-
-        stereo = render_binaural(mono, azimuth_deg, elevation_deg, self._sr)
-        stereo *= self._gain
-        self._sd.play(stereo.astype(np.float32), self._sr)
+        self._sd.play(self._render_ping(azimuth_deg, elevation_deg, sound, duration_s), self._sr)
 
     def start_continuous(self, azimuth_deg: float = 0.0,
                          elevation_deg: float = 0.0,
-                         freq: float = 500, loop_duration_s: float = 2.0):
+                         freq: float = 500, loop_duration_s: float = 2.0, world: bool = False):
         """
         Start a continuous looping sound at a 3D position.
         Call update_position() to move it in real-time.
+
+        With world=True (and a head tracker on the voice mixer) the position
+        is world-anchored and re-projected for every audio block.
         """
-        if not self._sd:
+        if not self._sd and self._mixer is None and self.voices is None:
             return
 
-        self._cont_mono = generate_continuous_tone(loop_duration_s, freq, self._sr)
+        # The mixer pulls blocks at its own rate: render the loop natively at it
+        if self.voices is not None:
+            rate = self.voices.sr
+        else:
+            rate = self._mixer.sample_rate if self._mixer is not None else self._sr
+        self._cont_mono = generate_continuous_tone(loop_duration_s, freq, rate)
+        self._cont_rate = rate
         self._cont_azimuth = azimuth_deg
         self._cont_elevation = elevation_deg
         self._cont_pos = 0
+        self._cont_world = world
         self._cont_params = compute_binaural_params(azimuth_deg, elevation_deg)
+        if self._renderer is None or self._renderer.sr != rate:
+            self._renderer = BinauralBlockRenderer(rate)
+        self._renderer.reset()
         self._continuous = True
 
+        if self.voices is not None:
+            # Already binaural: summed into the voice mixer's output as a bus
+            self.voices.set_bus("continuous", self._continuous_block)
+            logger.info(f"Continuous playback started at az={azimuth_deg}° (voice mixer)")
+            return
+        if self._mixer is not None:
+            self._mixer.set_source("beacon", self._continuous_block)
+            logger.info(f"Continuous playback started at az={azimuth_deg}° (mixer)")
+            return
+
         def _callback(outdata, frames, time_info, status):
             if status:
+                if status.output_underflow:
+                    self.underruns += 1
                 logger.warning(f"Audio callback status: {status}")
-
-            if not self._continuous or self._cont_mono is None:
+            block = self._continuous_block(frames)
+            if block is None:
                 outdata[:] = 0
-                return
-
-            mono = self._cont_mono
-            n_mono = len(mono)
-
-            # Extract a chunk from the looping buffer
-            chunk = np.empty(frames, dtype=np.float64)
-            pos = self._cont_pos
-            for i in range(frames):
-                chunk[i] = mono[pos % n_mono]
-                pos += 1
-            self._cont_pos = pos % n_mono
-
-            # Render binaural with current position
-            stereo = render_binaural(chunk, self._cont_azimuth,
-                                     self._cont_elevation, self._sr)
-            stereo *= self._gain
-            outdata[:] = stereo.astype(np.float32)
+            else:
+                outdata[:] = block
 
         self._stream = self._sd.OutputStream(
             samplerate=self._sr,
@@ -446,6 +933,57 @@ class BinauralEngine:
         self._stream.start()
         logger.info(f"Continuous playback started at az={azimuth_deg}°")
 
+    def _continuous_block(self, frames: int) -> Optional[np.ndarray]:
+        """Next block of the looping source at the current position (audio thread)."""
+        mono = self._cont_mono
+        renderer = self._renderer
+        if not self._continuous or mono is None or renderer is None:
+            return None
+        start = time.perf_counter()
+
+        # Extract a chunk from the looping buffer
+        idx = (self._cont_pos + np.arange(frames)) % len(mono)
+        self._cont_pos = int(idx[-1] + 1) % len(mono)
+
+        # Render binaural with current position (state carried from the last block)
+        azimuth, elevation = self._cont_azimuth, self._cont_elevation
+        head = self.voices.head if self.voices is not None else None
+        if self._cont_world and head is not None:
+            az, el = head.project_angles(np.array([azimuth]), np.array([elevation]),
+                                         t=start + frames / (2 * self._cont_rate))
+            azimuth, elevation = float(az[0]), float(el[0])
+        stereo = renderer.process(mono[idx], azimuth, elevation)
+        stereo *= self._gain
+        block = stereo.astype(np.float32)
+
+        elapsed = time.perf_counter() - start
+        self._block_ms[self._blocks % len(self._block_ms)] = elapsed * 1000
+        self._blocks += 1
+        self._block_frames = frames
+        if elapsed > frames / self._cont_rate:
+            self.late_blocks += 1
+        return block
+
+    def get_render_stats(self) -> Dict[str, float]:
+        """Continuous render time per block (p50/p95/max ms), late blocks and underruns."""
+        values = self._block_ms[:min(self._blocks, len(self._block_ms))]
+        stats = {
+            "blocks": self._blocks,
+            "block_frames": self._block_frames,
+            "late_blocks": self.late_blocks,
+            "underruns": self._mixer.underruns if self._mixer is not None else self.underruns,
+            "crossfades": self._renderer.crossfades if self._renderer is not None else 0,
+        }
+        if self.voices is not None:
+            stats["voices"] = self.voices.get_stats()
+        if len(values):
+            stats.update({
+                "p50_ms": float(np.percentile(values, 50)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "max_ms": float(values.max()),
+            })
+        return stats
+
     def update_position(self, azimuth_deg: float, elevation_deg: float = 0.0):
         """Update the position of the continuous sound source."""
         self._cont_azimuth = azimuth_deg
@@ -454,6 +992,10 @@ class BinauralEngine:
     def stop_continuous(self):
         """Stop continuous playback."""
         self._continuous = False
+        if self.voices is not None:
+            self.voices.set_bus("continuous", None)
+        elif self._mixer is not None:
+            self._mixer.set_source("beacon", None)
         if self._stream is not None:
             try:
                 self._stream.stop()
@@ -0,0 +1,534 @@
+"""
+Project-Cortex v2.0 - Multi-Source Binaural Mixer
+
+One binaural renderer for every positioned sound. The beacon, directional
+alerts, per-object cues and the engine's continuous tone used to be
+separate OpenAL sources, sounddevice streams or threads; here they are
+voices rendered together per audio block:
+
+- Vectorized across voices: gain envelopes, ILD gain ramps and the
+  far-ear fractional ITD delay line are array operations over
+  (voices x frames); only the head-shadow biquad runs per voice
+  (one lfilter call each, state carried across blocks)
+- Parameters from the shared HRTFTable (lookup_batch, one call per block)
+- Voice limit with priority stealing: safety > beacon > hum > object
+  cues; a stolen voice fades out instead of being cut, equal priority
+  steals the oldest, a lower-priority request is rejected when full
+- Per-voice attack / release envelopes and smooth gain / position changes
+- World-anchored voices are re-projected through the HeadTracker every
+  block, so they stay put while the head turns between camera / nav ticks
+- Lock-free: play() / move() / stop() only append commands or set fields;
+  the audio thread applies them at the start of the next block
+- Output on the shared AudioMixer beacon channel (ducked under safety
+  clips) or its own sounddevice stream; render time per block and
+  steal / reject counts in get_stats()
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from scipy import signal as sig
+
+from .binaural_engine import get_hrtf_table, positions_to_azimuth_elevation, shared_mixer
+
+logger = logging.getLogger("BinauralMixer")
+
+# Higher wins a voice slot
+VOICE_PRIORITY = {"safety": 100, "beacon": 60, "hum": 40, "object": 20}
+
+# Distance attenuation (inverse distance, clamped like the OpenAL sources used)
+REFERENCE_DISTANCE_M = 1.0
+MIN_DISTANCE_GAIN = 0.1
+
+RenderFn = Callable[[int], Optional[np.ndarray]]
+
+
+def _priority(priority: Union[str, int]) -> int:
+    return VOICE_PRIORITY.get(priority, 0) if isinstance(priority, str) else int(priority)
+
+
+class Voice:
+    """Handle for one positioned source (returned by BinauralMixer.play)."""
+
+    def __init__(self, vid: int, name: str, priority: int, audio: Optional[np.ndarray],
+                 render: Optional[RenderFn], loop: bool, gain: float,
+                 attack_s: float, release_s: float, world: bool = False):
+        self.id = vid
+        self.name = name
+        self.priority = priority
+        self.audio = audio
+        self.render = render
+        self.loop = loop
+        self.gain = gain
+        self.attack_s = attack_s
+        self.release_s = release_s
+        self.world = world          # Direction is world-anchored (re-projected per block)
+        self.azimuth = 0.0
+        self.elevation = 0.0
+        self.distance_gain = 1.0
+        self.position = 0           # Next sample of audio to read
+        self.started: Optional[float] = None
+        self.stolen = False
+        self.rejected = False
+        self._release = False
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def move(self, azimuth_deg: float, elevation_deg: float = 0.0):
+        """New direction; applied (and ramped) from the next block."""
+        self.azimuth = azimuth_deg
+        self.elevation = elevation_deg
+
+    def move_to(self, position: Tuple[float, float, float]):
+        """New OpenAL (x, y, z) position: direction plus distance attenuation."""
+        az, el = positions_to_azimuth_elevation(np.asarray(position))
+        distance = math.sqrt(sum(c * c for c in position))
+        self.distance_gain = max(MIN_DISTANCE_GAIN, min(1.0, REFERENCE_DISTANCE_M / max(distance, 1e-6)))
+        self.move(float(az[0]), float(el[0]))
+
+    set_position = move_to  # Same call as an OpenAL Source
+
+    def set_gain(self, gain: float):
+        self.gain = gain
+
+    def stop(self):
+        """Fade out over the release time, then free the voice."""
+        self._release = True
+
+
+class BinauralMixer:
+    """Renders all active voices into one stereo block per audio callback."""
+
+    def __init__(self, sr: int = 48000, max_voices: int = 16, attack_ms: float = 5.0,
+                 release_ms: float = 50.0, steal_release_ms: float = 10.0):
+        """
+        Args:
+            sr: Output sample rate
+            max_voices: Voices audible at once (fading stolen voices excluded)
+            attack_ms: Default fade-in
+            release_ms: Default fade-out (stop() / end of a looping voice)
+            steal_release_ms: Fade-out of a voice that loses its slot
+        """
+        self.max_voices = max_voices
+        self.attack_s = attack_ms / 1000.0
+        self.release_s = release_ms / 1000.0
+        self.steal_release_s = steal_release_ms / 1000.0
+
+        # Per-slot state; stolen voices keep their slot while fading, hence 2x
+        capacity = 2 * max_voices
+        self._slots: List[Optional[Voice]] = [None] * capacity
+        self._set_rate(sr)
+        self._zi = np.zeros((capacity, 2))             # Far-ear head-shadow biquad
+        self._sos = np.zeros((capacity, 6))
+        self._env = np.zeros(capacity)
+        self._ild = np.ones((capacity, 2))
+        self._delay = np.zeros(capacity)               # Far-ear delay (samples)
+        self._far = np.zeros(capacity, dtype=np.int64)
+        self._fresh = np.ones(capacity, dtype=bool)    # Parameters not ramped yet
+
+        self._commands: deque = deque()
+        self._buses: Dict[str, RenderFn] = {}
+        self._ids = itertools.count(1)
+        self.head = None    # HeadTracker for world-anchored voices (set when an IMU is present)
+        self.clock = time.perf_counter   # Time base shared with the HeadTracker (virtual when offline)
+
+        self._stream = None
+        self._mixer = None
+        self._block_ms = np.zeros(512)
+        self.blocks = 0
+        self.steals = 0
+        self.rejections = 0
+        self.peak_voices = 0
+
+    # ------------------------------------------------------------------
+    # Control (any thread)
+    # ------------------------------------------------------------------
+
+    def play(self, audio: Optional[np.ndarray] = None, azimuth_deg: float = 0.0, elevation_deg: float = 0.0,
+             priority: Union[str, int] = "object", gain: float = 1.0, loop: bool = False,
+             position: Optional[Tuple[float, float, float]] = None, render: Optional[RenderFn] = None,
+             name: str = "", attack_ms: Optional[float] = None, release_ms: Optional[float] = None,
+             world: bool = False) -> Voice:
+        """
+        Start a positioned voice.
+
+        Args:
+            audio: Mono samples at the mixer rate (or pass render)
+            azimuth_deg / elevation_deg: Direction (ignored if position is given)
+            priority: "safety", "beacon", "hum", "object" or a number
+            gain: Voice gain
+            loop: Repeat audio until stop()
+            position: OpenAL (x, y, z); adds distance attenuation
+            render: render(frames) -> mono block, for generated sources
+            name: Label for stats / logs
+            attack_ms / release_ms: Override the default envelope
+            world: Direction / position is world-anchored (relative to the
+                   head-tracking reference), not head-relative
+
+        Returns:
+            Voice handle (voice.rejected once the mixer turns it down)
+        """
+        prio = _priority(priority)
+        voice = Voice(
+            next(self._ids), name or str(priority), prio,
+            None if audio is None else np.asarray(audio, dtype=np.float64).ravel(),
+            render, loop, gain,
+            self.attack_s if attack_ms is None else attack_ms / 1000.0,
+            self.release_s if release_ms is None else release_ms / 1000.0,
+            world,
+        )
+        if position is not None:
+            voice.move_to(position)
+        else:
+            voice.move(azimuth_deg, elevation_deg)
+        self._commands.append(voice)
+        return voice
+
+    def set_bus(self, name: str, render: Optional[Callable[[int], Optional[np.ndarray]]]):
+        """Add an already-binaural stereo source (render(frames) -> (frames, 2)); None removes it."""
+        if render is None:
+            self._buses.pop(name, None)
+        else:
+            self._buses[name] = render
+
+    def stop_all(self):
+        for voice in list(self._slots):
+            if voice is not None:
+                voice.stop()
+
+    @property
+    def active_voices(self) -> int:
+        return sum(1 for v in self._slots if v is not None and not v.stolen)
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def _set_rate(self, sr: int):
+        self.sr = sr
+        self.table = get_hrtf_table(sr)
+        self._hist_len = int(math.ceil(np.abs(self.table.itd_s).max() * sr)) + 2
+        self._hist = np.zeros((len(self._slots), self._hist_len))
+
+    def start(self) -> bool:
+        """
+        Attach to the shared AudioMixer beacon channel (adopting its sample
+        rate; voices are rendered at self.sr), else open a sounddevice stream.
+        """
+        self._mixer = shared_mixer()
+        if self._mixer is not None:
+            if self._mixer.sample_rate != self.sr:
+                self._set_rate(self._mixer.sample_rate)
+            self._mixer.set_source("beacon", self.render)
+            logger.info(f"BinauralMixer on the audio mixer beacon channel ({self.max_voices} voices)")
+            return True
+        try:
+            import sounddevice as sd
+        except ImportError:
+            logger.error("sounddevice not installed! pip install sounddevice")
+            return False
+
+        def _callback(outdata, frames, time_info, status):
+            block = self.render(frames)
+            if block is None:
+                outdata[:] = 0
+            else:
+                np.clip(block, -1.0, 1.0, out=outdata)
+
+        try:
+            self._stream = sd.OutputStream(samplerate=self.sr, channels=2, dtype='float32',
+                                           blocksize=1024, callback=_callback)
+            self._stream.start()
+        except Exception as e:
+            logger.error(f"Failed to open BinauralMixer stream: {e}")
+            self._stream = None
+            return False
+        logger.info(f"BinauralMixer started (sr={self.sr}, {self.max_voices} voices)")
+        return True
+
+    def stop(self):
+        if self._mixer is not None:
+            self._mixer.set_source("beacon", None)
+            self._mixer = None
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+        for i, voice in enumerate(self._slots):
+            if voice is not None:
+                self._free(i)
+
+    # ------------------------------------------------------------------
+    # Voice allocation (audio thread)
+    # ------------------------------------------------------------------
+
+    def _free(self, slot: int):
+        voice = self._slots[slot]
+        self._slots[slot] = None
+        self._hist[slot] = 0.0
+        self._zi[slot] = 0.0
+        self._env[slot] = 0.0
+        self._fresh[slot] = True
+        if voice is not None:
+            voice._done.set()
+
+    def _admit(self, voice: Voice):
+        live = [i for i, v in enumerate(self._slots) if v is not None and not v.stolen]
+        if len(live) >= self.max_voices:
+            # Lowest priority, then oldest, loses its slot
+            victim = min(live, key=lambda i: (self._slots[i].priority, self._slots[i].id))
+            if self._slots[victim].priority > voice.priority:
+                voice.rejected = True
+                voice._done.set()
+                self.rejections += 1
+                return
+            stolen = self._slots[victim]
+            stolen.stolen = True
+            stolen.release_s = min(stolen.release_s, self.steal_release_s)
+            stolen._release = True
+            self.steals += 1
+            logger.debug(f"Voice '{stolen.name}' stolen by '{voice.name}'")
+        free = [i for i, v in enumerate(self._slots) if v is None]
+        if not free:
+            # Every slot busy fading: cut the quietest fading voice
+            fading = [i for i, v in enumerate(self._slots) if v is not None and v.stolen]
+            slot = min(fading, key=lambda i: self._env[i])
+            self._free(slot)
+        else:
+            slot = free[0]
+        self._slots[slot] = voice
+        voice.started = self.clock()
+
+    # ------------------------------------------------------------------
+    # Rendering (audio thread)
+    # ------------------------------------------------------------------
+
+    def _read(self, voice: Voice, frames: int) -> np.ndarray:
+        if voice.render is not None:
+            block = voice.render(frames)
+            return np.zeros(frames) if block is None else block
+        audio = voice.audio
+        start = voice.position
+        if voice.loop:
+            idx = (start + np.arange(frames)) % len(audio)
+            voice.position = int(idx[-1] + 1) % len(audio)
+            return audio[idx]
+        voice.position = start + frames
+        block = audio[start:start + frames]
+        if len(block) < frames:
+            block = np.concatenate([block, np.zeros(frames - len(block))])
+        return block
+
+    def render(self, frames: int) -> Optional[np.ndarray]:
+        """Next (frames, 2) float32 block of all voices and buses, or None if silent."""
+        start = time.perf_counter()
+        while self._commands:
+            self._admit(self._commands.popleft())
+
+        slots = np.array([i for i, v in enumerate(self._slots) if v is not None], dtype=np.int64)
+        out = None
+        if len(slots):
+            out = self._render_voices(slots, frames)
+        for render in list(self._buses.values()):
+            block = render(frames)
+            if block is not None:
+                out = block.astype(np.float64) if out is None else out + block
+
+        self._block_ms[self.blocks % len(self._block_ms)] = (time.perf_counter() - start) * 1000
+        self.blocks += 1
+        self.peak_voices = max(self.peak_voices, len(slots))
+        return None if out is None else out.astype(np.float32)
+
+    def _render_voices(self, slots: np.ndarray, n: int) -> np.ndarray:
+        voices = [self._slots[i] for i in slots]
+        k, h = len(slots), self._hist_len
+        sr = self.sr
+        rows = np.arange(k)
+
+        # Envelope: linear ramp toward gain (or 0 when releasing)
+        target = np.array([0.0 if v._release else v.gain * v.distance_gain for v in voices])
+        env0 = self._env[slots]
+        delta = target - env0
+        ramp_s = np.array([v.attack_s if d > 0 else v.release_s for v, d in zip(voices, delta)])
+        ramp_len = np.maximum(1.0, np.abs(delta) * ramp_s * sr)
+        t = np.arange(1, n + 1, dtype=np.float64)
+        env = env0[:, None] + delta[:, None] * np.minimum(1.0, t[None, :] / ramp_len[:, None])
+
+        # Enveloped source blocks behind each voice's delay-line history
+        buf = np.empty((k, h + n))
+        buf[:, :h] = self._hist[slots]
+        for j, voice in enumerate(voices):
+            buf[j, h:] = self._read(voice, n)
+        buf[:, h:] *= env
+
+        # HRTF parameters for all voices in one lookup, ramped from the last block
+        azimuth = np.array([v.azimuth for v in voices])
+        elevation = np.array([v.elevation for v in voices])
+        head = self.head
+        if head is not None:
+            world = np.array([v.world for v in voices])
+            if world.any():
+                # Head orientation at the middle of this block
+                when = self.clock() + n / (2 * sr)
+                azimuth[world], elevation[world] = head.project_angles(azimuth[world], elevation[world], t=when)
+        params = self.table.lookup_batch(azimuth, elevation)
+        far = params["far_ear"]
+        near = 1 - far
+        delay = np.abs(params["itd_s"]) * sr                  # Far ear lags, near ear is direct
+        ild = params["gain"]
+        fresh = self._fresh[slots]
+        flipped = (far != self._far[slots]) & ~fresh         # Source crossed the median plane
+        delay0 = np.where(fresh, delay, np.where(flipped, 0.0, self._delay[slots]))
+        ild0 = np.where(fresh[:, None], ild, self._ild[slots])
+        frac = t / n
+
+        def ramp(start, end):
+            return start[:, None] + (end - start)[:, None] * frac
+
+        def delayed(sel, start, end):
+            # Fractional delay ramp: linear interpolation into [history | block]
+            pos = (h - 1 + t)[None, :] - ramp(start, end)
+            i0 = np.floor(pos).astype(np.int64)
+            w = pos - i0
+            r = sel[:, None]
+            return buf[r, i0] * (1 - w) + buf[r, np.minimum(i0 + 1, h + n - 1)] * w
+
+        # Near ear: the block itself
+        near_gain = ramp(ild0[rows, near], ild[rows, near])
+        y_near = buf[:, h:] * near_gain
+
+        # Far ear: delayed, delay ramped from the last block
+        y_far = delayed(rows, delay0, delay) * ramp(ild0[rows, far], ild[rows, far])
+
+        # The old far ear is near now: ramp its delay to zero and fade its shadow filter out
+        for j in np.flatnonzero(flipped):
+            slot = slots[j]
+            old = delayed(rows[j:j + 1], self._delay[slots[j:j + 1]], np.zeros(1))[0] * near_gain[j]
+            shadowed, _ = sig.lfilter(self._sos[slot, :3], self._sos[slot, 3:], old, zi=self._zi[slot])
+            y_near[j] = shadowed * (1 - frac) + old * frac
+
+        # Head shadow on the far ear: one biquad per voice, state carried across blocks
+        sos = params["sos"][rows, far, 0]
+        for j, slot in enumerate(slots):
+            if flipped[j]:
+                # Shadow moved to the other ear: start its filter settled on the current sample
+                self._zi[slot] = sig.lfilter_zi(sos[j, :3], sos[j, 3:]) * y_far[j, 0]
+            y_far[j], self._zi[slot] = sig.lfilter(sos[j, :3], sos[j, 3:], y_far[j], zi=self._zi[slot])
+        self._sos[slots] = sos
+
+        # Carry state
+        self._hist[slots] = buf[:, n:]
+        self._env[slots] = env[:, -1]
+        self._delay[slots] = delay
+        self._ild[slots] = ild
+        self._far[slots] = far
+        self._fresh[slots] = False
+
+        # Finished: faded out, or a one-shot read past its end plus the delay tail
+        for j, voice in enumerate(voices):
+            ended = (voice.render is None and not voice.loop and voice.position >= len(voice.audio) + h)
+            if ended or (voice._release and env[j, -1] <= 1e-4):
+                self._free(int(slots[j]))
+
+        out = np.empty((n, 2))
+        left_far = far == 0
+        out[:, 0] = y_far[left_far].sum(axis=0) + y_near[~left_far].sum(axis=0)
+        out[:, 1] = y_far[~left_far].sum(axis=0) + y_near[left_far].sum(axis=0)
+        return out
+
+    def get_stats(self) -> Dict[str, float]:
+        """Render time per block (p50/p95/max ms), voice counts, steals and rejections."""
+        values = self._block_ms[:min(self.blocks, len(self._block_ms))]
+        stats = {
+            "blocks": self.blocks,
+            "active_voices": self.active_voices,
+            "peak_voices": self.peak_voices,
+            "max_voices": self.max_voices,
+            "steals": self.steals,
+            "rejections": self.rejections,
+        }
+        if self.head is not None:
+            stats["head"] = self.head.get_stats()
+        if len(values):
+            stats.update({
+                "p50_ms": float(np.percentile(values, 50)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "max_ms": float(values.max()),
+            })
+        return stats
+
+
+def load_mono(source, sr: int) -> np.ndarray:
+    """
+    WAV file path or bytes as mono float samples at sr.
+
+    Raises:
+        ValueError / OSError: Unreadable WAV data
+    """
+    from io import BytesIO
+    from scipy.io import wavfile
+
+    rate, data = wavfile.read(BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    if data.dtype.kind == 'i':
+        data = data / float(np.iinfo(data.dtype).max)
+    elif data.dtype.kind == 'u':
+        data = (data - 128.0) / 128.0
+    mono = data.mean(axis=1) if data.ndim > 1 else data.astype(np.float64)
+    if rate != sr:
+        mono = sig.resample_poly(mono, sr, rate)
+    return mono
+
+
+def create_binaural_mixer(config: Optional[dict], sr: int = 48000) -> BinauralMixer:
+    """Mixer from the spatial_audio.voices config block."""
+    config = config or {}
+    return BinauralMixer(
+        sr=sr,
+        max_voices=config.get("max_voices", 16),
+        attack_ms=config.get("attack_ms", 5.0),
+        release_ms=config.get("release_ms", 50.0),
+        steal_release_ms=config.get("steal_release_ms", 10.0),
+    )
+
+
+# One mixer per process: every engine's voices share the output and the voice limit
+_binaural_mixer: Optional[BinauralMixer] = None
+_binaural_mixer_lock = threading.Lock()
+
+
+def get_binaural_mixer(config: Optional[dict] = None, sr: int = 48000) -> Optional[BinauralMixer]:
+    """Shared, started BinauralMixer (created on first call), or None if no output is available."""
+    global _binaural_mixer
+    with _binaural_mixer_lock:
+        if _binaural_mixer is None:
+            mixer = create_binaural_mixer(config, sr)
+            if not mixer.start():
+                return None
+            _binaural_mixer = mixer
+        return _binaural_mixer
+
+
+def set_binaural_mixer(mixer: Optional[BinauralMixer]) -> Optional[BinauralMixer]:
+    """Install mixer as the shared one (offline rendering); returns the previous one."""
+    global _binaural_mixer
+    with _binaural_mixer_lock:
+        previous, _binaural_mixer = _binaural_mixer, mixer
+    return previous
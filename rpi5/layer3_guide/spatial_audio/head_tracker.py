@@ -0,0 +1,233 @@
+"""
+Project-Cortex v2.0 - Head Tracker (IMU orientation feed for spatial audio)
+
+Keeps world-anchored sounds in place while the user turns their head,
+without waiting for the 15 FPS frame loop or the navigation loop:
+
+- IMUHandler pushes every BNO055 quaternion here at sensor rate
+  (IMUHandler.on_reading), into a small lock-free ring
+- The audio callback asks for the head orientation at the time the block
+  will be heard: slerp between the two bracketing samples, or a short,
+  bounded extrapolation past the newest one
+- World-anchored directions (relative to the facing direction captured
+  at the reference) are re-projected into head-relative azimuth /
+  elevation for a whole batch of sources at once
+
+Frames: the IMU body axes of the 'default' mounting (x right, y forward,
+z up) are converted to OpenAL axes (x right, y up, -z forward) on push,
+so directions use the same convention as positions_to_azimuth_elevation().
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import math
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .binaural_engine import positions_to_azimuth_elevation
+
+logger = logging.getLogger("HeadTracker")
+
+
+def quat_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Hamilton product of (w, x, y, z) quaternions."""
+    aw, ax, ay, az = a
+    bw, bx, by, bz = b
+    return np.array([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ])
+
+
+def quat_conjugate(q: np.ndarray) -> np.ndarray:
+    return np.array([q[0], -q[1], -q[2], -q[3]])
+
+
+def quat_slerp(a: np.ndarray, b: np.ndarray, u: float) -> np.ndarray:
+    """Spherical interpolation from a (u=0) to b (u=1); u > 1 extrapolates along the same arc."""
+    dot = float(np.dot(a, b))
+    if dot < 0.0:            # Take the short way round
+        b, dot = -b, -dot
+    if dot > 0.9999999:      # Nearly identical: linear is exact enough
+        q = a + (b - a) * u
+        return q / np.linalg.norm(q)
+    theta = math.acos(dot)
+    s = math.sin(theta)
+    q = (math.sin((1.0 - u) * theta) * a + math.sin(u * theta) * b) / s
+    return q / np.linalg.norm(q)
+
+
+def quat_to_matrix(q: np.ndarray) -> np.ndarray:
+    """3x3 rotation matrix of a unit quaternion."""
+    w, x, y, z = q
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+        [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+        [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+    ])
+
+
+def quaternion_from_euler(heading_deg: float, pitch_deg: float = 0.0, roll_deg: float = 0.0) -> np.ndarray:
+    """
+    IMU-frame quaternion (w, x, y, z) from compass-style angles.
+
+    Heading is clockwise seen from above (turning right increases it), as
+    the BNO055 reports it. Useful in IMU mock mode and tests.
+    """
+    yaw = math.radians(-heading_deg) / 2       # Clockwise heading = negative turn about z (up)
+    pitch = math.radians(pitch_deg) / 2        # About x (right): nose up
+    roll = math.radians(roll_deg) / 2          # About y (forward)
+    qz = np.array([math.cos(yaw), 0.0, 0.0, math.sin(yaw)])
+    qx = np.array([math.cos(pitch), math.sin(pitch), 0.0, 0.0])
+    qy = np.array([math.cos(roll), 0.0, math.sin(roll), 0.0])
+    return quat_multiply(quat_multiply(qz, qx), qy)
+
+
+def directions_from_angles(azimuth_deg: np.ndarray, elevation_deg: np.ndarray) -> np.ndarray:
+    """(N, 3) OpenAL unit vectors for azimuth (+90 = right) / elevation (+90 = up)."""
+    az = np.radians(np.asarray(azimuth_deg, dtype=np.float64))
+    el = np.radians(np.asarray(elevation_deg, dtype=np.float64))
+    return np.stack([np.sin(az) * np.cos(el), np.sin(el), -np.cos(az) * np.cos(el)], axis=-1)
+
+
+class HeadTracker:
+    """Sensor-rate head orientation, sampled at audio-block rate by the binaural mixer."""
+
+    def __init__(self, history: int = 64, max_extrapolation_ms: float = 20.0,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            history: Samples kept for interpolation
+            max_extrapolation_ms: How far past the newest sample the head
+                may be predicted (bounded so a stalled IMU freezes, not spins)
+            clock: Time base of samples and queries (a virtual clock offline)
+        """
+        self.clock = clock
+        self._t = np.zeros(history)
+        self._q = np.tile([1.0, 0.0, 0.0, 0.0], (history, 1))
+        self._count = 0          # Published samples (single writer: the IMU thread)
+        self._ref: Optional[np.ndarray] = None
+        self._reset = False
+        self.max_extrapolation_s = max_extrapolation_ms / 1000.0
+        self._age_ms = np.zeros(512)
+        self._queries = 0
+
+    # ------------------------------------------------------------------
+    # Feed (IMU thread)
+    # ------------------------------------------------------------------
+
+    def push(self, quat: Tuple[float, float, float, float], t: Optional[float] = None) -> None:
+        """
+        Add one IMU orientation sample.
+
+        Args:
+            quat: (w, x, y, z) in IMU body axes
+            t: Sample time on self.clock (default: now)
+        """
+        w, x, y, z = quat
+        q = np.array([w, x, z, -y])          # Body (x right, y fwd, z up) -> OpenAL (x right, y up, z back)
+        norm = np.linalg.norm(q)
+        if norm < 0.5:                        # Sensor not fused yet (all-zero quaternion)
+            return
+        q /= norm
+        if self._ref is None or self._reset:
+            self._ref = q
+            self._reset = False
+            logger.info("🎧 Head-tracking reference captured")
+        i = self._count % len(self._t)
+        self._q[i] = q
+        self._t[i] = self.clock() if t is None else t
+        self._count += 1                      # Publish after the sample is written
+
+    def push_reading(self, reading) -> None:
+        """IMUHandler.on_reading callback."""
+        self.push((reading.quat_w, reading.quat_x, reading.quat_y, reading.quat_z))
+
+    def reset_reference(self) -> None:
+        """Recapture 'forward' from the next sample."""
+        self._reset = True
+
+    @property
+    def ready(self) -> bool:
+        return self._ref is not None and self._count > 0
+
+    # ------------------------------------------------------------------
+    # Queries (audio thread)
+    # ------------------------------------------------------------------
+
+    def _head_at(self, t: float) -> np.ndarray:
+        count, size = self._count, len(self._t)
+        newest = (count - 1) % size
+        if count == 1:
+            return self._q[newest]
+        n = min(count, size)
+        order = (np.arange(count - n, count)) % size
+        times = self._t[order]
+        k = int(np.searchsorted(times, t))
+        if k <= 0:
+            return self._q[order[0]]
+        if k >= n:
+            # Past the newest sample: extrapolate along the last two, by at
+            # most their spacing and max_extrapolation_s
+            a, b = order[-2], order[-1]
+            span = self._t[b] - self._t[a]
+            if span <= 0:
+                return self._q[b]
+            ahead = min(t - self._t[b], self.max_extrapolation_s, span)
+            return quat_slerp(self._q[a], self._q[b], 1.0 + ahead / span)
+        a, b = order[k - 1], order[k]
+        span = self._t[b] - self._t[a]
+        return quat_slerp(self._q[a], self._q[b], (t - self._t[a]) / span if span > 0 else 1.0)
+
+    def rotation(self, t: Optional[float] = None) -> Optional[np.ndarray]:
+        """World (reference) -> head rotation matrix at time t, or None before the first sample."""
+        if not self.ready:
+            return None
+        t = self.clock() if t is None else t
+        newest = self._t[(self._count - 1) % len(self._t)]
+        self._age_ms[self._queries % len(self._age_ms)] = (t - newest) * 1000
+        self._queries += 1
+        relative = quat_multiply(quat_conjugate(self._head_at(t)), self._ref)
+        return quat_to_matrix(relative)
+
+    def project(self, directions: np.ndarray, t: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Head-relative (azimuth, elevation) of (N, 3) world-anchored directions."""
+        rotation = self.rotation(t)
+        if rotation is None:
+            return positions_to_azimuth_elevation(directions)
+        return positions_to_azimuth_elevation(np.asarray(directions) @ rotation.T)
+
+    def project_angles(self, azimuth_deg, elevation_deg, t: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Head-relative (azimuth, elevation) of world-anchored azimuth / elevation arrays."""
+        return self.project(directions_from_angles(azimuth_deg, elevation_deg), t)
+
+    def to_world(self, azimuth_deg: float, elevation_deg: float = 0.0,
+                 t: Optional[float] = None) -> Tuple[float, float]:
+        """World-anchored direction of a head-relative one observed at time t (e.g. a camera frame)."""
+        rotation = self.rotation(t)
+        d = directions_from_angles(azimuth_deg, elevation_deg).reshape(1, 3)
+        if rotation is not None:
+            d = d @ rotation
+        az, el = positions_to_azimuth_elevation(d)
+        return float(az[0]), float(el[0])
+
+    def get_stats(self) -> Dict[str, float]:
+        """IMU sample rate and age of the newest sample when the audio asked (ms)."""
+        stats = {"samples": self._count, "queries": self._queries}
+        n = min(self._count, len(self._t))
+        if n >= 2:
+            order = np.arange(self._count - n, self._count) % len(self._t)
+            span = self._t[order[-1]] - self._t[order[0]]
+            if span > 0:
+                stats["sample_hz"] = (n - 1) / span
+        ages = self._age_ms[:min(self._queries, len(self._age_ms))]
+        if len(ages):
+            stats["age_p50_ms"] = float(np.percentile(ages, 50))
+            stats["age_p95_ms"] = float(np.percentile(ages, 95))
+        return stats
@@ -84,7 +84,7 @@ except ImportError as e:
 
 # Import local modules
 from .position_calculator import PositionCalculator, Position3D
-from .sound_generator import ProceduralSoundGenerator, get_sound_generator
+from .sound_generator import HumOscillatorBank, ProceduralSoundGenerator, get_sound_generator
 
 
 # ============================================================================
@@ -338,16 +338,15 @@ class SpatialAudioManager:
         # Reference heading captured at start — IMU heading is absolute (compass),
         # so we subtract the reference to get head rotation relative to "forward"
         self._reference_heading: Optional[float] = None
+        # Sensor-rate IMU orientation for the binaural mixer (set_head_tracker)
+        self._head_tracker = None
         
         # ---- Wall hum state (for update_from_depth) ----
-        # Tracks whether each channel region is actively humming
-        self._hum_active: Dict[str, bool] = {"left": False, "center": False, "right": False}
-        # Background thread for non-blocking hum playback
-        self._hum_thread: Optional[threading.Thread] = None
-        self._hum_stop_event = threading.Event()
+        # One oscillator bank runs for the whole session; depth updates only
+        # publish new targets to it (no thread restarts per frame)
+        self._hum = HumOscillatorBank()
         # Current hum parameters (region → (frequency, left_gain, right_gain))
         self._hum_params: Dict[str, Tuple[float, float, float]] = {}
-        self._hum_lock = threading.Lock()
 
         # ---- Binaural Engine (manual HRTF, bypasses OpenAL) ----
         self._binaural_engine = None  # Lazy init via enable_binaural_engine()
@@ -518,6 +517,9 @@ class SpatialAudioManager:
     
     def stop(self) -> None:
         """Stop the audio system and clean up resources."""
+        # The wall hum may run without OpenAL (mixer / sounddevice output)
+        self.stop_hum()
+        self._hum.stop()
         if not self._initialized:
             return
         
@@ -577,19 +579,23 @@ class SpatialAudioManager:
             # Update closest obstacle distance for status reporting
             self._closest_obstacle_distance = float('inf')
             
+            # Convert the frame's bboxes to 3D positions in one batch. Grid
+            # ids of untracked detections change as objects move; their
+            # smoothing state is evicted once stale
+            object_ids = []
             for detection in detections:
-                # Convert bbox to 3D position
                 cx = int((detection.bbox[0] + detection.bbox[2]) / 2 / 50) * 50
                 cy = int((detection.bbox[1] + detection.bbox[3]) / 2 / 50) * 50
-                object_id = detection.object_id or f"{detection.class_name}_{cx}_{cy}"
-                
-                position = self.position_calc.bbox_to_3d(
-                    detection.bbox,
-                    object_class=detection.class_name,
-                    object_id=object_id,
-                    hailo_distance_m=detection.distance_m
-                )
-                
+                object_ids.append(detection.object_id or f"{detection.class_name}_{cx}_{cy}")
+            
+            positions = self.position_calc.bboxes_to_3d(
+                [detection.bbox for detection in detections],
+                [detection.class_name for detection in detections],
+                object_ids=object_ids,
+                distances_m=[detection.distance_m for detection in detections]
+            )
+            
+            for detection, position in zip(detections, positions):
                 # Track closest obstacle
                 if position.distance_meters and position.distance_meters < self._closest_obstacle_distance:
                     self._closest_obstacle_distance = position.distance_meters
@@ -627,7 +633,8 @@ class SpatialAudioManager:
                     freq_map = {"critical": 1100, "warning": 880, "notice": 660}
                     # Use chirp for critical, tone for others
                     sound = "chirp" if urgency == "critical" else "tone"
-                    self._binaural_engine.play_at_nonblocking(az, el, sound=sound, duration_s=0.2)
+                    self._binaural_engine.play_at_nonblocking(az, el, sound=sound, duration_s=0.2,
+                                                              priority="safety")
                     logger.debug(f"Binaural directional alert: {alert_type} az={az:.0f}° ({urgency})")
                 except Exception as e:
                     logger.debug(f"Binaural alert fallback error: {e}")
@@ -1189,27 +1196,52 @@ class SpatialAudioManager:
         except Exception as e:
             logger.error(f"Failed to update listener orientation: {e}")
     
+    def set_head_tracker(self, tracker) -> None:
+        """
+        Attach the IMU HeadTracker: world-anchored binaural sounds are then
+        re-projected at audio block rate instead of per frame / nav tick.
+        """
+        self._head_tracker = tracker
+        if self._binaural_engine is not None and self._binaural_engine.voices is not None:
+            self._binaural_engine.voices.head = tracker
+
     def reset_reference_heading(self) -> None:
         """Reset the head-tracking reference so 'forward' recalibrates to current facing."""
         self._reference_heading = None
+        if self._head_tracker is not None:
+            self._head_tracker.reset_reference()
         logger.info("🎧 Head-tracking reference heading reset — will recapture on next IMU read")
     
     # ========== BINAURAL ENGINE (Manual HRTF — bypasses OpenAL) ==========
     
-    def enable_binaural_engine(self, gain: float = 1.0) -> bool:
+    def enable_binaural_engine(self, gain: float = 1.0, hrtf: Optional[dict] = None,
+                               voices: Optional[dict] = None) -> bool:
         """
         Enable the manual binaural HRTF engine (bypasses OpenAL).
         
         This uses ITD/ILD/head-shadow convolution via sounddevice for
         guaranteed 3D audio, independent of OpenAL-Soft's HRTF support.
+        All of its sounds (beacon pings, directional alerts, the continuous
+        tone) are voices of one BinauralMixer, rendered together per block.
         
         Once enabled, guide_beam_binaural() can be used instead of guide_beam().
         
+        Args:
+            gain: Output gain
+            hrtf: spatial_audio.hrtf config (table grid, optional SOFA file)
+            voices: spatial_audio.voices config (voice limit, envelopes)
+        
         Returns True if initialized successfully.
         """
         try:
-            from .binaural_engine import BinauralEngine
+            from .binaural_engine import BinauralEngine, configure_hrtf
+            from .binaural_mixer import get_binaural_mixer
+            if hrtf:
+                configure_hrtf(hrtf)
             self._binaural_engine = BinauralEngine(gain=gain)
+            self._binaural_engine.voices = get_binaural_mixer(voices, sr=self._binaural_engine._sr)
+            if self._binaural_engine.voices is not None and self._head_tracker is not None:
+                self._binaural_engine.voices.head = self._head_tracker
             if self._binaural_engine.start():
                 logger.info("✅ Binaural HRTF engine enabled (bypasses OpenAL)")
                 return True
@@ -1241,8 +1273,11 @@ class SpatialAudioManager:
             from .binaural_engine import compute_azimuth_elevation
             az, el = compute_azimuth_elevation(position.x, position.y, position.z)
             
-            # Apply head-tracking offset if IMU is active
-            if self._reference_heading is not None:
+            # Sensor-rate head tracking re-projects the ping every audio block;
+            # otherwise apply the last frame's head-tracking offset once
+            voices = self._binaural_engine.voices
+            world = voices is not None and voices.head is not None
+            if not world and self._reference_heading is not None:
                 delta_yaw = self._listener_orientation[0]  # Already computed in set_listener_orientation
                 az -= delta_yaw  # Shift source relative to head rotation
             
@@ -1251,6 +1286,7 @@ class SpatialAudioManager:
                 elevation_deg=el,
                 sound="chirp",
                 duration_s=0.3,
+                world=world,
             )
             return True
         except Exception as e:
@@ -1475,8 +1511,9 @@ class SpatialAudioManager:
         - Right wall → right channel only
         - Center wall → both channels
 
-        Audio is produced by SoundGenerator.play_tone_stereo() in a background
-        thread so this method returns immediately.
+        The parameters are published to the running HumOscillatorBank, which
+        glides to them in the audio callback, so this method returns
+        immediately and can be called every frame.
 
         Args:
             depth_map: 2D numpy float32 array of depth values in meters
@@ -1524,79 +1561,15 @@ class SpatialAudioManager:
                 else:  # center
                     new_params["center"] = (freq, gain, gain)
 
-        with self._hum_lock:
-            changed = new_params != self._hum_params
-            self._hum_params = new_params
-
-        if changed:
-            self._restart_hum_thread()
-
-    def _restart_hum_thread(self) -> None:
-        """Stop any running hum thread and start a new one with current params."""
-        # Signal old thread to stop
-        self._hum_stop_event.set()
-        if self._hum_thread and self._hum_thread.is_alive():
-            self._hum_thread.join(timeout=0.15)
-
-        # Reset stop event for the new thread
-        self._hum_stop_event.clear()
-
-        with self._hum_lock:
-            params_snapshot = dict(self._hum_params)
-
-        if not params_snapshot:
-            # Nothing to hum — thread exits immediately
-            return
-
-        self._hum_thread = threading.Thread(
-            target=self._hum_worker,
-            args=(params_snapshot,),
-            daemon=True,
-            name="cortex-wall-hum"
-        )
-        self._hum_thread.start()
-
-    def _hum_worker(self, params: Dict[str, Tuple[float, float, float]]) -> None:
-        """
-        Background worker: plays continuous directional hum tones until stopped.
-
-        Each region contributes a 100ms stereo tone chunk. We cycle through
-        active regions and loop until _hum_stop_event is set.
-        """
-        try:
-            from .sound_generator import SoundGenerator
-            sg = SoundGenerator()
-        except Exception as e:
-            logger.warning(f"SoundGenerator unavailable for hum worker: {e}")
-            return
-
-        CHUNK_MS = 100  # Each tone chunk length
-
-        while not self._hum_stop_event.is_set():
-            with self._hum_lock:
-                current_params = dict(self._hum_params)
-
-            if not current_params:
-                break  # No active hum regions — exit thread
-
-            for region, (freq, left_gain, right_gain) in current_params.items():
-                if self._hum_stop_event.is_set():
-                    return
-                try:
-                    sg.play_tone_stereo(
-                        left_gain=left_gain,
-                        right_gain=right_gain,
-                        frequency=freq,
-                        duration_ms=CHUNK_MS,
-                    )
-                except Exception as e:
-                    logger.debug(f"Hum playback error ({region}): {e}")
+        self._hum_params = new_params
+        if new_params and not self._hum.running:
+            self._hum.start()
+        self._hum.set_params(new_params)
 
     def stop_hum(self) -> None:
-        """Stop wall force-field hum immediately."""
-        self._hum_stop_event.set()
-        with self._hum_lock:
-            self._hum_params.clear()
+        """Stop wall force-field hum (fades out within the bank's smoothing time)."""
+        self._hum_params = {}
+        self._hum.set_params({})
 
     # ========== CONTEXT MANAGER ==========
 
@@ -1607,7 +1580,6 @@ class SpatialAudioManager:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.stop_hum()
         self.stop()
         return False
 
@@ -17,11 +17,13 @@ Author: Haziq (@IRSPlays)
 """
 
 import os
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple, Any
 from dataclasses import dataclass, field
 from pathlib import Path
 import logging
 
+import numpy as np
+
 logger = logging.getLogger("ObjectSounds")
 
 # Try to import PyOpenAL
@@ -259,7 +261,8 @@ class ObjectSoundMapper:
         self,
         assets_path: Optional[str] = None,
         custom_sounds: Optional[Dict[str, SoundProfile]] = None,
-        default_sound: str = "objects/generic.wav"
+        default_sound: str = "objects/generic.wav",
+        voices: Optional[Any] = None
     ):
         """
         Initialize the Object Sound Mapper.
@@ -268,6 +271,7 @@ class ObjectSoundMapper:
             assets_path: Path to sound assets directory
             custom_sounds: Custom sound mappings to add/override
             default_sound: Default sound for unknown objects
+            voices: BinauralMixer to play object cues on (instead of OpenAL sources)
         """
         # Determine assets path
         if assets_path:
@@ -286,8 +290,12 @@ class ObjectSoundMapper:
         
         # Audio buffer cache
         self._buffer_cache: Dict[str, Buffer] = {}
+        self._mono_cache: Dict[str, np.ndarray] = {}
+        
+        # Binaural voice mixer (object cues are its lowest-priority voices)
+        self.voices = voices
         
-        # Active sources (for cleanup)
+        # Active sources / voices (for cleanup)
         self._active_sources: List[Source] = []
         
         # Category index
@@ -359,9 +367,9 @@ class ObjectSoundMapper:
             loop: Override default loop setting
             
         Returns:
-            Audio Source if created, None otherwise
+            Audio Source (or binaural Voice) if created, None otherwise
         """
-        if not OPENAL_AVAILABLE:
+        if not OPENAL_AVAILABLE and self.voices is None:
             return None
         
         sound_file = self.get_sound(object_class)
@@ -373,6 +381,9 @@ class ObjectSoundMapper:
             sound_file=self.default_sound
         )
         
+        if self.voices is not None:
+            return self._play_voice(object_class, sound_file, profile, position, volume_override, loop)
+        
         try:
             # Load buffer (cached)
             buffer = self._load_buffer(sound_file)
@@ -402,6 +413,39 @@ class ObjectSoundMapper:
             logger.error(f"Failed to play object sound: {e}")
             return None
     
+    def _play_voice(self, object_class: str, sound_file: str, profile: SoundProfile,
+                    position: Tuple[float, float, float], volume_override: Optional[float],
+                    loop: Optional[bool]):
+        """Play an object cue as a voice of the binaural mixer."""
+        mono = self._load_mono(sound_file)
+        if mono is None:
+            return None
+        voice = self.voices.play(
+            mono,
+            position=position,
+            priority="object",
+            gain=volume_override if volume_override is not None else profile.volume,
+            loop=loop if loop is not None else profile.loop,
+            name=object_class,
+        )
+        self._active_sources.append(voice)
+        return voice
+    
+    def _load_mono(self, sound_file: str) -> Optional[np.ndarray]:
+        """Load a sound file as mono float samples at the voice mixer's rate (cached)."""
+        if sound_file in self._mono_cache:
+            return self._mono_cache[sound_file]
+        
+        try:
+            from .binaural_mixer import load_mono
+            
+            mono = load_mono(sound_file, self.voices.sr)
+            self._mono_cache[sound_file] = mono
+            return mono
+        except Exception as e:
+            logger.error(f"Failed to load audio file {sound_file}: {e}")
+            return None
+    
     def _load_buffer(self, sound_file: str) -> Optional[Buffer]:
         """Load audio buffer with caching."""
         if sound_file in self._buffer_cache:
@@ -514,13 +558,19 @@ class ObjectSoundMapper:
         Returns:
             Number of sources cleaned up
         """
-        if not OPENAL_AVAILABLE:
+        if not OPENAL_AVAILABLE and self.voices is None:
             return 0
         
         cleaned = 0
         still_active = []
         
         for source in self._active_sources:
+            if self.voices is not None:
+                if source.done:
+                    cleaned += 1
+                else:
+                    still_active.append(source)
+                continue
             try:
                 # Check if source is still playing
                 # OpenAL source state: 0=initial, 1=playing, 2=paused, 3=stopped
@@ -539,7 +589,7 @@ class ObjectSoundMapper:
         return {
             "total_mappings": len(self._sound_map),
             "categories": len(self._categories),
-            "cached_buffers": len(self._buffer_cache),
+            "cached_buffers": len(self._buffer_cache) + len(self._mono_cache),
             "active_sources": len(self._active_sources),
             "high_priority_objects": self.get_priority_objects(),
         }
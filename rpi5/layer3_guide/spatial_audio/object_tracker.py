@@ -162,18 +162,18 @@ class ObjectTracker:
         current_time = time.time()
         detected_ids = set()
         
+        # Calculate 3D positions for the whole frame at once
+        positions = self.position_calc.bboxes_to_3d(
+            [det.bbox for det in detections],
+            [det.class_name for det in detections],
+            object_ids=[det.object_id for det in detections],
+            apply_smoothing=True
+        )
+        
         # Process each detection
-        for det in detections:
+        for det, position in zip(detections, positions):
             detected_ids.add(det.object_id)
             
-            # Calculate 3D position
-            position = self.position_calc.bbox_to_3d(
-                det.bbox,
-                object_class=det.class_name,
-                object_id=det.object_id,
-                apply_smoothing=True
-            )
-            
             # Get object priority
             profile = self.sound_mapper.get_profile(det.class_name)
             priority = profile.priority if profile else 5
@@ -273,6 +273,11 @@ class ObjectTracker:
     
     def _create_source(self, obj: TrackedObject) -> bool:
         """Create an audio source for a tracked object."""
+        if self.sound_mapper.voices is not None:
+            # Rendered by the binaural voice mixer (moved / stopped like a Source)
+            obj.source = self.sound_mapper.play_object_sound(obj.object_class, obj.position.as_tuple())
+            return obj.source is not None
+        
         if not OPENAL_AVAILABLE:
             return False
         
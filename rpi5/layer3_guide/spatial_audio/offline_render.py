@@ -0,0 +1,510 @@
+"""
+Project-Cortex v2.0 - Offline Spatial Audio Render Harness
+
+Checks the spatial audio stack without earbuds or a listener. Scripted
+scenarios drive SpatialAudioManager, BinauralEngine, ProximityAlertSystem
+and AudioBeacon on a virtual clock while the audio callback is pulled
+block by block from a null / file device:
+
+- OfflineRender runs an AudioMixer without a device and a fresh
+  BinauralMixer, installed as the process-wide ones, so every component
+  starts on its normal code path (voice mixer, beacon / ambient channels)
+- VirtualClock advances one block per callback: alert / ping timing and
+  head tracking follow it, and a scenario renders faster than real time
+- Callback CPU time per block is recorded against the real-time budget
+  (the block period)
+- binaural_cues(): ITD, ILD and interaural cross-correlation (IACC) of a
+  rendered segment; lateral_angle() maps ITD back to an azimuth with the
+  HRTF table, so localization is checked numerically
+- The render can be written to WAV to listen back to or diff
+
+SCENARIOS are the scripted checks run by tests/test_spatial_render.py (CI)
+and tests/benchmark_spatial_render.py (reports, WAV files, exit status).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from ...audio_mixer import AudioMixer, set_mixer
+except ImportError:
+    from audio_mixer import AudioMixer, set_mixer
+
+from .binaural_engine import get_hrtf_table
+from .binaural_mixer import create_binaural_mixer, set_binaural_mixer
+
+logger = logging.getLogger("OfflineRender")
+
+
+class VirtualClock:
+    """Time source for components under test; advanced by the render loop, never sleeps."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@dataclass
+class BinauralCues:
+    """Interaural cues of a rendered segment."""
+    itd_us: float      # Positive: right ear leads
+    ild_db: float      # Positive: right ear louder
+    iacc: float        # Peak normalized interaural cross-correlation within +-1ms
+    level_db: float    # RMS of the louder ear (dBFS)
+
+
+@dataclass
+class Check:
+    """One pass / fail result of a scenario."""
+    name: str
+    passed: bool
+    detail: str = ""
+
+
+def binaural_cues(stereo: np.ndarray, sr: int, max_lag_ms: float = 1.0) -> BinauralCues:
+    """
+    ITD / ILD / IACC of a (frames, 2) segment.
+
+    ITD is the lag of the cross-correlation peak within +-max_lag_ms
+    (parabolic sub-sample refinement), ILD the energy ratio of the ears
+    (+-100dB when one ear is silent).
+    """
+    left = np.asarray(stereo[:, 0], dtype=np.float64)
+    right = np.asarray(stereo[:, 1], dtype=np.float64)
+    energy_l = float(np.dot(left, left))
+    energy_r = float(np.dot(right, right))
+    if energy_l <= 0.0 and energy_r <= 0.0:
+        return BinauralCues(0.0, 0.0, 0.0, -np.inf)
+    level_db = float(10 * np.log10(max(energy_l, energy_r) / len(left)))
+    if min(energy_l, energy_r) <= 1e-10 * max(energy_l, energy_r):
+        return BinauralCues(0.0, 100.0 if energy_r > energy_l else -100.0, 0.0, level_db)
+
+    nfft = 1 << int(np.ceil(np.log2(2 * len(left))))
+    xc = np.fft.irfft(np.fft.rfft(left, nfft) * np.conj(np.fft.rfft(right, nfft)), nfft)
+    max_lag = int(round(max_lag_ms * sr / 1000))
+    lags = np.arange(-max_lag, max_lag + 1)
+    values = xc[lags % nfft]                 # values[k]: left lags right by lags[k]
+    k = int(np.argmax(values))
+    lag = float(lags[k])
+    if 0 < k < len(values) - 1:
+        a, b, c = values[k - 1], values[k], values[k + 1]
+        denom = a - 2 * b + c
+        if denom != 0:
+            lag += 0.5 * (a - c) / denom
+
+    return BinauralCues(
+        itd_us=lag / sr * 1e6,
+        ild_db=float(10 * np.log10(energy_r / energy_l)),
+        iacc=float(values[k] / np.sqrt(energy_l * energy_r)),
+        level_db=level_db,
+    )
+
+
+def lateral_angle(itd_us: float, sr: int = 48000) -> float:
+    """Azimuth in [-90, 90] whose horizontal-plane table ITD matches itd_us (front / back ambiguous)."""
+    table = get_hrtf_table(sr)
+    row = int(np.argmin(np.abs(table.elevations)))
+    front = (table.azimuths >= -90) & (table.azimuths <= 90)
+    azimuths = table.azimuths[front]
+    itds = table.itd_s[front, row] * 1e6
+    order = np.argsort(itds)
+    return float(np.interp(itd_us, itds[order], azimuths[order]))
+
+
+def count_onsets(stereo: np.ndarray, sr: int, window_ms: float = 5.0, threshold_db: float = -40.0) -> int:
+    """Sounds in a segment: rising crossings of an RMS envelope threshold."""
+    n = max(1, int(sr * window_ms / 1000))
+    frames = len(stereo) // n
+    if frames == 0:
+        return 0
+    power = (np.asarray(stereo[:frames * n], dtype=np.float64) ** 2).reshape(frames, n, -1).mean(axis=(1, 2))
+    loud = 10 * np.log10(power + 1e-20) > threshold_db
+    return int(loud[0]) + int(np.count_nonzero(loud[1:] & ~loud[:-1]))
+
+
+class OfflineRender:
+    """
+    Null / file audio device on a virtual clock.
+
+    Example:
+        with OfflineRender() as render:
+            engine = BinauralEngine(sr=render.sample_rate)
+            engine.voices = render.voices
+            render.at(0.1, lambda: engine.play_at_nonblocking(60.0))
+            render.run(0.5)
+            cues = binaural_cues(render.segment(0.1, 0.4), render.sample_rate)
+            render.write_wav("ping_right.wav")
+    """
+
+    def __init__(self, sample_rate: int = 48000, blocksize: int = 480,
+                 voices: Optional[dict] = None, keep_audio: bool = True):
+        """
+        Args:
+            sample_rate: Device rate
+            blocksize: Frames per callback (the real-time budget is its period)
+            voices: spatial_audio.voices config for the BinauralMixer
+            keep_audio: Keep the rendered output (False: null device, stats only)
+        """
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.keep_audio = keep_audio
+        self.clock = VirtualClock()
+        self.mixer = AudioMixer(sample_rate=sample_rate, blocksize=blocksize)
+        self.voices = create_binaural_mixer(voices, sample_rate)
+        self.voices.clock = self.clock
+
+        self._events: List[tuple] = []     # (time, seq, action) heap
+        self._seq = 0
+        self._tickers: List[Callable[[float], object]] = []
+        self._blocks: List[np.ndarray] = []
+        self._cpu_ms: List[float] = []
+        self._previous = None
+
+    # ------------------------------------------------------------------
+    # Device
+    # ------------------------------------------------------------------
+
+    def start(self) -> "OfflineRender":
+        """Install the offline mixers as the process-wide ones."""
+        if self._previous is None:
+            self.mixer.start(offline=True)
+            self._previous = (set_mixer(self.mixer), set_binaural_mixer(self.voices))
+            self.voices.start()
+        return self
+
+    def close(self) -> None:
+        """Detach and restore the previous process-wide mixers."""
+        if self._previous is None:
+            return
+        self.voices.stop()
+        self.mixer.stop()
+        mixer, voices = self._previous
+        set_mixer(mixer)
+        set_binaural_mixer(voices)
+        self._previous = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Script
+    # ------------------------------------------------------------------
+
+    def at(self, t: float, action: Callable[[], object]) -> None:
+        """Run action at virtual time t (seconds), before the block that starts then."""
+        heapq.heappush(self._events, (t, self._seq, action))
+        self._seq += 1
+
+    def every(self, period: float, action: Callable[[float], object], start: float, end: float) -> None:
+        """Run action(t) every period seconds from start to end (inclusive)."""
+        for i in range(int(round((end - start) / period)) + 1):
+            t = start + i * period
+            self.at(t, lambda t=t: action(t))
+
+    def add_ticker(self, tick: Callable[[float], object]) -> None:
+        """Call tick(now) before every block (component timing loops: alerts, beacon pings)."""
+        self._tickers.append(tick)
+
+    def run(self, seconds: float) -> None:
+        """Render seconds of audio, firing due events and tickers before each block."""
+        frames = self.blocksize
+        period = frames / self.sample_rate
+        end = self.clock.now + seconds - 1e-9
+        while self.clock.now < end:
+            now = self.clock.now
+            while self._events and self._events[0][0] <= now + 1e-9:
+                heapq.heappop(self._events)[2]()
+            for tick in self._tickers:
+                tick(now)
+
+            start = time.thread_time()
+            block = self.mixer.mix_block(frames)
+            self._cpu_ms.append((time.thread_time() - start) * 1000)
+            if self.keep_audio:
+                self._blocks.append(block.copy())      # mix_block reuses its buffer
+            self.clock.advance(period)
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    @property
+    def audio(self) -> np.ndarray:
+        """Everything rendered so far, (frames, 2) float32."""
+        if not self._blocks:
+            return np.zeros((0, 2), dtype=np.float32)
+        if len(self._blocks) > 1:
+            self._blocks = [np.concatenate(self._blocks)]
+        return self._blocks[0]
+
+    def segment(self, start_s: float, end_s: float) -> np.ndarray:
+        """Rendered output between two virtual times."""
+        return self.audio[int(start_s * self.sample_rate):int(end_s * self.sample_rate)]
+
+    def write_wav(self, path: str) -> None:
+        """Write the render as 16-bit stereo WAV."""
+        from scipy.io import wavfile
+
+        wavfile.write(path, self.sample_rate, (np.clip(self.audio, -1.0, 1.0) * 32767).astype(np.int16))
+        logger.info(f"💾 Offline render written: {path} ({len(self.audio) / self.sample_rate:.1f}s)")
+
+    def get_stats(self) -> Dict[str, float]:
+        """Callback CPU time per block (ms) against the real-time budget."""
+        budget_ms = self.blocksize / self.sample_rate * 1000
+        stats = {"blocks": len(self._cpu_ms), "budget_ms": budget_ms}
+        if self._cpu_ms:
+            cpu = np.array(self._cpu_ms)
+            stats.update({
+                "p50_ms": float(np.percentile(cpu, 50)),
+                "p95_ms": float(np.percentile(cpu, 95)),
+                "max_ms": float(cpu.max()),
+                "load_p95": float(np.percentile(cpu, 95)) / budget_ms,
+                "overruns": int(np.count_nonzero(cpu > budget_ms)),
+                "realtime_factor": len(cpu) * budget_ms / max(float(cpu.sum()), 1e-9),
+            })
+        return stats
+
+
+# ============================================================================
+# Scenarios
+# ============================================================================
+
+def _check(checks: List[Check], name: str, passed: bool, detail: str) -> None:
+    checks.append(Check(name, bool(passed), detail))
+
+
+def engine_sweep(render: OfflineRender) -> List[Check]:
+    """BinauralEngine chirps across the horizontal plane: ITD / ILD / lateral angle per azimuth."""
+    from .binaural_engine import BinauralEngine
+
+    engine = BinauralEngine(sr=render.sample_rate)
+    engine.voices = render.voices
+    engine.start()
+    azimuths = [-90, -60, -30, 0, 30, 60, 90]
+    for i, azimuth in enumerate(azimuths):
+        render.at(0.1 + 0.4 * i, lambda azimuth=azimuth: engine.play_at_nonblocking(float(azimuth)))
+    render.run(0.1 + 0.4 * len(azimuths))
+
+    checks: List[Check] = []
+    itds = []
+    for i, azimuth in enumerate(azimuths):
+        start = 0.1 + 0.4 * i
+        cues = binaural_cues(render.segment(start, start + 0.35), render.sample_rate)
+        itds.append(cues.itd_us)
+        lateral = lateral_angle(cues.itd_us, render.sample_rate)
+        _check(checks, f"azimuth {azimuth:+d}: lateral angle", abs(lateral - azimuth) <= 15.0,
+               f"ITD {cues.itd_us:+.0f}us -> {lateral:+.0f} deg")
+        side = np.sign(azimuth)
+        _check(checks, f"azimuth {azimuth:+d}: ILD side",
+               abs(cues.ild_db) < 1.0 if side == 0 else np.sign(cues.ild_db) == side and abs(cues.ild_db) > 3.0,
+               f"ILD {cues.ild_db:+.1f}dB")
+        _check(checks, f"azimuth {azimuth:+d}: coherent", cues.iacc > 0.9, f"IACC {cues.iacc:.3f}")
+    _check(checks, "ITD monotonic in azimuth", np.all(np.diff(itds) > 0),
+           " ".join(f"{v:+.0f}" for v in itds))
+    return checks
+
+
+def proximity_approach(render: OfflineRender) -> List[Check]:
+    """Obstacle closing in from the left: silent until in range, escalating alerts from the left."""
+    from .proximity_alert import AlertLevel, ProximityAlertSystem
+
+    alerts = ProximityAlertSystem(voices=render.voices, clock=render.clock)
+    alerts.start(threaded=False)
+    render.add_ticker(alerts.tick)
+
+    def distance(t):
+        return 3.5 - 0.8 * t
+
+    render.every(0.1, lambda t: alerts.update_obstacles([{
+        "object_id": "chair_1", "object_class": "chair", "distance": distance(t),
+        "position": (-1.0, 0.0, -distance(t)),
+    }]), 0.0, 4.0)
+    render.run(4.5)
+    level = alerts.get_level()
+    alerts.stop()
+
+    sr = render.sample_rate
+    checks: List[Check] = []
+    quiet = binaural_cues(render.segment(0.0, 0.6), sr)
+    _check(checks, "silent out of range", quiet.level_db < -80, f"{quiet.level_db:.0f}dBFS")
+    cues = binaural_cues(render.segment(0.6, 4.5), sr)
+    _check(checks, "alerts from the left", cues.ild_db < -3.0 and cues.itd_us < -100,
+           f"ILD {cues.ild_db:+.1f}dB ITD {cues.itd_us:+.0f}us")
+    early, late = count_onsets(render.segment(0.0, 3.0), sr), count_onsets(render.segment(3.0, 4.5), sr)
+    _check(checks, "alert rate escalates", late > early, f"{early} sounds in 0-3s, {late} in 3-4.5s")
+    _check(checks, "reaches CRITICAL", level == AlertLevel.CRITICAL, level.name)
+    return checks
+
+
+def beacon_approach(render: OfflineRender) -> List[Check]:
+    """Walking up to a target ahead-right: pings from the right, faster when close, chime on arrival."""
+    from .audio_beacon import AudioBeacon, BeaconState
+
+    beacon = AudioBeacon(voices=render.voices, clock=render.clock)
+
+    def target(t):
+        u = t / 5.0
+        return (3.0 * (1 - u), 0.0, -6.0 + 5.6 * u)
+
+    beacon.start(target(0.0), threaded=False)
+    render.add_ticker(beacon.tick)
+    render.every(0.1, lambda t: beacon.update_position(target(t)), 0.0, 5.0)
+    render.run(5.5)
+
+    sr = render.sample_rate
+    checks: List[Check] = []
+    cues = binaural_cues(render.segment(0.0, 1.5), sr)
+    _check(checks, "far pings from the right", cues.ild_db > 2.0 and cues.itd_us > 100,
+           f"ILD {cues.ild_db:+.1f}dB ITD {cues.itd_us:+.0f}us")
+    early, late = count_onsets(render.segment(0.0, 2.0), sr), count_onsets(render.segment(4.0, 4.9), sr)
+    _check(checks, "ping rate rises when close", late > early, f"{early} pings in 0-2s, {late} in 4-4.9s")
+    _check(checks, "target reached", beacon.get_state() == BeaconState.REACHED, beacon.get_state().value)
+    chime = binaural_cues(render.segment(4.9, 5.5), sr)
+    _check(checks, "success chime ahead", chime.level_db > -40 and abs(chime.ild_db) < 1.0,
+           f"{chime.level_db:.0f}dBFS ILD {chime.ild_db:+.1f}dB")
+    beacon.stop()
+    return checks
+
+
+def manager_head_turn(render: OfflineRender) -> List[Check]:
+    """
+    SpatialAudioManager on the binaural engine: a world-anchored guide ping
+    before / after a 90 deg head turn, a directional safety alert and the
+    wall hum from a depth map.
+    """
+    from .head_tracker import HeadTracker, quaternion_from_euler
+    from .manager import SpatialAudioManager
+    from .position_calculator import Position3D
+
+    manager = SpatialAudioManager()
+    tracker = HeadTracker(clock=render.clock)
+    manager.set_head_tracker(tracker)
+    checks: List[Check] = []
+    _check(checks, "binaural engine on the voice mixer",
+           manager.enable_binaural_engine() and manager._binaural_engine.voices is render.voices, "")
+
+    def heading(t):
+        return 90.0 * float(np.clip((t - 0.5) / 0.5, 0.0, 1.0))      # Turn right between 0.5s and 1s
+
+    render.every(0.01, lambda t: tracker.push(quaternion_from_euler(heading(t)), t=t), 0.0, 3.0)
+    ahead = Position3D(x=0.0, y=0.0, z=-2.0)
+    render.at(0.1, lambda: manager.guide_beam_binaural(ahead))
+    render.at(1.2, lambda: manager.guide_beam_binaural(ahead))
+    render.at(1.6, lambda: manager.play_directional_alert((2.0, 0.0, 0.0), "wall", "critical"))
+    depth = np.full((48, 64), np.inf, dtype=np.float32)
+    depth[:, :21] = 0.5                                               # Wall close on the left
+    render.at(2.0, lambda: manager.update_from_depth(depth))
+    render.run(2.7)
+    manager.stop_hum()
+    manager._hum.stop()
+
+    sr = render.sample_rate
+    before = binaural_cues(render.segment(0.1, 0.4), sr)
+    _check(checks, "guide ping ahead before the turn", abs(before.itd_us) < 60 and abs(before.ild_db) < 1.0,
+           f"ITD {before.itd_us:+.0f}us ILD {before.ild_db:+.1f}dB")
+    after = binaural_cues(render.segment(1.2, 1.5), sr)
+    lateral = lateral_angle(after.itd_us, sr)
+    _check(checks, "guide ping stays put after turning right", lateral < -75,
+           f"ITD {after.itd_us:+.0f}us -> {lateral:+.0f} deg")
+    alert = binaural_cues(render.segment(1.6, 1.8), sr)
+    _check(checks, "safety alert on the right", alert.ild_db > 6.0 and alert.itd_us > 500,
+           f"ILD {alert.ild_db:+.1f}dB ITD {alert.itd_us:+.0f}us")
+    hum = binaural_cues(render.segment(2.3, 2.6), sr)
+    _check(checks, "wall hum in the left ear only", hum.level_db > -30 and hum.ild_db < -40,
+           f"{hum.level_db:.0f}dBFS ILD {hum.ild_db:+.0f}dB")
+    return checks
+
+
+def full_load(render: OfflineRender) -> List[Check]:
+    """
+    Every voice busy: moving object cues, world-anchored guide tone and
+    wall hum, with safety pings stealing object voices at the limit.
+    """
+    from .binaural_engine import BinauralEngine, generate_continuous_tone
+    from .head_tracker import HeadTracker, quaternion_from_euler
+    from .sound_generator import HumOscillatorBank
+
+    tracker = HeadTracker(clock=render.clock)
+    render.voices.head = tracker
+    render.every(0.01, lambda t: tracker.push(quaternion_from_euler(30.0 * np.sin(t)), t=t), 0.0, 3.0)
+
+    engine = BinauralEngine(sr=render.sample_rate)
+    engine.voices = render.voices
+    engine.start()
+    engine.start_continuous(azimuth_deg=20.0, world=True)
+
+    tone = generate_continuous_tone(1.0, 700, render.sample_rate)
+    cues = [render.voices.play(tone, priority="object", gain=0.05, loop=True, name=f"object_{i}")
+            for i in range(render.voices.max_voices)]
+
+    def move(now):
+        for i, voice in enumerate(cues):
+            voice.move(90.0 * np.sin(now + i), 10.0 * np.cos(now + i))
+
+    render.add_ticker(move)
+    render.every(0.2, lambda t: engine.play_at_nonblocking(-45.0, priority="safety", duration_s=0.15), 0.0, 3.0)
+
+    hum = HumOscillatorBank()
+    hum.start()
+    hum.set_params({"left": (120.0, 0.4, 0.0), "center": (150.0, 0.2, 0.2)})
+    render.run(3.0)
+    engine.stop_continuous()
+    hum.stop()
+
+    stats = render.voices.get_stats()
+    checks: List[Check] = []
+    _check(checks, "voice limit reached", stats["peak_voices"] >= render.voices.max_voices,
+           f"peak {stats['peak_voices']} of {render.voices.max_voices}")
+    _check(checks, "safety pings steal object voices", stats["steals"] > 0 and stats["rejections"] == 0,
+           f"{stats['steals']} steals, {stats['rejections']} rejections")
+    return checks
+
+
+SCENARIOS: Dict[str, Callable[[OfflineRender], List[Check]]] = {
+    "engine_sweep": engine_sweep,
+    "proximity_approach": proximity_approach,
+    "beacon_approach": beacon_approach,
+    "manager_head_turn": manager_head_turn,
+    "full_load": full_load,
+}
+
+
+def run_scenario(name: str, max_load: float = 0.5, wav_path: Optional[str] = None,
+                 **render_args) -> Tuple[List[Check], Dict[str, float]]:
+    """
+    Render one scenario offline.
+
+    Args:
+        name: Key of SCENARIOS
+        max_load: Budget check: p95 callback CPU time / block period
+        wav_path: Also write the render here
+        **render_args: OfflineRender arguments (sample_rate, blocksize, voices)
+
+    Returns:
+        (checks including the real-time budget check, callback timing stats)
+    """
+    with OfflineRender(**render_args) as render:
+        checks = SCENARIOS[name](render)
+        stats = render.get_stats()
+        if wav_path:
+            render.write_wav(wav_path)
+    _check(checks, "real-time budget", stats["load_p95"] <= max_load,
+           f"p95 {stats['p95_ms']:.2f}ms of {stats['budget_ms']:.1f}ms ({stats['load_p95']:.0%}, "
+           f"limit {max_load:.0%}), {stats['overruns']} overruns")
+    return checks, stats
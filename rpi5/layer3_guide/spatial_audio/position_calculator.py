@@ -9,12 +9,22 @@ Coordinate System (OpenAL):
 - Y-axis: Down (-1) to Up (+1)
 - Z-axis: Behind (+) to Front (-), User faces -Z direction
 
+A whole detection batch is converted at once (bboxes_to_3d): the bbox
+geometry, depth / known-size / area distance fallbacks and smoothing are
+array operations. Smoothing state lives in fixed-capacity arrays indexed
+by track id; tracks not seen for history_timeout_s are evicted (and the
+least recently seen one when full), so ids that flicker away cannot grow
+memory over a long walk.
+
 Author: Haziq (@IRSPlays)
 """
 
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List, Sequence
 from dataclasses import dataclass
 import math
+import time
+
+import numpy as np
 
 
 # Default known object sizes in meters (used for distance estimation)
@@ -106,7 +116,9 @@ class PositionCalculator:
         max_distance: float = 10.0,
         object_sizes: Optional[Dict[str, float]] = None,
         smoothing_alpha: float = 0.3,
-        spatial_width_meters: float = 3.0
+        spatial_width_meters: float = 3.0,
+        history_capacity: int = 128,
+        history_timeout_s: float = 2.0
     ):
         """
         Initialize the position calculator.
@@ -120,6 +132,8 @@ class PositionCalculator:
             object_sizes: Dict of object class → real-world width in meters
             smoothing_alpha: Smoothing factor for position interpolation (0-1)
             spatial_width_meters: Width of virtual sound field in meters (for HRTF)
+            history_capacity: Tracks with smoothing state at once
+            history_timeout_s: Drop a track's smoothing state after this long unseen
         """
         self.frame_width = frame_width
         self.frame_height = frame_height
@@ -130,8 +144,13 @@ class PositionCalculator:
         self.smoothing_alpha = smoothing_alpha
         self.spatial_width_meters = spatial_width_meters
         
-        # Position history for smoothing (object_id → last_position)
-        self._position_history: Dict[str, Position3D] = {}
+        # Smoothing state: fixed-capacity arrays, one slot per track id
+        self.history_timeout_s = history_timeout_s
+        self._slots: Dict[str, int] = {}                         # object_id → slot
+        self._slot_ids: List[Optional[str]] = [None] * history_capacity
+        self._history = np.zeros((history_capacity, 4))          # Smoothed x, y, z, distance (nan = none)
+        self._last_seen = np.full(history_capacity, -np.inf)
+        self.evictions = 0
         
         # Area thresholds for distance estimation (when no known size)
         self.area_close = 0.6   # Normalized area when object is close
@@ -156,92 +175,100 @@ class PositionCalculator:
             object_class: Class name for distance estimation (optional)
             object_id: Unique ID for position smoothing (optional)
             apply_smoothing: Whether to smooth position changes
+            hailo_distance_m: Depth NPU distance in meters (optional, preferred)
             
         Returns:
             Position3D with x, y, z coordinates in METERS and optional distance estimate
         """
-        x1, y1, x2, y2 = bbox
-        
-        # Normalize bbox to [0, 1] if in pixel coordinates
-        if x2 > 1.0 or y2 > 1.0:
-            x1 = x1 / self.frame_width
-            y1 = y1 / self.frame_height
-            x2 = x2 / self.frame_width
-            y2 = y2 / self.frame_height
+        return self.bboxes_to_3d(
+            [bbox],
+            [object_class],
+            object_ids=[object_id],
+            distances_m=[hailo_distance_m],
+            apply_smoothing=apply_smoothing,
+        )[0]
+    
+    def bboxes_to_3d(
+        self,
+        bboxes: Sequence[Tuple[float, float, float, float]],
+        object_classes: Optional[Sequence[Optional[str]]] = None,
+        object_ids: Optional[Sequence[Optional[str]]] = None,
+        distances_m: Optional[Sequence[Optional[float]]] = None,
+        apply_smoothing: bool = True,
+        now: Optional[float] = None
+    ) -> List[Position3D]:
+        """
+        Convert a whole detection batch to 3D audio positions (one frame).
         
-        # Calculate center point
-        center_x = (x1 + x2) / 2  # Range: 0 to 1
-        center_y = (y1 + y2) / 2  # Range: 0 to 1
+        Same mapping as bbox_to_3d, computed as array operations. Distance
+        priority per detection: depth NPU > known object size > bbox area.
         
-        # Calculate bbox dimensions
-        width = x2 - x1
-        height = y2 - y1
-        area = width * height  # Normalized area
+        Args:
+            bboxes: (x1, y1, x2, y2) per detection, pixels or normalized [0-1]
+            object_classes: Class name per detection (None = unknown)
+            object_ids: Track id per detection for smoothing (None = unsmoothed)
+            distances_m: Depth NPU distance per detection (None / <= 0 = unavailable)
+            apply_smoothing: Whether to smooth position changes
+            now: Frame time (time.monotonic()) for history staleness
+            
+        Returns:
+            Position3D per detection, in input order
+        """
+        n = len(bboxes)
+        if n == 0:
+            return []
+        b = np.asarray(bboxes, dtype=np.float64).reshape(n, 4)
+        
+        # Normalize bboxes to [0, 1] where given in pixel coordinates
+        pixels = (b[:, 2] > 1.0) | (b[:, 3] > 1.0)
+        b = np.where(pixels[:, None], b / [self.frame_width, self.frame_height,
+                                          self.frame_width, self.frame_height], b)
+        center_x = (b[:, 0] + b[:, 2]) / 2
+        center_y = (b[:, 1] + b[:, 3]) / 2
+        width = b[:, 2] - b[:, 0]
+        area = width * (b[:, 3] - b[:, 1])
         
         # === HORIZONTAL POSITION (X-axis) in METERS ===
-        # Map [0, 1] → [-spatial_width/2, +spatial_width/2] meters
-        # This creates perceivable left/right separation for HRTF
-        # 
-        # CRITICAL FOR HRTF PERCEPTION:
-        # OpenAL HRTF needs significant X displacement to be perceivable.
-        # Human ears are ~17cm apart, so sounds need to be >0.5m off-center
-        # to produce meaningful interaural time/level differences.
-        #
-        # Example: With spatial_width=5.0, objects at screen edge are 2.5m left/right
-        x_normalized = (center_x - 0.5) * 2.0  # -1 to +1
-        x = x_normalized * (self.spatial_width_meters / 2.0)  # Convert to meters
-        
-        # Apply non-linear scaling to exaggerate positions away from center
-        # This makes left/right more obvious while center remains centered
-        # Using a gentle curve: x = sign(x) * |x|^0.8 * scale
-        if abs(x) > 0.1:  # Only apply to off-center sounds
-            sign = 1 if x >= 0 else -1
-            x = sign * (abs(x) ** 0.85) * 1.3  # Boost off-center by 30%
+        # Map [0, 1] → [-spatial_width/2, +spatial_width/2] meters, then
+        # exaggerate off-center positions (|x|^0.85, +30%) so left/right is
+        # obvious through HRTF while center stays centered
+        x = (center_x - 0.5) * 2.0 * (self.spatial_width_meters / 2.0)
+        x = np.where(np.abs(x) > 0.1, np.sign(x) * np.abs(x) ** 0.85 * 1.3, x)
         
         # === VERTICAL POSITION (Y-axis) in METERS ===
-        # Map [0, 1] → [+height/2, -height/2] meters
-        # Note: Image Y increases downward, OpenAL Y increases upward
-        # Use a smaller vertical spread (1.5m) since head doesn't tilt much
-        y_normalized = (0.5 - center_y) * 2.0  # +1 (top) to -1 (bottom)
-        y = y_normalized * 1.0  # ±1.0m vertical spread (increased from 0.75)
+        # Image Y increases downward, OpenAL Y increases upward; ±1.0m spread
+        y = (0.5 - center_y) * 2.0
         
         # === DEPTH POSITION (Z-axis) in METERS ===
         # Priority: Hailo NPU depth > known object size > bbox area fallback
-        distance_meters = None
-        if hailo_distance_m is not None and hailo_distance_m > 0:
-            # Best: Hailo NPU monocular depth (fast_depth, ~3ms)
-            distance_meters = max(self.min_distance, min(self.max_distance, hailo_distance_m))
-            z = -distance_meters
-        elif object_class and object_class.lower() in self.object_sizes:
-            bbox_width_pixels = width * self.frame_width
-            distance_meters = self._estimate_distance_from_size(
-                bbox_width_pixels, 
-                object_class.lower()
-            )
-            
-            # Sanity check: if bbox area is large, the object is clearly close.
-            # The class-based formula can overestimate (e.g. hand detected as
-            # "person" with 0.5m width). Use min of class-based and area-based.
-            if area > 0.08:
-                area_distance = abs(self._area_to_depth(area))
-                distance_meters = min(distance_meters, area_distance)
-            
-            # Convert distance to Z coordinate (negative because user faces -Z)
-            z = -max(self.min_distance, min(self.max_distance, distance_meters))
-        else:
-            # Fallback: use bbox area for rough distance estimate
-            z = self._area_to_depth(area)
-            # Estimate distance from Z
-            distance_meters = abs(z)
-        
-        # Create position (all values now in METERS)
-        position = Position3D(x=x, y=y, z=z, distance_meters=distance_meters)
-        
-        # Apply smoothing if enabled and we have history
-        if apply_smoothing and object_id:
-            position = self._smooth_position(object_id, position)
-        
-        return position
+        classes = object_classes if object_classes is not None else [None] * n
+        known_width = np.array([self.object_sizes.get(c.lower(), np.nan) if c else np.nan
+                                for c in classes])
+        depth = np.array([np.nan if d is None else d for d in distances_m], dtype=np.float64) \
+            if distances_m is not None else np.full(n, np.nan)
+        
+        area_distance = -self._area_to_depth(area)
+        width_pixels = width * self.frame_width
+        with np.errstate(divide='ignore', invalid='ignore'):
+            size_distance = np.where(width_pixels > 0, known_width * self.focal_length / width_pixels,
+                                     self.max_distance)
+        size_distance = np.clip(size_distance, self.min_distance, self.max_distance)
+        # A large bbox is clearly close: the class formula can overestimate
+        # (e.g. a hand detected as "person"), so take the nearer estimate
+        size_distance = np.where(area > 0.08, np.minimum(size_distance, area_distance), size_distance)
+        size_distance = np.clip(size_distance, self.min_distance, self.max_distance)
+        
+        distance = np.where(np.isnan(known_width), area_distance, size_distance)
+        has_depth = depth > 0
+        distance = np.where(has_depth, np.clip(np.where(has_depth, depth, 0.0), self.min_distance,
+                                               self.max_distance), distance)
+        
+        positions = np.stack([x, y, -distance, distance], axis=1)
+        if apply_smoothing and object_ids is not None:
+            self._smooth_positions(object_ids, positions, time.monotonic() if now is None else now)
+        
+        return [Position3D(x=x, y=y, z=z, distance_meters=None if d != d else d)    # d != d: nan
+                for x, y, z, d in positions.tolist()]
     
     def _estimate_distance_from_size(
         self, 
@@ -280,13 +307,13 @@ class PositionCalculator:
         Larger area = closer = smaller |z|
         
         Args:
-            area: Normalized bounding box area (0 to 1)
+            area: Normalized bounding box area (0 to 1), scalar or array
             
         Returns:
             Z coordinate (negative, user faces -Z)
         """
         # Clamp area to valid range
-        area_clamped = max(self.area_far, min(self.area_close, area))
+        area_clamped = np.clip(area, self.area_far, self.area_close)
         
         # Inverse mapping: larger area → smaller distance
         # Normalize to [0, 1] where 1 = close, 0 = far
@@ -298,49 +325,102 @@ class PositionCalculator:
         # Return as negative Z (user faces -Z direction)
         return -distance
     
-    def _smooth_position(self, object_id: str, new_position: Position3D) -> Position3D:
+    def _smooth_positions(self, object_ids: Sequence[Optional[str]], positions: np.ndarray, now: float) -> None:
         """
-        Apply exponential smoothing to position changes.
+        Apply exponential smoothing to a batch of positions, in place.
         
         This prevents audio sources from "jumping" when object detection
-        has slight variations between frames.
+        has slight variations between frames. Rows without an id, or that
+        find no free history slot, are left unsmoothed. An id repeated in
+        the batch is smoothed in row order, as with per-detection calls.
         
         Args:
-            object_id: Unique identifier for the object
-            new_position: Newly calculated position
-            
-        Returns:
-            Smoothed position
+            object_ids: Track id per row (None = no smoothing)
+            positions: (N, 4) x, y, z, distance rows
+            now: Frame time for staleness
         """
-        if object_id not in self._position_history:
-            # First time seeing this object, no smoothing needed
-            self._position_history[object_id] = new_position
-            return new_position
+        # Evict tracks not seen for history_timeout_s
+        stale = np.flatnonzero(now - self._last_seen > self.history_timeout_s)
+        for slot in stale:
+            if self._slot_ids[slot] is not None:
+                self._release_slot(int(slot))
+        
+        # Rounds: the k-th occurrence of an id in the batch goes in round k,
+        # so repeats blend with the row before them instead of stale history
+        rounds: List[Tuple[List[int], List[int], List[bool]]] = []
+        occurrences: Dict[str, int] = {}
+        batch = set(object_ids)
+        for row, object_id in enumerate(object_ids):
+            if not object_id:
+                continue
+            slot = self._slots.get(object_id)
+            is_new = slot is None
+            if is_new:
+                slot = self._claim_slot(batch)
+                if slot is None:
+                    continue
+                self._slots[object_id] = slot
+                self._slot_ids[slot] = object_id
+                self._history[slot] = 0.0
+            k = occurrences.get(object_id, 0)
+            occurrences[object_id] = k + 1
+            if k == len(rounds):
+                rounds.append(([], [], []))
+            rounds[k][0].append(row)
+            rounds[k][1].append(slot)
+            rounds[k][2].append(is_new)
         
-        old_pos = self._position_history[object_id]
         alpha = self.smoothing_alpha
-        
-        # Exponential moving average
-        smoothed = Position3D(
-            x=alpha * new_position.x + (1 - alpha) * old_pos.x,
-            y=alpha * new_position.y + (1 - alpha) * old_pos.y,
-            z=alpha * new_position.z + (1 - alpha) * old_pos.z,
-            distance_meters=(
-                alpha * (new_position.distance_meters or 0) + 
-                (1 - alpha) * (old_pos.distance_meters or 0)
-            ) if new_position.distance_meters else old_pos.distance_meters
-        )
-        
-        self._position_history[object_id] = smoothed
-        return smoothed
+        for rows, slots, fresh in rounds:
+            rows, slots, fresh = np.array(rows), np.array(slots), np.array(fresh)
+            new = positions[rows]
+            old = self._history[slots]
+            smoothed = alpha * new + (1 - alpha) * old
+            # Distance: blend only when this frame has one (a missing old one counts as 0)
+            new_d, old_d = new[:, 3], old[:, 3]
+            smoothed[:, 3] = np.where(np.isnan(new_d), old_d,
+                                      alpha * new_d + (1 - alpha) * np.where(np.isnan(old_d), 0.0, old_d))
+            # First time seeing this object: no smoothing
+            smoothed[fresh] = new[fresh]
+            
+            positions[rows] = smoothed
+            self._history[slots] = smoothed
+            self._last_seen[slots] = now
+    
+    def _claim_slot(self, batch: set) -> Optional[int]:
+        """Free history slot, evicting the least recently seen track outside this batch when full."""
+        if len(self._slots) < len(self._slot_ids):
+            return self._slot_ids.index(None)
+        order = np.argsort(self._last_seen)
+        for slot in order:
+            if self._slot_ids[slot] not in batch:
+                self._release_slot(int(slot))
+                return int(slot)
+        return None
+    
+    def _release_slot(self, slot: int) -> None:
+        del self._slots[self._slot_ids[slot]]
+        self._slot_ids[slot] = None
+        self._last_seen[slot] = -np.inf
+        self.evictions += 1
+    
+    @property
+    def tracked_count(self) -> int:
+        """Tracks currently holding smoothing state."""
+        return len(self._slots)
     
     def clear_object_history(self, object_id: str) -> None:
         """Remove an object from position history (when it leaves frame)."""
-        self._position_history.pop(object_id, None)
+        slot = self._slots.pop(object_id, None)
+        if slot is not None:
+            self._slot_ids[slot] = None
+            self._last_seen[slot] = -np.inf
     
     def clear_all_history(self) -> None:
         """Clear all position history."""
-        self._position_history.clear()
+        self._slots.clear()
+        self._slot_ids = [None] * len(self._slot_ids)
+        self._last_seen.fill(-np.inf)
     
     def update_frame_size(self, width: int, height: int) -> None:
         """Update frame dimensions (e.g., if camera resolution changes)."""
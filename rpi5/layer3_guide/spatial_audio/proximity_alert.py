@@ -11,6 +11,10 @@ Alert Levels:
 - Danger: Object close (0.5-1m) - rapid beeping
 - Critical: Imminent collision (< 0.5m) - alarm
 
+Alerts play through OpenAL, or as safety-priority voices of a
+BinauralMixer when one is passed (no OpenAL needed; used by the offline
+render harness together with an injected clock and tick()).
+
 Author: Haziq (@IRSPlays)
 """
 
@@ -22,6 +26,8 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 import logging
 
+import numpy as np
+
 logger = logging.getLogger("ProximityAlert")
 
 # Try to import PyOpenAL
@@ -142,7 +148,9 @@ class ProximityAlertSystem:
         self,
         config: Optional[AlertConfig] = None,
         sound_paths: Optional[Dict[AlertLevel, str]] = None,
-        on_level_change: Optional[Callable[[AlertLevel, AlertLevel], None]] = None
+        on_level_change: Optional[Callable[[AlertLevel, AlertLevel], None]] = None,
+        voices=None,
+        clock: Callable[[], float] = time.time
     ):
         """
         Initialize the Proximity Alert System.
@@ -151,10 +159,14 @@ class ProximityAlertSystem:
             config: Alert configuration
             sound_paths: Dict mapping AlertLevel to sound file paths
             on_level_change: Callback when alert level changes (old, new)
+            voices: BinauralMixer to play alerts on instead of OpenAL (optional)
+            clock: Time source for debounce / repeat timing (virtual when offline)
         """
         self.config = config or AlertConfig()
         self.sound_paths = sound_paths or {}
         self.on_level_change = on_level_change
+        self.voices = voices
+        self._clock = clock
         
         # State
         self._current_level = AlertLevel.NONE
@@ -169,6 +181,7 @@ class ProximityAlertSystem:
         # Audio resources
         self._sound_buffers: Dict[AlertLevel, Buffer] = {}
         self._alert_source: Optional[Source] = None
+        self._alert_audio: Dict[AlertLevel, np.ndarray] = {}  # Mono samples for voices
         
         # Threading
         self._running = False
@@ -195,8 +208,14 @@ class ProximityAlertSystem:
                 except Exception as e:
                     logger.error(f"Failed to load {level.name} sound: {e}")
     
-    def start(self) -> None:
-        """Start the proximity alert system."""
+    def start(self, threaded: bool = True) -> None:
+        """
+        Start the proximity alert system.
+        
+        Args:
+            threaded: Run the alert loop thread; False when the caller
+                drives tick() itself (offline rendering)
+        """
         if self._running:
             return
         
@@ -205,8 +224,9 @@ class ProximityAlertSystem:
         self._closest_distance = float('inf')
         
         # Start alert loop
-        self._alert_thread = threading.Thread(target=self._alert_loop, daemon=True)
-        self._alert_thread.start()
+        if threaded:
+            self._alert_thread = threading.Thread(target=self._alert_loop, daemon=True)
+            self._alert_thread.start()
         
         logger.info("🚨 Proximity Alert System started")
     
@@ -274,7 +294,7 @@ class ProximityAlertSystem:
         Returns:
             Current alert level
         """
-        current_time = time.time()
+        current_time = self._clock()
         
         with self._lock:
             # Update tracked obstacles
@@ -328,7 +348,7 @@ class ProximityAlertSystem:
     
     def _update_level(self, new_level: AlertLevel) -> None:
         """Update the alert level with debouncing."""
-        current_time = time.time()
+        current_time = self._clock()
         
         # Debounce level changes (except for escalation to critical)
         if new_level != self._current_level:
@@ -362,24 +382,66 @@ class ProximityAlertSystem:
     def _alert_loop(self) -> None:
         """Background thread that plays alerts at appropriate intervals."""
         while self._running:
-            with self._lock:
-                current_level = self._current_level
-                repeat_interval = self.config.repeat_intervals.get(current_level, 1.0)
-            
-            # Play alert if needed
-            if current_level != AlertLevel.NONE:
-                current_time = time.time()
-                time_since_last = current_time - self._last_alert_time
-                
-                if time_since_last >= repeat_interval:
-                    self._play_alert(current_level)
-                    self._last_alert_time = current_time
+            self.tick()
             
             # Sleep a short interval
             time.sleep(0.05)
     
+    def tick(self, now: Optional[float] = None) -> None:
+        """
+        Play the current level's alert if its repeat interval has elapsed.
+        
+        Called by the alert thread every 50ms, or by the offline render
+        harness once per audio block on its virtual clock.
+        """
+        with self._lock:
+            current_level = self._current_level
+            repeat_interval = self.config.repeat_intervals.get(current_level, 1.0)
+        
+        if current_level == AlertLevel.NONE:
+            return
+        current_time = self._clock() if now is None else now
+        if current_time - self._last_alert_time >= repeat_interval:
+            self._play_alert(current_level)
+            self._last_alert_time = current_time
+    
+    def _direction_position(self) -> Tuple[float, float, float]:
+        """Alert position for the closest obstacle's direction."""
+        if self._closest_direction == "left":
+            return (-0.5, 0, -1.0)
+        if self._closest_direction == "right":
+            return (0.5, 0, -1.0)
+        return (0, 0, -1.0)
+    
+    def _load_alert_audio(self, level: AlertLevel) -> Optional[np.ndarray]:
+        """Alert sound for a level as mono samples at the voice mixer rate (cached)."""
+        if level in self._alert_audio:
+            return self._alert_audio[level]
+        try:
+            from .binaural_mixer import load_mono
+            from .sound_generator import get_sound_generator
+            
+            path = self.sound_paths.get(level)
+            if path and os.path.exists(path):
+                audio = load_mono(path, self.voices.sr)
+            else:
+                audio = load_mono(get_sound_generator().generate_proximity_alert(level.name.lower()),
+                                  self.voices.sr)
+        except Exception as e:
+            logger.error(f"Failed to load {level.name} alert sound: {e}")
+            return None
+        self._alert_audio[level] = audio
+        return audio
+    
     def _play_alert(self, level: AlertLevel) -> None:
         """Play the alert sound for the given level."""
+        if self.voices is not None:
+            audio = self._load_alert_audio(level)
+            if audio is not None:
+                self.voices.play(audio, position=self._direction_position(), priority="safety",
+                                 gain=self.config.volumes.get(level, 0.5), name=f"proximity_{level.name.lower()}")
+            return
+        
         if not OPENAL_AVAILABLE:
             return
         
@@ -392,12 +454,7 @@ class ProximityAlertSystem:
             volume = self.config.volumes.get(level, 0.5)
             
             # Position sound based on obstacle direction
-            if self._closest_direction == "left":
-                position = (-0.5, 0, -1.0)
-            elif self._closest_direction == "right":
-                position = (0.5, 0, -1.0)
-            else:
-                position = (0, 0, -1.0)
+            position = self._direction_position()
             
             # Create and play source
             source = Source(buffer)
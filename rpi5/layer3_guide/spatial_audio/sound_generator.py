@@ -9,6 +9,7 @@ Sound Types:
 - Proximity alerts: Escalating warning sounds
 - Object indicators: Distinct tones for different object classes
 - Feedback sounds: System status indicators
+- Wall hum: Continuously running oscillator bank driven by depth
 
 Author: Haziq (@IRSPlays)
 """
@@ -18,6 +19,7 @@ from typing import Optional, Dict, Tuple
 import io
 import logging
 import threading
+import time
 
 logger = logging.getLogger("SoundGenerator")
 
@@ -44,6 +46,8 @@ try:
 except ImportError:
     logger.warning("sounddevice not available — SoundGenerator audio output disabled")
 
+from .binaural_engine import shared_mixer
+
 
 class ProceduralSoundGenerator:
     """
@@ -524,7 +528,9 @@ class SoundGenerator:
     - generate_tone(): Returns a float32 numpy array for a pure sine tone.
     - play_tone_stereo(): Blocking stereo tone playback with per-channel gain.
 
-    Falls back gracefully if sounddevice is not installed.
+    Plays on the shared AudioMixer (hum on the ambient channel, dropoff on
+    the safety channel) when the app runs one; otherwise uses sounddevice
+    directly and falls back gracefully if it is not installed.
     """
 
     SAMPLE_RATE = 44100
@@ -590,7 +596,8 @@ class SoundGenerator:
             frequency:   Tone frequency in Hz.
             duration_ms: Duration in milliseconds.
         """
-        if not SOUNDDEVICE_AVAILABLE:
+        mixer = shared_mixer()
+        if not SOUNDDEVICE_AVAILABLE and mixer is None:
             return
 
         mono = self.generate_tone(frequency, duration_ms, gain=1.0)
@@ -599,6 +606,10 @@ class SoundGenerator:
             mono * float(right_gain),
         ])  # shape: (n_samples, 2), float32
 
+        if mixer is not None:
+            mixer.play("ambient", stereo, self.sample_rate).wait(timeout=duration_ms / 1000 + 2.0)
+            return
+
         try:
             sd.play(stereo, samplerate=self.sample_rate, blocking=True)
         except Exception as e:
@@ -613,7 +624,8 @@ class SoundGenerator:
         Runs in a dedicated daemon thread so the call is non-blocking.
         """
         def _play() -> None:
-            if not SOUNDDEVICE_AVAILABLE:
+            mixer = shared_mixer()
+            if not SOUNDDEVICE_AVAILABLE and mixer is None:
                 logger.warning("sounddevice not available — dropoff warning skipped")
                 return
 
@@ -625,6 +637,14 @@ class SoundGenerator:
                 mono = self.generate_tone(frequency=1000.0, duration_ms=100, gain=0.9)
                 stereo = np.column_stack([mono, mono])
 
+                if mixer is not None:
+                    # Chirp + 500ms silence as one safety clip: everything else
+                    # stays ducked / paused while the user registers the warning
+                    silence = np.zeros((int(self.sample_rate * 0.5), 2), dtype=np.float32)
+                    mixer.play("safety", np.concatenate([stereo, silence]), self.sample_rate,
+                               preempt=True).wait(timeout=2.0)
+                    return
+
                 # Play warning immediately (non-buffered, latency='low')
                 sd.play(stereo, samplerate=self.sample_rate, blocking=True,
                         latency="low")
@@ -644,6 +664,167 @@ class SoundGenerator:
         t.start()
 
 
+class HumOscillatorBank:
+    """
+    Continuously running wall force-field hum synthesizer.
+
+    One sine oscillator per depth region (left / center / right), each with
+    its own frequency and left/right gains. The depth stage publishes new
+    targets with set_params() as often as it likes; the audio callback
+    glides every oscillator toward them (one-pole smoothing per block,
+    linear ramps within the block, phase carried across blocks), so
+    updates never restart anything and never click.
+
+    - Lock-free: set_params() swaps in a whole new parameter block; the
+      audio thread reads that reference once per block
+    - Constant cost: three oscillators per block while any region hums,
+      nothing once all gains have faded out
+    - Plays as a source on the shared AudioMixer ambient channel (ducked
+      under safety / speech), else on its own sounddevice stream
+
+    Example:
+        hum = HumOscillatorBank()
+        hum.start()
+        hum.set_params({"left": (120.0, 0.6, 0.0)})   # region -> (freq, left, right)
+        hum.set_params({})                              # fade out
+        hum.stop()
+    """
+
+    REGIONS = ("left", "center", "right")
+    SILENCE = 1e-4    # Gain below which a faded-out bank renders nothing
+    # After a failed start(), wait this long before opening the output again (doubles per failure)
+    RETRY_S = 1.0
+    MAX_RETRY_S = 60.0
+
+    def __init__(self, sample_rate: int = 44100, smoothing_ms: float = 30.0, base_freq: float = 80.0):
+        """
+        Args:
+            sample_rate: Output rate (replaced by the mixer's rate on start())
+            smoothing_ms: Time constant of the frequency / gain glide
+            base_freq: Frequency idle oscillators rest at
+        """
+        self.sample_rate = sample_rate
+        self.smoothing_s = smoothing_ms / 1000.0
+
+        n = len(self.REGIONS)
+        # Published targets: rows = regions, columns = (freq, left_gain, right_gain)
+        self._params = np.zeros((n, 3))
+        self._params[:, 0] = base_freq
+        # Oscillator state (audio thread only)
+        self._freq = np.full(n, base_freq)
+        self._gain = np.zeros((n, 2))
+        self._phase = np.zeros(n)
+
+        self._mixer = None
+        self._stream = None
+        self._retry_s = 0.0
+        self._retry_at = 0.0
+        self.clock = time.monotonic
+        self.blocks = 0
+        self.updates = 0
+        self.start_failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._mixer is not None or self._stream is not None
+
+    def set_params(self, params: Dict[str, Tuple[float, float, float]]) -> None:
+        """
+        Publish new hum targets (any thread, never blocks).
+
+        Args:
+            params: region -> (frequency, left_gain, right_gain); regions
+                    left out fade to silence at their current pitch
+        """
+        block = self._params.copy()
+        block[:, 1:] = 0.0
+        for i, region in enumerate(self.REGIONS):
+            if region in params:
+                block[i] = params[region]
+        self._params = block      # Reference swap: the audio thread sees old or new, never half
+        self.updates += 1
+
+    def render(self, frames: int) -> Optional[np.ndarray]:
+        """Next (frames, 2) float32 block, or None while silent (audio thread)."""
+        target = self._params
+        alpha = 1.0 - np.exp(-frames / (self.smoothing_s * self.sample_rate))
+        f0, g0 = self._freq, self._gain
+        f1 = f0 + (target[:, 0] - f0) * alpha
+        g1 = g0 + (target[:, 1:] - g0) * alpha
+        self._freq, self._gain = f1, g1
+        if g0.max() < self.SILENCE and g1.max() < self.SILENCE:
+            return None
+
+        ramp = np.arange(1, frames + 1) / frames
+        freq = f0[:, None] + (f1 - f0)[:, None] * ramp
+        phase = self._phase[:, None] + 2.0 * np.pi * np.cumsum(freq, axis=1) / self.sample_rate
+        self._phase = phase[:, -1] % (2.0 * np.pi)
+        gains = g0[:, :, None] + (g1 - g0)[:, :, None] * ramp        # (regions, 2, frames)
+        self.blocks += 1
+        return np.einsum("rn,rcn->nc", np.sin(phase), gains).astype(np.float32)
+
+    def start(self) -> bool:
+        """
+        Attach to the shared AudioMixer ambient channel, else open a sounddevice stream.
+
+        Cheap to call per depth frame: after a failure it returns False
+        without retrying until the backoff (RETRY_S, doubling) has passed.
+        """
+        if self.running:
+            return True
+        if self.clock() < self._retry_at:
+            return False
+        if not self._open():
+            self.start_failures += 1
+            self._retry_s = min(max(self._retry_s * 2, self.RETRY_S), self.MAX_RETRY_S)
+            self._retry_at = self.clock() + self._retry_s
+            return False
+        self._retry_s = self._retry_at = 0.0
+        return True
+
+    def _open(self) -> bool:
+        mixer = shared_mixer()
+        if mixer is not None:
+            self.sample_rate = mixer.sample_rate
+            mixer.set_source("ambient", self.render)
+            self._mixer = mixer
+            logger.info("Wall hum oscillator bank on the audio mixer ambient channel")
+            return True
+        if not SOUNDDEVICE_AVAILABLE:
+            return False
+
+        def _callback(outdata, frames, time_info, status):
+            block = self.render(frames)
+            if block is None:
+                outdata[:] = 0
+            else:
+                np.clip(block, -1.0, 1.0, out=outdata)
+
+        try:
+            self._stream = sd.OutputStream(samplerate=self.sample_rate, channels=2, dtype='float32',
+                                           blocksize=1024, callback=_callback)
+            self._stream.start()
+        except Exception as e:
+            logger.error(f"Wall hum stream failed: {e}")
+            self._stream = None
+            return False
+        logger.info("Wall hum oscillator bank started")
+        return True
+
+    def stop(self) -> None:
+        """Detach from the output (the bank keeps its state)."""
+        if self._mixer is not None:
+            self._mixer.set_source("ambient", None)
+            self._mixer = None
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+
+
 # Global instance for easy access
 _generator_instance: Optional[ProceduralSoundGenerator] = None
 
@@ -0,0 +1,269 @@
+"""
+Layer 3: Speculative Router - Route and Prefetch on Partial Transcripts
+
+IntentRouter normally runs only after the final transcript, and the vision
+path only then grabs the camera frame, encodes it and sets up the Gemini
+request. With streaming STT the stable prefix of the transcript is known
+while the user is still speaking, so this router:
+
+1. Classifies each stable partial (IntentRouter.classify, no logging)
+2. On a CONFIDENT vision or recall prediction (an explicit keyword match,
+   not the default fallback) starts the registered prefetchers on a small
+   thread pool: frame capture + encode, LLM client warm-up, recall lookup
+3. When the final transcript arrives, resolve() re-routes it:
+   - same route + same key  -> COMMIT: handlers take the prefetched results
+   - different / no route   -> CANCEL: results are dropped (misprediction)
+
+Stats per route: hits, mispredictions, abandoned speculations and the
+latency saved (prefetch work already done when the final text arrived).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+VISION = "vision"
+RECALL = "recall"
+
+
+@dataclass
+class Speculation:
+    """One in-flight speculative route for the current utterance."""
+    route: str                          # VISION or RECALL
+    key: str                            # Layer (vision) or search object (recall)
+    text: str                           # Stable text the prediction was made on
+    routing: Dict[str, Any]             # route_with_flags() on that text
+    started: float = field(default_factory=time.perf_counter)
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    futures: Dict[str, Future] = field(default_factory=dict)
+    task_times: Dict[str, List[Optional[float]]] = field(default_factory=dict)  # name -> [start, end]
+
+
+class Prefetched:
+    """Committed prefetch results handed to the voice command handler."""
+
+    def __init__(self, speculation: Speculation):
+        self.route = speculation.route
+        self.key = speculation.key
+        self._futures = speculation.futures
+
+    def get(self, name: str, timeout: float = 5.0) -> Any:
+        """Result of a prefetcher (waits if still running), None if absent or failed."""
+        future = self._futures.get(name)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            logger.warning(f"⚠️ Prefetch '{name}' still running after {timeout}s, not used")
+        except Exception as e:
+            logger.warning(f"⚠️ Prefetch '{name}' failed: {e}")
+        return None
+
+    async def get_async(self, name: str, timeout: float = 5.0) -> Any:
+        """get() for coroutines: awaits the prefetch without blocking the event loop."""
+        future = self._futures.get(name)
+        if future is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Prefetch '{name}' still running after {timeout}s, not used")
+        except Exception as e:
+            logger.warning(f"⚠️ Prefetch '{name}' failed: {e}")
+        return None
+
+
+class SpeculativeRouter:
+    """
+    Predicts the route from stable partial transcripts and prefetches for it.
+
+    on_partial() is called from the streaming STT decoder thread; resolve()
+    from the voice command handler. Prefetchers receive the Speculation and
+    should check speculation.cancelled between expensive steps.
+    """
+
+    def __init__(
+        self,
+        router,
+        search_object_fn: Optional[Callable[[str], Optional[str]]] = None,
+        min_stable_words: int = 2,
+        max_age_s: float = 5.0,
+        max_workers: int = 2,
+    ):
+        """
+        Args:
+            router: IntentRouter instance
+            search_object_fn: text -> object name for recall queries
+                (ConversationManager.extract_search_object)
+            min_stable_words: Stable words needed before predicting
+            max_age_s: Prefetches older than this at resolve() are discarded
+                (stale camera frame)
+            max_workers: Prefetch thread pool size
+        """
+        self.router = router
+        self.search_object_fn = search_object_fn
+        self.min_stable_words = min_stable_words
+        self.max_age_s = max_age_s
+
+        self._prefetchers: Dict[str, List[Tuple[str, Callable[[Speculation], Any]]]] = {
+            VISION: [], RECALL: [],
+        }
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Prefetch")
+        self._lock = threading.Lock()
+        self._active: Optional[Speculation] = None
+
+        self.stats: Dict[str, Dict[str, float]] = {
+            route: {"started": 0, "hits": 0, "mispredictions": 0, "abandoned": 0,
+                    "stale": 0, "saved_ms": 0.0, "wasted_ms": 0.0}
+            for route in (VISION, RECALL)
+        }
+
+    def register_prefetch(self, route: str, name: str, fn: Callable[[Speculation], Any]):
+        """Run fn(speculation) on the prefetch pool whenever route is predicted."""
+        self._prefetchers[route].append((name, fn))
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+
+    def predict(self, text: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Confident (route, key, routing) for text, or None.
+
+        Only explicit keyword matches count: the default Gemini fallback and
+        navigation commands are never speculated on.
+        """
+        if self.search_object_fn:
+            search_obj = self.search_object_fn(text)
+            if search_obj:
+                return RECALL, search_obj, self.router.route_with_flags(text, quiet=True)
+        layer, reason = self.router.classify(text)
+        if reason in ("thinker", "reflex"):
+            return VISION, layer, self.router.route_with_flags(text, quiet=True)
+        return None
+
+    def on_partial(self, partial):
+        """Streaming STT callback (PartialTranscript)."""
+        if partial.revision == 1:
+            # First hypothesis of a new utterance: drop leftovers of the last one
+            self._cancel_active("abandoned")
+        if partial.is_final or len(partial.stable.split()) < self.min_stable_words:
+            return
+
+        prediction = self.predict(partial.stable)
+        with self._lock:
+            active = self._active
+        if active is not None:
+            if prediction is not None and prediction[:2] == (active.route, active.key):
+                return
+            # Stable text grew and now predicts something else
+            self._cancel_active("mispredictions")
+        if prediction is not None:
+            self._start(partial.stable, *prediction)
+
+    def _start(self, text: str, route: str, key: str, routing: Dict[str, Any]):
+        prefetchers = self._prefetchers[route]
+        if not prefetchers:
+            return
+        spec = Speculation(route=route, key=key, text=text, routing=routing)
+        for name, fn in prefetchers:
+            spec.futures[name] = self._executor.submit(self._run, spec, name, fn)
+        with self._lock:
+            self._active = spec
+        self.stats[route]["started"] += 1
+        logger.info(f"🔮 Speculating {route} ({key}) on '{text}'")
+
+    @staticmethod
+    def _run(spec: Speculation, name: str, fn: Callable[[Speculation], Any]) -> Any:
+        times = spec.task_times[name] = [time.perf_counter(), None]
+        try:
+            return None if spec.cancelled.is_set() else fn(spec)
+        finally:
+            times[1] = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Commit / cancel
+    # ------------------------------------------------------------------
+
+    def resolve(self, final_text: str) -> Optional[Prefetched]:
+        """
+        Commit the active speculation if the final transcript confirms it.
+
+        Returns:
+            Prefetched results on a hit, None otherwise (speculation cancelled)
+        """
+        with self._lock:
+            spec, self._active = self._active, None
+        if spec is None:
+            return None
+
+        now = time.perf_counter()
+        prediction = self.predict(final_text)
+        if prediction is None or prediction[:2] != (spec.route, spec.key):
+            self._cancel(spec, "mispredictions", now)
+            logger.info(f"🔮 Misprediction: speculated {spec.route} ({spec.key}), "
+                        f"final '{final_text[:60]}'")
+            return None
+        if now - spec.started > self.max_age_s:
+            self._cancel(spec, "stale", now)
+            return None
+
+        saved_ms = self._work_done_ms(spec, now)
+        stats = self.stats[spec.route]
+        stats["hits"] += 1
+        stats["saved_ms"] += saved_ms
+        logger.info(f"⚡ Speculation hit ({spec.route}): ~{saved_ms:.0f}ms of prefetch already done")
+        return Prefetched(spec)
+
+    def _cancel_active(self, reason: str):
+        with self._lock:
+            spec, self._active = self._active, None
+        if spec is not None:
+            self._cancel(spec, reason, time.perf_counter())
+
+    def _cancel(self, spec: Speculation, reason: str, now: float):
+        spec.cancelled.set()
+        for future in spec.futures.values():
+            future.cancel()
+        stats = self.stats[spec.route]
+        stats[reason] += 1
+        stats["wasted_ms"] += self._work_done_ms(spec, now)
+
+    @staticmethod
+    def _work_done_ms(spec: Speculation, now: float) -> float:
+        """
+        Prefetch work already done at `now`, i.e. what the handler no longer
+        waits for (it would otherwise run these steps one after another).
+        """
+        done = 0.0
+        for start, end in list(spec.task_times.values()):
+            if start < now:
+                done += min(end if end is not None else now, now) - start
+        return done * 1000
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-route counters plus average saved latency per hit."""
+        report = {}
+        for route, stats in self.stats.items():
+            resolved = stats["hits"] + stats["mispredictions"]
+            report[route] = {
+                **stats,
+                "hit_rate": stats["hits"] / resolved if resolved else 0.0,
+                "avg_saved_ms": stats["saved_ms"] / stats["hits"] if stats["hits"] else 0.0,
+            }
+        return report
+
+    def shutdown(self):
+        self._cancel_active("abandoned")
+        self._executor.shutdown(wait=False)
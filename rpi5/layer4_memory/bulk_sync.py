@@ -0,0 +1,448 @@
+"""
+Bulk Sync - Columnar Compressed Upload Protocol for Supabase
+
+Packs every table waiting for upload (detections, queries, system logs,
+heartbeat) into ONE compressed columnar payload per sync interval and posts
+it to a single edge function (supabase/functions/bulk-sync), which hands it to
+the idempotent ingest_bulk() SQL function.
+
+Why:
+- The old path made one PostgREST round trip per table plus one per
+  store_query/store_system_log/heartbeat, each with JSON dict rows that repeat
+  every key name. On a cellular hotspot the per-request overhead (TLS, HTTP
+  headers) dominated the actual data.
+- Columnar JSON + zlib: key names appear once per table, low-cardinality
+  strings are dictionary-encoded, floats are quantized and timestamps are
+  integer millisecond deltas from one base time. The server derives
+  created_at from those deltas (no per-row Python stamping).
+- Idempotency: the key is a hash of the payload content, so a retry after a
+  lost ACK (or after a restart that re-queues the same rows) is recognised by
+  the server and not inserted twice.
+- Adaptive interval: sync sooner when the queue backs up, back off when the
+  link is poor, the queue is empty or uploads keep failing.
+
+Payload (before zlib):
+    {"v": 1, "device_id": "...", "base_ts": 1767225600.0,
+     "tables": {"detections": {"n": 3, "cols": {
+         "class_name": {"dict": ["person", "car"], "idx": [0, 1, 0]},
+         "confidence": [0.91, 0.77, 0.88],
+         "ts": [0, 120, 250]}}}}
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+# zlib-compressed columnar JSON. Deliberately not Content-Encoding: deflate,
+# so proxies in front of the edge function pass the body through untouched.
+CONTENT_TYPE = "application/x-cortex-columnar+zlib"
+
+# Decimal places kept per float column (anything else is sent as-is)
+FLOAT_PRECISION = {
+    "confidence": 3,
+    "bbox_x1": 4, "bbox_y1": 4, "bbox_x2": 4, "bbox_y2": 4,
+    "bbox_area": 5,
+    "routing_confidence": 3,
+    "cpu_percent": 1,
+    "temperature": 1,
+    "latitude": 6, "longitude": 6,
+}
+
+# ConnectivityLevel (layer3_guide.connectivity_monitor) -> link quality factor
+LINK_QUALITY_BY_LEVEL = {4: 1.0, 3: 0.75, 2: 0.4, 1: 0.0}
+
+
+# ─── Columnar codec ────────────────────────────────────────────────
+
+def _encode_column(name: str, values: List[Any]) -> Any:
+    """Encode one column: dictionary-encode repetitive strings, quantize floats."""
+    strings = [v for v in values if isinstance(v, str)]
+    if strings and len(strings) == sum(v is not None for v in values):
+        uniques = list(dict.fromkeys(strings))
+        if len(uniques) <= max(1, len(values) // 2):
+            index = {s: i for i, s in enumerate(uniques)}
+            return {"dict": uniques, "idx": [index[v] if v is not None else -1 for v in values]}
+    places = FLOAT_PRECISION.get(name)
+    if places is not None:
+        return [round(v, places) if isinstance(v, float) else v for v in values]
+    return values
+
+
+def _decode_column(column: Any) -> List[Any]:
+    if isinstance(column, dict) and "dict" in column:
+        uniques = column["dict"]
+        return [uniques[i] if i >= 0 else None for i in column["idx"]]
+    return column
+
+
+def encode_tables(tables: Dict[str, List[Dict[str, Any]]], device_id: str) -> Dict[str, Any]:
+    """
+    Build the (uncompressed) columnar payload dict.
+
+    Each row may carry a float 'ts' (epoch seconds); it is converted to an
+    integer millisecond offset from the earliest ts in the payload.
+
+    Args:
+        tables: Table name -> list of row dicts
+        device_id: Device identifier (stored once per payload)
+
+    Returns:
+        Payload dict (see module docstring)
+    """
+    stamps = [row["ts"] for rows in tables.values() for row in rows if row.get("ts") is not None]
+    base_ts = min(stamps) if stamps else time.time()
+
+    encoded = {}
+    for table, rows in tables.items():
+        if not rows:
+            continue
+        names = list(dict.fromkeys(k for row in rows for k in row if k != "device_id"))
+        cols = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            if name == "ts":
+                values = [int(round((v - base_ts) * 1000)) if v is not None else None for v in values]
+                cols[name] = values
+            else:
+                cols[name] = _encode_column(name, values)
+        encoded[table] = {"n": len(rows), "cols": cols}
+
+    return {
+        "v": PROTOCOL_VERSION,
+        "device_id": device_id,
+        "base_ts": round(base_ts, 3),
+        "tables": encoded,
+    }
+
+
+def decode_tables(payload: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Inverse of encode_tables(): table name -> list of row dicts (ts restored)."""
+    base_ts = payload.get("base_ts", 0.0)
+    tables = {}
+    for table, block in payload.get("tables", {}).items():
+        n = block["n"]
+        columns = {name: _decode_column(col) for name, col in block["cols"].items()}
+        rows = []
+        for i in range(n):
+            row = {name: values[i] for name, values in columns.items()}
+            if row.get("ts") is not None:
+                row["ts"] = base_ts + row["ts"] / 1000.0
+            row["device_id"] = payload.get("device_id")
+            rows.append(row)
+        tables[table] = rows
+    return tables
+
+
+def idempotency_key(payload: Dict[str, Any]) -> str:
+    """Content-derived key: identical rows always produce the same key."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def compress_payload(payload: Dict[str, Any], level: int = 9) -> bytes:
+    """Serialize a payload as compact JSON and zlib-compress it."""
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), level)
+
+
+def decompress_payload(body: bytes) -> Dict[str, Any]:
+    """Inverse of compress_payload()."""
+    return json.loads(zlib.decompress(body).decode("utf-8"))
+
+
+@dataclass
+class SyncEnvelope:
+    """One payload ready to send. Retries re-send the same bytes and key."""
+    key: str
+    body: bytes
+    rows: int
+    items: List[Dict[str, Any]] = field(default_factory=list)  # upload_queue entries covered
+    raw_bytes: int = 0
+    attempts: int = 0
+
+
+def build_envelope(items: List[Dict[str, Any]], device_id: str) -> SyncEnvelope:
+    """
+    Pack upload queue entries ({'table', 'data', 'ts', ...}) into one envelope.
+
+    Args:
+        items: Upload queue entries
+        device_id: Device identifier
+
+    Returns:
+        SyncEnvelope with compressed body and idempotency key
+    """
+    tables: Dict[str, List[Dict[str, Any]]] = {}
+    for item in items:
+        row = dict(item["data"])
+        row.setdefault("ts", item.get("ts"))
+        tables.setdefault(item["table"], []).append(row)
+    payload = encode_tables(tables, device_id)
+    key = idempotency_key(payload)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return SyncEnvelope(
+        key=key,
+        body=zlib.compress(raw, 9),
+        rows=len(items),
+        items=list(items),
+        raw_bytes=len(raw),
+    )
+
+
+# ─── Adaptive interval ─────────────────────────────────────────────
+
+class AdaptiveSyncInterval:
+    """
+    Pick the next sync delay from queue depth, link quality and failures.
+
+    - Backlog at or above target_rows -> sync at min_interval
+    - Empty queue -> max_interval (nothing to do)
+    - Poor link -> longer interval (bigger batches amortize the round trip)
+    - Consecutive failures -> exponential backoff (capped at max_interval)
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 60.0,
+        min_interval: float = 10.0,
+        max_interval: float = 300.0,
+        target_rows: int = 500,
+        good_rtt_ms: float = 300.0,
+        bad_rtt_ms: float = 3000.0,
+    ):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_rows = target_rows
+        self.good_rtt_ms = good_rtt_ms
+        self.bad_rtt_ms = bad_rtt_ms
+        self.rtt_ms: Optional[float] = None
+        self.failures = 0
+
+    def record_success(self, rtt_ms: float):
+        """Update the RTT estimate (EWMA) and clear the failure streak."""
+        self.rtt_ms = rtt_ms if self.rtt_ms is None else 0.7 * self.rtt_ms + 0.3 * rtt_ms
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+
+    def link_quality(self, level: Optional[int] = None) -> float:
+        """0 (offline) .. 1 (good), from measured RTT and an optional connectivity level."""
+        quality = 1.0
+        if self.rtt_ms is not None:
+            span = max(self.bad_rtt_ms - self.good_rtt_ms, 1.0)
+            quality = 1.0 - min(max((self.rtt_ms - self.good_rtt_ms) / span, 0.0), 1.0)
+        if level is not None:
+            quality = min(quality, LINK_QUALITY_BY_LEVEL.get(int(level), 1.0))
+        return quality
+
+    def next_interval(self, queue_depth: int, level: Optional[int] = None) -> float:
+        """Seconds to wait before the next sync attempt."""
+        if queue_depth <= 0:
+            return self.max_interval
+        quality = self.link_quality(level)
+        if quality <= 0.0:
+            return self.max_interval
+        interval = self.base_interval * min(1.0, self.target_rows / queue_depth)
+        interval /= max(quality, 0.25)
+        interval *= 2 ** min(self.failures, 8)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+
+# ─── Transport ─────────────────────────────────────────────────────
+
+class BulkSyncError(Exception):
+    """Upload failed; the envelope should be retried with the same key."""
+
+
+class HTTPBulkTransport:
+    """
+    POST envelopes to the bulk-sync endpoint over one keep-alive connection.
+
+    Blocking (http.client); call from a worker thread or asyncio.to_thread().
+    Reusing the connection avoids a TLS handshake per sync on cellular links.
+    """
+
+    def __init__(self, url: str, api_key: str = "", timeout: float = 15.0):
+        """
+        Args:
+            url: Endpoint URL (e.g. https://<project>.supabase.co/functions/v1/bulk-sync)
+            api_key: Supabase anon key (sent as apikey + Bearer token)
+            timeout: Socket timeout in seconds
+        """
+        parsed = urlparse(url)
+        self.url = url
+        self.scheme = parsed.scheme or "https"
+        self.host = parsed.hostname or ""
+        self.port = parsed.port
+        self.path = parsed.path or "/"
+        self.api_key = api_key
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._conn = cls(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def send(self, envelope: SyncEnvelope, device_id: str) -> Dict[str, Any]:
+        """
+        Send one envelope.
+
+        Returns:
+            Server response dict ({"status": "ok"|"duplicate", "rows": n})
+
+        Raises:
+            BulkSyncError: on network errors or non-2xx responses
+        """
+        headers = {
+            "Content-Type": CONTENT_TYPE,
+            "Idempotency-Key": envelope.key,
+            "X-Device-Id": device_id,
+        }
+        if self.api_key:
+            headers["apikey"] = self.api_key
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        with self._lock:
+            for attempt in range(2):
+                conn = self._connection()
+                try:
+                    conn.request("POST", self.path, body=envelope.body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.HTTPException, OSError) as e:
+                    self.close()
+                    # A stale keep-alive connection fails once; retry on a fresh one
+                    if attempt == 1:
+                        raise BulkSyncError(f"bulk sync request failed: {e}") from e
+
+        if response.status >= 300:
+            raise BulkSyncError(f"bulk sync HTTP {response.status}: {data[:200]!r}")
+        try:
+            return json.loads(data.decode("utf-8")) if data else {"status": "ok"}
+        except ValueError:
+            return {"status": "ok"}
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+# ─── Local mock endpoint (tests / offline development) ─────────────
+
+class MockBulkSyncServer:
+    """
+    In-process HTTP server that behaves like the bulk-sync edge function.
+
+    Decodes payloads, deduplicates by Idempotency-Key and keeps the rows in
+    memory. Failure injection:
+        fail_next: respond 503 to the next N requests (nothing stored)
+        drop_ack_next: store the next N payloads but reset the connection
+                       before replying (simulates a lost ACK)
+
+    Usage:
+        server = MockBulkSyncServer().start()
+        transport = HTTPBulkTransport(server.url)
+        ...
+        server.stop()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.rows: Dict[str, List[Dict[str, Any]]] = {}
+        self.keys: Dict[str, int] = {}
+        self.requests = 0
+        self.duplicates = 0
+        self.bytes_received = 0
+        self.fail_next = 0
+        self.drop_ack_next = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/functions/v1/bulk-sync"
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, reply, drop = mock._handle(self.headers.get("Idempotency-Key", ""), body)
+                if drop:
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                data = json.dumps(reply).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def _handle(self, key: str, body: bytes):
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += len(body)
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                return 503, {"error": "injected failure"}, False
+            if not key:
+                return 400, {"error": "missing Idempotency-Key"}, False
+            if key in self.keys:
+                self.duplicates += 1
+                return 200, {"status": "duplicate", "rows": self.keys[key]}, False
+            try:
+                tables = decode_tables(decompress_payload(body))
+            except Exception as e:
+                return 400, {"error": f"bad payload: {e}"}, False
+            count = 0
+            for table, rows in tables.items():
+                self.rows.setdefault(table, []).extend(rows)
+                count += len(rows)
+            self.keys[key] = count
+            if self.drop_ack_next > 0:
+                self.drop_ack_next -= 1
+                return 200, {}, True
+            return 200, {"status": "ok", "rows": count}, False
+
+    def start(self) -> "MockBulkSyncServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockBulkSync", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
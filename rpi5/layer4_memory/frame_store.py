@@ -0,0 +1,523 @@
+"""
+Frame Store - Content-Addressed, Size-Capped Storage for Memory Images
+
+Replaces the write-every-frame-at-full-resolution behaviour of
+ConversationManager.save_image with a bounded, deduplicating store.
+
+Features:
+- Perceptual-hash addressing: each frame is keyed by its 64-bit dHash, and
+  near-duplicates (Hamming distance <= dedup_distance) resolve to the
+  existing entry instead of writing another file
+- Asynchronous encoding: put() returns the final path immediately, and JPEG
+  encoding plus disk writes happen on a background thread off the voice path
+- Two tiers: a small thumbnail that is kept long-term, and a full-resolution
+  JPEG capped by a byte budget and max age (LRU by last access)
+- get_jpeg(): ready-to-send JPEG bytes at a requested max side, served from
+  the pending queue, an encoded-bytes cache, the thumbnail, or the full file
+  without re-encoding when the stored size already fits
+
+Layout (root/):
+    full/<key>.jpg     Full-resolution tier (evicted first)
+    thumb/<key>.jpg    Thumbnail tier
+    frames.db          Index (key, dhash, sizes, created/last access)
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import io
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .sqlite_access import get_database
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def compute_dhash(pil_image) -> int:
+    """
+    64-bit difference hash (dHash) of an image.
+
+    The image is reduced to 9x8 grayscale and each bit records whether a pixel
+    is brighter than its right neighbour. Robust to small shifts, exposure
+    and JPEG noise, which is what separates camera near-duplicates.
+    """
+    small = pil_image.convert("L").resize((9, 8), Image.BILINEAR)
+    px = np.asarray(small, dtype=np.int16)
+    bits = (px[:, 1:] > px[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def _hamming(hashes: np.ndarray, h: int) -> np.ndarray:
+    """Hamming distance between one 64-bit hash and an array of hashes."""
+    x = np.bitwise_xor(hashes, np.uint64(h))
+    return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def _to_signed(h: int) -> int:
+    """Map an unsigned 64-bit hash into SQLite's signed INTEGER range."""
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+class FrameStore:
+    """
+    Content-addressed frame store with thumbnail + capped full-res tiers.
+
+    Usage:
+        store = FrameStore("memory_images", max_full_bytes=200 * 1024 * 1024)
+        path = store.put(pil_image)            # Returns immediately
+        jpeg = store.get_jpeg(path, max_side=512)
+    """
+
+    def __init__(
+        self,
+        root_dir: str = "memory_images",
+        max_full_bytes: int = 200 * 1024 * 1024,
+        max_full_age_days: float = 7.0,
+        max_thumb_bytes: int = 20 * 1024 * 1024,
+        thumb_size: int = 160,
+        full_max_side: int = 1280,
+        jpeg_quality: int = 80,
+        thumb_quality: int = 70,
+        dedup_distance: int = 4,
+        queue_size: int = 16,
+        bytes_cache_entries: int = 16,
+    ):
+        """
+        Initialize the frame store.
+
+        Args:
+            root_dir: Root directory (same as conversation.memory_images_dir)
+            max_full_bytes: Disk budget for the full-resolution tier
+            max_full_age_days: Full-res files older than this are evicted
+            max_thumb_bytes: Disk budget for the thumbnail tier
+            thumb_size: Thumbnail longest side (px)
+            full_max_side: Full-res frames are downscaled to this longest side
+            jpeg_quality: JPEG quality for the full-res tier
+            thumb_quality: JPEG quality for thumbnails
+            dedup_distance: Max dHash Hamming distance treated as a duplicate
+            queue_size: Max frames waiting for encoding
+            bytes_cache_entries: Encoded (key, size) results kept in memory
+        """
+        if not PIL_AVAILABLE:
+            raise ImportError("Pillow is required for FrameStore")
+
+        self.root = Path(root_dir)
+        self.full_dir = self.root / "full"
+        self.thumb_dir = self.root / "thumb"
+        self.full_dir.mkdir(parents=True, exist_ok=True)
+        self.thumb_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(self.root / "frames.db")
+        self.db = get_database(self.db_path)
+
+        self.max_full_bytes = max_full_bytes
+        self.max_full_age_s = max_full_age_days * 86400
+        self.max_thumb_bytes = max_thumb_bytes
+        self.thumb_size = thumb_size
+        self.full_max_side = full_max_side
+        self.jpeg_quality = jpeg_quality
+        self.thumb_quality = thumb_quality
+        self.dedup_distance = dedup_distance
+
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Any] = {}                     # key -> PIL image awaiting encode
+        self._keys: list = []                                  # Parallel to _hashes
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._full_bytes = 0
+        self._thumb_bytes = 0
+        self._bytes_cache: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+        self._bytes_cache_entries = bytes_cache_entries
+
+        # Stats
+        self.frames_written = 0
+        self.frames_deduped = 0
+        self.frames_dropped = 0
+        self.full_evicted = 0
+
+        self._init_db()
+        self._load_index()
+
+        self._jobs: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=queue_size)
+        self._running = True
+        self._worker = threading.Thread(target=self._worker_loop, name="FrameStore", daemon=True)
+        self._worker.start()
+
+        logger.info(
+            f"✅ FrameStore ready: {len(self._keys)} frames, "
+            f"full {self._full_bytes / 1e6:.1f}/{max_full_bytes / 1e6:.0f} MB, "
+            f"thumbs {self._thumb_bytes / 1e6:.1f} MB"
+        )
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _init_db(self):
+        self.db.transaction(self._create_schema)
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS frames (
+                key TEXT PRIMARY KEY,
+                dhash INTEGER NOT NULL,
+                width INTEGER,
+                height INTEGER,
+                full_bytes INTEGER DEFAULT 0,
+                thumb_bytes INTEGER DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_frames_access ON frames(last_access)")
+
+    def _load_index(self):
+        rows = self.db.query("SELECT key, dhash, full_bytes, thumb_bytes FROM frames")
+        self._keys = [r[0] for r in rows]
+        self._hashes = np.array([r[1] & ((1 << 64) - 1) for r in rows], dtype=np.uint64)
+        self._full_bytes = sum(r[2] or 0 for r in rows)
+        self._thumb_bytes = sum(r[3] or 0 for r in rows)
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def full_path(self, key: str) -> Path:
+        return self.full_dir / f"{key}.jpg"
+
+    def thumb_path(self, key: str) -> Path:
+        return self.thumb_dir / f"{key}.jpg"
+
+    def key_for_path(self, path: str) -> Optional[str]:
+        """Return the store key for a path produced by put(), else None."""
+        p = Path(path)
+        if p.parent.name in ("full", "thumb") and p.parent.parent == self.root:
+            return p.stem
+        return None
+
+    def put(self, pil_image) -> Optional[str]:
+        """
+        Store a frame, deduplicating against existing frames.
+
+        Only the perceptual hash is computed on the caller's thread; encoding
+        and disk writes are queued.
+
+        Args:
+            pil_image: PIL Image (RGB camera frame)
+
+        Returns:
+            Path of the full-res JPEG (may not exist on disk yet), or None
+            if the encode queue is full
+        """
+        h = compute_dhash(pil_image)
+        with self._lock:
+            if len(self._hashes):
+                dist = _hamming(self._hashes, h)
+                best = int(np.argmin(dist))
+                if dist[best] <= self.dedup_distance:
+                    key = self._keys[best]
+                    self.frames_deduped += 1
+                    logger.debug(f"[FRAMES] Near-duplicate of {key} (distance {int(dist[best])})")
+                    if key in self._pending or self.full_path(key).exists():
+                        self._touch(key)
+                        return str(self.full_path(key))
+                    # Full-res tier was evicted: refresh it from this frame
+                    self._pending[key] = pil_image
+                    return self._enqueue(key, new_entry=False)
+
+            key = f"{h:016x}"
+            self._pending[key] = pil_image
+            self._keys.append(key)
+            self._hashes = np.append(self._hashes, np.uint64(h))
+            return self._enqueue(key, new_entry=True)
+
+    def _enqueue(self, key: str, new_entry: bool) -> Optional[str]:
+        """Queue a pending key for encoding (called with self._lock held)."""
+        try:
+            self._jobs.put_nowait(key)
+        except queue.Full:
+            self._pending.pop(key, None)
+            if new_entry:
+                self._remove_key(key)
+            self.frames_dropped += 1
+            logger.warning("[FRAMES] Encode queue full, frame not stored")
+            return None
+        return str(self.full_path(key))
+
+    def _remove_key(self, key: str):
+        """Drop a key from the in-memory hash index (called with self._lock held)."""
+        if key in self._keys:
+            idx = self._keys.index(key)
+            self._keys.pop(idx)
+            self._hashes = np.delete(self._hashes, idx)
+
+    def _worker_loop(self):
+        while self._running:
+            try:
+                key = self._jobs.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if key is None:
+                break
+            try:
+                self._encode(key)
+            except Exception as e:
+                logger.error(f"[FRAMES] Failed to encode {key}: {e}")
+                with self._lock:
+                    self._pending.pop(key, None)
+
+    def _encode(self, key: str):
+        with self._lock:
+            image = self._pending.get(key)
+        if image is None:
+            return
+        image = image.convert("RGB")
+        width, height = image.size
+
+        full = image
+        if max(width, height) > self.full_max_side:
+            full = image.copy()
+            full.thumbnail((self.full_max_side, self.full_max_side), Image.BILINEAR)
+        full_path = self.full_path(key)
+        tmp = full_path.with_suffix(".tmp")
+        full.save(str(tmp), "JPEG", quality=self.jpeg_quality)
+        tmp.replace(full_path)
+
+        thumb = image.copy()
+        thumb.thumbnail((self.thumb_size, self.thumb_size), Image.BILINEAR)
+        thumb_path = self.thumb_path(key)
+        thumb.save(str(thumb_path), "JPEG", quality=self.thumb_quality)
+
+        full_bytes = full_path.stat().st_size
+        thumb_bytes = thumb_path.stat().st_size
+        now = time.time()
+
+        def upsert(conn):
+            previous = conn.execute(
+                "SELECT full_bytes, thumb_bytes FROM frames WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                """INSERT INTO frames
+                   (key, dhash, width, height, full_bytes, thumb_bytes, created_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET
+                       width = excluded.width, height = excluded.height,
+                       full_bytes = excluded.full_bytes, thumb_bytes = excluded.thumb_bytes,
+                       last_access = excluded.last_access""",
+                (key, _to_signed(int(key, 16)), full.size[0], full.size[1],
+                 full_bytes, thumb_bytes, now, now),
+            )
+            return previous
+
+        previous = self.db.transaction(upsert)
+
+        with self._lock:
+            self._pending.pop(key, None)
+            self._full_bytes += full_bytes - (previous[0] or 0 if previous else 0)
+            self._thumb_bytes += thumb_bytes - (previous[1] or 0 if previous else 0)
+        self.frames_written += 1
+        logger.info(f"[FRAMES] Stored {key}: full {full_bytes}B, thumb {thumb_bytes}B")
+        self.evict()
+
+    def _touch(self, key: str):
+        self.db.execute(
+            "UPDATE frames SET last_access = ? WHERE key = ?", (time.time(), key), wait=False
+        )
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def evict(self) -> int:
+        """
+        Enforce the age and byte budgets.
+
+        Full-res files go first (oldest access first) while the thumbnail is
+        kept. Frames whose thumbnail also falls outside the thumbnail budget
+        are removed entirely.
+
+        Returns:
+            Number of files deleted
+        """
+        deleted = 0
+        now = time.time()
+        rows = self.db.query(
+            "SELECT key, full_bytes, thumb_bytes, created_at FROM frames ORDER BY last_access ASC"
+        )
+
+        demoted, removed = [], []
+        remaining_full = {}
+        for key, full_bytes, thumb_bytes, created_at in rows:
+            too_old = full_bytes and now - created_at > self.max_full_age_s
+            if full_bytes and (too_old or self._full_bytes > self.max_full_bytes):
+                self.full_path(key).unlink(missing_ok=True)
+                demoted.append((key,))
+                with self._lock:
+                    self._full_bytes -= full_bytes
+                self.full_evicted += 1
+                deleted += 1
+                self._drop_cached(key)
+            else:
+                remaining_full[key] = full_bytes or 0
+
+        if self._thumb_bytes > self.max_thumb_bytes:
+            for key, _full, thumb_bytes, _created in rows:
+                if self._thumb_bytes <= self.max_thumb_bytes:
+                    break
+                self.full_path(key).unlink(missing_ok=True)
+                self.thumb_path(key).unlink(missing_ok=True)
+                removed.append((key,))
+                with self._lock:
+                    self._thumb_bytes -= thumb_bytes
+                    self._full_bytes -= remaining_full.get(key, 0)
+                    self._remove_key(key)
+                deleted += 1
+                self._drop_cached(key)
+
+        if demoted or removed:
+            def apply(conn):
+                conn.executemany("UPDATE frames SET full_bytes = 0 WHERE key = ?", demoted)
+                conn.executemany("DELETE FROM frames WHERE key = ?", removed)
+            self.db.transaction(apply)
+        if deleted:
+            logger.info(
+                f"[FRAMES] Evicted {deleted} files "
+                f"(full {self._full_bytes / 1e6:.1f} MB, thumbs {self._thumb_bytes / 1e6:.1f} MB)"
+            )
+        return deleted
+
+    def _drop_cached(self, key: str):
+        with self._lock:
+            for cache_key in [k for k in self._bytes_cache if k[0] == key]:
+                del self._bytes_cache[cache_key]
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    def get_jpeg(self, path: str, max_side: Optional[int] = None, quality: int = 80) -> Optional[bytes]:
+        """
+        Return JPEG bytes for a stored frame, no larger than max_side.
+
+        Works for paths returned by put() (including frames still queued for
+        encoding) and for legacy image files outside the store.
+
+        Args:
+            path: Path returned by put() or any image path
+            max_side: Longest side in pixels (None = stored resolution)
+            quality: JPEG quality when a resize is needed
+
+        Returns:
+            JPEG bytes, or None if the frame no longer exists
+        """
+        key = self.key_for_path(path)
+        size_key = max_side or 0
+        if key is not None:
+            with self._lock:
+                cached = self._bytes_cache.get((key, size_key))
+                if cached is not None:
+                    self._bytes_cache.move_to_end((key, size_key))
+                    return cached
+                pending = self._pending.get(key)
+
+            if pending is not None:
+                data = self._encode_bytes(pending, max_side, quality)
+            else:
+                data = self._read_tiered(key, max_side, quality)
+                if data is not None:
+                    self._touch(key)
+        else:
+            data = self._read_file(Path(path), max_side, quality)
+
+        if data is not None and key is not None:
+            with self._lock:
+                self._bytes_cache[(key, size_key)] = data
+                while len(self._bytes_cache) > self._bytes_cache_entries:
+                    self._bytes_cache.popitem(last=False)
+        return data
+
+    def _read_tiered(self, key: str, max_side: Optional[int], quality: int) -> Optional[bytes]:
+        full = self.full_path(key)
+        thumb = self.thumb_path(key)
+        if max_side is not None and max_side <= self.thumb_size and thumb.exists():
+            return self._read_file(thumb, max_side, quality)
+        if full.exists():
+            return self._read_file(full, max_side, quality)
+        if thumb.exists():
+            return self._read_file(thumb, max_side, quality)
+        return None
+
+    def _read_file(self, path: Path, max_side: Optional[int], quality: int) -> Optional[bytes]:
+        if not path.exists():
+            return None
+        try:
+            with Image.open(path) as img:
+                if img.format == "JPEG" and (max_side is None or max(img.size) <= max_side):
+                    return path.read_bytes()  # Already fits, no re-encode
+                return self._encode_bytes(img, max_side, quality)
+        except Exception as e:
+            logger.error(f"[FRAMES] Failed to read {path}: {e}")
+            return None
+
+    def _encode_bytes(self, image, max_side: Optional[int], quality: int) -> bytes:
+        image = image.convert("RGB")
+        if max_side is not None and max(image.size) > max_side:
+            image = image.copy()
+            image.thumbnail((max_side, max_side), Image.BILINEAR)
+        buf = io.BytesIO()
+        image.save(buf, "JPEG", quality=quality)
+        return buf.getvalue()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued frames are written. Returns True if drained."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                if not self._pending:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def close(self):
+        """Drain pending frames and stop the encoder thread."""
+        self.flush()
+        self._running = False
+        try:
+            self._jobs.put_nowait(None)
+        except queue.Full:
+            pass
+        self._worker.join(timeout=2.0)
+        if self.db is not None:
+            self.db.release()
+            self.db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store statistics for diagnostics."""
+        return {
+            "frames": len(self._keys),
+            "pending": len(self._pending),
+            "full_mb": round(self._full_bytes / 1e6, 2),
+            "thumb_mb": round(self._thumb_bytes / 1e6, 2),
+            "written": self.frames_written,
+            "deduped": self.frames_deduped,
+            "dropped": self.frames_dropped,
+            "full_evicted": self.full_evicted,
+        }
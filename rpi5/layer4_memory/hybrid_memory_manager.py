@@ -11,6 +11,8 @@ Key Features:
 - Bandwidth efficient (batch upload 100 rows at once)
 - Auto-cleanup (keep last 1000 rows locally)
 - Graceful degradation (works if Supabase down)
+- Bulk sync (optional): all tables in one compressed columnar payload per
+  interval, idempotent retries, adaptive interval (see bulk_sync.py)
 
 Author: Haziq (@IRSPlays) + AI Implementer (Claude)
 Date: January 8, 2026
@@ -25,6 +27,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from .bulk_sync import AdaptiveSyncInterval, BulkSyncError, HTTPBulkTransport, build_envelope
+from .sqlite_access import get_database
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,7 +52,13 @@ class HybridMemoryManager:
         local_db_path: str = "local_cortex.db",
         sync_interval: int = 60,
         batch_size: int = 100,
-        local_cache_size: int = 1000
+        local_cache_size: int = 1000,
+        bulk_sync: bool = False,
+        bulk_sync_url: Optional[str] = None,
+        min_sync_interval: int = 10,
+        max_sync_interval: int = 300,
+        bulk_target_rows: int = 500,
+        bulk_max_rows: int = 5000
     ):
         """
         Initialize Hybrid Memory Manager
@@ -60,6 +71,12 @@ class HybridMemoryManager:
             sync_interval: Seconds between batch uploads (default: 60)
             batch_size: Max rows per batch upload (default: 100)
             local_cache_size: Max rows to keep locally (default: 1000)
+            bulk_sync: Send all tables in one columnar payload per interval
+            bulk_sync_url: Bulk endpoint (default: <supabase_url>/functions/v1/bulk-sync)
+            min_sync_interval: Fastest adaptive interval when the queue backs up
+            max_sync_interval: Slowest adaptive interval (idle / poor link)
+            bulk_target_rows: Queue depth that triggers the fastest interval
+            bulk_max_rows: Max rows per bulk payload
         """
         logger.info("🧠 Initializing Hybrid Memory Manager...")
 
@@ -71,9 +88,11 @@ class HybridMemoryManager:
         self.batch_size = batch_size
         self.local_cache_size = local_cache_size
 
-        # Local: SQLite (hot cache)
+        # Local: SQLite (hot cache) via the shared access layer
         self.local_db_path = local_db_path
-        self.local_db = self._init_local_db()
+        self.db = get_database(local_db_path)
+        self._init_local_db()
+        self._local_db: Optional[sqlite3.Connection] = None
 
         # Cloud: Supabase (lazy initialization)
         self.supabase_client = None
@@ -85,6 +104,33 @@ class HybridMemoryManager:
         # Upload queue (for offline mode)
         self.upload_queue = []
 
+        # Bulk sync (one compressed columnar payload per interval)
+        self.bulk_sync = bulk_sync
+        self.bulk_max_rows = bulk_max_rows
+        self.link_monitor = None  # Optional ConnectivityMonitor (set by main)
+        self._bulk_transport: Optional[HTTPBulkTransport] = None
+        self._pending_envelope = None
+        self._pending_heartbeat: Optional[Dict[str, Any]] = None
+        self._sync_interval = AdaptiveSyncInterval(
+            base_interval=sync_interval,
+            min_interval=min(min_sync_interval, sync_interval),
+            max_interval=max(max_sync_interval, sync_interval),
+            target_rows=bulk_target_rows,
+        )
+        self.bulk_stats = {
+            'requests': 0,
+            'rows': 0,
+            'bytes': 0,
+            'raw_bytes': 0,
+            'duplicates': 0,
+            'failures': 0,
+            'next_interval_s': float(sync_interval),
+        }
+        if bulk_sync:
+            url = bulk_sync_url or f"{supabase_url.rstrip('/')}/functions/v1/bulk-sync"
+            if supabase_url or bulk_sync_url:
+                self._bulk_transport = HTTPBulkTransport(url, api_key=supabase_key)
+
         # Background sync worker
         self.sync_running = False
         self.sync_task = None
@@ -94,14 +140,23 @@ class HybridMemoryManager:
         logger.info(f"   Sync Interval: {sync_interval}s")
         logger.info(f"   Batch Size: {batch_size} rows")
         logger.info(f"   Local Cache: {local_cache_size} rows")
+        if bulk_sync:
+            logger.info(f"   Bulk Sync: {min_sync_interval}-{max_sync_interval}s adaptive")
+
+    @property
+    def local_db(self) -> sqlite3.Connection:
+        """Read-only connection to the local DB (diagnostics / tests)."""
+        if self._local_db is None:
+            self._local_db = self.db.connect_readonly()
+        return self._local_db
+
+    def _init_local_db(self):
+        """Initialize local SQLite database with schema (PRAGMAs come from the access layer)"""
+        self.db.transaction(self._create_schema)
+        logger.info("✅ Local SQLite database initialized")
 
-    def _init_local_db(self) -> sqlite3.Connection:
-        """Initialize local SQLite database with schema"""
-        conn = sqlite3.connect(self.local_db_path, check_same_thread=False)
-        conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL for better concurrency
-        conn.execute("PRAGMA synchronous=FULL")  # Safe for power-failure scenarios (wearable device)
-        conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
-
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
         # Create tables
         conn.execute("""
             CREATE TABLE IF NOT EXISTS detections_local (
@@ -152,25 +207,25 @@ class HybridMemoryManager:
             )
         """)
 
-        conn.commit()
-        logger.info("✅ Local SQLite database initialized")
-        return conn
+    def _supabase_ready(self) -> bool:
+        """H26: True if Supabase is enabled, re-enabling it once the cooldown has elapsed."""
+        if self.supabase_available:
+            return True
+        if self._supabase_disabled_at is not None:
+            elapsed = time.time() - self._supabase_disabled_at
+            if elapsed >= self._supabase_retry_cooldown:
+                logger.info("🔄 Supabase cooldown elapsed, retrying connection...")
+                self.supabase_available = True
+                self._supabase_backoff = 1
+                self._supabase_disabled_at = None
+                return True
+        return False
 
     async def init_supabase(self):
         """Lazy initialization of Supabase client"""
         # H26: If disabled, check if cooldown has elapsed for retry
-        if not self.supabase_available:
-            if self._supabase_disabled_at is not None:
-                elapsed = time.time() - self._supabase_disabled_at
-                if elapsed >= self._supabase_retry_cooldown:
-                    logger.info("🔄 Supabase cooldown elapsed, retrying connection...")
-                    self.supabase_available = True
-                    self._supabase_backoff = 1
-                    self._supabase_disabled_at = None
-                else:
-                    return
-            else:
-                return
+        if not self._supabase_ready():
+            return
 
         if self.supabase_client is None:
             try:
@@ -205,9 +260,8 @@ class HybridMemoryManager:
         """
         start_time = time.time()
 
-        # 1. Store locally (<10ms)
-        cursor = self.local_db.cursor()
-        cursor.execute("""
+        # 1. Store locally (<10ms, group-committed with concurrent writers)
+        result = self.db.execute("""
             INSERT INTO detections_local
             (layer, class_name, confidence, bbox_x1, bbox_y1, bbox_x2, bbox_y2,
              bbox_area, detection_mode, source, timestamp, synced)
@@ -225,46 +279,40 @@ class HybridMemoryManager:
             detection.get('source'),
             time.time()
         ))
-        self.local_db.commit()
 
         write_time = (time.time() - start_time) * 1000
         logger.debug(f"💾 Local write: {write_time:.2f}ms")
 
         # 2. Queue for cloud upload (non-blocking, capped to prevent OOM)
-        row_id = cursor.lastrowid
-        if len(self.upload_queue) < self.local_cache_size * 2:
-            self.upload_queue.append({
-                'table': 'detections',
-                'row_id': row_id,
-                'data': {**detection, 'device_id': self.device_id}
-            })
-        else:
-            logger.warning(f"Upload queue full ({len(self.upload_queue)} items), dropping oldest")
-            self.upload_queue.pop(0)
-            self.upload_queue.append({
-                'table': 'detections',
-                'row_id': row_id,
-                'data': {**detection, 'device_id': self.device_id}
-            })
+        self._enqueue('detections', {**detection, 'device_id': self.device_id}, row_id=result.lastrowid)
 
         # 3. Cleanup old local rows (keep last 1000)
         self._cleanup_old_rows()
 
+    def _enqueue(self, table: str, data: Dict[str, Any], row_id: Optional[int] = None):
+        """Append a row to the upload queue (capped; drops the oldest when full)."""
+        if len(self.upload_queue) >= self.local_cache_size * 2:
+            logger.warning(f"Upload queue full ({len(self.upload_queue)} items), dropping oldest")
+            self.upload_queue.pop(0)
+        self.upload_queue.append({
+            'table': table,
+            'row_id': row_id,
+            'ts': time.time(),
+            'data': data
+        })
+
     def _cleanup_old_rows(self):
         """Delete old synced rows to keep local cache size under limit.
         Only deletes rows that have been synced to cloud (synced=1)."""
-        cursor = self.local_db.cursor()
-        cursor.execute(f"""
+        deleted = self.db.execute("""
             DELETE FROM detections_local
             WHERE synced = 1 AND id NOT IN (
                 SELECT id FROM detections_local
                 WHERE synced = 1
                 ORDER BY id DESC
-                LIMIT {self.local_cache_size}
+                LIMIT ?
             )
-        """)
-        deleted = cursor.rowcount
-        self.local_db.commit()
+        """, (self.local_cache_size,)).rowcount
 
         if deleted > 0:
             logger.debug(f"🧹 Cleaned up {deleted} old synced rows from local DB")
@@ -273,6 +321,10 @@ class HybridMemoryManager:
         """
         Background worker: Upload queued data every sync_interval seconds
         """
+        if self.bulk_sync:
+            await self._bulk_sync_worker()
+            return
+
         logger.info(f"🔄 Background sync worker started (interval: {self.sync_interval}s)")
 
         while self.sync_running:
@@ -319,6 +371,111 @@ class HybridMemoryManager:
 
         logger.info("⏹️ Background sync worker stopped")
 
+    async def _bulk_sync_worker(self):
+        """
+        Bulk mode worker: one columnar payload per adaptive interval.
+        """
+        logger.info(f"🔄 Bulk sync worker started (adaptive {self._sync_interval.min_interval:.0f}-"
+                    f"{self._sync_interval.max_interval:.0f}s)")
+        elapsed = 0.0
+        while self.sync_running:
+            try:
+                # Re-evaluate every second so a growing backlog syncs early
+                await asyncio.sleep(1.0)
+                elapsed += 1.0
+                if elapsed < self._next_sync_interval():
+                    continue
+                elapsed = 0.0
+
+                if not self._has_bulk_work():
+                    continue
+                if self.link_monitor is not None:
+                    if getattr(self.link_monitor, 'is_offline', False):
+                        logger.info("⚠️ Offline, queueing locally")
+                        continue
+                elif not self._is_wifi_connected():
+                    logger.info("⚠️ WiFi disconnected, queueing locally")
+                    continue
+                await self.sync_now()
+            except Exception as e:
+                logger.error(f"❌ Bulk sync worker error: {e}")
+
+        logger.info("⏹️ Bulk sync worker stopped")
+
+    def _next_sync_interval(self) -> float:
+        level = getattr(self.link_monitor, 'level', None)
+        depth = len(self.upload_queue) + (1 if self._pending_heartbeat else 0)
+        interval = self._sync_interval.next_interval(depth, level)
+        self.bulk_stats['next_interval_s'] = round(interval, 1)
+        return interval
+
+    def _has_bulk_work(self) -> bool:
+        return bool(self._pending_envelope or self.upload_queue or self._pending_heartbeat)
+
+    async def sync_now(self) -> bool:
+        """
+        Send one bulk payload (all queued tables) right now.
+
+        A failed payload is kept and re-sent unchanged (same idempotency key)
+        on the next call, so rows are never inserted twice.
+
+        Returns:
+            True if the payload was acknowledged (or there was nothing to send)
+        """
+        if self._bulk_transport is None or not self._supabase_ready():
+            return False
+
+        envelope = self._pending_envelope
+        if envelope is None:
+            items = self.upload_queue[:self.bulk_max_rows]
+            heartbeat = self._pending_heartbeat
+            if heartbeat:
+                items = items + [{'table': 'heartbeats', 'row_id': None,
+                                  'ts': heartbeat['ts'], 'data': heartbeat['data']}]
+            if not items:
+                return True
+            envelope = build_envelope(items, self.device_id)
+            self._pending_envelope = envelope
+
+        envelope.attempts += 1
+        start_time = time.time()
+        try:
+            reply = await asyncio.to_thread(self._bulk_transport.send, envelope, self.device_id)
+        except BulkSyncError as e:
+            self._sync_interval.record_failure()
+            self.bulk_stats['failures'] += 1
+            logger.error(f"❌ Bulk sync failed (attempt {envelope.attempts}): {e}")
+            self._handle_supabase_failure()
+            return False
+        rtt_ms = (time.time() - start_time) * 1000
+        self._sync_interval.record_success(rtt_ms)
+        self._supabase_backoff = 1
+
+        # Acknowledged: drop exactly the covered entries from the queue
+        sent = {id(item) for item in envelope.items}
+        self.upload_queue = [item for item in self.upload_queue if id(item) not in sent]
+        heartbeat = self._pending_heartbeat
+        if heartbeat and any(item['data'] is heartbeat['data'] for item in envelope.items):
+            self._pending_heartbeat = None
+        self._pending_envelope = None
+        try:
+            self._mark_as_synced([item for item in envelope.items if item.get('table') == 'detections'])
+        except Exception as mark_err:
+            logger.error(f"Failed to mark batch as synced: {mark_err}. Rows may re-upload.")
+
+        duplicate = reply.get('status') == 'duplicate'
+        self.bulk_stats['requests'] += 1
+        self.bulk_stats['rows'] += envelope.rows
+        self.bulk_stats['bytes'] += len(envelope.body)
+        self.bulk_stats['raw_bytes'] += envelope.raw_bytes
+        self.bulk_stats['duplicates'] += int(duplicate)
+        logger.info(
+            f"✅ Bulk synced {envelope.rows} rows in {len(envelope.body)}B "
+            f"({len(envelope.body) / max(envelope.rows, 1):.1f} B/row, {rtt_ms:.0f}ms"
+            f"{', duplicate' if duplicate else ''}), queue {len(self.upload_queue)}"
+        )
+        return True
+
     async def _upload_batch(self, batch: List[Dict[str, Any]]):
         """
         Upload batch of detections to Supabase with timeout and backoff.
@@ -361,19 +518,15 @@ class HybridMemoryManager:
         Args:
             batch: List of detection dicts with row_id
         """
-        cursor = self.local_db.cursor()
-
         row_ids = [item.get('row_id') for item in batch if item.get('row_id') is not None]
         if row_ids:
             placeholders = ','.join('?' * len(row_ids))
-            cursor.execute(f"""
+            self.db.execute(f"""
                 UPDATE detections_local
                 SET synced = 1
                 WHERE id IN ({placeholders})
             """, row_ids)
 
-        self.local_db.commit()
-
     def _is_wifi_connected(self) -> bool:
         """
         Check if WiFi/network is actually connected.
@@ -456,6 +609,20 @@ class HybridMemoryManager:
             response_latency_ms: End-to-end latency in ms
             tier_used: Which tier was used ('local', 'gemini_live', etc.)
         """
+        if self.bulk_sync:
+            # Rides along with the next bulk payload (no round trip)
+            self._enqueue('queries', {
+                'user_query': user_query,
+                'transcribed_text': transcribed_text,
+                'routed_layer': routed_layer,
+                'routing_confidence': routing_confidence,
+                'detection_mode': detection_mode,
+                'ai_response': ai_response,
+                'response_latency_ms': response_latency_ms,
+                'tier_used': tier_used,
+            })
+            return
+
         if not self.supabase_client:
             await self.init_supabase()
         if not self.supabase_client:
@@ -499,6 +666,20 @@ class HybridMemoryManager:
             memory_mb: Memory usage in MB
             error_trace: Error stack trace (if applicable)
         """
+        if self.bulk_sync:
+            self._enqueue('system_logs', {
+                'level': level,
+                'component': component,
+                'message': message,
+                'latency_ms': latency_ms,
+                'cpu_percent': cpu_percent,
+                'memory_mb': memory_mb,
+                'error_trace': error_trace,
+            })
+            if level == 'ERROR':
+                logger.error(f"📝 ERROR logged: {component} - {message}")
+            return
+
         if not self.supabase_client:
             await self.init_supabase()
         if not self.supabase_client:
@@ -535,6 +716,21 @@ class HybridMemoryManager:
         """
         Update device heartbeat in Supabase (graceful degradation)
         """
+        if self.bulk_sync:
+            # Only the latest heartbeat matters: replace, don't queue
+            self._pending_heartbeat = {'ts': time.time(), 'data': {
+                'device_name': device_name,
+                'battery_percent': battery_percent,
+                'cpu_percent': cpu_percent,
+                'memory_mb': memory_mb,
+                'temperature': temperature,
+                'active_layers': active_layers,
+                'current_mode': current_mode,
+                'latitude': latitude,
+                'longitude': longitude,
+            }}
+            return
+
         # Guard clause: Skip if Supabase is disabled
         if not self.supabase_available:
             logger.debug("⏭️ Heartbeat skipped: Supabase disabled")
@@ -622,13 +818,11 @@ class HybridMemoryManager:
             query_type: Optional query type (e.g., 'analysis_ocr')
         """
         try:
-            cursor = self.local_db.cursor()
-            cursor.execute("""
+            self.db.execute("""
                 INSERT INTO conversations_local
                 (session_id, role, content, query_type, timestamp)
                 VALUES (?, ?, ?, ?, ?)
             """, (session_id, role, content, query_type, time.time()))
-            self.local_db.commit()
             logger.debug(f"💬 Conversation turn stored: {role} ({len(content)} chars)")
         except Exception as e:
             logger.error(f"❌ Failed to store conversation turn: {e}")
@@ -644,15 +838,13 @@ class HybridMemoryManager:
             List of turn dicts with role, content, query_type, timestamp
         """
         try:
-            cursor = self.local_db.cursor()
-            cursor.execute("""
+            rows = self.db.query("""
                 SELECT role, content, query_type, timestamp
                 FROM conversations_local
                 WHERE session_id = ?
                 ORDER BY timestamp ASC
             """, (session_id,))
             
-            rows = cursor.fetchall()
             return [
                 {
                     'role': row[0],
@@ -674,15 +866,13 @@ class HybridMemoryManager:
             Dict with 'session_id' and 'last_timestamp', or None
         """
         try:
-            cursor = self.local_db.cursor()
-            cursor.execute("""
+            row = self.db.query_one("""
                 SELECT session_id, MAX(timestamp) as last_ts
                 FROM conversations_local
                 GROUP BY session_id
                 ORDER BY last_ts DESC
                 LIMIT 1
             """)
-            row = cursor.fetchone()
             if row and row[0]:
                 return {
                     'session_id': row[0],
@@ -702,13 +892,11 @@ class HybridMemoryManager:
             value: Profile value
         """
         try:
-            cursor = self.local_db.cursor()
-            cursor.execute("""
+            self.db.execute("""
                 INSERT INTO user_profile (key, value, updated_at)
                 VALUES (?, ?, ?)
                 ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = ?
             """, (key, value, time.time(), value, time.time()))
-            self.local_db.commit()
             logger.info(f"👤 User profile updated: {key} = '{value}'")
         except Exception as e:
             logger.error(f"❌ Failed to store user profile: {e}")
@@ -721,9 +909,7 @@ class HybridMemoryManager:
             Dict of profile facts
         """
         try:
-            cursor = self.local_db.cursor()
-            cursor.execute("SELECT key, value FROM user_profile")
-            rows = cursor.fetchall()
+            rows = self.db.query("SELECT key, value FROM user_profile")
             return {row[0]: row[1] for row in rows}
         except Exception as e:
             logger.error(f"❌ Failed to get user profile: {e}")
@@ -738,13 +924,10 @@ class HybridMemoryManager:
         """
         cutoff = time.time() - (days * 86400)
         try:
-            cursor = self.local_db.cursor()
-            cursor.execute(
+            deleted = self.db.execute(
                 "DELETE FROM conversations_local WHERE timestamp < ?",
                 (cutoff,)
-            )
-            deleted = cursor.rowcount
-            self.local_db.commit()
+            ).rowcount
             if deleted > 0:
                 logger.info(f"🧹 Cleaned up {deleted} conversation turns older than {days} days")
         except Exception as e:
@@ -779,10 +962,17 @@ class HybridMemoryManager:
             except Exception as e:
                 logger.warning(f"⚠️ Error releasing Supabase client: {e}")
 
-        # Close local DB
-        if self.local_db:
-            self.local_db.close()
-            logger.info("✅ Local DB closed")
+        if self._bulk_transport:
+            self._bulk_transport.close()
+
+        # Release local DB (closed once every component sharing it has released)
+        if self.db:
+            if self._local_db is not None:
+                self._local_db.close()
+                self._local_db = None
+            self.db.release()
+            self.db = None
+            logger.info("✅ Local DB released")
 
         logger.info("✅ Hybrid Memory Manager cleaned up")
 
@@ -793,17 +983,12 @@ class HybridMemoryManager:
         Returns:
             Dict with stats: local_rows, queue_size, etc.
         """
-        cursor = self.local_db.cursor()
-
-        # Local DB stats
-        cursor.execute("SELECT COUNT(*) FROM detections_local")
-        local_rows = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM detections_local WHERE synced = 0")
-        unsynced_rows = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM detections_local WHERE synced = 1")
-        synced_rows = cursor.fetchone()[0]
+        # Local DB stats (single pass over the table)
+        row = self.db.query_one("""
+            SELECT COUNT(*), COALESCE(SUM(synced = 0), 0), COALESCE(SUM(synced = 1), 0)
+            FROM detections_local
+        """)
+        local_rows, unsynced_rows, synced_rows = row[0], row[1], row[2]
 
         return {
             'device_id': self.device_id,
@@ -812,9 +997,20 @@ class HybridMemoryManager:
             'synced_rows': synced_rows,
             'upload_queue_size': len(self.upload_queue),
             'sync_running': self.sync_running,
-            'local_db_path': self.local_db_path
+            'local_db_path': self.local_db_path,
+            'bulk_sync': self.get_bulk_sync_stats() if self.bulk_sync else None
         }
 
+    def get_bulk_sync_stats(self) -> Dict[str, Any]:
+        """Bulk sync efficiency: requests, bytes per row, compression ratio."""
+        stats = dict(self.bulk_stats)
+        rows = max(stats['rows'], 1)
+        stats['bytes_per_row'] = round(stats['bytes'] / rows, 1)
+        stats['rows_per_request'] = round(stats['rows'] / max(stats['requests'], 1), 1)
+        stats['compression_ratio'] = round(stats['raw_bytes'] / max(stats['bytes'], 1), 2)
+        stats['pending_retry'] = self._pending_envelope is not None
+        return stats
+
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,566 @@
+"""
+Sighting Index - Spatio-Temporal Object Memory for Offline Recall
+
+Records where and when each detected object class was seen so recall
+questions ("where is my wallet?") can be answered locally in milliseconds
+instead of with a Gemini round trip:
+
+    "You last saw your wallet 4 minutes ago, to your left."
+
+Per-frame detections are merged into tracks (same class seen again within
+track_gap_s extends the open track), so the index grows with sightings, not
+with frames. Each track stores:
+- class, start/end time, confidence, frame count
+- GPS position (last known fix) and a coarse place tag (e.g. "indoor")
+- IMU heading at the time and the object's bearing relative to the camera
+- distance (from Hailo depth when available) and a frame reference
+
+Storage (SQLite, shared local DB):
+- sightings          Track rows
+- idx_sightings_recall  Covering index (class_name, end_ts DESC, ...) so
+                     "last N sightings of X" never touches the table
+- sightings_rtree    R*Tree over (time, lat, lon) for "near here" and time
+                     range queries
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sqlite_access import get_database
+
+logger = logging.getLogger(__name__)
+
+# Metres per degree of latitude (WGS84 mean)
+METERS_PER_DEG_LAT = 111_320.0
+
+# Detection class aliases so spoken names match COCO/YOLOE labels
+CLASS_ALIASES = {
+    "phone": "cell phone",
+    "mobile": "cell phone",
+    "mobile phone": "cell phone",
+    "bag": "handbag",
+    "glasses": "eyeglasses",
+    "spectacles": "eyeglasses",
+    "laptop computer": "laptop",
+    "remote control": "remote",
+    "mug": "cup",
+    "water bottle": "bottle",
+}
+
+
+@dataclass
+class Sighting:
+    """One tracked sighting of an object class."""
+    id: int
+    class_name: str
+    start_ts: float
+    end_ts: float
+    bearing_deg: Optional[float]     # Relative to camera centre (-left / +right)
+    heading_deg: Optional[float]     # IMU compass heading when last seen
+    distance_m: Optional[float]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    place: Optional[str]
+    confidence: float
+    frame_ref: Optional[str]
+    frames: int = 1
+
+    @property
+    def absolute_bearing(self) -> Optional[float]:
+        """Compass bearing to the object (heading + relative bearing)."""
+        if self.heading_deg is None or self.bearing_deg is None:
+            return None
+        return (self.heading_deg + self.bearing_deg) % 360.0
+
+
+def _angle_diff(a: float, b: float) -> float:
+    """Signed smallest difference a - b in degrees (-180..180)."""
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    r = 6_371_000.0
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * r * math.asin(math.sqrt(a))
+
+
+def _strip_determiner(name: str) -> str:
+    name = name.lower().strip()
+    for prefix in ("my ", "the ", "a ", "an ", "our "):
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+
+def normalize_object_name(name: str) -> str:
+    """Map a spoken object name to the detector's class label."""
+    name = _strip_determiner(name)
+    if name in CLASS_ALIASES:
+        return CLASS_ALIASES[name]
+    if name.endswith("s") and not name.endswith("ss") and name not in ("keys", "glasses"):
+        singular = name[:-1]
+        return CLASS_ALIASES.get(singular, singular)
+    return name
+
+
+class SightingIndex:
+    """
+    Track-level object sighting index backed by SQLite R*Tree.
+
+    Usage:
+        index = SightingIndex(db_path="local_cortex.db")
+        index.record(detections, frame_shape, gps_fix=fix, heading=imu.heading)
+        answer = index.answer_recall("wallet", current_heading=imu.heading)
+    """
+
+    def __init__(
+        self,
+        db_path: str = "local_cortex.db",
+        hfov_deg: float = 102.0,
+        track_gap_s: float = 3.0,
+        flush_interval_s: float = 1.0,
+        min_confidence: float = 0.4,
+        max_answer_age_s: float = 6 * 3600,
+        ambiguity_window_s: float = 120.0,
+        ambiguity_bearing_deg: float = 90.0,
+        ambiguity_distance_m: float = 30.0,
+    ):
+        """
+        Initialize the sighting index.
+
+        Args:
+            db_path: SQLite database path (shared local DB)
+            hfov_deg: Camera horizontal field of view (IMX708 Wide = 102°)
+            track_gap_s: A class unseen for this long closes its track
+            flush_interval_s: Min seconds between SQLite writes
+            min_confidence: Ignore detections below this confidence
+            max_answer_age_s: Sightings older than this defer to Gemini
+            ambiguity_window_s: Sightings this close in time to the latest
+                must agree on direction/location for a local answer
+            ambiguity_bearing_deg: Max compass disagreement within the window
+            ambiguity_distance_m: Max GPS disagreement within the window
+        """
+        self.db_path = db_path
+        self.db = get_database(db_path)
+        self.hfov_deg = hfov_deg
+        self.track_gap_s = track_gap_s
+        self.flush_interval_s = flush_interval_s
+        self.min_confidence = min_confidence
+        self.max_answer_age_s = max_answer_age_s
+        self.ambiguity_window_s = ambiguity_window_s
+        self.ambiguity_bearing_deg = ambiguity_bearing_deg
+        self.ambiguity_distance_m = ambiguity_distance_m
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Serializes flushes (main loop vs voice thread)
+        self._open_tracks: Dict[str, Dict[str, Any]] = {}   # class -> track dict
+        self._dirty: Dict[str, Dict[str, Any]] = {}         # class -> track awaiting write
+        self._last_flush = 0.0
+        self.has_rtree = True
+
+        # Stats
+        self.tracks_written = 0
+        self.local_answers = 0
+        self.deferred_answers = 0
+
+        self._init_db()
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def _init_db(self):
+        self.db.transaction(self._create_schema)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sightings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                class_name TEXT NOT NULL,
+                start_ts REAL NOT NULL,
+                end_ts REAL NOT NULL,
+                bearing_deg REAL,
+                heading_deg REAL,
+                distance_m REAL,
+                latitude REAL,
+                longitude REAL,
+                place TEXT,
+                confidence REAL NOT NULL,
+                frame_ref TEXT,
+                frames INTEGER DEFAULT 1
+            )
+        """)
+        # Covering index: recall queries are answered from the index alone
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sightings_recall
+            ON sightings(class_name, end_ts DESC, start_ts, bearing_deg, heading_deg,
+                         distance_m, latitude, longitude, place, confidence,
+                         frame_ref, frames)
+        """)
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS sightings_rtree USING rtree(
+                    id, min_ts, max_ts, min_lat, max_lat, min_lon, max_lon
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite built without R*Tree — fall back to plain range scans
+            logger.warning(f"⚠️ SQLite R*Tree unavailable ({e}), using B-tree index")
+            self.has_rtree = False
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sightings_geo
+                ON sightings(latitude, longitude, end_ts)
+            """)
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        detections: List[Dict[str, Any]],
+        frame_shape: Tuple[int, ...],
+        gps_fix: Any = None,
+        heading: Optional[float] = None,
+        place: Optional[str] = None,
+        frame_ref: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """
+        Merge one frame's detections into tracks.
+
+        Cheap enough for the main loop: only in-memory dict updates, plus a
+        batched SQLite write at most once per flush_interval_s.
+
+        Args:
+            detections: Detection dicts ('class', 'confidence', 'bbox', optional 'distance_m')
+            frame_shape: (height, width, ...) of the frame the bboxes refer to
+            gps_fix: GPSFix-like object with latitude/longitude (or None)
+            heading: IMU compass heading in degrees (or None)
+            place: Coarse place tag (e.g. "indoor"/"outdoor")
+            frame_ref: Saved frame path, if one exists for this frame
+            timestamp: Frame time (default: now)
+
+        Returns:
+            Number of detections merged
+        """
+        now = timestamp or time.time()
+        width = frame_shape[1] if len(frame_shape) > 1 else 0
+        lat = lon = None
+        if gps_fix is not None and (gps_fix.latitude or gps_fix.longitude):
+            lat, lon = gps_fix.latitude, gps_fix.longitude
+
+        merged = 0
+        with self._lock:
+            for det in detections:
+                conf = float(det.get("confidence", 0.0))
+                if conf < self.min_confidence:
+                    continue
+                class_name = str(det.get("class", "")).lower()
+                if not class_name:
+                    continue
+                bearing = self._bbox_bearing(det.get("bbox"), width)
+                track = self._open_tracks.get(class_name)
+                if track is None or now - track["end_ts"] > self.track_gap_s:
+                    if track is not None:
+                        self._dirty[class_name + "@closed"] = track
+                    track = {"id": None, "class_name": class_name, "start_ts": now, "frames": 0,
+                             "confidence": 0.0, "frame_ref": None}
+                    self._open_tracks[class_name] = track
+                track.update(
+                    end_ts=now,
+                    bearing_deg=bearing,
+                    heading_deg=heading,
+                    distance_m=det.get("distance_m"),
+                    latitude=lat,
+                    longitude=lon,
+                    place=place,
+                    confidence=max(track["confidence"], conf),
+                    frames=track["frames"] + 1,
+                )
+                if frame_ref:
+                    track["frame_ref"] = frame_ref
+                self._dirty[class_name] = track
+                merged += 1
+
+        if now - self._last_flush >= self.flush_interval_s:
+            self.flush(now)
+        return merged
+
+    def _bbox_bearing(self, bbox, width: int) -> Optional[float]:
+        """Horizontal angle of the bbox centre from the camera axis (+right)."""
+        if not bbox or len(bbox) < 4:
+            return None
+        cx = (float(bbox[0]) + float(bbox[2])) / 2.0
+        if width and cx > 1.0:
+            cx /= width
+        return (cx - 0.5) * self.hfov_deg
+
+    def flush(self, now: Optional[float] = None):
+        """Write dirty tracks to SQLite in one transaction."""
+        with self._write_lock:
+            self._flush_locked(now)
+
+    def _flush_locked(self, now: Optional[float]):
+        with self._lock:
+            dirty = list(self._dirty.values())
+            self._dirty.clear()
+            self._last_flush = now or time.time()
+            # Closed tracks that were never written are no longer referenced
+            for class_name, track in list(self._open_tracks.items()):
+                if self._last_flush - track["end_ts"] > self.track_gap_s * 10:
+                    del self._open_tracks[class_name]
+        if not dirty:
+            return
+
+        def write(conn):
+            for t in dirty:
+                values = (t["class_name"], t["start_ts"], t["end_ts"], t["bearing_deg"],
+                          t["heading_deg"], t["distance_m"], t["latitude"], t["longitude"],
+                          t["place"], t["confidence"], t["frame_ref"], t["frames"])
+                if t["id"] is None:
+                    cur = conn.execute(
+                        """INSERT INTO sightings
+                           (class_name, start_ts, end_ts, bearing_deg, heading_deg, distance_m,
+                            latitude, longitude, place, confidence, frame_ref, frames)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                        values,
+                    )
+                    t["id"] = cur.lastrowid
+                    self.tracks_written += 1
+                else:
+                    conn.execute(
+                        """UPDATE sightings SET class_name=?, start_ts=?, end_ts=?, bearing_deg=?,
+                           heading_deg=?, distance_m=?, latitude=?, longitude=?, place=?,
+                           confidence=?, frame_ref=?, frames=? WHERE id=?""",
+                        values + (t["id"],),
+                    )
+                if self.has_rtree:
+                    lat = t["latitude"] if t["latitude"] is not None else 0.0
+                    lon = t["longitude"] if t["longitude"] is not None else 0.0
+                    conn.execute(
+                        "INSERT OR REPLACE INTO sightings_rtree VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (t["id"], t["start_ts"], t["end_ts"], lat, lat, lon, lon),
+                    )
+
+        try:
+            self.db.transaction(write)
+        except Exception as e:
+            logger.error(f"Sighting flush failed: {e}")
+
+    def close(self):
+        """Flush open tracks and release the shared database."""
+        self.flush()
+        self.db.release()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def last_sightings(
+        self,
+        class_name: str,
+        limit: int = 3,
+        near: Optional[Tuple[float, float]] = None,
+        radius_m: float = 50.0,
+        since: Optional[float] = None,
+    ) -> List[Sighting]:
+        """
+        Most recent sightings of a class, optionally near a position.
+
+        Args:
+            class_name: Detector class label (see normalize_object_name)
+            limit: Max results (newest first)
+            near: (latitude, longitude) to restrict to
+            radius_m: Search radius around near
+            since: Only sightings that ended after this timestamp
+
+        Returns:
+            Sightings ordered by end time, newest first
+        """
+        self.flush()
+        class_name = class_name.lower()
+        since = since or 0.0
+        with self.db.reader() as conn:
+            if near is not None:
+                dlat = radius_m / METERS_PER_DEG_LAT
+                dlon = radius_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(near[0])), 1e-6))
+                box = (near[0] - dlat, near[0] + dlat, near[1] - dlon, near[1] + dlon)
+                if self.has_rtree:
+                    rows = conn.execute(
+                        """SELECT s.* FROM sightings_rtree r JOIN sightings s ON s.id = r.id
+                           WHERE r.max_ts >= ? AND r.max_lat >= ? AND r.min_lat <= ?
+                             AND r.max_lon >= ? AND r.min_lon <= ? AND s.class_name = ?
+                           ORDER BY s.end_ts DESC LIMIT ?""",
+                        (since,) + box + (class_name, limit),
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        """SELECT * FROM sightings
+                           WHERE class_name = ? AND end_ts >= ?
+                             AND latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?
+                           ORDER BY end_ts DESC LIMIT ?""",
+                        (class_name, since) + box + (limit,),
+                    ).fetchall()
+            else:
+                rows = conn.execute(
+                    """SELECT * FROM sightings
+                       WHERE class_name = ? AND end_ts >= ?
+                       ORDER BY end_ts DESC LIMIT ?""",
+                    (class_name, since, limit),
+                ).fetchall()
+        return [self._row_to_sighting(r) for r in rows]
+
+    def sightings_between(self, start_ts: float, end_ts: float, limit: int = 50) -> List[Sighting]:
+        """All sightings overlapping a time range (any class), newest first."""
+        self.flush()
+        with self.db.reader() as conn:
+            if self.has_rtree:
+                rows = conn.execute(
+                    """SELECT s.* FROM sightings_rtree r JOIN sightings s ON s.id = r.id
+                       WHERE r.max_ts >= ? AND r.min_ts <= ?
+                       ORDER BY s.end_ts DESC LIMIT ?""",
+                    (start_ts, end_ts, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """SELECT * FROM sightings WHERE end_ts >= ? AND start_ts <= ?
+                       ORDER BY end_ts DESC LIMIT ?""",
+                    (start_ts, end_ts, limit),
+                ).fetchall()
+        return [self._row_to_sighting(r) for r in rows]
+
+    @staticmethod
+    def _row_to_sighting(row: sqlite3.Row) -> Sighting:
+        return Sighting(
+            id=row["id"],
+            class_name=row["class_name"],
+            start_ts=row["start_ts"],
+            end_ts=row["end_ts"],
+            bearing_deg=row["bearing_deg"],
+            heading_deg=row["heading_deg"],
+            distance_m=row["distance_m"],
+            latitude=row["latitude"],
+            longitude=row["longitude"],
+            place=row["place"],
+            confidence=row["confidence"],
+            frame_ref=row["frame_ref"],
+            frames=row["frames"],
+        )
+
+    # ------------------------------------------------------------------
+    # Recall answers
+    # ------------------------------------------------------------------
+
+    def answer_recall(
+        self,
+        object_name: str,
+        current_heading: Optional[float] = None,
+        current_position: Optional[Tuple[float, float]] = None,
+        now: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Build a spoken answer for "where is my X?" from the index.
+
+        Returns None (defer to Gemini) when the object was never seen, the
+        latest sighting is too old, or recent sightings disagree on where
+        it was.
+
+        Args:
+            object_name: Object as spoken ("my wallet", "keys")
+            current_heading: IMU heading now, for "to your left" phrasing
+            current_position: (lat, lon) now, for "about N metres away"
+            now: Current time (default: time.time())
+
+        Returns:
+            Answer sentence, or None
+        """
+        now = now or time.time()
+        class_name = normalize_object_name(object_name)
+        sightings = self.last_sightings(class_name, limit=3)
+        if not sightings:
+            self.deferred_answers += 1
+            return None
+
+        latest = sightings[0]
+        if now - latest.end_ts > self.max_answer_age_s or self._is_ambiguous(sightings):
+            self.deferred_answers += 1
+            return None
+
+        parts = [f"You last saw your {_strip_determiner(object_name)} {self._ago_phrase(now - latest.end_ts)}"]
+        direction = self._direction_phrase(latest, current_heading)
+        if direction:
+            parts.append(direction)
+        if latest.distance_m and latest.distance_m < 10:
+            parts.append(f"about {latest.distance_m:.0f} metres away" if latest.distance_m >= 1.5
+                         else "within arm's reach")
+        if (current_position and latest.latitude is not None and latest.longitude is not None):
+            moved = _haversine_m(current_position[0], current_position[1], latest.latitude, latest.longitude)
+            if moved > 30:
+                parts.append(f"about {moved:.0f} metres from where you are now")
+        self.local_answers += 1
+        return ", ".join(parts) + "."
+
+    def _is_ambiguous(self, sightings: List[Sighting]) -> bool:
+        latest = sightings[0]
+        for other in sightings[1:]:
+            if latest.end_ts - other.end_ts > self.ambiguity_window_s:
+                break
+            a, b = latest.absolute_bearing, other.absolute_bearing
+            if a is not None and b is not None and abs(_angle_diff(a, b)) > self.ambiguity_bearing_deg:
+                return True
+            if (latest.latitude is not None and other.latitude is not None
+                    and _haversine_m(latest.latitude, latest.longitude,
+                                     other.latitude, other.longitude) > self.ambiguity_distance_m):
+                return True
+        return False
+
+    @staticmethod
+    def _ago_phrase(age_s: float) -> str:
+        if age_s < 60:
+            return "just now"
+        minutes = int(age_s // 60)
+        if minutes < 60:
+            return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+        hours = int(minutes // 60)
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+
+    @staticmethod
+    def _direction_phrase(s: Sighting, current_heading: Optional[float]) -> Optional[str]:
+        if current_heading is not None and s.absolute_bearing is not None:
+            rel = _angle_diff(s.absolute_bearing, current_heading)
+            tense = ""
+        elif s.bearing_deg is not None:
+            rel = s.bearing_deg  # Relative to where the user was facing then
+            tense = "it was "
+        else:
+            return None
+        if abs(rel) <= 20:
+            return f"{tense}straight ahead"
+        if abs(rel) >= 150:
+            return f"{tense}behind you"
+        side = "right" if rel > 0 else "left"
+        if abs(rel) <= 50:
+            return f"{tense}slightly to your {side}"
+        return f"{tense}to your {side}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index statistics for diagnostics."""
+        return {
+            "open_tracks": len(self._open_tracks),
+            "tracks_written": self.tracks_written,
+            "local_answers": self.local_answers,
+            "deferred_answers": self.deferred_answers,
+            "rtree": self.has_rtree,
+        }
@@ -0,0 +1,446 @@
+"""
+SQLite Access Layer - Shared Connections, Single Writer, Group Commit
+
+One SQLiteDatabase per database file, shared by every component that uses it
+(HybridMemoryManager, ConversationManager, NavigationEngine route cache,
+BusHandler stops, sighting/visual memory indexes, frame store).
+
+Design:
+- Single writer thread per database owns the only read-write connection.
+  Writes are queued and drained in batches: every op queued while the
+  previous batch was committing goes into the next BEGIN IMMEDIATE ... COMMIT,
+  so N concurrent writers pay for one fsync instead of N and never see
+  "database is locked". Each op runs inside its own SAVEPOINT, so one failing
+  statement doesn't roll back its neighbours.
+- Pool of read-only (query_only) WAL connections. Readers never block the
+  writer or each other. Connections are long-lived, so sqlite3's per-connection
+  prepared statement cache is actually reused across calls.
+- Consistent PRAGMAs on every connection (WAL, synchronous, busy_timeout,
+  cache_size, mmap_size, temp_store).
+- ":memory:" databases use a private shared-cache URI so the writer and
+  readers see the same data (used by tests).
+
+Usage:
+    db = get_database("local_cortex.db")
+    db.execute("INSERT INTO t (a) VALUES (?)", (1,))          # Waits for commit
+    db.execute("INSERT INTO t (a) VALUES (?)", (2,), wait=False)  # Fire-and-forget
+    rows = db.query("SELECT a FROM t WHERE a > ?", (0,))
+    db.release()  # Drop this component's reference
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import itertools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Default PRAGMAs applied to every connection
+DEFAULT_PRAGMAS = {
+    "synchronous": "FULL",      # Safe for power-failure scenarios (wearable device)
+    "busy_timeout": 5000,       # ms — only matters for external processes
+    "cache_size": -16000,       # 16 MB page cache per connection
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+_memory_ids = itertools.count()
+
+
+@dataclass
+class WriteResult:
+    """Result of a queued write statement."""
+    lastrowid: Optional[int]
+    rowcount: int
+
+
+class _WriteOp:
+    __slots__ = ("kind", "sql", "params", "fn", "future")
+
+    def __init__(self, kind: str, sql: Optional[str] = None, params: Any = None,
+                 fn: Optional[Callable[[sqlite3.Connection], Any]] = None):
+        self.kind = kind
+        self.sql = sql
+        self.params = params
+        self.fn = fn
+        self.future: Future = Future()
+
+    def run(self, conn: sqlite3.Connection) -> Any:
+        if self.kind == "execute":
+            cur = conn.execute(self.sql, self.params)
+            return WriteResult(cur.lastrowid, cur.rowcount)
+        if self.kind == "many":
+            cur = conn.executemany(self.sql, self.params)
+            return WriteResult(cur.lastrowid, cur.rowcount)
+        return self.fn(conn)
+
+
+class SQLiteDatabase:
+    """
+    Shared handle to one SQLite database file.
+
+    Use get_database() instead of constructing directly so all components
+    share the same writer thread and read pool.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        read_pool_size: int = 4,
+        max_batch: int = 256,
+        queue_size: int = 10000,
+        pragmas: Optional[Dict[str, Any]] = None,
+        cached_statements: int = 256,
+    ):
+        """
+        Open the database and start its writer thread.
+
+        Args:
+            path: Database file path (":memory:" for a private in-memory DB)
+            read_pool_size: Max concurrent read connections
+            max_batch: Max write ops committed in one transaction
+            queue_size: Max pending write ops (writers block when full)
+            pragmas: Overrides for DEFAULT_PRAGMAS
+            cached_statements: Prepared statements cached per connection
+        """
+        self.path = path
+        self.read_pool_size = read_pool_size
+        self.max_batch = max_batch
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+
+        if path == ":memory:":
+            self._uri = f"file:cortex_mem_{next(_memory_ids)}?mode=memory&cache=shared"
+            self.is_memory = True
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._uri = f"file:{urllib.parse.quote(os.path.abspath(path))}"
+            self.is_memory = False
+
+        self._refs = 0
+        self.closed = False
+
+        # Writer
+        self._queue: "queue.Queue[Optional[_WriteOp]]" = queue.Queue(maxsize=queue_size)
+        self._writer_conn = self._connect(writer=True)
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name=f"sqlite-writer:{os.path.basename(path)}", daemon=True
+        )
+        self._writer_ident: Optional[int] = None
+
+        # Readers
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._pool_lock = threading.Lock()
+        self._pool_created = 0
+        self._all_readers: List[sqlite3.Connection] = []
+
+        # Stats
+        self.writes = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.write_errors = 0
+        self.queue_high_water = 0
+        self.reads = 0
+        self.read_wait_s = 0.0
+
+        self._writer_thread.start()
+        logger.debug(f"SQLite access layer opened: {path}")
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _connect(self, writer: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._uri,
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,          # Transactions are managed explicitly
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        if writer and not self.is_memory:
+            conn.execute("PRAGMA journal_mode=WAL")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        if not writer:
+            conn.execute("PRAGMA query_only=ON")
+            if self.is_memory:
+                # Shared-cache readers would otherwise take table locks
+                conn.execute("PRAGMA read_uncommitted=ON")
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _submit(self, op: _WriteOp, wait: bool, timeout: Optional[float]) -> Any:
+        if self.closed:
+            raise sqlite3.ProgrammingError(f"Database {self.path} is closed")
+        if threading.get_ident() == self._writer_ident:
+            # Called from inside a transaction fn: run inline
+            return op.run(self._writer_conn)
+        self._queue.put(op)
+        depth = self._queue.qsize()
+        if depth > self.queue_high_water:
+            self.queue_high_water = depth
+        if not wait:
+            return op.future
+        return op.future.result(timeout=timeout)
+
+    def execute(self, sql: str, params: Sequence[Any] = (), wait: bool = True,
+                timeout: Optional[float] = 10.0) -> Any:
+        """
+        Queue one write statement.
+
+        Args:
+            sql: INSERT/UPDATE/DELETE/DDL statement
+            params: Statement parameters
+            wait: Block until committed (False = return a Future)
+            timeout: Max seconds to wait for the commit
+
+        Returns:
+            WriteResult (or Future[WriteResult] when wait=False)
+        """
+        return self._submit(_WriteOp("execute", sql, tuple(params)), wait, timeout)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]], wait: bool = True,
+                    timeout: Optional[float] = 30.0) -> Any:
+        """Queue one statement with many parameter sets (single op, single commit)."""
+        return self._submit(_WriteOp("many", sql, list(seq_of_params)), wait, timeout)
+
+    def transaction(self, fn: Callable[[sqlite3.Connection], Any], wait: bool = True,
+                    timeout: Optional[float] = 30.0) -> Any:
+        """
+        Run fn(conn) on the writer connection inside the write transaction.
+
+        Use for multi-statement writes that must be atomic or that need the
+        result of one statement in the next (e.g. INSERT then UPDATE by id).
+        fn must not call commit()/rollback().
+        """
+        return self._submit(_WriteOp("fn", fn=fn), wait, timeout)
+
+    def flush(self, timeout: float = 10.0):
+        """Block until every write queued so far is committed."""
+        self.transaction(lambda conn: None, timeout=timeout)
+
+    def _writer_loop(self):
+        self._writer_ident = threading.get_ident()
+        while True:
+            op = self._queue.get()
+            if op is None:
+                break
+            batch = [op]
+            stop = False
+            # Group commit: take everything that queued up meanwhile
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._run_batch(batch)
+            if stop:
+                break
+
+    def _run_batch(self, batch: List[_WriteOp]):
+        conn = self._writer_conn
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except Exception as e:
+            for op in batch:
+                op.future.set_exception(e)
+            self.write_errors += len(batch)
+            return
+
+        for op in batch:
+            try:
+                conn.execute("SAVEPOINT op")
+                value = op.run(conn)
+                conn.execute("RELEASE op")
+                results.append((op, value, None))
+            except Exception as e:
+                try:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                except Exception:
+                    pass
+                results.append((op, None, e))
+
+        try:
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"❌ SQLite commit failed ({self.path}): {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass
+            results = [(op, None, e) for op, _v, _e in results]
+
+        self.batches += 1
+        self.writes += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        for op, value, error in results:
+            if error is not None:
+                self.write_errors += 1
+                op.future.set_exception(error)
+            else:
+                op.future.set_result(value)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only pooled connection."""
+        if self.closed:
+            raise sqlite3.ProgrammingError(f"Database {self.path} is closed")
+        start = time.perf_counter()
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._pool_lock:
+                if self._pool_created < self.read_pool_size:
+                    self._pool_created += 1
+                    conn = self._connect(writer=False)
+                    self._all_readers.append(conn)
+            if conn is None:
+                conn = self._pool.get()
+        self.read_wait_s += time.perf_counter() - start
+        self.reads += 1
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Run a read query on a pooled connection and return all rows."""
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        """Run a read query and return the first row (or None)."""
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def connect_readonly(self) -> sqlite3.Connection:
+        """
+        Open a dedicated read-only connection outside the pool.
+
+        For long-lived callers that hold a connection (diagnostics, tests).
+        Closed automatically with the database.
+        """
+        conn = self._connect(writer=False)
+        with self._pool_lock:
+            self._all_readers.append(conn)
+        return conn
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def release(self):
+        """Drop one reference; the database closes when the last user releases it."""
+        with _registry_lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            _registry.pop(_registry_key(self.path), None)
+        self.close()
+
+    def close(self):
+        """Commit queued writes, stop the writer and close all connections."""
+        if self.closed:
+            return
+        self._queue.put(None)
+        self._writer_thread.join(timeout=10.0)
+        self.closed = True
+        with self._pool_lock:
+            for conn in self._all_readers:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._all_readers.clear()
+        self._writer_conn.close()
+        logger.debug(f"SQLite access layer closed: {self.path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Writer/reader statistics for diagnostics and benchmarks."""
+        return {
+            "path": self.path,
+            "writes": self.writes,
+            "batches": self.batches,
+            "avg_batch": round(self.writes / self.batches, 2) if self.batches else 0.0,
+            "max_batch": self.max_batch_seen,
+            "write_errors": self.write_errors,
+            "queue_depth": self._queue.qsize(),
+            "queue_high_water": self.queue_high_water,
+            "reads": self.reads,
+            "read_connections": self._pool_created,
+            "read_wait_ms": round(self.read_wait_s * 1000, 2),
+        }
+
+
+# ─── Registry ──────────────────────────────────────────────────────
+
+_registry: Dict[str, SQLiteDatabase] = {}
+_registry_lock = threading.Lock()
+
+
+def _registry_key(path: str) -> str:
+    return path if path == ":memory:" else os.path.abspath(path)
+
+
+def get_database(path: str, **kwargs) -> SQLiteDatabase:
+    """
+    Get the shared SQLiteDatabase for a file, opening it on first use.
+
+    Each call adds a reference; call release() when the component shuts down.
+    ":memory:" always returns a new private database.
+
+    Args:
+        path: Database file path
+        **kwargs: SQLiteDatabase options (only used when the database is opened)
+    """
+    if path == ":memory:":
+        db = SQLiteDatabase(path, **kwargs)
+        db._refs = 1
+        return db
+    key = _registry_key(path)
+    with _registry_lock:
+        db = _registry.get(key)
+        if db is None or db.closed:
+            db = SQLiteDatabase(path, **kwargs)
+            _registry[key] = db
+        db._refs += 1
+        return db
+
+
+def close_all():
+    """Close every open database (process shutdown)."""
+    with _registry_lock:
+        dbs = list(_registry.values())
+        _registry.clear()
+    for db in dbs:
+        db.close()
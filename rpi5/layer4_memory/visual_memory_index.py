@@ -0,0 +1,621 @@
+"""
+Visual Memory Index - Embedding-Based Object Recall
+
+Local, caption-independent visual memory for "where did I leave my keys?".
+Saved Gemini frames and Layer 1 (YOLOE) detection crops are embedded with
+the MobileCLIP TorchScript model that ships in the repo root, and recall
+queries are answered by embedding the query text and ranking stored
+vectors by cosine similarity.
+
+Storage layout (index_dir/):
+- embeddings.f16   Memory-mapped float16 matrix (capacity x dim), L2-normalized
+- visual_memory    SQLite table with one metadata row per matrix row
+                   (kind, image_path, class_name, bbox, timestamp, session_id)
+
+Design:
+- Embedding runs on a background worker thread with a bounded queue, so the
+  voice path and the main frame loop never wait on the CLIP encoder.
+  When the queue is full, new jobs are dropped (memory is best-effort).
+- Search is brute force over the float16 matrix in fixed-size chunks that are
+  upcast to float32 and multiplied via BLAS (NEON/AVX SIMD). At wearable scale
+  (<100K vectors) this returns top-k in a few milliseconds with exact recall,
+  without the build/maintenance cost of an ANN graph.
+- Crops are rate-limited per class so a static scene doesn't flood the index.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .sqlite_access import get_database
+
+logger = logging.getLogger(__name__)
+
+# Rows upcast to float32 per BLAS call during search (~4 MB at dim=512)
+SEARCH_CHUNK_ROWS = 2048
+
+# Layer 1 detection layer tags (learner = YOLOE, layer1 = normalized name)
+LAYER1_TAGS = {"learner", "layer1"}
+
+
+@dataclass
+class VisualMemoryHit:
+    """A single visual memory search result."""
+    row_id: int
+    score: float              # Cosine similarity (-1..1, higher = better)
+    kind: str                 # "frame" or "crop"
+    image_path: Optional[str]
+    class_name: Optional[str]
+    timestamp: float
+    session_id: Optional[str] = None
+    bbox: Optional[List[float]] = None
+
+
+class MobileCLIPEmbedder:
+    """
+    Image + text encoder backed by a MobileCLIP TorchScript export.
+
+    The TorchScript module must expose encode_image() and encode_text().
+    Text-only exports (e.g. the YOLOE mobileclip_blt.ts) still work for
+    text queries, but supports_images will be False.
+    """
+
+    def __init__(
+        self,
+        model_path: str = "mobileclip2_b.ts",
+        image_size: int = 256,
+        image_mean: Sequence[float] = (0.0, 0.0, 0.0),
+        image_std: Sequence[float] = (1.0, 1.0, 1.0),
+        device: str = "cpu",
+    ):
+        self.model_path = model_path
+        self.image_size = image_size
+        self.image_mean = np.asarray(image_mean, dtype=np.float32).reshape(1, 3, 1, 1)
+        self.image_std = np.asarray(image_std, dtype=np.float32).reshape(1, 3, 1, 1)
+        self.device = device
+
+        self.model = None
+        self.tokenizer = None
+        self.dim: Optional[int] = None
+        self.supports_images = False
+        self._lock = threading.Lock()  # TorchScript modules are not re-entrant
+
+    def load(self) -> bool:
+        """Load the TorchScript model and tokenizer. Returns True on success."""
+        if self.model is not None:
+            return True
+        if not os.path.exists(self.model_path) or os.path.getsize(self.model_path) < 1024:
+            # < 1 KB = Git LFS pointer that was never pulled
+            logger.warning(f"⚠️ MobileCLIP model missing or LFS pointer only: {self.model_path}")
+            return False
+        try:
+            import torch
+            import clip  # ultralytics/CLIP fork (same tokenizer YOLOE uses)
+
+            self.model = torch.jit.load(self.model_path, map_location=self.device).eval()
+            self.tokenizer = clip.tokenize
+            self.supports_images = hasattr(self.model, "encode_image")
+            self.dim = int(self.encode_text(["object"]).shape[-1])
+            logger.info(
+                f"✅ MobileCLIP loaded: {self.model_path} (dim={self.dim}, "
+                f"images={'yes' if self.supports_images else 'no'})"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to load MobileCLIP ({self.model_path}): {e}")
+            self.model = None
+            return False
+
+    def _preprocess(self, images: List[np.ndarray]) -> np.ndarray:
+        """Resize RGB uint8 images to a normalized NCHW float32 batch."""
+        import cv2
+        batch = np.empty((len(images), 3, self.image_size, self.image_size), dtype=np.float32)
+        for i, img in enumerate(images):
+            resized = cv2.resize(img, (self.image_size, self.image_size), interpolation=cv2.INTER_AREA)
+            batch[i] = resized.transpose(2, 0, 1)
+        batch *= 1.0 / 255.0
+        batch -= self.image_mean
+        batch /= self.image_std
+        return batch
+
+    def encode_image(self, images: List[np.ndarray]) -> np.ndarray:
+        """Embed a list of RGB uint8 images. Returns (n, dim) L2-normalized float32."""
+        import torch
+        batch = torch.from_numpy(self._preprocess(images))
+        with self._lock, torch.inference_mode():
+            feats = self.model.encode_image(batch).float().cpu().numpy()
+        return _l2_normalize(feats)
+
+    def encode_text(self, texts: List[str]) -> np.ndarray:
+        """Embed a list of strings. Returns (n, dim) L2-normalized float32."""
+        import torch
+        tokens = self.tokenizer(texts)
+        with self._lock, torch.inference_mode():
+            if hasattr(self.model, "encode_text"):
+                feats = self.model.encode_text(tokens)
+            else:
+                feats = self.model(tokens)
+        return _l2_normalize(feats.float().cpu().numpy())
+
+
+def _l2_normalize(x: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (safe for zero rows)."""
+    x = np.atleast_2d(np.asarray(x, dtype=np.float32))
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def _to_rgb_array(image) -> np.ndarray:
+    """Accept a PIL Image or an RGB numpy array and return an RGB uint8 array."""
+    if isinstance(image, np.ndarray):
+        return image
+    return np.asarray(image.convert("RGB"))
+
+
+class VisualMemoryIndex:
+    """
+    Memory-mapped embedding index over saved frames and Layer 1 crops.
+
+    Usage:
+        index = VisualMemoryIndex(index_dir="memory_index", db_path="local_cortex.db")
+        index.start()
+        index.add_frame(pil_image, image_path="memory_images/abc/123.jpg")
+        index.add_detections(frame_bgr, detections)
+        hits = index.search("wallet", k=3)
+    """
+
+    def __init__(
+        self,
+        index_dir: str = "memory_index",
+        db_path: str = "local_cortex.db",
+        embedder=None,
+        dim: Optional[int] = None,
+        initial_capacity: int = 4096,
+        queue_size: int = 32,
+        crop_interval_s: float = 10.0,
+        crop_min_px: int = 32,
+        text_prompt: str = "a photo of {}",
+    ):
+        """
+        Initialize the visual memory index.
+
+        Args:
+            index_dir: Directory for the float16 matrix and saved crops
+            db_path: SQLite database for row metadata (shared local DB)
+            embedder: Object with encode_image()/encode_text() (default: MobileCLIPEmbedder)
+            dim: Embedding dimension (None = taken from embedder after load)
+            initial_capacity: Rows preallocated in the memory-mapped matrix
+            queue_size: Max pending embedding jobs before new ones are dropped
+            crop_interval_s: Min seconds between stored crops of the same class
+            crop_min_px: Skip crops smaller than this on either side
+            text_prompt: Template used to embed recall queries
+        """
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.crops_dir = self.index_dir / "crops"
+        self.crops_dir.mkdir(parents=True, exist_ok=True)
+        self.matrix_path = self.index_dir / "embeddings.f16"
+        self.db_path = db_path
+        self.db = None
+
+        self.embedder = embedder if embedder is not None else MobileCLIPEmbedder()
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+        self.crop_interval_s = crop_interval_s
+        self.crop_min_px = crop_min_px
+        self.text_prompt = text_prompt
+
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+        self._jobs: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+        self._last_crop_time: Dict[str, float] = {}
+
+        # Stats
+        self.embedded_count = 0
+        self.dropped_jobs = 0
+        self.last_search_ms = 0.0
+
+        self.is_available = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """Load the embedder, open the matrix and start the embedding worker."""
+        if self._running:
+            return True
+        if hasattr(self.embedder, "load") and not self.embedder.load():
+            logger.warning("⚠️ Visual memory disabled: embedder unavailable")
+            return False
+        if self.dim is None:
+            self.dim = int(getattr(self.embedder, "dim", 0) or 0)
+        if not self.dim:
+            logger.warning("⚠️ Visual memory disabled: unknown embedding dimension")
+            return False
+
+        self._init_db()
+        self._open_matrix()
+
+        self._running = True
+        self._worker = threading.Thread(target=self._worker_loop, name="VisualMemoryIndex", daemon=True)
+        self._worker.start()
+        self.is_available = True
+        logger.info(f"✅ Visual memory index ready ({self._count} vectors, dim={self.dim})")
+        return True
+
+    def stop(self):
+        """Stop the worker (pending jobs are discarded) and flush the matrix."""
+        if not self._running:
+            return
+        self._running = False
+        try:
+            self._jobs.put_nowait(None)
+        except queue.Full:
+            pass
+        if self._worker:
+            self._worker.join(timeout=2.0)
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+        if self.db is not None:
+            self.db.release()
+            self.db = None
+        self.is_available = False
+        logger.info("⏹️ Visual memory index stopped")
+
+    def _init_db(self):
+        self.db = get_database(self.db_path)
+        self.db.transaction(self._create_schema)
+        row = self.db.query_one("SELECT MAX(row_id) FROM visual_memory")
+        # Metadata is written after the vector, so it is the source of truth
+        self._count = 0 if row[0] is None else int(row[0]) + 1
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS visual_memory (
+                row_id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                image_path TEXT,
+                class_name TEXT,
+                bbox TEXT,
+                session_id TEXT,
+                timestamp REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_visual_memory_time
+            ON visual_memory(timestamp)
+        """)
+
+    def _open_matrix(self):
+        row_bytes = self.dim * 2
+        existing_rows = 0
+        if self.matrix_path.exists():
+            existing_rows = self.matrix_path.stat().st_size // row_bytes
+        capacity = max(self.initial_capacity, existing_rows, self._count)
+        self._resize_file(capacity)
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def _resize_file(self, rows: int):
+        size = rows * self.dim * 2
+        with open(self.matrix_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+
+    def _grow(self):
+        """Double matrix capacity (called with self._lock held)."""
+        new_capacity = self._capacity * 2
+        self._matrix.flush()
+        del self._matrix
+        self._resize_file(new_capacity)
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float16, mode="r+", shape=(new_capacity, self.dim))
+        self._capacity = new_capacity
+        logger.info(f"📈 Visual memory matrix grown to {new_capacity} rows")
+
+    # ------------------------------------------------------------------
+    # Ingest (non-blocking)
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, job: Dict[str, Any]) -> bool:
+        if not self._running:
+            return False
+        try:
+            self._jobs.put_nowait(job)
+            return True
+        except queue.Full:
+            self.dropped_jobs += 1
+            logger.debug("Visual memory queue full, dropping job")
+            return False
+
+    def add_frame(
+        self,
+        image,
+        image_path: Optional[str],
+        session_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """
+        Queue a saved camera frame for embedding.
+
+        Args:
+            image: PIL Image or RGB numpy array
+            image_path: Path of the saved frame on disk (returned on recall)
+            session_id: Conversation session the frame belongs to
+            timestamp: Capture time (default: now)
+
+        Returns:
+            True if queued, False if the index is stopped or the queue is full
+        """
+        if not getattr(self.embedder, "supports_images", True):
+            return False
+        return self._enqueue({
+            "kind": "frame",
+            "image": image,
+            "image_path": image_path,
+            "class_name": None,
+            "bbox": None,
+            "session_id": session_id,
+            "timestamp": timestamp or time.time(),
+        })
+
+    def add_detections(self, frame_bgr: np.ndarray, detections: List[Dict[str, Any]]) -> int:
+        """
+        Queue Layer 1 detection crops (region embeddings) from a live frame.
+
+        Only Layer 1 (learner) detections are used; each class is stored at most
+        once per crop_interval_s. Crops are copied so the caller may reuse frame.
+
+        Returns:
+            Number of crops queued
+        """
+        if not self._running or frame_bgr is None or not getattr(self.embedder, "supports_images", True):
+            return 0
+        now = time.time()
+        h, w = frame_bgr.shape[:2]
+        queued = 0
+        for det in detections:
+            if det.get("layer") not in LAYER1_TAGS:
+                continue
+            class_name = det.get("class", "unknown")
+            if now - self._last_crop_time.get(class_name, 0.0) < self.crop_interval_s:
+                continue
+            bbox = det.get("bbox")
+            if not bbox or len(bbox) < 4:
+                continue
+            x1, y1, x2, y2 = (float(v) for v in bbox[:4])
+            if max(x1, y1, x2, y2) <= 1.0:  # Normalized coordinates
+                x1, x2, y1, y2 = x1 * w, x2 * w, y1 * h, y2 * h
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(w, int(x2)), min(h, int(y2))
+            if x2 - x1 < self.crop_min_px or y2 - y1 < self.crop_min_px:
+                continue
+            crop_rgb = np.ascontiguousarray(frame_bgr[y1:y2, x1:x2, ::-1])
+            if self._enqueue({
+                "kind": "crop",
+                "image": crop_rgb,
+                "image_path": None,
+                "class_name": class_name,
+                "bbox": [x1, y1, x2, y2],
+                "session_id": None,
+                "timestamp": now,
+            }):
+                self._last_crop_time[class_name] = now
+                queued += 1
+        return queued
+
+    def _worker_loop(self):
+        while self._running:
+            try:
+                job = self._jobs.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if job is None:
+                break
+            try:
+                self._process_job(job)
+            except Exception as e:
+                logger.warning(f"Visual memory embedding failed: {e}")
+
+    def _process_job(self, job: Dict[str, Any]):
+        image = _to_rgb_array(job["image"])
+        vec = self.embedder.encode_image([image])[0]
+
+        image_path = job["image_path"]
+        if job["kind"] == "crop" and image_path is None:
+            image_path = self._save_crop(image, job["class_name"], job["timestamp"])
+
+        self.add_vector(
+            vec,
+            kind=job["kind"],
+            image_path=image_path,
+            class_name=job["class_name"],
+            bbox=job["bbox"],
+            session_id=job["session_id"],
+            timestamp=job["timestamp"],
+        )
+        self.embedded_count += 1
+
+    def _save_crop(self, crop_rgb: np.ndarray, class_name: str, timestamp: float) -> Optional[str]:
+        try:
+            from PIL import Image
+            safe_name = "".join(c if c.isalnum() else "_" for c in class_name or "object")
+            path = self.crops_dir / f"{int(timestamp * 1000)}_{safe_name}.jpg"
+            Image.fromarray(crop_rgb).save(str(path), "JPEG", quality=80)
+            return str(path)
+        except Exception as e:
+            logger.debug(f"Failed to save crop: {e}")
+            return None
+
+    def add_vector(
+        self,
+        vector: np.ndarray,
+        kind: str,
+        image_path: Optional[str] = None,
+        class_name: Optional[str] = None,
+        bbox: Optional[List[float]] = None,
+        session_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """
+        Append a precomputed embedding (synchronous). Returns the row id.
+        """
+        vec = _l2_normalize(vector)[0].astype(np.float16)
+        with self._lock:
+            if self._count >= self._capacity:
+                self._grow()
+            row_id = self._count
+            self._matrix[row_id] = vec
+            # Vector first, metadata second: a crash in between leaves an
+            # orphan row that is overwritten on restart.
+            self.db.execute(
+                """INSERT OR REPLACE INTO visual_memory
+                   (row_id, kind, image_path, class_name, bbox, session_id, timestamp)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    row_id, kind, image_path, class_name,
+                    ",".join(str(int(v)) for v in bbox) if bbox else None,
+                    session_id, timestamp or time.time(),
+                ),
+            )
+            self._count += 1
+        return row_id
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        kind: Optional[str] = None,
+        min_score: float = 0.0,
+    ) -> List[VisualMemoryHit]:
+        """
+        Embed a text query and return the top-k most similar stored images.
+
+        Args:
+            query: Object or description (e.g. "wallet", "red bag")
+            k: Number of results
+            kind: Restrict to "frame" or "crop" (None = both)
+            min_score: Drop results below this cosine similarity
+
+        Returns:
+            Hits sorted by descending score
+        """
+        if not self.is_available or self._count == 0:
+            return []
+        query_vec = self.embedder.encode_text([self.text_prompt.format(query)])[0]
+        return self.search_vector(query_vec, k=k, kind=kind, min_score=min_score)
+
+    def search_vector(
+        self,
+        query_vec: np.ndarray,
+        k: int = 3,
+        kind: Optional[str] = None,
+        min_score: float = 0.0,
+    ) -> List[VisualMemoryHit]:
+        """Exact top-k cosine search for a precomputed query embedding."""
+        start = time.time()
+        with self._lock:
+            n = self._count
+            matrix = self._matrix
+        if n == 0:
+            return []
+
+        q = _l2_normalize(query_vec)[0]
+        allowed = self._rows_of_kind(kind) if kind else None
+
+        # Over-fetch when filtering by kind so enough candidates survive
+        fetch = min(n, k if allowed is None else max(k * 4, 32))
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for lo in range(0, n, SEARCH_CHUNK_ROWS):
+            hi = min(lo + SEARCH_CHUNK_ROWS, n)
+            scores = matrix[lo:hi].astype(np.float32) @ q
+            if allowed is not None:
+                scores[~allowed[lo:hi]] = -np.inf
+            if hi - lo > fetch:
+                part = np.argpartition(scores, -fetch)[-fetch:]
+            else:
+                part = np.arange(hi - lo)
+            best_scores = np.concatenate([best_scores, scores[part]])
+            best_rows = np.concatenate([best_rows, part + lo])
+            if len(best_scores) > fetch:
+                keep = np.argpartition(best_scores, -fetch)[-fetch:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.argsort(-best_scores)
+        rows = [int(best_rows[i]) for i in order if best_scores[i] >= min_score][:k]
+        scores = {int(best_rows[i]): float(best_scores[i]) for i in order}
+        hits = self._load_hits(rows, scores)
+        self.last_search_ms = (time.time() - start) * 1000
+        logger.debug(f"Visual memory search: {len(hits)} hits over {n} vectors in {self.last_search_ms:.1f}ms")
+        return hits
+
+    def _rows_of_kind(self, kind: str) -> np.ndarray:
+        mask = np.zeros(self._count, dtype=bool)
+        for (row_id,) in self.db.query("SELECT row_id FROM visual_memory WHERE kind = ?", (kind,)):
+            if row_id < len(mask):
+                mask[row_id] = True
+        return mask
+
+    def _load_hits(self, rows: List[int], scores: Dict[int, float]) -> List[VisualMemoryHit]:
+        if not rows:
+            return []
+        placeholders = ",".join("?" * len(rows))
+        meta = {
+            r[0]: r for r in self.db.query(
+                f"""SELECT row_id, kind, image_path, class_name, bbox, session_id, timestamp
+                    FROM visual_memory WHERE row_id IN ({placeholders})""",
+                rows,
+            )
+        }
+        hits = []
+        for row_id in rows:
+            r = meta.get(row_id)
+            if r is None:
+                continue
+            hits.append(VisualMemoryHit(
+                row_id=row_id,
+                score=scores[row_id],
+                kind=r[1],
+                image_path=r[2],
+                class_name=r[3],
+                bbox=[float(v) for v in r[4].split(",")] if r[4] else None,
+                session_id=r[5],
+                timestamp=r[6],
+            ))
+        return hits
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index statistics for diagnostics / dashboard."""
+        return {
+            "available": self.is_available,
+            "vectors": self._count,
+            "capacity": self._capacity,
+            "dim": self.dim,
+            "pending_jobs": self._jobs.qsize(),
+            "embedded": self.embedded_count,
+            "dropped_jobs": self.dropped_jobs,
+            "last_search_ms": round(self.last_search_ms, 2),
+        }
@@ -24,6 +24,7 @@ Date: January 8, 2026
 import asyncio
 import json
 import logging
+import math
 import os
 import signal
 import sys
@@ -165,6 +166,7 @@ except ImportError as e:
 try:
     from rpi5.layer3_guide.router import IntentRouter
     from rpi5.layer3_guide.detection_router import DetectionRouter
+    from rpi5.layer3_guide.speculative_router import SpeculativeRouter, VISION, RECALL
     from rpi5.layer3_guide import Navigator
     from rpi5.layer3_guide.spatial_audio.manager import SpatialAudioManager
     logger.info("[DEBUG] ✅ Layer 3 (Router + Navigator + SpatialAudio) imported successfully")
@@ -172,6 +174,7 @@ except ImportError as e:
     logger.error(f"[DEBUG] ❌ Layer 3 (Router) import failed: {e}")
     IntentRouter = None
     DetectionRouter = None
+    SpeculativeRouter = None
     Navigator = None
     SpatialAudioManager = None
 
@@ -189,6 +192,27 @@ except ImportError as e:
     logger.warning(f"[DEBUG] ⚠️ ConversationManager import failed: {e}")
     ConversationManager = None
 
+try:
+    from rpi5.layer4_memory.visual_memory_index import VisualMemoryIndex, MobileCLIPEmbedder
+    logger.info("[DEBUG] ✅ VisualMemoryIndex imported successfully")
+except ImportError as e:
+    logger.warning(f"[DEBUG] ⚠️ VisualMemoryIndex import failed: {e}")
+    VisualMemoryIndex = None
+    MobileCLIPEmbedder = None
+
+try:
+    from rpi5.layer4_memory.sighting_index import SightingIndex
+    logger.info("[DEBUG] ✅ SightingIndex imported successfully")
+except ImportError as e:
+    logger.warning(f"[DEBUG] ⚠️ SightingIndex import failed: {e}")
+    SightingIndex = None
+
+try:
+    from rpi5.layer4_memory.sqlite_access import close_all as close_all_databases
+except ImportError as e:
+    logger.warning(f"[DEBUG] ⚠️ SQLite access layer import failed: {e}")
+    close_all_databases = None
+
 logger.info("[DEBUG] ===== LAYER IMPORTS COMPLETE =====")
 
 # =====================================================
@@ -211,6 +235,7 @@ except ImportError:
 # Use the config module
 from rpi5.config.config import get_config, load_config
 from rpi5.voice_coordinator import VoiceCoordinator
+from rpi5.voice_trace import configure_tracer, current_trace, get_tracer, voice_span
 
 # =====================================================
 # IMPORT NEW VOICE PIPELINE HANDLERS
@@ -231,6 +256,9 @@ except ImportError as e:
 
 try:
     from rpi5.tts_router import TTSRouter
+    from rpi5.tts_cache import create_tts_cache
+    from rpi5.tts_selector import create_tts_selector
+    from rpi5.audio_mixer import MixerStreamPlayer, configure_mixer
     logger.info("[DEBUG] ✅ TTSRouter imported successfully")
 except ImportError as e:
     logger.warning(f"[DEBUG] ⚠️ TTSRouter import failed: {e}")
@@ -261,6 +289,7 @@ except ImportError:
 
 try:
     from rpi5.audio_alerts import AudioAlertManager
+    from rpi5.alert_bank import create_alert_bank
     logger.info("[DEBUG] ✅ AudioAlertManager imported successfully")
 except ImportError as e:
     logger.warning(f"[DEBUG] ⚠️ AudioAlertManager import failed: {e}")
@@ -1003,6 +1032,7 @@ class CortexSystem:
             logger.info("💾 Initializing Layer 4: Memory Manager...")
             sb_url = sb_cfg.get('url', '')
             logger.info(f"[DEBUG] Layer 4 config: url={sb_url[:30]}..., device_id={sb_cfg.get('device_id', 'rpi5-001')}")
+            bulk_cfg = sb_cfg.get('bulk_sync', {})
             self.memory_manager = HybridMemoryManager(
                 supabase_url=sb_url,
                 supabase_key=sb_cfg.get('anon_key', ''),
@@ -1010,7 +1040,13 @@ class CortexSystem:
                 local_db_path=sb_cfg.get('local_db_path', 'cortex_local.db'),
                 sync_interval=sb_cfg.get('sync_interval_seconds', 60),
                 batch_size=sb_cfg.get('batch_size', 50),
-                local_cache_size=sb_cfg.get('local_cache_size', 1000)
+                local_cache_size=sb_cfg.get('local_cache_size', 1000),
+                bulk_sync=bulk_cfg.get('enabled', False),
+                bulk_sync_url=bulk_cfg.get('url') or None,
+                min_sync_interval=bulk_cfg.get('min_interval_seconds', 10),
+                max_sync_interval=bulk_cfg.get('max_interval_seconds', 300),
+                bulk_target_rows=bulk_cfg.get('target_rows', 500),
+                bulk_max_rows=bulk_cfg.get('max_rows_per_request', 5000)
             )
             self.memory_manager.start_sync_worker()
             logger.info("✅ Layer 4 initialized")
@@ -1048,6 +1084,46 @@ class CortexSystem:
             except Exception as e:
                 logger.error(f"❌ ConversationManager init failed: {e}")
 
+        # Initialize Visual Memory Index (embedding-based object recall)
+        self.visual_memory = None
+        vm_cfg = conv_config.get('visual_memory', {})
+        if vm_cfg.get('enabled', False) and VisualMemoryIndex:
+            try:
+                embedder = MobileCLIPEmbedder(
+                    model_path=vm_cfg.get('model_path', 'mobileclip2_b.ts'),
+                    image_size=vm_cfg.get('image_size', 256),
+                )
+                self.visual_memory = VisualMemoryIndex(
+                    index_dir=vm_cfg.get('index_dir', 'memory_index'),
+                    db_path=sb_cfg.get('local_db_path', 'cortex_local.db'),
+                    embedder=embedder,
+                    queue_size=vm_cfg.get('queue_size', 32),
+                    crop_interval_s=vm_cfg.get('crop_interval_s', 10.0),
+                )
+                if self.visual_memory.start():
+                    logger.info("✅ Visual memory index initialized")
+                else:
+                    self.visual_memory = None
+            except Exception as e:
+                logger.error(f"❌ Visual memory index init failed: {e}")
+                self.visual_memory = None
+
+        # Initialize Sighting Index (local "where did I see X" answers)
+        self.sighting_index = None
+        si_cfg = conv_config.get('sighting_index', {})
+        if si_cfg.get('enabled', True) and SightingIndex:
+            try:
+                self.sighting_index = SightingIndex(
+                    db_path=sb_cfg.get('local_db_path', 'cortex_local.db'),
+                    hfov_deg=si_cfg.get('hfov_deg', 102.0),
+                    track_gap_s=si_cfg.get('track_gap_s', 3.0),
+                    min_confidence=si_cfg.get('min_confidence', 0.4),
+                    max_answer_age_s=si_cfg.get('max_answer_age_minutes', 360) * 60,
+                )
+                logger.info("✅ Sighting index initialized")
+            except Exception as e:
+                logger.error(f"❌ Sighting index init failed: {e}")
+
         # Initialize Layer 0: Guardian (Safety-Critical Detection)
         logger.info("[DEBUG] ===== LAYER 0 INITIALIZATION START =====")
         if YOLOGuardian:
@@ -1093,6 +1169,14 @@ class CortexSystem:
             logger.warning("⚠️  Layer 1 not available")
         logger.info("[DEBUG] ===== LAYER 1 INITIALIZATION COMPLETE =====")
 
+        # One output stream for every playback path (safety/speech/gemini/beacon/ambient)
+        self.audio_mixer = None
+        if TTSRouter:
+            try:
+                self.audio_mixer = configure_mixer(self.config.get('audio', {}).get('mixer'))
+            except Exception as e:
+                logger.warning(f"⚠️ Audio mixer init failed: {e}")
+
         # Initialize Layer 2: Thinker (Gemini Live API via Manager)
         logger.info("[DEBUG] ===== LAYER 2 INITIALIZATION START =====")
         self.gemini_audio_player = None
@@ -1103,7 +1187,10 @@ class CortexSystem:
             logger.info(f"[DEBUG] Layer 2 config: api_key={'*' * 10} (hidden)")
 
             # Initialize streaming audio player for Gemini output
-            if StreamingAudioPlayer:
+            if self.audio_mixer:
+                self.gemini_audio_player = MixerStreamPlayer(self.audio_mixer, "gemini", sample_rate=24000)
+                logger.info("✅ Gemini output routed to the audio mixer")
+            elif StreamingAudioPlayer:
                 try:
                     self.gemini_audio_player = StreamingAudioPlayer(
                         sample_rate=24000,  # Gemini Live API outputs 24kHz PCM
@@ -1122,6 +1209,8 @@ class CortexSystem:
                         logger.info("🔊 Auto-starting audio player for Gemini response")
                         self.gemini_audio_player.start()
                     self.gemini_audio_player.add_audio_chunk(audio_bytes)
+                    # Closes a voice trace parked after a Gemini Live send
+                    get_tracer().first_audio("gemini_live")
 
             self.layer2 = GeminiLiveManager(
                 api_key=api_key,
@@ -1142,6 +1231,11 @@ class CortexSystem:
         if self.layer2 and hasattr(self.layer2, 'set_tool_callback'):
             self.layer2.set_tool_callback(self._handle_gemini_tool_call)
 
+        # A Gemini Live answer to a voice query is what "repeat" replays
+        self._gemini_answer_pending = False
+        if self.layer2 and hasattr(self.layer2, 'set_response_callback'):
+            self.layer2.set_response_callback(self._on_gemini_response)
+
         logger.info("[DEBUG] ===== LAYER 2 INITIALIZATION COMPLETE =====")
 
         # Initialize Layer 3: Router (Intent Routing)
@@ -1214,16 +1308,49 @@ class CortexSystem:
         self.running = False
         self.detection_count = 0
 
+        # Voice interaction tracer (VAD speech start -> first audio out)
+        self.voice_tracer = configure_tracer(self.config.get('audio', {}).get('tracing', {}))
+
         # TTS singleton (M1 fix: avoid re-instantiation on every voice command)
         self.tts = TTSRouter() if TTSRouter else None
 
         # Initialize Voice Coordinator (with audio config for VAD/Whisper tuning)
         audio_config = self.config.get('audio', {})
+
+        # Phrase cache in front of TTS synthesis (memory LRU + disk)
+        self._tts_cache_config = audio_config.get('tts_cache', {})
+        if self.tts:
+            self.tts.cache = create_tts_cache(self._tts_cache_config)
+            # Engine choice from measured time-to-first-audio (+ link state, below)
+            self.tts.selector = create_tts_selector(audio_config.get('tts_selection', {}))
         self.voice_coordinator = VoiceCoordinator(
             on_command_detected=self.handle_voice_command,
             config=audio_config
         )
         self.voice_coordinator.initialize()
+        if self.tts:
+            # Wake phrase on its own (keyword spotter): short local acknowledgement
+            self.voice_coordinator.on_wake = lambda: run_async_safe(
+                self.tts.speak_async("Yes?", engine_override="kokoro"))
+
+        # Speculative routing: prefetch for vision/recall on stable partial
+        # transcripts (needs streaming STT)
+        self.speculative_router = None
+        spec_cfg = audio_config.get('stt', {}).get('streaming', {}).get('speculative_routing', {})
+        if SpeculativeRouter and self.intent_router and spec_cfg.get('enabled', False):
+            if self.voice_coordinator._streaming_enabled():
+                self.speculative_router = SpeculativeRouter(
+                    self.intent_router,
+                    search_object_fn=(self.conversation_manager.extract_search_object
+                                      if self.conversation_manager else None),
+                    min_stable_words=spec_cfg.get('min_stable_words', 2),
+                    max_age_s=spec_cfg.get('max_age_s', 5.0),
+                )
+                self._register_prefetchers()
+                self.voice_coordinator.on_partial_transcript = self.speculative_router.on_partial
+                logger.info("🔮 Speculative routing enabled (prefetch on partial transcripts)")
+            else:
+                logger.info("⏭️  Speculative routing needs streaming Whisper, disabled")
 
         # Wire GeminiLiveManager into voice pipeline.
         # Raw audio is streamed continuously for ambient context, but
@@ -1279,7 +1406,9 @@ class CortexSystem:
                         getattr(self.navigator, 'spatial_audio', None)]:
             if _sa_ref and hasattr(_sa_ref, 'enable_binaural_engine'):
                 try:
-                    if _sa_ref.enable_binaural_engine(gain=0.8):
+                    if _sa_ref.enable_binaural_engine(gain=0.8,
+                                                      hrtf=self.config.get('spatial_audio', {}).get('hrtf'),
+                                                      voices=self.config.get('spatial_audio', {}).get('voices')):
                         logger.info("✅ BinauralEngine active — HRTF guaranteed without OpenAL")
                     else:
                         logger.warning("⚠️ BinauralEngine init failed — OpenAL is sole 3D audio path")
@@ -1333,6 +1462,23 @@ class CortexSystem:
                 logger.error(f"❌ Failed to init IMU: {e}")
                 self.imu = None
 
+        # Head tracking: every IMU sample feeds the binaural mixer, which
+        # re-projects world-anchored sounds per audio block (not per frame)
+        self.head_tracker = None
+        if self.imu:
+            try:
+                from rpi5.layer3_guide.spatial_audio.head_tracker import HeadTracker
+                self.head_tracker = HeadTracker()
+                self.imu.on_reading = self.head_tracker.push_reading
+                for _sa_ref in [self.spatial_audio,
+                                getattr(self.navigator, 'spatial_audio', None)]:
+                    if _sa_ref and hasattr(_sa_ref, 'set_head_tracker'):
+                        _sa_ref.set_head_tracker(self.head_tracker)
+                logger.info("✅ Head tracking at IMU rate → binaural mixer")
+            except Exception as e:
+                logger.warning(f"⚠️ Head tracker init failed: {e}")
+                self.head_tracker = None
+
         # Button Handler
         self.button = None  # type: Optional[ButtonHandler]
         btn_cfg = sensor_cfg.get('button', {})
@@ -1423,6 +1569,12 @@ class CortexSystem:
                     tts=self.tts,
                 )
                 logger.info("✅ ConnectivityMonitor initialized")
+                if self.tts:
+                    # Cloud TTS is skipped offline and penalized on intermittent links
+                    self.tts.selector.connectivity = self.connectivity_monitor
+                if self.memory_manager:
+                    # Bulk sync stretches its interval on poor links
+                    self.memory_manager.link_monitor = self.connectivity_monitor
             except Exception as e:
                 logger.error(f"❌ Failed to init ConnectivityMonitor: {e}")
                 self.connectivity_monitor = None
@@ -1430,6 +1582,7 @@ class CortexSystem:
         # Initialize Hailo Depth Estimator (lazy — only if config enabled)
         self.depth_estimator = None
         self.audio_alerts = None
+        self.alert_bank = None
         self.ocr_pipeline = None
         self._shared_hailo_vdevice = None  # Shared across depth + OCR
         hailo_config = self.config.get('hailo', {})
@@ -1477,6 +1630,18 @@ class CortexSystem:
                         cooldown=hazard_cfg.get('alert_cooldown', 3.0)
                     )
                     logger.info(f"✅ Audio alerts initialized ({len(self.audio_alerts.available_alerts)} clips)")
+                    if self.audio_mixer:
+                        self.alert_bank = create_alert_bank(
+                            self.config.get('audio', {}).get('alert_bank'),
+                            self.audio_alerts.clip_paths,
+                            sample_rate=self.audio_mixer.sample_rate,
+                        )
+                    if self.alert_bank:
+                        # Rendered once (seconds), afterwards just memory-mapped
+                        def _build_alert_bank():
+                            if self.alert_bank.build():
+                                self.audio_alerts.bank = self.alert_bank
+                        threading.Thread(target=_build_alert_bank, daemon=True, name="AlertBank").start()
                 except Exception as e:
                     logger.error(f"❌ Failed to init audio alerts: {e}")
                     self.audio_alerts = None
@@ -1615,6 +1780,15 @@ class CortexSystem:
                     self.layer1.mode = mode # Direct attribute fallback
                 logger.info(f"✅ Layer 1 switched to {mode}")
 
+        # Voice latency traces: recent spans + p50/p95 per segment
+        elif action == "GET_VOICE_TRACES":
+            if self.ws_client and self.ws_client.is_connected:
+                payload = {
+                    "summary": self.voice_tracer.summary(),
+                    "traces": self.voice_tracer.recent(int(cmd.get("limit", 20))),
+                }
+                self.ws_client.send_status("VOICE_TRACES", json.dumps(payload))
+
     def set_mode(self, mode: str):
         """Set system operation mode"""
         logger.info(f"🔄 set_mode() called with: '{mode}'")
@@ -1828,6 +2002,12 @@ class CortexSystem:
         except Exception as e:
             logger.debug(f"Nav event Gemini forward error: {e}")
 
+    def _on_gemini_response(self, text: str):
+        """Gemini Live finished a turn; remember it if it answered a voice query."""
+        if self._gemini_answer_pending and self.tts:
+            self._gemini_answer_pending = False
+            self.tts.last_spoken = text
+
     def _handle_gemini_tool_call(self, name: str, args: dict) -> dict:
         """Handle function calls from Gemini Live API.
         
@@ -2007,6 +2187,16 @@ class CortexSystem:
             logger.info("🔊 Pre-loading TTS engines (Kokoro + Gemini)...")
             gemini_ok, kokoro_ok = self.tts.initialize()
             logger.info(f"🔊 TTS ready — Kokoro: {'OK' if kokoro_ok else 'FAIL'}, Gemini: {'OK' if gemini_ok else 'FAIL'}")
+            if self.tts.cache is not None:
+                # Synthesize known phrases in the background (disk tier makes this cheap after day one)
+                threading.Thread(
+                    target=lambda: asyncio.run(self.tts.prewarm(
+                        self._tts_cache_config.get('prewarm', []),
+                        self._tts_cache_config.get('templates', []),
+                    )),
+                    name="TTSPrewarm",
+                    daemon=True,
+                ).start()
 
         logger.info("✅ System started")
         logger.info("📸 Capturing frames...")
@@ -2053,7 +2243,8 @@ class CortexSystem:
                         self._camera_blocked_warned = True
                         if self.tts:
                             run_async_safe(self.tts.speak_async(
-                                "My camera seems blocked. Can you check it? I can't see obstacles, so please use your cane."
+                                "My camera seems blocked. Can you check it? I can't see obstacles, so please use your cane.",
+                                urgent=True
                             ))
                         logger.warning("📷 Camera blocked detected — dark frames for >3s")
                 else:
@@ -2066,6 +2257,10 @@ class CortexSystem:
                 # 2. Run Layer 0 + Layer 1 in parallel
                 all_detections = self._run_dual_detection(frame)
 
+                # 2a. Queue Layer 1 crops for visual memory (non-blocking)
+                if self.visual_memory and all_detections:
+                    self.visual_memory.add_detections(frame, all_detections)
+
                 # 2b. Run Hailo depth estimation + hazard detection
                 depth_map = None
                 hazards = []
@@ -2128,6 +2323,20 @@ class CortexSystem:
                     except Exception as e:
                         logger.warning(f"Depth processing error: {e}")
 
+                # 2b'. Record object sightings (class + time + place + heading)
+                if self.sighting_index and all_detections:
+                    try:
+                        imu_now = self.imu.get_reading() if self.imu else None
+                        self.sighting_index.record(
+                            all_detections,
+                            frame.shape,
+                            gps_fix=self.gps.get_fix() if self.gps else None,
+                            heading=imu_now.heading if imu_now else None,
+                            place="indoor" if self._was_indoor else None,
+                        )
+                    except Exception as e:
+                        logger.debug(f"Sighting index error: {e}")
+
                 # 2c. Safety Monitor: fuse YOLO + Hailo depth → tiered alerts
                 if self.safety_monitor:
                     try:
@@ -2139,7 +2348,16 @@ class CortexSystem:
                             # Gemini Live audio is prioritized over safety TTS
 
                             # 3D-positioned warning sound
+                            urgency = "critical" if alert.tier == 1 and alert.needs_haptic else (
+                                "warning" if alert.tier <= 2 else "notice"
+                            )
+                            azimuth = 0.0
                             if alert.position_3d:
+                                azimuth = math.degrees(math.atan2(alert.position_3d[0], -alert.position_3d[2]))
+                            # Pre-rendered and pre-spatialized: lookup + enqueue
+                            banked = bool(alert.position_3d and self.alert_bank and self.alert_bank.trigger(
+                                "chirp" if urgency == "critical" else "tone", azimuth, urgency))
+                            if alert.position_3d and not banked:
                                 sa = None
                                 if self.navigator and hasattr(self.navigator, 'spatial_audio'):
                                     sa = self.navigator.spatial_audio
@@ -2148,14 +2366,11 @@ class CortexSystem:
                                 elif self.spatial_audio:
                                     sa = self.spatial_audio
                                 if sa:
-                                    urgency = "critical" if alert.tier == 1 and alert.needs_haptic else (
-                                        "warning" if alert.tier <= 2 else "notice"
-                                    )
                                     sa.play_directional_alert(alert.position_3d, alert.alert_type, urgency)
 
                             # TTS voice for first-time Tier 1 hazards
                             if alert.needs_tts and self.audio_alerts:
-                                self.audio_alerts.play(alert.alert_type)
+                                self.audio_alerts.play(alert.alert_type, azimuth_deg=azimuth, urgency=urgency)
 
                             # Haptic pulse for critical Tier 1
                             if (alert.needs_haptic
@@ -2419,7 +2634,12 @@ class CortexSystem:
                         battery_percent=self._get_battery_percent(),
                         temperature=self._get_cpu_temp(),
                         active_layers=["layer0", "layer1"],
-                        current_mode="PRODUCTION" if not self.privacy_mode else "PRIVACY"
+                        current_mode="PRODUCTION" if not self.privacy_mode else "PRIVACY",
+                        tts_cache=self.tts.get_cache_stats() if self.tts else None,
+                        tts_selection=self.tts.get_selection_stats() if self.tts else None,
+                        audio_onset=({**self.audio_mixer.get_stats(),
+                                      **({"alert_bank": self.alert_bank.get_stats()} if self.alert_bank else {})}
+                                     if self.audio_mixer else None)
                     )
                     last_metrics_time = time.time()
 
@@ -2734,7 +2954,68 @@ class CortexSystem:
             except Exception as e:
                 logger.warning(f"Heartbeat update failed: {e}")
 
+    def _register_prefetchers(self):
+        """Prefetch the work the vision/recall handlers otherwise do after routing."""
+
+        def prefetch_frame(spec):
+            if self.privacy_mode or not self.camera:
+                return None
+            frame = self.camera.get_frame()
+            if frame is None or spec.cancelled.is_set():
+                return None
+            from PIL import Image
+            pil_frame = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if spec.cancelled.is_set():
+                return None
+            ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+            return {"frame": frame, "pil": pil_frame, "jpeg": jpeg.tobytes() if ok else None}
+
+        def prefetch_llm(spec):
+            # Client construction + key pool setup (the request itself needs the final text);
+            # used by the Gemini vision path in _handle_voice_command
+            from rpi5.layer2_thinker.gemini_tts_handler import GeminiTTS
+            gemini = GeminiTTS()
+            return gemini if gemini.initialize() else None
+
+        def prefetch_visual_recall(spec):
+            if not self.visual_memory:
+                return None
+            vm_cfg = self.config.get('conversation', {}).get('visual_memory', {})
+            return self.visual_memory.search(
+                spec.key, k=vm_cfg.get('top_k', 3), min_score=vm_cfg.get('min_score', 0.2),
+            )
+
+        for route in (VISION, RECALL):
+            self.speculative_router.register_prefetch(route, "frame", prefetch_frame)
+            self.speculative_router.register_prefetch(route, "llm", prefetch_llm)
+        self.speculative_router.register_prefetch(RECALL, "visual_recall", prefetch_visual_recall)
+
     async def handle_voice_command(self, query: str):
+        """
+        Trace wrapper around _handle_voice_command.
+
+        Voice queries arrive inside the trace VoiceCoordinator started at VAD
+        speech start; dashboard text queries get a trace of their own.
+
+        Args:
+            query: User's voice command text
+        """
+        trace = current_trace()
+        if trace is not None:
+            with trace.span("handler"):
+                await self._handle_voice_command(query)
+            return
+
+        tracer = get_tracer()
+        trace = tracer.start("text")
+        with tracer.activate(trace):
+            try:
+                with voice_span("handler"):
+                    await self._handle_voice_command(query)
+            finally:
+                tracer.finish(trace)
+
+    async def _handle_voice_command(self, query: str):
         """
         Handle voice command through routing system with new voice pipeline.
         
@@ -2754,9 +3035,23 @@ class CortexSystem:
 
         logger.info(f"🎤 Voice command: '{query}'")
 
+        # "Repeat": replay the last spoken answer (no routing, no Gemini)
+        if query.lower().strip(" .!?") in ("repeat", "repeat that", "say that again"):
+            if self.tts and self.tts.last_spoken:
+                await self.tts.speak_async(self.tts.last_spoken)
+            else:
+                logger.info("🔁 Nothing to repeat yet")
+            return
+
         # Get routing with detailed flags
-        routing = self.intent_router.route_with_flags(query)
-        target_layer = routing["layer"]
+        with voice_span("route") as route_attrs:
+            routing = self.intent_router.route_with_flags(query)
+            target_layer = routing["layer"]
+
+            # Commit or cancel work speculated on partial transcripts
+            prefetched = self.speculative_router.resolve(query) if self.speculative_router else None
+            prefetched_frame = await prefetched.get_async("frame") if prefetched else None
+            route_attrs.update(layer=target_layer, speculation_hit=prefetched is not None)
         
         logger.info(f"🔀 Routed to: {target_layer} | L0={routing['use_layer0']}, "
                    f"L1={routing['use_layer1']}, Gemini={routing['use_gemini']}, "
@@ -2767,6 +3062,31 @@ class CortexSystem:
             logger.debug(f"Ignoring filler utterance: '{query}'")
             return
 
+        # Local object recall: answer from the sighting index when it is
+        # unambiguous, otherwise fall through to Gemini (with history images)
+        if self.sighting_index and self.conversation_manager:
+            search_obj = self.conversation_manager.extract_search_object(query)
+            if search_obj:
+                try:
+                    imu_now = self.imu.get_reading() if self.imu else None
+                    location = self.gps.get_location() if self.gps else None
+                    answer = self.sighting_index.answer_recall(
+                        search_obj,
+                        current_heading=imu_now.heading if imu_now else None,
+                        current_position=location,
+                    )
+                except Exception as e:
+                    logger.warning(f"Sighting recall failed: {e}")
+                    answer = None
+                if answer:
+                    logger.info(f"📍 [MEMORY] Local recall answer: {answer}")
+                    self.conversation_manager.add_turn("user", query, query_type="recall_local")
+                    self.conversation_manager.add_turn("model", answer, query_type="recall_local")
+                    if self.tts:
+                        await self.tts.speak_async(answer, remember=True)
+                    return
+                logger.info(f"  [MEMORY] No unambiguous sighting of '{search_obj}', asking Gemini")
+
         # ══════════════════════════════════════════════════════════════════
         # GEMINI-FIRST PIPELINE: When Gemini Live is connected, it handles
         # ALL perception queries (Layer 1 detection + Layer 2 analysis)
@@ -2819,14 +3139,22 @@ class CortexSystem:
                 nav_ctx = self.nav_engine.get_context_string()
                 if nav_ctx:
                     prompt_parts.append(nav_ctx)
-            self.layer2.send_text("\n".join(prompt_parts))
-            # Send current video frame for visual context
-            if self.camera:
-                frame = self.camera.get_frame()
-                if frame is not None:
-                    from PIL import Image
-                    pil_frame = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-                    self.layer2.send_video(pil_frame)
+            with voice_span("gemini", mode="live"):
+                self._gemini_answer_pending = True
+                self.layer2.send_text("\n".join(prompt_parts))
+                # Send current video frame for visual context
+                if prefetched_frame:
+                    self.layer2.send_video(prefetched_frame["pil"])
+                elif self.camera:
+                    frame = self.camera.get_frame()
+                    if frame is not None:
+                        from PIL import Image
+                        pil_frame = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                        self.layer2.send_video(pil_frame)
+            # The spoken answer streams back through _on_gemini_audio
+            trace = current_trace()
+            if trace is not None:
+                trace.expect_audio = True
             return
 
         # ---- System-level commands (before routing/frame capture) ----
@@ -2860,7 +3188,7 @@ class CortexSystem:
             except Exception as e:
                 logger.debug(f"Audio event send error: {e}")
 
-        frame = self.camera.get_frame()
+        frame = prefetched_frame["frame"] if prefetched_frame else self.camera.get_frame()
         if frame is None:
             logger.warning("⚠️  No frame available")
             # Speak error via TTS
@@ -2910,7 +3238,7 @@ class CortexSystem:
                     response = "Sorry, there was an error getting directions."
                 # TTS and return — skip normal layer routing
                 if response and self.tts:
-                    await self.tts.speak_async(response)
+                    await self.tts.speak_async(response, remember=True)
                 logger.info(f"✅ Voice command processed: '{response[:50]}...'")
                 return
             elif location_input.strip():
@@ -2938,7 +3266,7 @@ class CortexSystem:
                     logger.error(f"🧭 [NAV] Navigation start error (raw address): {e}")
                     response = "Sorry, there was an error getting directions."
                 if response and self.tts:
-                    await self.tts.speak_async(response)
+                    await self.tts.speak_async(response, remember=True)
                 logger.info(f"✅ Voice command processed: '{response[:50]}...'")
                 return
 
@@ -3004,7 +3332,7 @@ class CortexSystem:
             
             # Speak via TTS (Cartesia cloud preferred — Kokoro CPU starves L0 YOLO)
             if self.tts and response:
-                await self.tts.speak_async(response)
+                await self.tts.speak_async(response, remember=True)
             
             # Store to memory
             if self.memory_manager:
@@ -3034,7 +3362,7 @@ class CortexSystem:
                         response = self.ocr_pipeline.format_for_speech(ocr_results)
                         logger.info(f"  OCR response (local Hailo, {self.ocr_pipeline.avg_latency_ms:.0f}ms): {response}")
                         if self.tts and response:
-                            await self.tts.speak_async(response)
+                            await self.tts.speak_async(response, remember=True)
                         # Store to memory
                         if self.memory_manager:
                             try:
@@ -3058,9 +3386,14 @@ class CortexSystem:
                     from rpi5.layer2_thinker.gemini_tts_handler import GeminiTTS
                     from PIL import Image
                     
-                    gemini = GeminiTTS()
+                    gemini = await prefetched.get_async("llm") if prefetched else None
+                    if gemini is None:
+                        gemini = GeminiTTS()
                     # Frame is BGR (normalized at capture time) — convert to RGB for PIL
-                    pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                    if prefetched_frame:
+                        pil_image = prefetched_frame["pil"]
+                    else:
+                        pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
                     
                     # --- Save camera frame for memory recall ---
                     saved_image_path = None
@@ -3068,6 +3401,11 @@ class CortexSystem:
                         saved_image_path = self.conversation_manager.save_image(pil_image)
                         if saved_image_path:
                             logger.info(f"  [MEMORY] Frame saved: {saved_image_path}")
+                            if self.visual_memory:
+                                self.visual_memory.add_frame(
+                                    pil_image, saved_image_path,
+                                    session_id=self.conversation_manager.session_id,
+                                )
                     
                     # --- Object recall: check if this is a search query ---
                     reference_images = None
@@ -3076,15 +3414,45 @@ class CortexSystem:
                         if search_obj:
                             logger.info(f"  [MEMORY] Object recall: searching for '{search_obj}' in history...")
                             matches = self.conversation_manager.search_object_in_history(search_obj)
+                            # Merge embedding hits — finds the object even if no caption mentioned it
+                            if self.visual_memory:
+                                vm_cfg = self.config.get('conversation', {}).get('visual_memory', {})
+                                seen_paths = {m.get("image_path") for m in matches}
+                                hits = None
+                                if prefetched and prefetched.key == search_obj:
+                                    hits = await prefetched.get_async("visual_recall")
+                                if hits is None:
+                                    hits = self.visual_memory.search(
+                                        search_obj,
+                                        k=vm_cfg.get('top_k', 3),
+                                        min_score=vm_cfg.get('min_score', 0.2),
+                                    )
+                                for hit in hits:
+                                    if hit.image_path and hit.image_path not in seen_paths:
+                                        seen_paths.add(hit.image_path)
+                                        ago_min = (time.time() - hit.timestamp) / 60
+                                        matches.append({
+                                            "image_path": hit.image_path,
+                                            "content": f"Visual memory match for '{search_obj}' "
+                                                       f"(similarity {hit.score:.2f}), seen {ago_min:.0f} minutes ago.",
+                                        })
+                                logger.info(f"  [MEMORY] Visual index: {self.visual_memory.last_search_ms:.1f}ms")
                             if matches:
                                 reference_images = []
+                                conv_cfg_fs = self.config.get('conversation', {}).get('frame_store', {})
+                                ref_max_side = conv_cfg_fs.get('reference_max_side', 640)
                                 for match in matches:
-                                    if match.get("image_path") and os.path.exists(match["image_path"]):
-                                        ref_img = Image.open(match["image_path"])
+                                    if not match.get("image_path"):
+                                        continue
+                                    # Ready-to-send JPEG bytes (no PIL decode/re-encode on the voice path)
+                                    ref_jpeg = self.conversation_manager.get_image_bytes(
+                                        match["image_path"], max_side=ref_max_side
+                                    )
+                                    if ref_jpeg:
                                         context = match.get("full_response") or match.get("content", "")
                                         # Truncate context to ~500 chars for token efficiency
                                         reference_images.append({
-                                            "image": ref_img,
+                                            "jpeg_bytes": ref_jpeg,
                                             "context": context[:500] if context else "Object was seen here previously."
                                         })
                                 logger.info(f"  [MEMORY] Loaded {len(reference_images)} reference images from history")
@@ -3109,14 +3477,16 @@ class CortexSystem:
                             f"max_chars: {max_chars}, code_exec: {enable_code_exec}"
                         )
                     
-                    response = gemini.generate_text_from_image(
-                        pil_image, query,
-                        conversation_history=history,
-                        system_instruction=system_instruction,
-                        enable_code_execution=enable_code_exec,
-                        max_response_chars=max_chars,
-                        reference_images=reference_images,
-                    )
+                    with voice_span("gemini", mode="vision"):
+                        response = gemini.generate_text_from_image(
+                            pil_image, query,
+                            conversation_history=history,
+                            system_instruction=system_instruction,
+                            enable_code_execution=enable_code_exec,
+                            max_response_chars=max_chars,
+                            reference_images=reference_images,
+                            image_jpeg=prefetched_frame["jpeg"] if prefetched_frame else None,
+                        )
                     
                     # --- Fallback if Gemini returned nothing ---
                     if not response:
@@ -3144,7 +3514,7 @@ class CortexSystem:
                     # Speak via TTS — Cartesia Sonic 3 for Layer 2 (ultra-low latency cloud)
                     # Fallback chain: Cartesia -> Kokoro -> Gemini
                     if self.tts and response:
-                        await self.tts.speak_async(response, engine_override="cartesia")
+                        await self.tts.speak_async(response, engine_override="cartesia", remember=True)
                     
                     # Store to memory
                     if self.memory_manager:
@@ -3271,7 +3641,7 @@ class CortexSystem:
                             if geo_data.get('results'):
                                 address = geo_data['results'][0].get('formatted_address', '')
                                 if address and self.tts:
-                                    await self.tts.speak_async(f"You're near {address}.")
+                                    await self.tts.speak_async(f"You're near {address}.", remember=True)
                     except Exception as e:
                         logger.debug(f"Reverse geocode error: {e}")
 
@@ -3329,7 +3699,7 @@ class CortexSystem:
                 response = "Spatial audio system is not available."
             
             if self.tts and response:
-                await self.tts.speak_async(response)
+                await self.tts.speak_async(response, remember=True)
 
             # After Cartesia speaks the route summary, prompt Gemini to elaborate
             if _nav_just_started and self.layer2:
@@ -3362,6 +3732,10 @@ class CortexSystem:
         if self.gemini_audio_player:
             self.gemini_audio_player.stop()
 
+        # Close the shared output stream last (everything above may still be playing into it)
+        if self.audio_mixer:
+            self.audio_mixer.stop()
+
         # Disconnect WebSocket
         if self.ws_client:
             self.ws_client.stop()
@@ -3371,11 +3745,24 @@ class CortexSystem:
             self.memory_manager.stop_sync_worker()
             self.memory_manager.cleanup()
 
+        if self.speculative_router:
+            self.speculative_router.shutdown()
+
+        # Stop visual memory worker
+        if self.visual_memory:
+            self.visual_memory.stop()
+
+        # Persist open object sighting tracks
+        if self.sighting_index:
+            self.sighting_index.close()
+
         # Save conversation session and cleanup old data
         if self.conversation_manager:
             self.conversation_manager.save_session()
             cleanup_days = self.config.get('conversation', {}).get('cleanup_days', 7)
             self.conversation_manager.cleanup_old_conversations(days=cleanup_days)
+            # Drains the frame store's encoder queue before the databases close
+            self.conversation_manager.close()
             session_id = self.conversation_manager.session_id[:8]
             print(f"[Cortex] Session {session_id}... saved. Data is safe.")
             logger.info("Conversation session saved")
@@ -3437,6 +3824,10 @@ class CortexSystem:
         except Exception as e:
             logger.debug(f"Temp audio cleanup error: {e}")
 
+        # Commit queued SQLite writes and close shared connections
+        if close_all_databases:
+            close_all_databases()
+
         logger.info("✅ ProjectCortex v2.0 stopped")
         logger.info(f"📊 Total detections: {self.detection_count}")
 
@@ -0,0 +1,278 @@
+"""
+TTS Phrase Cache - Never Synthesize the Same Sentence Twice
+============================================================
+
+The device says the same things all day: turn instructions, "Camera's
+working again.", battery warnings, connectivity announcements, bus
+arrivals with a couple of variable slots. Every one of them used to go
+through Gemini TTS / Cartesia / Kokoro again.
+
+Cache in front of TTSRouter.speak_async, keyed by
+(engine, voice, speed, normalized text):
+- Memory tier: LRU of decoded int16 PCM with a byte budget
+- Disk tier:   one .npz per phrase (PCM, sample rate, original synthesis
+               time) with a size budget, least recently used evicted first;
+               survives reboots, so boot-time pre-warm is cheap after day one
+- Templates:   "Bus {service} arrives in {minutes} minutes." is spoken as
+               cached fragments ("Bus", "{service}", "arrives in", ...)
+               joined with short gaps, so only unseen slot values are new
+- Metrics:     hits per tier, misses, hit rate, synthesis time saved
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import hashlib
+import logging
+import os
+import re
+import string
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, float, str]
+
+_LEADING_PUNCT = re.compile(r"^[.,;:!?]*")
+_QUOTES = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+
+
+def normalize_text(text: str) -> str:
+    """Cache form of a phrase: straight quotes, single spaces, trimmed."""
+    return " ".join(text.translate(_QUOTES).split())
+
+
+@dataclass
+class CachedAudio:
+    """Decoded audio of one phrase."""
+    pcm: np.ndarray        # int16 mono
+    sample_rate: int
+    synth_ms: float        # What synthesizing it originally cost
+
+    @property
+    def nbytes(self) -> int:
+        return self.pcm.nbytes
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.pcm) / self.sample_rate
+
+
+def template_parts(template: str, slots: Dict[str, object]) -> List[str]:
+    """
+    Split a template into speakable fragments in order.
+
+    Literal text between slots and each filled slot become separate
+    fragments, e.g. ("Bus {service} arrives in {minutes} minutes.",
+    service=190, minutes=4) -> ["Bus", "190", "arrives in", "4", "minutes."].
+    Punctuation right after a slot stays with the slot value ("Orchard.")
+    so each fragment is spoken with its own intonation.
+    """
+    parts: List[str] = []
+    after_slot = False
+    for literal, name, _spec, _conv in string.Formatter().parse(template):
+        literal = normalize_text(literal)
+        punct = _LEADING_PUNCT.match(literal).group()
+        if punct:
+            if after_slot:
+                parts[-1] += punct
+            literal = literal[len(punct):].strip()
+        if literal:
+            parts.append(literal)
+        after_slot = False
+        if name is not None:
+            value = normalize_text(str(slots[name]))
+            if value:
+                parts.append(value)
+                after_slot = True
+    return parts
+
+
+def template_literals(template: str) -> List[str]:
+    """Fixed fragments of a template (what boot-time pre-warm can cache)."""
+    return template_parts(template, defaultdict(str))
+
+
+def join_fragments(fragments: List[CachedAudio], gap_ms: float = 60.0) -> CachedAudio:
+    """Concatenate fragment audio with short silences (all at the first one's rate)."""
+    rate = fragments[0].sample_rate
+    gap = np.zeros(int(rate * gap_ms / 1000), dtype=np.int16)
+    pieces = []
+    for i, fragment in enumerate(fragments):
+        if fragment.sample_rate != rate:
+            raise ValueError("Template fragments must share one sample rate")
+        if i:
+            pieces.append(gap)
+        pieces.append(fragment.pcm)
+    return CachedAudio(np.concatenate(pieces), rate, sum(f.synth_ms for f in fragments))
+
+
+class TTSCache:
+    """Two-tier (memory LRU + disk) cache of synthesized phrases."""
+
+    def __init__(
+        self,
+        memory_mb: float = 32.0,
+        disk_dir: Optional[str] = "cache/tts",
+        disk_mb: float = 200.0,
+    ):
+        """
+        Args:
+            memory_mb: PCM budget of the in-memory LRU
+            disk_dir: Directory of the disk tier (None = memory only)
+            disk_mb: Size budget of the disk tier
+        """
+        self.memory_budget = int(memory_mb * 1024 * 1024)
+        self.disk_budget = int(disk_mb * 1024 * 1024)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._memory: "OrderedDict[CacheKey, CachedAudio]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    @staticmethod
+    def key(engine: str, voice: str, speed: float, text: str) -> CacheKey:
+        return (engine, voice or "default", round(float(speed or 1.0), 2), normalize_text(text))
+
+    def _path(self, key: CacheKey) -> Path:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}.npz"
+
+    # ------------------------------------------------------------------
+    # Lookup / insert
+    # ------------------------------------------------------------------
+
+    def get(self, key: CacheKey) -> Optional[CachedAudio]:
+        """Cached audio for key (memory first, then disk), or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                self.saved_ms += entry.synth_ms
+                return entry
+
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits_disk += 1
+            self.saved_ms += entry.synth_ms
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key: CacheKey, audio: CachedAudio):
+        """Store audio in both tiers."""
+        with self._lock:
+            self._remember(key, audio)
+        self._store(key, audio)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+        return self.disk_dir is not None and self._path(key).exists()
+
+    def _remember(self, key: CacheKey, audio: CachedAudio):
+        """Insert into the memory LRU (lock held)."""
+        if audio.nbytes > self.memory_budget:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.nbytes
+        self._memory[key] = audio
+        self._memory_bytes += audio.nbytes
+        while self._memory_bytes > self.memory_budget:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _load(self, key: CacheKey) -> Optional[CachedAudio]:
+        if self.disk_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                audio = CachedAudio(data["pcm"], int(data["sample_rate"]), float(data["synth_ms"]))
+            os.utime(path)  # Recency for disk eviction
+            return audio
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"TTS cache entry {path.name} unreadable, dropped: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _store(self, key: CacheKey, audio: CachedAudio):
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        try:
+            np.savez(tmp, pcm=audio.pcm, sample_rate=audio.sample_rate, synth_ms=audio.synth_ms)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"⚠️ TTS cache write failed: {e}")
+            return
+        self._enforce_disk_budget()
+
+    def _enforce_disk_budget(self):
+        files = [(p, p.stat()) for p in self.disk_dir.glob("*.npz")]
+        total = sum(st.st_size for _, st in files)
+        if total <= self.disk_budget:
+            return
+        for path, st in sorted(files, key=lambda item: item[1].st_mtime):
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+            if total <= self.disk_budget:
+                break
+
+    def disk_usage(self) -> int:
+        if self.disk_dir is None:
+            return 0
+        return sum(p.stat().st_size for p in self.disk_dir.glob("*.npz"))
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, float]:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+            "saved_synth_ms": round(self.saved_ms),
+            "memory_entries": len(self._memory),
+            "memory_mb": round(self._memory_bytes / 1024 / 1024, 2),
+        }
+
+
+def create_tts_cache(config: Optional[dict]) -> Optional[TTSCache]:
+    """Cache from the audio.tts_cache config block (None if disabled)."""
+    config = config or {}
+    if not config.get("enabled", True):
+        return None
+    return TTSCache(
+        memory_mb=config.get("memory_mb", 32.0),
+        disk_dir=config.get("disk_dir", "cache/tts"),
+        disk_mb=config.get("disk_mb", 200.0),
+    )
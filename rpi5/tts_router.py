@@ -2,10 +2,26 @@
 TTS Router - Smart Text-to-Speech Routing
 ==========================================
 
-Routes text to the appropriate TTS engine based on text length:
+Routes text to the engine predicted to start speaking first: a
+TTSEngineSelector keeps rolling time-to-first-audio per engine and text
+length, folds in the ConnectivityMonitor level, and orders the fallback
+chain fastest first. Short urgent lines are hedged: if the cloud engine
+has not delivered by a deadline, Kokoro starts in parallel and the first
+one wins. Before any measurements (or without initialize()) the static
+rule applies:
 - Short text (<300 chars): Gemini 2.5 Flash TTS (cloud, natural voice)
 - Long text (>=300 chars): Kokoro TTS (local, faster for long text)
 
+Kokoro streams clause by clause into a persistent in-process player
+(playback starts after the first clause) when sounddevice is available,
+otherwise the whole response is rendered and played with aplay. When the
+shared AudioMixer is running, all of it goes to its speech channel instead
+(paused under safety alerts, no per-utterance process or device open).
+
+An optional TTSCache (memory LRU + disk) sits in front of synthesis:
+repeated phrases are played from cache, templated phrases are composed
+from cached fragments, and known phrases can be pre-warmed at boot.
+
 Auto-saves every TTS output as a pristine .wav file to tts_recordings/
 for video editing (mute camera audio, drag in the .wav).
 
@@ -18,9 +34,14 @@ import logging
 import asyncio
 import time
 import re
-from typing import Optional, Tuple, Callable
+from typing import Iterable, Optional, Tuple, Callable
 from pathlib import Path
 
+from rpi5.audio_mixer import MixerStreamPlayer, get_mixer
+from rpi5.tts_cache import CachedAudio, TTSCache, join_fragments, template_literals, template_parts
+from rpi5.tts_selector import TTSEngineSelector, hedged
+from rpi5.voice_trace import current_trace, get_tracer, voice_span
+
 logger = logging.getLogger(__name__)
 
 # TTS Engine imports (lazy loaded)
@@ -77,15 +98,72 @@ def _get_cartesia_tts():
     return _cartesia_tts
 
 
+_stream_player = None
+
+
+def _get_stream_player():
+    """Lazy load the persistent 24kHz player for streaming Kokoro."""
+    global _stream_player
+    if _stream_player is None:
+        mixer = get_mixer()
+        if mixer is not None:
+            _stream_player = MixerStreamPlayer(mixer, "speech", sample_rate=24000)
+            return _stream_player
+        try:
+            from rpi5.layer2_thinker.streaming_audio_player import StreamingAudioPlayer
+            # 50ms blocks; stays open between responses (no per-utterance device open)
+            _stream_player = StreamingAudioPlayer(sample_rate=24000, blocksize=1200, silence_timeout=60.0)
+        except Exception as e:
+            logger.warning(f"Streaming TTS player unavailable, using aplay: {e}")
+            _stream_player = False
+    return _stream_player or None
+
+
+def _wav_to_cached(audio_data: bytes, synth_ms: float) -> Optional[CachedAudio]:
+    """Decode engine WAV bytes (16-bit mono) for the cache."""
+    import io
+    import wave
+    import numpy as np
+    try:
+        with wave.open(io.BytesIO(audio_data), 'rb') as wf:
+            if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+                return None
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).copy()
+            return CachedAudio(pcm, wf.getframerate(), synth_ms)
+    except Exception as e:
+        logger.debug(f"TTS audio not cacheable: {e}")
+        return None
+
+
+def _cached_to_wav(audio: CachedAudio) -> bytes:
+    import io
+    import wave
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(audio.sample_rate)
+        wf.writeframes(audio.pcm.tobytes())
+    return buffer.getvalue()
+
+
+def _mark_first_audio(player: str):
+    """First sample handed to the output device for the traced interaction."""
+    trace = current_trace()
+    if trace is not None:
+        get_tracer().first_audio(player, trace)
+
+
 class TTSRouter:
     """
-    Smart TTS router that selects the best TTS engine based on text length.
+    Smart TTS router that selects the TTS engine predicted to be fastest.
     
     Routing logic:
-    - Short text (<300 chars): Gemini 2.5 Flash TTS (natural, cloud-based)
-    - Long text (>=300 chars): Kokoro TTS (local, faster for long responses)
+    - Measured: lowest predicted time-to-first-audio (TTSEngineSelector),
+      fallback chain in the same order; urgent short lines are hedged
+    - Static (no engines initialized): short text -> Gemini, long -> Kokoro
     - Cartesia Sonic 3: Ultra-low latency cloud TTS for Layer 2 (via engine_override)
-    - Fallback: If primary engine fails, use the other
+    - Fallback: If primary engine fails, use the next one
     
     Engine override options: "gemini", "kokoro", "cartesia"
     """
@@ -103,7 +181,8 @@ class TTSRouter:
         self,
         length_threshold: int = 300,
         prefer_local: bool = False,
-        audio_output_dir: str = "temp_audio"
+        audio_output_dir: str = "temp_audio",
+        streaming: bool = True
     ):
         """
         Initialize TTS Router.
@@ -112,6 +191,7 @@ class TTSRouter:
             length_threshold: Character count threshold for switching to Kokoro
             prefer_local: If True, always use Kokoro (offline mode)
             audio_output_dir: Directory for temporary audio files
+            streaming: Stream Kokoro clause by clause into a persistent player
         """
         if self._initialized:
             return
@@ -129,6 +209,11 @@ class TTSRouter:
         self._gemini_available = False
         self._kokoro_available = False
         self._cartesia_available = False
+        self.last_spoken: Optional[str] = None  # Last answer played (for "repeat")
+        self.streaming = streaming
+        self._kokoro_stream = None  # StreamingSynthesizer (created on first use)
+        self.cache: Optional[TTSCache] = None  # Phrase cache (set by the owner)
+        self.selector = TTSEngineSelector()  # Owner may replace it / attach a ConnectivityMonitor
         
         self._initialized = True
         logger.info(f"TTSRouter initialized (threshold: {length_threshold} chars)")
@@ -196,6 +281,21 @@ class TTSRouter:
         
         return self._gemini_available, self._kokoro_available
     
+    def _available_engines(self) -> list:
+        return [engine for engine, available in (
+            ("cartesia", self._cartesia_available),
+            ("gemini", self._gemini_available),
+            ("kokoro", self._kokoro_available),
+        ) if available]
+
+    def _engine_order(self, text: str, first: str) -> list:
+        """first, then the remaining engines fastest first (the fallback chain)."""
+        ranked = self.selector.rank(text, self._available_engines())
+        if not ranked:
+            # Nothing initialized: the original fixed chains
+            ranked = {"cartesia": ["kokoro", "gemini"], "gemini": ["kokoro"]}.get(first, ["gemini"])
+        return [first] + [engine for engine in ranked if engine != first]
+
     def select_engine(self, text: str) -> str:
         """
         Select the appropriate TTS engine for the given text.
@@ -209,9 +309,10 @@ class TTSRouter:
         if self.prefer_local:
             return "kokoro"
         
-        # Primary: Cartesia Sonic 3 (lowest latency cloud TTS)
-        if self._cartesia_available:
-            return "cartesia"
+        # Engine predicted to produce first audio soonest
+        engine = self.selector.select(text, self._available_engines())
+        if engine is not None:
+            return engine
         
         text_length = len(text)
         
@@ -227,7 +328,9 @@ class TTSRouter:
         text: str,
         play_audio: bool = True,
         save_path: Optional[str] = None,
-        engine_override: Optional[str] = None
+        engine_override: Optional[str] = None,
+        urgent: bool = False,
+        remember: bool = False
     ) -> Tuple[bool, str, Optional[bytes]]:
         """
         Synthesize and optionally play text using the appropriate TTS engine.
@@ -238,39 +341,43 @@ class TTSRouter:
             save_path: Optional path to save audio file
             engine_override: Force a specific engine ("gemini", "kokoro", or "cartesia"),
                              bypassing the automatic selection logic.
+            urgent: Safety-relevant line: hedge a cloud engine with Kokoro
+            remember: An answer to the user: once played it is what "repeat"
+                      replays (never set for acknowledgements / announcements)
             
         Returns:
             Tuple of (success, engine_used, audio_bytes)
         """
         engine = engine_override or self.select_engine(text)
+
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(engine, text))
+            if cached is not None:
+                logger.info(f"TTS cache hit '{text[:50]}' ({engine}, saved {cached.synth_ms:.0f}ms)")
+                result = await self._finish_cached(text, engine, cached, play_audio, save_path)
+                if remember and play_audio:
+                    self.last_spoken = text
+                return result
+
         logger.info(f"TTS routing '{text[:50]}...' to {engine} ({len(text)} chars)")
         
         success = False
         audio_data = None
+        synth_ms = 0.0
         
         try:
-            if engine == "cartesia":
-                success, audio_data = await self._speak_cartesia(text, play_audio, save_path)
-                if not success:
-                    logger.warning("Cartesia TTS failed, falling back to Kokoro")
-                    engine = "kokoro"
-                    success, audio_data = await self._speak_kokoro(text, play_audio, save_path)
-                    if not success:
-                        logger.warning("Kokoro TTS also failed, falling back to Gemini")
-                        engine = "gemini"
-                        success, audio_data = await self._speak_gemini(text, play_audio, save_path)
-            elif engine == "gemini":
-                success, audio_data = await self._speak_gemini(text, play_audio, save_path)
-                if not success:
-                    logger.warning("Gemini TTS failed, falling back to Kokoro")
-                    engine = "kokoro"
-                    success, audio_data = await self._speak_kokoro(text, play_audio, save_path)
+            deadline = self.selector.hedge_deadline(text, engine, self._available_engines(), urgent)
+            if deadline is not None:
+                success, engine, audio_data, synth_ms = await self._speak_hedged(
+                    text, engine, deadline, play_audio, save_path)
             else:
-                success, audio_data = await self._speak_kokoro(text, play_audio, save_path)
-                if not success:
-                    logger.warning("Kokoro TTS failed, falling back to Gemini")
-                    engine = "gemini"
-                    success, audio_data = await self._speak_gemini(text, play_audio, save_path)
+                order = self._engine_order(text, engine)
+                for i, engine in enumerate(order):
+                    if i:
+                        logger.warning(f"{order[i - 1].capitalize()} TTS failed, falling back to {engine.capitalize()}")
+                    success, audio_data, synth_ms = await self._speak_measured(engine, text, play_audio, save_path)
+                    if success:
+                        break
         
         except Exception as e:
             logger.error(f"TTS error: {e}")
@@ -278,8 +385,219 @@ class TTSRouter:
         # Auto-save pristine recording for video editing
         if success and audio_data:
             self._save_recording(audio_data, engine, text)
+        if success and play_audio and remember:
+            self.last_spoken = text
+        if success and audio_data and self.cache is not None:
+            cached = _wav_to_cached(audio_data, synth_ms)
+            if cached is not None:
+                self.cache.put(self._cache_key(engine, text), cached)
         
         return success, engine, audio_data
+
+    # ------------------------------------------------------------------
+    # Engine calls (measured for the selector)
+    # ------------------------------------------------------------------
+
+    def _speak_engine(self, engine: str, text: str, play_audio: bool, save_path: Optional[str]):
+        """One engine call -> (success, audio_bytes, synth_ms, ttfa_ms or None)."""
+        speak = {"cartesia": self._speak_cartesia, "gemini": self._speak_gemini}.get(engine, self._speak_kokoro)
+        return speak(text, play_audio, save_path)
+
+    async def _speak_measured(self, engine: str, text: str, play_audio: bool,
+                              save_path: Optional[str]) -> Tuple[bool, Optional[bytes], float]:
+        """
+        One engine call; its time-to-first-audio (or failure) feeds the selector.
+
+        Returns:
+            Tuple of (success, audio_bytes, synth_ms)
+        """
+        start = time.perf_counter()
+        success, audio_data, synth_ms, ttfa_ms = await self._speak_engine(engine, text, play_audio, save_path)
+        if success:
+            # Cloud / batch paths play after synthesis; streamed Kokoro reports its own TTFA
+            self.selector.model.record(engine, len(text), ttfa_ms if ttfa_ms is not None else synth_ms)
+        else:
+            self.selector.model.record_failure(engine, len(text), (time.perf_counter() - start) * 1000)
+        return success, audio_data, synth_ms
+
+    async def _speak_hedged(self, text: str, primary: str, deadline_s: float, play_audio: bool,
+                            save_path: Optional[str]) -> Tuple[bool, str, Optional[bytes], float]:
+        """
+        Synthesize with primary, start Kokoro after deadline_s, play whichever is ready first.
+
+        Returns:
+            Tuple of (success, engine_used, audio_bytes, synth_ms of the winner)
+        """
+        self.selector.hedges += 1
+        start = time.perf_counter()
+
+        async def synthesize(engine: str) -> Optional[Tuple[bytes, float]]:
+            t0 = time.perf_counter()
+            success, audio_data, synth_ms, _ = await self._speak_engine(engine, text, False, None)
+            elapsed = (time.perf_counter() - t0) * 1000
+            if success and audio_data:
+                self.selector.model.record(engine, len(text), elapsed)
+                return audio_data, synth_ms
+            self.selector.model.record_failure(engine, len(text), elapsed)
+            return None
+
+        with voice_span("tts_hedge", primary=primary, deadline_ms=round(deadline_s * 1000)) as attrs:
+            winner, result = await hedged(lambda: synthesize(primary), lambda: synthesize("kokoro"), deadline_s)
+            attrs.update(winner=winner)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if winner is None:
+            return False, primary, None, 0.0
+        audio_data, synth_ms = result
+
+        engine = primary
+        if winner == "backup":
+            engine = "kokoro"
+            self.selector.hedge_backup_wins += 1
+            # The cancelled primary took at least this long
+            self.selector.model.record(primary, len(text), elapsed_ms)
+        logger.info(f"TTS hedge: {engine} first after {elapsed_ms:.0f}ms (primary {primary})")
+
+        if save_path:
+            with open(save_path, 'wb') as f:
+                f.write(audio_data)
+        if play_audio:
+            cached = _wav_to_cached(audio_data, synth_ms)
+            if cached is not None:
+                await self._play_cached(cached)
+            else:
+                temp_path = str(self.audio_output_dir / "hedge_temp.wav")
+                with open(temp_path, 'wb') as f:
+                    f.write(audio_data)
+                await self._play_audio_file(temp_path)
+        return True, engine, audio_data, synth_ms
+
+    def get_selection_stats(self) -> dict:
+        """Measured TTFA per engine / length bucket and hedge outcomes."""
+        return self.selector.get_stats()
+
+    # ------------------------------------------------------------------
+    # Phrase cache
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, engine: str, text: str):
+        """(engine, voice, speed, normalized text) for the current engine settings."""
+        voice, speed = "default", 1.0
+        try:
+            if engine == "kokoro" and _get_kokoro_tts():
+                voice, speed = _kokoro_tts.default_voice, _kokoro_tts.default_speed
+            elif engine == "cartesia" and _get_cartesia_tts():
+                voice, speed = _cartesia_tts.voice_id, _cartesia_tts.speed
+            elif engine == "gemini" and _get_gemini_tts():
+                voice = _gemini_tts.voice_name
+        except AttributeError:
+            pass
+        return TTSCache.key(engine, voice, speed, text)
+
+    async def _finish_cached(self, text: str, engine: str, audio: CachedAudio,
+                             play_audio: bool, save_path: Optional[str]) -> Tuple[bool, str, Optional[bytes]]:
+        audio_data = _cached_to_wav(audio)
+        if save_path:
+            with open(save_path, 'wb') as f:
+                f.write(audio_data)
+        if play_audio:
+            await self._play_cached(audio)
+        return True, engine, audio_data
+
+    async def _play_cached(self, audio: CachedAudio):
+        """Play cached PCM (persistent stream player if running at its rate, else aplay)."""
+        player = _get_stream_player() if self.streaming else None
+        if player is not None and player.sample_rate == audio.sample_rate:
+            with voice_span("player_spawn", player="stream_player"):
+                player.add_audio_chunk(audio.pcm.tobytes())
+            _mark_first_audio("stream_player")
+            await asyncio.to_thread(player.wait_drained, audio.duration_s + 5.0)
+        else:
+            await self._play_audio_samples(audio.pcm, audio.sample_rate)
+
+    async def _synthesize_cached(self, engine: str, text: str) -> Optional[CachedAudio]:
+        """Cached audio for text, synthesizing (without playing) on a miss."""
+        key = self._cache_key(engine, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        success, audio_data, synth_ms, _ = await self._speak_engine(engine, text, False, None)
+        cached = _wav_to_cached(audio_data, synth_ms) if success and audio_data else None
+        if cached is not None:
+            self.cache.put(key, cached)
+        return cached
+
+    async def speak_template_async(
+        self,
+        template: str,
+        play_audio: bool = True,
+        engine_override: Optional[str] = None,
+        **slots
+    ) -> Tuple[bool, str, Optional[bytes]]:
+        """
+        Speak a templated phrase composed from cached fragments.
+        
+        "Bus {service} arrives in {minutes} minutes." is spoken as the
+        fragments "Bus", "<service>", "arrives in", "<minutes>", "minutes."
+        so only unseen slot values need synthesis. Without a cache (or if a
+        fragment cannot be synthesized) the filled-in text is spoken whole.
+        
+        Args:
+            template: str.format template
+            play_audio: If True, play audio immediately
+            engine_override: Force a specific engine
+            **slots: Template values
+            
+        Returns:
+            Tuple of (success, engine_used, audio_bytes)
+        """
+        text = template.format(**slots)
+        if self.cache is None:
+            return await self.speak_async(text, play_audio, engine_override=engine_override)
+        engine = engine_override or self.select_engine(text)
+
+        fragments = []
+        for part in template_parts(template, slots):
+            fragment = await self._synthesize_cached(engine, part)
+            if fragment is None:
+                return await self.speak_async(text, play_audio, engine_override=engine_override)
+            fragments.append(fragment)
+        try:
+            audio = join_fragments(fragments)
+        except ValueError:
+            return await self.speak_async(text, play_audio, engine_override=engine_override)
+        return await self._finish_cached(text, engine, audio, play_audio, None)
+
+    async def prewarm(self, phrases: Iterable[str], templates: Iterable[str] = (),
+                      engine: Optional[str] = None) -> int:
+        """
+        Synthesize known phrases and template fragments into the cache.
+        
+        Args:
+            phrases: Fixed phrases the device speaks
+            templates: Templates whose literal fragments should be cached
+            engine: Engine to warm (default: what select_engine would pick)
+            
+        Returns:
+            Number of phrases newly synthesized
+        """
+        if self.cache is None:
+            return 0
+        texts = list(phrases)
+        for template in templates:
+            texts.extend(template_literals(template))
+        warmed = 0
+        for text in texts:
+            target = engine or self.select_engine(text)
+            if self._cache_key(target, text) in self.cache:
+                continue
+            if await self._synthesize_cached(target, text) is not None:
+                warmed += 1
+        logger.info(f"🔥 TTS cache pre-warmed: {warmed} new of {len(texts)} phrases")
+        return warmed
+
+    def get_cache_stats(self) -> dict:
+        """Phrase cache hit rate and synthesis time saved (empty without a cache)."""
+        return self.cache.get_stats() if self.cache is not None else {}
     
     def speak(
         self,
@@ -315,53 +633,69 @@ class TTSRouter:
         text: str,
         play_audio: bool,
         save_path: Optional[str]
-    ) -> Tuple[bool, Optional[bytes]]:
+    ) -> Tuple[bool, Optional[bytes], float, Optional[float]]:
         """Use Gemini TTS to synthesize speech."""
         gemini = _get_gemini_tts()
         if not gemini:
-            return False, None
+            return False, None, 0.0, None
         
         try:
             # GeminiTTS.generate_speech_from_text() returns path to saved audio file
-            audio_path = await asyncio.to_thread(
-                gemini.generate_speech_from_text, text
-            )
+            start = time.perf_counter()
+            with voice_span("tts_synth", engine="gemini"):
+                audio_path = await asyncio.to_thread(
+                    gemini.generate_speech_from_text, text
+                )
+            synth_ms = (time.perf_counter() - start) * 1000
             
             if audio_path:
-                audio_data = None
-                if save_path or not play_audio:
-                    with open(audio_path, 'rb') as f:
-                        audio_data = f.read()
-                    if save_path:
-                        import shutil
-                        shutil.copy(audio_path, save_path)
+                with open(audio_path, 'rb') as f:
+                    audio_data = f.read()
+                if save_path:
+                    import shutil
+                    shutil.copy(audio_path, save_path)
                 
                 if play_audio:
                     # Play using sounddevice or system audio
                     await self._play_audio_file(audio_path)
                 
-                return True, audio_data
+                return True, audio_data, synth_ms, None
             
-            return False, None
+            return False, None, 0.0, None
             
         except Exception as e:
             logger.error(f"Gemini TTS error: {e}")
-            return False, None
+            return False, None, 0.0, None
     
     async def _speak_kokoro(
         self,
         text: str,
         play_audio: bool,
         save_path: Optional[str]
-    ) -> Tuple[bool, Optional[bytes]]:
+    ) -> Tuple[bool, Optional[bytes], float, Optional[float]]:
         """Use Kokoro TTS to synthesize speech."""
         kokoro = _get_kokoro_tts()
         if not kokoro:
-            return False, None
+            return False, None, 0.0, None
         
         try:
-            # KokoroTTS.generate_speech() returns audio samples (numpy array)
-            audio_samples = kokoro.generate_speech(text)
+            streamer = self._get_kokoro_stream(kokoro) if play_audio else None
+            if streamer is not None:
+                # Clause-wise synthesis into the live player; blocks until played
+                with voice_span("tts_synth", engine="kokoro", streaming=True) as attrs:
+                    result = await asyncio.to_thread(streamer.speak, text)
+                    attrs.update(ttfa_ms=round(result.ttfa_ms), clauses=result.chunks)
+                audio_samples = result.audio
+                synth_ms, ttfa_ms = result.synth_ms, result.ttfa_ms
+                play_audio = False  # Already played
+            else:
+                # KokoroTTS.generate_speech() returns audio samples (numpy array).
+                # Off the event loop: as a hedge backup it races the primary's thread.
+                ttfa_ms = None
+                start = time.perf_counter()
+                with voice_span("tts_synth", engine="kokoro"):
+                    audio_samples = await asyncio.to_thread(kokoro.generate_speech, text)
+                synth_ms = (time.perf_counter() - start) * 1000
             
             if audio_samples is not None:
                 # Convert to WAV bytes
@@ -373,7 +707,7 @@ class TTSRouter:
                 sample_rate = 24000
                 
                 # Normalize to int16
-                audio_int16 = (audio_samples * 32767).astype(np.int16)
+                audio_int16 = (np.clip(audio_samples, -1.0, 1.0) * 32767).astype(np.int16)
                 
                 # Create WAV in memory
                 wav_buffer = io.BytesIO()
@@ -392,28 +726,55 @@ class TTSRouter:
                 if play_audio:
                     await self._play_audio_samples(audio_samples, sample_rate)
                 
-                return True, audio_data
+                return True, audio_data, synth_ms, ttfa_ms
             
-            return False, None
+            return False, None, 0.0, None
             
         except Exception as e:
             logger.error(f"Kokoro TTS error: {e}")
-            return False, None
+            return False, None, 0.0, None
     
+    def _get_kokoro_stream(self, kokoro):
+        """StreamingSynthesizer over Kokoro + the persistent player (None = use aplay)."""
+        if not self.streaming:
+            return None
+        if self._kokoro_stream is None:
+            player = _get_stream_player()
+            if player is None:
+                self.streaming = False
+                return None
+            from rpi5.layer1_reflex.tts_streaming import StreamingSynthesizer
+            self._kokoro_stream = StreamingSynthesizer(
+                kokoro.generate_speech_streaming,
+                player,
+                sample_rate=24000,
+                on_first_audio=lambda: _mark_first_audio("stream_player"),
+            )
+        return self._kokoro_stream
+
+    def get_stream_stats(self) -> dict:
+        """Time-to-first-audio of streamed Kokoro responses."""
+        if self._kokoro_stream is None:
+            return {"count": 0}
+        return {"count": self._kokoro_stream.ttfa.count, **self._kokoro_stream.ttfa.summary()}
+
     async def _speak_cartesia(
         self,
         text: str,
         play_audio: bool,
         save_path: Optional[str]
-    ) -> Tuple[bool, Optional[bytes]]:
+    ) -> Tuple[bool, Optional[bytes], float, Optional[float]]:
         """Use Cartesia Sonic 3 TTS to synthesize speech."""
         cartesia = _get_cartesia_tts()
         if not cartesia:
-            return False, None
+            return False, None, 0.0, None
         
         try:
             # CartesiaTTS.generate_speech() returns WAV bytes directly
-            audio_bytes = await asyncio.to_thread(cartesia.generate_speech, text)
+            start = time.perf_counter()
+            with voice_span("tts_synth", engine="cartesia"):
+                audio_bytes = await asyncio.to_thread(cartesia.generate_speech, text)
+            synth_ms = (time.perf_counter() - start) * 1000
             
             if audio_bytes:
                 if save_path:
@@ -427,28 +788,64 @@ class TTSRouter:
                         f.write(audio_bytes)
                     await self._play_audio_file(temp_path)
                 
-                return True, audio_bytes
+                return True, audio_bytes, synth_ms, None
             
-            return False, None
+            return False, None, 0.0, None
             
         except Exception as e:
             logger.error(f"Cartesia TTS error: {e}")
-            return False, None
+            return False, None, 0.0, None
     
+    @staticmethod
+    def _run_player(cmd, timeout: float = 30):
+        """Run an audio player process to completion (called via asyncio.to_thread).
+
+        The trace records the process spawn and takes the spawn as the first
+        audio out: aplay starts writing to ALSA right after it opens the file.
+        """
+        import subprocess
+        with voice_span("player_spawn", player=cmd[0]):
+            proc = subprocess.Popen(cmd)
+        _mark_first_audio(cmd[0])
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+
+    @staticmethod
+    async def _play_on_mixer(mixer, samples, sample_rate: int):
+        """Queue samples on the mixer speech channel and wait until played."""
+        with voice_span("player_spawn", player="mixer"):
+            playback = mixer.play("speech", samples, sample_rate)
+        _mark_first_audio("mixer")
+        await asyncio.to_thread(playback.wait, len(samples) / sample_rate + 5.0)
+
     async def _play_audio_file(self, audio_path: str):
-        """Play an audio file via aplay (Linux) or sounddevice (fallback).
+        """Play an audio file via the mixer, aplay (Linux) or sounddevice (fallback).
         
         On Linux (RPi5), uses aplay to avoid PortAudio mutex contention
         between PyAudio (VAD input) and sounddevice (Gemini output).
         """
         import platform
+        mixer = get_mixer()
+        if mixer is not None:
+            import wave
+            import numpy as np
+            try:
+                with wave.open(audio_path, 'rb') as wf:
+                    samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+                    if wf.getnchannels() > 1:
+                        samples = samples.reshape(-1, wf.getnchannels())
+                    rate = wf.getframerate()
+                await self._play_on_mixer(mixer, samples, rate)
+                return
+            except Exception as e:
+                logger.warning(f"Mixer playback failed, using fallback player: {e}")
         if platform.system() == "Linux":
-            import subprocess
             try:
-                await asyncio.to_thread(
-                    subprocess.run, ["aplay", "-q", audio_path],
-                    check=False, timeout=30
-                )
+                await asyncio.to_thread(self._run_player, ["aplay", "-q", audio_path])
             except Exception as e:
                 logger.error(f"aplay error: {e}")
             return
@@ -458,23 +855,28 @@ class TTSRouter:
             import sounddevice as sd
             import soundfile as sf
             data, samplerate = sf.read(audio_path)
-            sd.play(data, samplerate)
+            with voice_span("player_spawn", player="sounddevice"):
+                sd.play(data, samplerate)
+            _mark_first_audio("sounddevice")
             sd.wait()
         except Exception as e:
             logger.error(f"Audio playback error: {e}")
     
     async def _play_audio_samples(self, samples, sample_rate: int):
-        """Play audio samples via aplay (Linux) or sounddevice (fallback).
+        """Play audio samples via the mixer, aplay (Linux) or sounddevice (fallback).
         
         On Linux (RPi5), writes a temp WAV and uses aplay to avoid
         PortAudio mutex contention with concurrent PyAudio/sounddevice streams.
         """
         import platform
+        mixer = get_mixer()
+        if mixer is not None:
+            await self._play_on_mixer(mixer, samples, sample_rate)
+            return
         if platform.system() == "Linux":
             import tempfile
             import wave
             import numpy as np
-            import subprocess
             import os
             temp_path = None
             try:
@@ -487,10 +889,7 @@ class TTSRouter:
                         if isinstance(samples, np.ndarray) and samples.dtype == np.float32:
                             samples = (samples * 32767).astype(np.int16)
                         wf.writeframes(samples.tobytes())
-                await asyncio.to_thread(
-                    subprocess.run, ["aplay", "-q", temp_path],
-                    check=False, timeout=30
-                )
+                await asyncio.to_thread(self._run_player, ["aplay", "-q", temp_path])
             except Exception as e:
                 logger.error(f"aplay samples error: {e}")
             finally:
@@ -504,7 +903,9 @@ class TTSRouter:
         # Non-Linux fallback
         try:
             import sounddevice as sd
-            sd.play(samples, sample_rate)
+            with voice_span("player_spawn", player="sounddevice"):
+                sd.play(samples, sample_rate)
+            _mark_first_audio("sounddevice")
             sd.wait()
         except Exception as e:
             logger.error(f"Audio playback error: {e}")
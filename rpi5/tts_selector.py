@@ -0,0 +1,275 @@
+"""
+TTS Engine Selector - Pick the Engine That Will Speak First
+===========================================================
+
+TTSRouter used to route on fixed rules (prefer_local, "Cartesia if
+available", a 300-character threshold) and fail over sequentially, so a
+slow or dead cloud call cost its whole timeout before Kokoro even started.
+
+The selector predicts time-to-first-audio (TTFA) from live measurements:
+- Rolling TTFA per engine and per text-length bucket; only recent
+  samples count, so an engine that was slow during an outage is retried
+  once its bad samples age out
+- Failures are recorded as penalty samples (elapsed time + penalty)
+- Priors (base + per-character cost) until an engine has enough samples
+- ConnectivityMonitor level: cloud engines are skipped when OFFLINE and
+  penalized when the link is INTERMITTENT
+- Engines are ranked fastest first; the ranking is also the fallback order
+- hedged(): for short safety-relevant lines the primary (cloud) engine gets
+  a deadline, after which local Kokoro starts in parallel; the first
+  success wins and the loser is cancelled
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOUD_ENGINES = ("cartesia", "gemini")
+LOCAL_ENGINE = "kokoro"
+
+# Level values of layer3_guide.connectivity_monitor.ConnectivityLevel
+OFFLINE = 1
+INTERMITTENT = 2
+
+
+@dataclass
+class EnginePrior:
+    """TTFA guess before measurements exist: base_ms + ms_per_char * len(text)."""
+    base_ms: float
+    ms_per_char: float
+
+
+# Cloud engines return the whole utterance before playback starts, so their
+# TTFA grows with length; streamed Kokoro starts after its first clause.
+DEFAULT_PRIORS = {
+    "cartesia": EnginePrior(350.0, 1.5),
+    "gemini": EnginePrior(900.0, 5.0),
+    "kokoro": EnginePrior(300.0, 0.5),
+}
+
+
+class EngineLatencyModel:
+    """Rolling TTFA samples per (engine, length bucket)."""
+
+    def __init__(
+        self,
+        buckets: Tuple[int, ...] = (60, 150, 300),
+        window: int = 32,
+        max_age_s: float = 600.0,
+        min_samples: int = 3,
+        priors: Optional[Dict[str, EnginePrior]] = None,
+    ):
+        """
+        Args:
+            buckets: Upper character bounds of the length buckets (one more
+                     bucket holds everything longer)
+            window: Samples kept per (engine, bucket)
+            max_age_s: Samples older than this are ignored
+            min_samples: Recent samples needed before trusting measurements
+            priors: Per-engine TTFA priors
+        """
+        self.buckets = tuple(buckets)
+        self.window = window
+        self.max_age_s = max_age_s
+        self.min_samples = min_samples
+        self.priors = dict(DEFAULT_PRIORS if priors is None else priors)
+        self._samples: Dict[Tuple[str, int], Deque[Tuple[float, float]]] = {}
+
+    def bucket(self, chars: int) -> int:
+        for i, bound in enumerate(self.buckets):
+            if chars < bound:
+                return i
+        return len(self.buckets)
+
+    def record(self, engine: str, chars: int, ttfa_ms: float):
+        key = (engine, self.bucket(chars))
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append((time.monotonic(), float(ttfa_ms)))
+
+    def record_failure(self, engine: str, chars: int, elapsed_ms: float, penalty_ms: float = 2000.0):
+        """A failed call counts as a very slow one."""
+        self.record(engine, chars, elapsed_ms + penalty_ms)
+
+    def _recent(self, engine: str, bucket: int) -> List[float]:
+        samples = self._samples.get((engine, bucket))
+        if not samples:
+            return []
+        cutoff = time.monotonic() - self.max_age_s
+        return [ms for t, ms in samples if t >= cutoff]
+
+    def predict(self, engine: str, chars: int) -> float:
+        """Predicted TTFA in ms (median of recent samples, else the prior)."""
+        recent = self._recent(engine, self.bucket(chars))
+        if len(recent) >= self.min_samples:
+            return statistics.median(recent)
+        prior = self.priors.get(engine)
+        if prior is None:
+            return float("inf")
+        return prior.base_ms + prior.ms_per_char * chars
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Median recent TTFA per engine and bucket (e.g. {"cartesia": {"<60": 410.0}})."""
+        labels = [f"<{b}" for b in self.buckets] + [f">={self.buckets[-1]}"]
+        stats: Dict[str, Dict[str, float]] = {}
+        for (engine, bucket) in sorted(self._samples):
+            recent = self._recent(engine, bucket)
+            if recent:
+                stats.setdefault(engine, {})[labels[bucket]] = round(statistics.median(recent))
+        return stats
+
+
+class TTSEngineSelector:
+    """Ranks TTS engines by predicted time-to-first-audio."""
+
+    def __init__(
+        self,
+        model: Optional[EngineLatencyModel] = None,
+        connectivity=None,
+        preference: Tuple[str, ...] = ("cartesia", "gemini", "kokoro"),
+        margin_ms: float = 150.0,
+        intermittent_factor: float = 2.0,
+        hedge_deadline_ms: float = 400.0,
+        hedge_max_chars: int = 120,
+    ):
+        """
+        Args:
+            model: Latency model (a default one if None)
+            connectivity: Object with a `level` (ConnectivityMonitor), optional
+            preference: Voice preference, used when predictions are within margin
+            margin_ms: A less preferred engine must be this much faster to win
+            intermittent_factor: Cloud TTFA multiplier on an INTERMITTENT link
+            hedge_deadline_ms: Wait this long for the primary before starting Kokoro
+            hedge_max_chars: Only lines up to this length are hedged
+        """
+        self.model = model or EngineLatencyModel()
+        self.connectivity = connectivity
+        self.preference = preference
+        self.margin_ms = margin_ms
+        self.intermittent_factor = intermittent_factor
+        self.hedge_deadline_ms = hedge_deadline_ms
+        self.hedge_max_chars = hedge_max_chars
+
+        self.hedges = 0
+        self.hedge_backup_wins = 0
+
+    def _link_level(self) -> Optional[int]:
+        level = getattr(self.connectivity, "level", None)
+        return int(level) if level is not None else None
+
+    def predict(self, engine: str, chars: int) -> float:
+        """Predicted TTFA including the current link state."""
+        ttfa = self.model.predict(engine, chars)
+        if engine in CLOUD_ENGINES:
+            level = self._link_level()
+            if level == OFFLINE:
+                return float("inf")
+            if level == INTERMITTENT:
+                ttfa *= self.intermittent_factor
+        return ttfa
+
+    def rank(self, text: str, available: Iterable[str]) -> List[str]:
+        """Available engines, predicted fastest first (unusable ones dropped)."""
+        chars = len(text)
+        predictions = {e: self.predict(e, chars) for e in available}
+        usable = [e for e, ttfa in predictions.items() if ttfa != float("inf")]
+
+        def score(engine):
+            # Preferred voices get a head start of margin_ms per rank
+            rank = self.preference.index(engine) if engine in self.preference else len(self.preference)
+            return predictions[engine] + rank * self.margin_ms
+
+        return sorted(usable, key=score)
+
+    def select(self, text: str, available: Iterable[str]) -> Optional[str]:
+        ranked = self.rank(text, available)
+        return ranked[0] if ranked else None
+
+    def hedge_deadline(self, text: str, primary: str, available: Iterable[str], urgent: bool) -> Optional[float]:
+        """Seconds to wait for primary before starting Kokoro, or None (no hedge)."""
+        if not urgent or primary == LOCAL_ENGINE or LOCAL_ENGINE not in available:
+            return None
+        if len(text) > self.hedge_max_chars:
+            return None
+        return self.hedge_deadline_ms / 1000.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ttfa_ms": self.model.get_stats(),
+            "hedges": self.hedges,
+            "hedge_backup_wins": self.hedge_backup_wins,
+        }
+
+
+async def hedged(
+    primary: Callable[[], Awaitable[Any]],
+    backup: Callable[[], Awaitable[Any]],
+    deadline_s: float,
+    ok: Callable[[Any], bool] = bool,
+) -> Tuple[Optional[str], Any]:
+    """
+    Run primary; if it has not succeeded within deadline_s (or fails), run
+    backup in parallel. The first successful result wins (primary on a tie),
+    the other task is cancelled.
+
+    Returns:
+        ("primary" | "backup" | None, result of the winner / last result)
+    """
+    tasks = {asyncio.ensure_future(primary()): "primary"}
+    backup_started = False
+    result = None
+    try:
+        while tasks:
+            timeout = None if backup_started else deadline_s
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                # Deadline passed: start the backup alongside the primary
+                tasks[asyncio.ensure_future(backup())] = "backup"
+                backup_started = True
+                continue
+            for task in sorted(done, key=lambda t: tasks[t] != "primary"):
+                name = tasks.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.debug(f"Hedged {name} failed: {e}")
+                    result = None
+                if ok(result):
+                    return name, result
+            if not backup_started:
+                # Primary failed before the deadline: go straight to the backup
+                tasks[asyncio.ensure_future(backup())] = "backup"
+                backup_started = True
+        return None, result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def create_tts_selector(config: Optional[dict]) -> TTSEngineSelector:
+    """Selector from the audio.tts_selection config block."""
+    config = config or {}
+    model = EngineLatencyModel(
+        buckets=tuple(config.get("length_buckets", (60, 150, 300))),
+        window=config.get("window", 32),
+        max_age_s=config.get("max_age_s", 600.0),
+        min_samples=config.get("min_samples", 3),
+    )
+    return TTSEngineSelector(
+        model=model,
+        preference=tuple(config.get("preference", ("cartesia", "gemini", "kokoro"))),
+        margin_ms=config.get("margin_ms", 150.0),
+        intermittent_factor=config.get("intermittent_factor", 2.0),
+        hedge_deadline_ms=config.get("hedge_deadline_ms", 400.0),
+        hedge_max_chars=config.get("hedge_max_chars", 120),
+    )
@@ -5,18 +5,27 @@ Voice Coordinator Module
 Orchestrates Voice Activity Detection (Silero VAD) and Speech-to-Text (Whisper).
 Part of the Production Mode pipeline for "Always On" voice commands.
 
+Speech segments are transcribed one at a time on a persistent STTWorker
+thread; segments that end while STT is busy wait in a bounded queue. An
+optional keyword spotter runs first and answers the wake phrase, the
+high-frequency commands and plain noise without any STT.
+
 Author: Haziq (@IRSPlays)
 Date: January 17, 2026
 """
 
 import logging
 import asyncio
+import time
 import numpy as np
 from typing import Callable, Optional
 
 from rpi5.layer1_reflex.vad_handler import VADHandler
-from rpi5.layer1_reflex.whisper_handler import WhisperSTT
+from rpi5.layer1_reflex.stt_backends import DecodeSettings, STTBackend, STTJob, STTWorker, create_stt_backend
 from rpi5.layer1_reflex.cartesia_stt import CartesiaSTT
+from rpi5.layer1_reflex.streaming_stt import PartialTranscript, StreamingTranscriber
+from rpi5.layer1_reflex.keyword_spotter import COMMAND, NOISE, WAKE, KeywordSpotter, create_keyword_spotter
+from rpi5.voice_trace import VoiceTrace, get_tracer, voice_span
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +44,10 @@ class VoiceCoordinator:
         self.on_command_detected = on_command_detected
         self.config = config or {}
         self.vad = None
-        self.stt = None         # Local Whisper (offline fallback)
+        self.stt: Optional[STTBackend] = None  # Local Whisper backend (offline fallback)
+        self.stt_worker: Optional[STTWorker] = None
         self.cloud_stt = None   # Cartesia Ink (primary, cloud)
+        self.spotter: Optional[KeywordSpotter] = None  # Wake phrase / command spotter (before STT)
         self.is_active = False
         # Optional raw audio callback: fn(audio_bytes: bytes, sample_rate: int) -> None
         # Set this after init to forward PCM audio to GeminiLiveHandler (audio-to-audio path)
@@ -44,8 +55,17 @@ class VoiceCoordinator:
         # Optional activity signal callbacks for explicit VAD
         self.on_speech_start_callback: Optional[Callable] = None
         self.on_speech_end_callback: Optional[Callable] = None
+        # Called (from the STT worker thread) when a segment was just the wake phrase
+        self.on_wake: Optional[Callable[[], None]] = None
         # Tracks whether continuous audio hook is wired
         self._continuous_audio_wired = False
+        # Streaming STT: partial transcripts while the user is still speaking
+        self.on_partial_transcript: Optional[Callable[[PartialTranscript], None]] = None
+        self._streaming_config = {}
+        self._stream: Optional[StreamingTranscriber] = None
+        self._min_silence_s = 0.5
+        # Trace of the utterance in progress (VAD speech start -> first audio out)
+        self._trace: Optional[VoiceTrace] = None
     
     @property
     def is_listening(self) -> bool:
@@ -61,6 +81,7 @@ class VoiceCoordinator:
             vad_min_speech = vad_config.get('min_speech_duration_ms', 400)
             vad_min_silence = vad_config.get('min_silence_duration_ms', 500)
             vad_padding = vad_config.get('padding_duration_ms', 200)
+            self._min_silence_s = vad_min_silence / 1000.0
             
             # Initialize VAD with config-driven params
             self.vad = VADHandler(
@@ -81,6 +102,15 @@ class VoiceCoordinator:
 
             # Initialize Cartesia Ink STT (primary — cloud, ~66ms)
             stt_config = self.config.get('stt', {})
+            self._streaming_config = stt_config.get('streaming', {})
+
+            # One warm transcription thread; busy STT queues segments instead of dropping them
+            self.stt_worker = STTWorker(
+                self._process_segment,
+                max_queue=stt_config.get('queue_size', 4),
+                on_drop=self._on_segment_dropped,
+            )
+
             if stt_config.get('cartesia_enabled', True):
                 self.cloud_stt = CartesiaSTT(
                     model=stt_config.get('cartesia_model', 'ink-whisper'),
@@ -91,15 +121,31 @@ class VoiceCoordinator:
                 else:
                     self.cloud_stt = None
 
-            # Initialize Whisper (fallback — offline, ~8000ms on RPi5)
+            # Initialize Whisper (fallback — offline, ~8000ms on RPi5 with
+            # openai-whisper, int8 faster-whisper is several times faster)
             whisper_model = self.config.get('whisper', {}).get('model_size', 'base')
-            self.stt = WhisperSTT(model_size=whisper_model)
-            if not self.stt.load_model():
+            fw_config = stt_config.get('faster_whisper', {})
+            self.stt = create_stt_backend(
+                stt_config.get('backend', 'whisper'),
+                model_size=whisper_model,
+                language=stt_config.get('language', 'en'),
+                decode=DecodeSettings.from_config(stt_config.get('decoding', {})),
+                compute_type=fw_config.get('compute_type', 'int8'),
+                cpu_threads=fw_config.get('cpu_threads', 4),
+            )
+            if not self.stt.load_model():  # Loads and runs a warm-up decode
                 logger.error("Failed to load Whisper model")
             if self.cloud_stt:
-                logger.info(f"🔇 Fallback STT: Whisper {whisper_model} (offline)")
+                logger.info(f"🔇 Fallback STT: Whisper {whisper_model} [{self.stt.name}] (offline)")
             else:
-                logger.info(f"🎤 STT: Whisper {whisper_model} (offline only — no Cartesia key)")
+                logger.info(f"🎤 STT: Whisper {whisper_model} [{self.stt.name}] (offline only — no Cartesia key)")
+            if self._streaming_enabled():
+                logger.info("⚡ Streaming Whisper enabled (partial transcripts during speech)")
+
+            self.spotter = create_keyword_spotter(self.config.get('kws', {}))
+            if self.spotter is not None and not self.spotter.n_templates:
+                logger.warning("⚠️ Keyword spotter enabled but no templates enrolled, disabled")
+                self.spotter = None
 
             logger.info("Voice Coordinator Initialized")
         except Exception as e:
@@ -125,6 +171,10 @@ class VoiceCoordinator:
             self._continuous_audio_wired = True
             logger.info("🔊 Continuous audio streaming to Gemini Live enabled")
 
+        if self._streaming_enabled():
+            self.vad.on_speech_chunk = self._on_speech_chunk
+
+        self.stt_worker.start()
         if self.vad.start_listening():
             self.is_active = True
 
@@ -132,6 +182,7 @@ class VoiceCoordinator:
         """Stop listening"""
         if self.vad and self.is_active:
             self.vad.stop_listening()
+            self.stt_worker.stop()
             self.is_active = False
             logger.info("🛑 Voice Coordinator Stopped")
 
@@ -144,8 +195,41 @@ class VoiceCoordinator:
             except Exception:
                 pass  # Don't log per-chunk errors
 
+    def _streaming_enabled(self) -> bool:
+        """Streaming applies to the local Whisper path (cloud STT is already fast)."""
+        return (
+            bool(self._streaming_config.get('enabled', False))
+            and self.cloud_stt is None
+            and self.stt is not None
+            and self.stt.model is not None
+        )
+
+    def _on_speech_chunk(self, chunk: np.ndarray):
+        """Feed speech audio to the current streaming transcriber."""
+        if self._stream is not None:
+            self._stream.feed(chunk)
+
+    def _on_partial(self, partial: PartialTranscript):
+        logger.debug(f"🎤 Partial [{partial.stability:.0%} stable]: '{partial.text}'")
+        if self.on_partial_transcript:
+            try:
+                self.on_partial_transcript(partial)
+            except Exception:
+                pass
+
     def _on_speech_start(self):
         """Callback from VAD when speech starts. Signal Gemini to listen."""
+        self._trace = get_tracer().start("vad")
+        if self._streaming_enabled():
+            cfg = self._streaming_config
+            self._stream = StreamingTranscriber(
+                decode_fn=self.stt.transcribe_window,
+                step_s=cfg.get('step_ms', 800) / 1000.0,
+                min_first_s=cfg.get('min_first_ms', 800) / 1000.0,
+                max_window_s=cfg.get('max_window_s', 12),
+                overlap_s=cfg.get('overlap_s', 3),
+                on_partial=self._on_partial,
+            )
         if self.on_speech_start_callback:
             try:
                 self.on_speech_start_callback()
@@ -153,12 +237,23 @@ class VoiceCoordinator:
                 pass
 
     def _on_speech_end(self, audio: np.ndarray):
-        """Callback from VAD when speech segment ends.
+        """Callback from VAD (on the VAD thread) when a speech segment ends.
         
         Pipeline: Cartesia Ink (cloud, ~66ms) → Whisper (offline fallback, ~8s)
         Gemini Live audio path runs in parallel via continuous chunk streaming.
+        Only the per-segment state is taken here; STT runs on the STTWorker.
         """
-        logger.info(f"🎤 Speech segment detected ({len(audio)} samples), transcribing...")
+        logger.info(f"🎤 Speech segment detected ({len(audio)} samples), queued for STT")
+
+        # This segment's trace and streaming transcriber go with the job (the
+        # next segment may start before the worker gets to this one)
+        trace, self._trace = self._trace, None
+        stream, self._stream = self._stream, None
+        if trace is not None:
+            end = time.perf_counter()
+            trace.mark("speech_end", end)
+            trace.add_span("vad_tail", end - self._min_silence_s, end)
+            trace.annotate(audio_s=round(len(audio) / 16000, 2))
 
         # Signal Gemini that user stopped speaking
         if self.on_speech_end_callback:
@@ -167,13 +262,62 @@ class VoiceCoordinator:
             except Exception:
                 pass
 
+        # The VAD audio is a view into its capture buffers: queue a copy
+        self.stt_worker.submit(np.array(audio, dtype=np.float32), (trace, stream))
+
+    def _on_segment_dropped(self, job: STTJob):
+        """STT queue overflow: the oldest waiting segment is not transcribed."""
+        trace, _stream = job.context
+        if trace is not None:
+            trace.annotate(dropped=True)
+            get_tracer().finish(trace)
+
+    def _process_segment(self, job: STTJob):
+        """STTWorker handler: transcribe one queued segment inside its trace."""
+        trace, stream = job.context
+        if trace is not None:
+            trace.add_span("stt_queue", job.queued, time.perf_counter())
+        with get_tracer().activate(trace):
+            self._transcribe_and_dispatch(job.audio, trace, stream)
+
+    def _transcribe_and_dispatch(self, audio: np.ndarray, trace: Optional[VoiceTrace],
+                                 stream: Optional[StreamingTranscriber]):
+        """STT cascade for one segment, then hand the text to the command handler."""
         try:
             text = None
 
+            # Keyword spotter: noise, the wake phrase and common commands skip STT
+            if self.spotter is not None:
+                with voice_span("kws") as attrs:
+                    spot = self.spotter.spot(audio)
+                    attrs.update(result=spot.kind, label=spot.label)
+                if spot.kind == NOISE:
+                    logger.debug(f"🔇 KWS: noise (voiced {spot.voiced_ratio:.0%}), STT skipped")
+                    get_tracer().finish(trace)
+                    return
+                if spot.kind == WAKE:
+                    logger.info(f"👂 KWS: wake phrase ({spot.elapsed_ms:.0f}ms)")
+                    if self.on_wake:
+                        self.on_wake()
+                    get_tracer().finish(trace)
+                    return
+                if spot.kind == COMMAND:
+                    logger.info(f"⚡ KWS command: '{spot.text}' (d={spot.distance:.3f}, {spot.elapsed_ms:.0f}ms)")
+                    text = spot.text
+                    stream = None  # Any in-flight streaming decode is simply abandoned
+
+            # 0. Streaming Whisper: most of the utterance is already decoded
+            if text is None and stream is not None:
+                with voice_span("stt", engine="whisper_streaming"):
+                    text = stream.finish(silence_tail_s=self._min_silence_s).text
+                if text:
+                    logger.info(f"🗣️ Transcribed (Whisper streaming): '{text}'")
+
             # 1. Try Cartesia Ink (cloud) — ~66ms latency
             #    Returns str (possibly empty) on success, None on API failure
-            if self.cloud_stt and self.cloud_stt.available:
-                text = self.cloud_stt.transcribe(audio)
+            if text is None and self.cloud_stt and self.cloud_stt.available:
+                with voice_span("stt", engine="cartesia"):
+                    text = self.cloud_stt.transcribe(audio)
                 if text:
                     logger.info(f"🗣️ Transcribed (Cartesia): '{text}'")
                 elif text is not None:
@@ -181,10 +325,11 @@ class VoiceCoordinator:
                     logger.debug("🔇 Cartesia: no speech detected (empty response)")
 
             # 2. Fallback to local Whisper ONLY if Cartesia actually failed (None)
-            if text is None and self.stt:
+            if text is None and self.stt and stream is None:
                 if self.cloud_stt and self.cloud_stt.available:
                     logger.info("🔄 Cartesia API error, falling back to Whisper...")
-                text = self.stt.transcribe(audio)
+                with voice_span("stt", engine="whisper"):
+                    text = self.stt.transcribe(audio)
                 if text:
                     logger.info(f"🗣️ Transcribed (Whisper): '{text}'")
             
@@ -195,24 +340,32 @@ class VoiceCoordinator:
                         # Use thread-safe async execution
                         try:
                             loop = asyncio.get_running_loop()
-                            asyncio.run_coroutine_threadsafe(self._dispatch_command(text), loop)
+                            asyncio.run_coroutine_threadsafe(self._dispatch_command(text, trace), loop)
                         except RuntimeError:
-                            asyncio.run(self._dispatch_command(text))
+                            asyncio.run(self._dispatch_command(text, trace))
                     except Exception as e:
                         logger.error(f"❌ Error dispatching command: {e}")
             else:
                 logger.debug("⚠️ Empty transcription or noise")
+                get_tracer().finish(trace)
                 
         except Exception as e:
             logger.error(f"❌ Transcription error: {e}")
+            get_tracer().finish(trace)
 
-    async def _dispatch_command(self, text: str):
-        """Async dispatch wrapper"""
-        try:
-            # Check if callback is a coroutine
-            if asyncio.iscoroutinefunction(self.on_command_detected):
-                await self.on_command_detected(text)
-            else:
-                self.on_command_detected(text)
-        except Exception as e:
-            logger.error(f"❌ Error handling voice command: {e}")
+    async def _dispatch_command(self, text: str, trace: Optional[VoiceTrace] = None):
+        """Async dispatch wrapper (the handler runs inside the utterance's trace)"""
+        if trace is not None:
+            trace.annotate(text=text[:80])
+        tracer = get_tracer()
+        with tracer.activate(trace):
+            try:
+                # Check if callback is a coroutine
+                if asyncio.iscoroutinefunction(self.on_command_detected):
+                    await self.on_command_detected(text)
+                else:
+                    self.on_command_detected(text)
+            except Exception as e:
+                logger.error(f"❌ Error handling voice command: {e}")
+            finally:
+                tracer.finish(trace)
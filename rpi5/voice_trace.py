@@ -0,0 +1,350 @@
+"""
+Voice Interaction Tracer - Where Did the Time Go?
+
+One trace per voice interaction, created at VAD speech start and carried
+through transcription, routing, the command handler, Gemini and TTS up to
+the first audio sample handed to the output device. Each stage records a
+span (start offset + duration from the trace start), so a "that was slow"
+report can be pinned on one segment:
+
+    speech       VAD speech start -> speech end event
+    vad_tail     silence the VAD waits for before firing the end event
+    stt_queue    segment waiting for the STT worker (previous one still running)
+    kws          keyword spotter (attrs: result, label)
+    stt          Cartesia / Whisper / streaming finish (attr: engine)
+    route        IntentRouter.route_with_flags + speculative resolve
+    handler      handle_voice_command as a whole
+    gemini       Gemini request (vision / text / Live send)
+    tts_synth    TTS synthesis (attr: engine)
+    player_spawn aplay process start (or sounddevice play call)
+    first_audio  speech end -> first audio out (derived)
+
+The trace lives in a ContextVar: spans opened anywhere below
+handle_voice_command (including asyncio.to_thread helpers, which copy the
+context) attach to it without passing it around. Thread hops that do not
+copy the context (VAD callback threads) pass the trace explicitly.
+
+Finished traces go into an in-memory ring (dashboard) and an append-only
+JSONL file (CLI: `python -m rpi5 traces`), and summary() aggregates
+p50/p95 per segment.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import contextvars
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_PATH = "logs/voice_traces.jsonl"
+
+# Display order for reports (anything else is appended alphabetically)
+SEGMENTS = [
+    "speech", "vad_tail", "stt_queue", "kws", "stt", "route", "handler", "gemini",
+    "tts_synth", "player_spawn", "first_audio", "total",
+]
+
+_current: contextvars.ContextVar = contextvars.ContextVar("voice_trace", default=None)
+_trace_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    """One timed stage of a voice interaction (times in ms from trace start)."""
+    name: str
+    start_ms: float
+    duration_ms: float
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class VoiceTrace:
+    """Spans and marks of one voice interaction."""
+
+    def __init__(self, source: str = "vad", trace_id: Optional[str] = None):
+        self.trace_id = trace_id or f"{int(time.time())}-{next(_trace_ids)}"
+        self.source = source
+        self.wall_time = time.time()
+        self.t0 = time.perf_counter()
+        self.spans: List[Span] = []
+        self.marks: Dict[str, float] = {}
+        self.attrs: Dict[str, Any] = {}
+        self.expect_audio = False  # Audio arrives after the handler returns (Gemini Live)
+
+    def _ms(self, t: float) -> float:
+        return (t - self.t0) * 1000
+
+    def add_span(self, name: str, start: float, end: float, **attrs):
+        """Record a span from perf_counter() timestamps."""
+        self.spans.append(Span(name, self._ms(start), (end - start) * 1000, attrs))
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Dict[str, Any]]:
+        """Time a block; the yielded dict can take attributes set inside it."""
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.add_span(name, start, time.perf_counter(), **attrs)
+
+    def mark(self, name: str, t: Optional[float] = None) -> bool:
+        """Record an instant (first occurrence wins); True if it was new."""
+        if name in self.marks:
+            return False
+        self.marks[name] = self._ms(t if t is not None else time.perf_counter())
+        return True
+
+    def annotate(self, **attrs):
+        self.attrs.update(attrs)
+
+    def segments(self) -> Dict[str, float]:
+        """Duration per segment in ms (repeated spans are summed)."""
+        result: Dict[str, float] = {}
+        for span in self.spans:
+            result[span.name] = result.get(span.name, 0.0) + span.duration_ms
+        if "speech_end" in self.marks:
+            if self.source == "vad":
+                result["speech"] = self.marks["speech_end"]
+            if "first_audio" in self.marks:
+                result["first_audio"] = self.marks["first_audio"] - self.marks["speech_end"]
+        ends = [s.start_ms + s.duration_ms for s in self.spans] + list(self.marks.values())
+        if ends:
+            result["total"] = max(ends)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "source": self.source,
+            "time": self.wall_time,
+            "attrs": self.attrs,
+            "marks": self.marks,
+            "spans": [asdict(s) for s in self.spans],
+            "segments": self.segments(),
+        }
+
+
+def current_trace() -> Optional[VoiceTrace]:
+    """Trace of the interaction running in this context, if any."""
+    return _current.get()
+
+
+def voice_span(name: str, **attrs):
+    """Span on the current trace; a no-op context when nothing is traced."""
+    trace = _current.get()
+    if trace is None:
+        return nullcontext(attrs)
+    return trace.span(name, **attrs)
+
+
+class VoiceTracer:
+    """
+    Collects finished traces into a ring buffer and a JSONL log.
+
+    A trace whose audio comes back asynchronously (Gemini Live) is parked
+    by finish() until first_audio() is called or audio_wait_s passes.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ring_size: int = 200,
+        log_path: Optional[str] = DEFAULT_LOG_PATH,
+        max_log_kb: int = 2048,
+        audio_wait_s: float = 8.0,
+    ):
+        """
+        Args:
+            enabled: If False, start() returns None and nothing is recorded
+            ring_size: Finished traces kept in memory
+            log_path: JSONL file for the CLI (None = memory only)
+            max_log_kb: Rotate the log to <log_path>.1 beyond this size
+            audio_wait_s: How long a parked trace waits for its first audio
+        """
+        self.enabled = enabled
+        self.log_path = Path(log_path) if log_path else None
+        self.max_log_bytes = max_log_kb * 1024
+        self.audio_wait_s = audio_wait_s
+
+        self._ring: Deque[Dict[str, Any]] = deque(maxlen=ring_size)
+        self._lock = threading.Lock()
+        self._pending: Optional[VoiceTrace] = None
+        self._pending_since = 0.0
+
+    # ------------------------------------------------------------------
+    # Trace lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, source: str = "vad") -> Optional[VoiceTrace]:
+        """New trace (not yet active in any context)."""
+        if not self.enabled:
+            return None
+        self._expire_pending()
+        return VoiceTrace(source)
+
+    @contextmanager
+    def activate(self, trace: Optional[VoiceTrace]) -> Iterator[Optional[VoiceTrace]]:
+        """Make trace the current one for this thread / task."""
+        token = _current.set(trace)
+        try:
+            yield trace
+        finally:
+            _current.reset(token)
+
+    def finish(self, trace: Optional[VoiceTrace]):
+        """Handler done: commit, or park until the asynchronous audio starts."""
+        if trace is None:
+            return
+        if trace.expect_audio and "first_audio" not in trace.marks:
+            with self._lock:
+                previous, self._pending = self._pending, trace
+                self._pending_since = time.perf_counter()
+            if previous is not None:
+                self._commit(previous)
+            return
+        self._commit(trace)
+
+    def first_audio(self, source: str, trace: Optional[VoiceTrace] = None):
+        """
+        First audio sample handed to the output for the current (or parked) trace.
+
+        Args:
+            source: What produced it (aplay, sounddevice, gemini_live)
+            trace: Explicit trace; defaults to the current one, then the parked one
+        """
+        trace = trace or _current.get()
+        parked = False
+        if trace is None:
+            with self._lock:
+                trace, self._pending = self._pending, None
+            parked = trace is not None
+        if trace is not None and trace.mark("first_audio"):
+            trace.annotate(audio_source=source)
+        if parked:
+            self._commit(trace)
+
+    def _expire_pending(self):
+        with self._lock:
+            trace = self._pending
+            if trace is None or time.perf_counter() - self._pending_since < self.audio_wait_s:
+                return
+            self._pending = None
+        trace.annotate(audio_timeout=True)
+        self._commit(trace)
+
+    def _commit(self, trace: VoiceTrace):
+        record = trace.to_dict()
+        with self._lock:
+            self._ring.append(record)
+        segments = record["segments"]
+        logger.info(
+            "⏱️ Voice trace %s: %s",
+            trace.trace_id,
+            ", ".join(f"{name}={segments[name]:.0f}ms" for name in _ordered(segments)),
+        )
+        if self.log_path is not None:
+            self._append_log(record)
+
+    def _append_log(self, record: Dict[str, Any]):
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.log_path.exists() and self.log_path.stat().st_size > self.max_log_bytes:
+                os.replace(self.log_path, str(self.log_path) + ".1")
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.debug(f"Voice trace log write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    def recent(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent finished traces (oldest first)."""
+        self._expire_pending()
+        with self._lock:
+            traces = list(self._ring)
+        return traces[-n:] if n else traces
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return summarize(self.recent())
+
+
+def _ordered(names: Iterable[str]) -> List[str]:
+    names = set(names)
+    return [s for s in SEGMENTS if s in names] + sorted(names - set(SEGMENTS))
+
+
+def summarize(traces: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate p50/p95 per segment over trace records.
+
+    Returns:
+        {segment: {"count", "p50_ms", "p95_ms", "max_ms"}} in display order
+    """
+    values: Dict[str, List[float]] = {}
+    for record in traces:
+        for name, ms in record.get("segments", {}).items():
+            values.setdefault(name, []).append(ms)
+    report = {}
+    for name in _ordered(values):
+        data = np.asarray(values[name])
+        report[name] = {
+            "count": len(data),
+            "p50_ms": float(np.percentile(data, 50)),
+            "p95_ms": float(np.percentile(data, 95)),
+            "max_ms": float(data.max()),
+        }
+    return report
+
+
+def load_traces(path: str = DEFAULT_LOG_PATH, last: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Read trace records from the JSONL log (and its rotated predecessor)."""
+    records = []
+    for candidate in (Path(str(path) + ".1"), Path(path)):
+        if not candidate.exists():
+            continue
+        with open(candidate) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Torn write at shutdown
+    return records[-last:] if last else records
+
+
+_tracer: Optional[VoiceTracer] = None
+
+
+def get_tracer() -> VoiceTracer:
+    """Process-wide tracer (configure_tracer() replaces it)."""
+    global _tracer
+    if _tracer is None:
+        _tracer = VoiceTracer()
+    return _tracer
+
+
+def configure_tracer(config: Optional[dict] = None) -> VoiceTracer:
+    """Build the process-wide tracer from the audio.tracing config block."""
+    global _tracer
+    config = config or {}
+    _tracer = VoiceTracer(
+        enabled=config.get("enabled", True),
+        ring_size=config.get("ring_size", 200),
+        log_path=config.get("log_path", DEFAULT_LOG_PATH),
+        max_log_kb=config.get("max_log_kb", 2048),
+        audio_wait_s=config.get("audio_wait_s", 8.0),
+    )
+    return _tracer
@@ -278,7 +278,8 @@ class RPiWebSocketClient:
 
     def send_metrics(self, fps: float, ram_mb: int, ram_percent: float, cpu_percent: float,
                      battery_percent: float, temperature: float, active_layers: list,
-                     current_mode: str):
+                     current_mode: str, tts_cache: Optional[dict] = None,
+                     audio_onset: Optional[dict] = None, tts_selection: Optional[dict] = None):
         """Send system metrics to laptop (thread-safe)"""
         message = {
             "type": "METRICS",
@@ -294,6 +295,12 @@ class RPiWebSocketClient:
                 "current_mode": current_mode
             }
         }
+        if tts_cache:
+            message["data"]["tts_cache"] = tts_cache  # Hit rate, saved synthesis ms
+        if audio_onset:
+            message["data"]["audio_onset"] = audio_onset  # Mixer onset p50/p95 per channel
+        if tts_selection:
+            message["data"]["tts_selection"] = tts_selection  # TTFA per engine/length, hedge wins
 
         self._send_to_loop(message)
 
@@ -0,0 +1,53 @@
+// =====================================================
+// ProjectCortex v2.0 - bulk-sync Edge Function
+// Receives one zlib-compressed columnar payload per device sync interval
+// (rpi5/layer4_memory/bulk_sync.py) and hands it to ingest_bulk().
+// =====================================================
+// Author: Haziq (@IRSPlays)
+// Deploy: supabase functions deploy bulk-sync
+// =====================================================
+
+import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
+
+const supabase = createClient(
+  Deno.env.get("SUPABASE_URL")!,
+  Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!,
+);
+
+function json(body: unknown, status = 200): Response {
+  return new Response(JSON.stringify(body), {
+    status,
+    headers: { "Content-Type": "application/json" },
+  });
+}
+
+Deno.serve(async (req: Request) => {
+  if (req.method !== "POST") {
+    return json({ error: "method not allowed" }, 405);
+  }
+
+  const key = req.headers.get("Idempotency-Key");
+  if (!key) {
+    return json({ error: "missing Idempotency-Key" }, 400);
+  }
+
+  // Body is zlib (RFC 1950) == DecompressionStream("deflate")
+  let payload;
+  try {
+    const stream = req.body!.pipeThrough(new DecompressionStream("deflate"));
+    payload = JSON.parse(await new Response(stream).text());
+  } catch (e) {
+    return json({ error: `bad payload: ${e}` }, 400);
+  }
+
+  const { data, error } = await supabase.rpc("ingest_bulk", {
+    p_device_id: payload.device_id,
+    p_idempotency_key: key,
+    p_payload: payload,
+  });
+  if (error) {
+    // 5xx: the device keeps the payload and retries with the same key
+    return json({ error: error.message }, 500);
+  }
+  return json(data);
+});
@@ -0,0 +1,188 @@
+-- =====================================================
+-- ProjectCortex v2.0 - Bulk Sync Ingest
+-- One columnar payload per sync interval (see rpi5/layer4_memory/bulk_sync.py)
+-- =====================================================
+-- Author: Haziq (@IRSPlays)
+-- Status: Called by the bulk-sync edge function (supabase/functions/bulk-sync)
+-- =====================================================
+
+-- =====================================================
+-- TABLE: sync_batches (Idempotency ledger)
+-- One row per accepted payload; retries with the same key are no-ops
+-- =====================================================
+CREATE TABLE IF NOT EXISTS sync_batches (
+    idempotency_key TEXT PRIMARY KEY,
+    device_id UUID NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    received_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_batches_received ON sync_batches(received_at DESC);
+
+ALTER TABLE sync_batches ENABLE ROW LEVEL SECURITY;
+
+-- =====================================================
+-- HELPER FUNCTION: bulk_column()
+-- Returns one column of a table block as a plain JSON array,
+-- expanding dictionary-encoded columns ({"dict": [...], "idx": [...]})
+-- =====================================================
+CREATE OR REPLACE FUNCTION bulk_column(p_block JSONB, p_name TEXT)
+RETURNS JSONB AS $$
+DECLARE
+    v_col JSONB := p_block->'cols'->p_name;
+BEGIN
+    IF v_col IS NULL THEN
+        RETURN '[]'::jsonb;
+    END IF;
+    IF jsonb_typeof(v_col) = 'object' THEN
+        RETURN (
+            SELECT COALESCE(jsonb_agg(
+                CASE WHEN t.idx::int >= 0 THEN v_col->'dict'->(t.idx::int) ELSE 'null'::jsonb END
+                ORDER BY t.ord
+            ), '[]'::jsonb)
+            FROM jsonb_array_elements_text(v_col->'idx') WITH ORDINALITY AS t(idx, ord)
+        );
+    END IF;
+    RETURN v_col;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- =====================================================
+-- FUNCTION: ingest_bulk()
+-- Inserts every table in a decoded bulk payload in one transaction.
+-- created_at is derived from base_ts + per-row millisecond offsets.
+-- Returns {"status": "ok" | "duplicate", "rows": n}
+-- =====================================================
+CREATE OR REPLACE FUNCTION ingest_bulk(
+    p_device_id UUID,
+    p_idempotency_key TEXT,
+    p_payload JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_base DOUBLE PRECISION := COALESCE((p_payload->>'base_ts')::double precision, extract(epoch FROM NOW()));
+    v_block JSONB;
+    v_n INTEGER;
+    v_rows INTEGER := 0;
+    v_hb RECORD;
+BEGIN
+    -- Idempotency: first writer wins, retries are acknowledged without inserting
+    INSERT INTO sync_batches (idempotency_key, device_id)
+    VALUES (p_idempotency_key, p_device_id)
+    ON CONFLICT (idempotency_key) DO NOTHING;
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object(
+            'status', 'duplicate',
+            'rows', (SELECT row_count FROM sync_batches WHERE idempotency_key = p_idempotency_key)
+        );
+    END IF;
+
+    -- Detections
+    v_block := p_payload->'tables'->'detections';
+    IF v_block IS NOT NULL THEN
+        v_n := (v_block->>'n')::int;
+        INSERT INTO detections (
+            device_id, layer, class_name, confidence, bbox_x1, bbox_y1, bbox_x2, bbox_y2,
+            bbox_area, detection_mode, source, created_at
+        )
+        SELECT p_device_id, c.layer->>i, c.class_name->>i, (c.confidence->>i)::numeric,
+               (c.x1->>i)::numeric, (c.y1->>i)::numeric, (c.x2->>i)::numeric, (c.y2->>i)::numeric,
+               (c.area->>i)::numeric, c.mode->>i, c.source->>i,
+               to_timestamp(v_base + COALESCE((c.ts->>i)::double precision, 0) / 1000.0)
+        FROM (SELECT bulk_column(v_block, 'layer') AS layer,
+                     bulk_column(v_block, 'class_name') AS class_name,
+                     bulk_column(v_block, 'confidence') AS confidence,
+                     bulk_column(v_block, 'bbox_x1') AS x1,
+                     bulk_column(v_block, 'bbox_y1') AS y1,
+                     bulk_column(v_block, 'bbox_x2') AS x2,
+                     bulk_column(v_block, 'bbox_y2') AS y2,
+                     bulk_column(v_block, 'bbox_area') AS area,
+                     bulk_column(v_block, 'detection_mode') AS mode,
+                     bulk_column(v_block, 'source') AS source,
+                     bulk_column(v_block, 'ts') AS ts) c,
+             generate_series(0, v_n - 1) AS i;
+        v_rows := v_rows + v_n;
+    END IF;
+
+    -- Queries
+    v_block := p_payload->'tables'->'queries';
+    IF v_block IS NOT NULL THEN
+        v_n := (v_block->>'n')::int;
+        INSERT INTO queries (
+            device_id, user_query, transcribed_text, routed_layer, routing_confidence,
+            detection_mode, ai_response, response_latency_ms, tier_used, created_at
+        )
+        SELECT p_device_id, c.uq->>i, c.tt->>i, c.rl->>i, (c.rc->>i)::numeric,
+               c.dm->>i, c.ar->>i, (c.lat->>i)::int, c.tier->>i,
+               to_timestamp(v_base + COALESCE((c.ts->>i)::double precision, 0) / 1000.0)
+        FROM (SELECT bulk_column(v_block, 'user_query') AS uq,
+                     bulk_column(v_block, 'transcribed_text') AS tt,
+                     bulk_column(v_block, 'routed_layer') AS rl,
+                     bulk_column(v_block, 'routing_confidence') AS rc,
+                     bulk_column(v_block, 'detection_mode') AS dm,
+                     bulk_column(v_block, 'ai_response') AS ar,
+                     bulk_column(v_block, 'response_latency_ms') AS lat,
+                     bulk_column(v_block, 'tier_used') AS tier,
+                     bulk_column(v_block, 'ts') AS ts) c,
+             generate_series(0, v_n - 1) AS i;
+        v_rows := v_rows + v_n;
+    END IF;
+
+    -- System logs
+    v_block := p_payload->'tables'->'system_logs';
+    IF v_block IS NOT NULL THEN
+        v_n := (v_block->>'n')::int;
+        INSERT INTO system_logs (
+            device_id, level, component, message, latency_ms, cpu_percent, memory_mb,
+            error_trace, created_at
+        )
+        SELECT p_device_id, c.lvl->>i, c.comp->>i, c.msg->>i, (c.lat->>i)::int,
+               (c.cpu->>i)::numeric, (c.mem->>i)::int, c.trace->>i,
+               to_timestamp(v_base + COALESCE((c.ts->>i)::double precision, 0) / 1000.0)
+        FROM (SELECT bulk_column(v_block, 'level') AS lvl,
+                     bulk_column(v_block, 'component') AS comp,
+                     bulk_column(v_block, 'message') AS msg,
+                     bulk_column(v_block, 'latency_ms') AS lat,
+                     bulk_column(v_block, 'cpu_percent') AS cpu,
+                     bulk_column(v_block, 'memory_mb') AS mem,
+                     bulk_column(v_block, 'error_trace') AS trace,
+                     bulk_column(v_block, 'ts') AS ts) c,
+             generate_series(0, v_n - 1) AS i;
+        v_rows := v_rows + v_n;
+    END IF;
+
+    -- Heartbeat (latest row only)
+    v_block := p_payload->'tables'->'heartbeats';
+    IF v_block IS NOT NULL THEN
+        v_n := (v_block->>'n')::int - 1;
+        SELECT bulk_column(v_block, 'device_name')->>v_n AS device_name,
+               (bulk_column(v_block, 'battery_percent')->>v_n)::int AS battery,
+               (bulk_column(v_block, 'cpu_percent')->>v_n)::numeric AS cpu,
+               (bulk_column(v_block, 'memory_mb')->>v_n)::int AS memory,
+               (bulk_column(v_block, 'temperature')->>v_n)::numeric AS temp,
+               ARRAY(SELECT jsonb_array_elements_text(
+                   COALESCE(NULLIF(bulk_column(v_block, 'active_layers')->v_n, 'null'::jsonb), '[]'::jsonb)
+               )) AS layers,
+               bulk_column(v_block, 'current_mode')->>v_n AS mode,
+               (bulk_column(v_block, 'latitude')->>v_n)::numeric AS lat,
+               (bulk_column(v_block, 'longitude')->>v_n)::numeric AS lon
+        INTO v_hb;
+        PERFORM update_device_heartbeat(
+            p_device_id, v_hb.device_name, v_hb.battery, v_hb.cpu, v_hb.memory,
+            v_hb.temp, v_hb.layers, v_hb.mode, v_hb.lat, v_hb.lon
+        );
+        v_rows := v_rows + v_n + 1;
+    END IF;
+
+    UPDATE sync_batches SET row_count = v_rows WHERE idempotency_key = p_idempotency_key;
+    RETURN jsonb_build_object('status', 'ok', 'rows', v_rows);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Ledger housekeeping: keys only need to outlive the client's retry window
+CREATE OR REPLACE FUNCTION prune_sync_batches()
+RETURNS void AS $$
+BEGIN
+    DELETE FROM sync_batches WHERE received_at < NOW() - INTERVAL '7 days';
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Alert Bank Trigger Latency Benchmark
+
+Compares, per safety alert:
+- render:  the old path's work at alert time (generate the sound, run the
+           binaural renderer for the threat direction)
+- bank:    AlertBank.trigger() (index lookup + enqueue on the mixer)
+and reports trigger-to-sound (trigger call -> first sample handed to the
+device) for bank alerts, plus bank build time and size.
+
+Uses the real alert clips in rpi5/assets/alerts when present, otherwise
+synthetic stand-ins. --simulate pulls mixer blocks from a paced thread
+instead of the sound card.
+
+Usage:
+    python3 tests/benchmark_alert_bank.py --simulate
+    python3 tests/benchmark_alert_bank.py --alerts 100 --step 15
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add rpi5 to path
+RPI5 = Path(__file__).parent.parent / "rpi5"
+sys.path.insert(0, str(RPI5))
+
+import alert_bank
+from alert_bank import AlertBank
+from audio_alerts import ALERT_TEXTS
+from audio_mixer import AudioMixer
+from layer3_guide.spatial_audio.binaural_engine import generate_chirp, render_binaural
+
+
+def synthetic_clips(directory: Path):
+    clips = {}
+    for i, key in enumerate(ALERT_TEXTS):
+        t = np.arange(int(24000 * 1.2)) / 24000
+        pcm = (np.sin(2 * np.pi * (200 + 40 * i) * t) * 10000).astype(np.int16)
+        path = directory / f"{key}.wav"
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(24000)
+            wf.writeframes(pcm.tobytes())
+        clips[key] = str(path)
+    return clips
+
+
+def simulate(mixer, stop):
+    period = mixer.blocksize / mixer.sample_rate
+    next_t = time.perf_counter()
+    while not stop.is_set():
+        mixer.mix_block(mixer.blocksize)
+        next_t += period
+        time.sleep(max(0.0, next_t - time.perf_counter()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert bank vs render-at-alert-time")
+    parser.add_argument("--alerts", type=int, default=50)
+    parser.add_argument("--step", type=float, default=30.0, help="Azimuth grid (degrees)")
+    parser.add_argument("--simulate", action="store_true", help="No output device")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="alert_bank_"))
+    assets = RPI5 / "assets" / "alerts"
+    clips = {k: str(assets / f"{k}.wav") for k in ALERT_TEXTS if (assets / f"{k}.wav").exists()}
+    source = "assets/alerts"
+    if not clips:
+        clips, source = synthetic_clips(tmp), "synthetic"
+
+    mixer = AudioMixer()
+    stop = threading.Event()
+    if args.simulate:
+        threading.Thread(target=simulate, args=(mixer, stop), daemon=True).start()
+    elif not mixer.start():
+        print("No output device; rerun with --simulate")
+        return 1
+    alert_bank.get_mixer = lambda: mixer
+
+    bank = AlertBank(str(tmp / "bank"), clips, sample_rate=mixer.sample_rate, azimuth_step=args.step)
+    start = time.perf_counter()
+    bank.build(force=True)
+    build_s = time.perf_counter() - start
+
+    render_ms, enqueue_ms = [], []
+    keys = list(clips) + ["chirp", "tone"]
+    for _ in range(args.alerts):
+        az = random.uniform(-180, 180)
+        t0 = time.perf_counter()
+        render_binaural(generate_chirp(0.2, sr=mixer.sample_rate), az, 0.0, mixer.sample_rate)
+        render_ms.append((time.perf_counter() - t0) * 1000)
+
+        time.sleep(random.uniform(0.05, 0.15))
+        t0 = time.perf_counter()
+        playback = bank.trigger(random.choice(keys), az, random.choice(["notice", "warning", "critical"]))
+        enqueue_ms.append((time.perf_counter() - t0) * 1000)
+        playback.wait(timeout=5.0)
+
+    stop.set()
+    mixer.stop()
+    stats = bank.get_stats()
+    shutil.rmtree(tmp, ignore_errors=True)
+    print(f"\nBank: {len(keys)} sounds x 3 urgencies x {len(bank.azimuths)} azimuths ({source} clips), "
+          f"{stats['size_mb']}MB, built in {build_s:.1f}s")
+    print(f"{'':>22} {'p50':>8} {'p95':>8}")
+    print(f"{'render at alert time':>22} {np.percentile(render_ms, 50):>6.2f}ms {np.percentile(render_ms, 95):>6.2f}ms")
+    print(f"{'bank lookup+enqueue':>22} {np.percentile(enqueue_ms, 50):>6.2f}ms {np.percentile(enqueue_ms, 95):>6.2f}ms")
+    print(f"{'bank trigger-to-sound':>22} {stats['trigger_to_sound_p50_ms']:>6.2f}ms {stats['trigger_to_sound_p95_ms']:>6.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
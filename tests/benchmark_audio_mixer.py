@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Alert Onset Latency Benchmark
+
+Triggers safety alerts while speech and a beacon are playing and reports
+the onset latency (alert submitted -> first alert sample handed to the
+device, plus the stream's output latency) measured by the AudioMixer.
+
+- default: the real output stream (sounddevice)
+- --simulate: no device; a thread pulls blocks at real-time pace, so the
+  numbers are the mixer's own queueing delay (block wait + mixing)
+- --paplay: also time the old path (paplay process spawn for the same clip)
+
+Usage:
+    python3 tests/benchmark_audio_mixer.py
+    python3 tests/benchmark_audio_mixer.py --simulate --alerts 200
+    python3 tests/benchmark_audio_mixer.py --blocksize 240 --paplay
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from audio_mixer import AudioMixer
+
+
+def tone(freq, seconds, rate=24000, gain=0.3):
+    t = np.arange(int(rate * seconds)) / rate
+    return (np.sin(2 * np.pi * freq * t) * gain * 32767).astype(np.int16)
+
+
+def simulate(mixer, stop):
+    """Pull blocks like a device would (one block per block period)."""
+    period = mixer.blocksize / mixer.sample_rate
+    next_t = time.perf_counter()
+    while not stop.is_set():
+        mixer.mix_block(mixer.blocksize)
+        next_t += period
+        time.sleep(max(0.0, next_t - time.perf_counter()))
+
+
+def time_paplay(clip, rate, runs):
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        with wave.open(f, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            wf.writeframes(clip.tobytes())
+        path = f.name
+    spawn = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            proc = subprocess.Popen(["paplay", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            return None
+        spawn.append((time.perf_counter() - start) * 1000)
+        proc.wait()
+    Path(path).unlink(missing_ok=True)
+    return spawn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixer alert onset latency")
+    parser.add_argument("--alerts", type=int, default=50)
+    parser.add_argument("--blocksize", type=int, default=480)
+    parser.add_argument("--rate", type=int, default=48000)
+    parser.add_argument("--simulate", action="store_true", help="No output device")
+    parser.add_argument("--paplay", action="store_true", help="Also time paplay spawn")
+    args = parser.parse_args()
+
+    mixer = AudioMixer(sample_rate=args.rate, blocksize=args.blocksize)
+    stop = threading.Event()
+    if args.simulate:
+        threading.Thread(target=simulate, args=(mixer, stop), daemon=True).start()
+        mode = "simulated device"
+    elif mixer.start():
+        mode = f"device (output latency {mixer.output_latency_s * 1000:.1f}ms)"
+    else:
+        print("No output device; rerun with --simulate")
+        return 1
+
+    clip = tone(1000, 0.15)
+    beacon_phase = [0]
+
+    def beacon(frames):
+        t = (beacon_phase[0] + np.arange(frames)) / mixer.sample_rate
+        beacon_phase[0] += frames
+        block = (0.1 * np.sin(2 * np.pi * 600 * t)).astype(np.float32)
+        return np.repeat(block[:, None], 2, axis=1)
+
+    mixer.set_source("beacon", beacon)
+    mixer.play("speech", tone(220, args.alerts * 0.5 + 5), 24000)
+
+    for _ in range(args.alerts):
+        time.sleep(random.uniform(0.1, 0.3))  # Land at random points in the block cycle
+        mixer.play("safety", clip, 24000, preempt=True).wait(timeout=2.0)
+
+    stop.set()
+    mixer.stop()
+    onset = mixer.get_stats()["safety"]
+    print(f"\nAlert onset over {onset['count']} alerts, {args.blocksize}-frame blocks @ {args.rate}Hz, {mode}")
+    print(f"  p50 {onset['p50_ms']:.1f}ms   p95 {onset['p95_ms']:.1f}ms   max {onset['max_ms']:.1f}ms")
+    print(f"  block period {args.blocksize / args.rate * 1000:.1f}ms, underruns {mixer.underruns}")
+
+    if args.paplay:
+        spawn = time_paplay(clip, 24000, min(args.alerts, 20))
+        if spawn is None:
+            print("  paplay not installed")
+        else:
+            print(f"  paplay spawn alone: p50 {np.percentile(spawn, 50):.1f}ms "
+                  f"p95 {np.percentile(spawn, 95):.1f}ms (before the device is even opened)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Binaural Continuous Render Benchmark
+
+Renders a continuous beacon tone in device-sized blocks while the source
+sweeps around the head, and compares:
+- old:    render_binaural() per block (filter designed per block, zero
+          filter state, whole-sample ITD padding)
+- block:  BinauralBlockRenderer.process() (precomputed bins, carried
+          filter / delay-line state, cross-fade on bin changes)
+
+Reports callback time per block (p50/p95/max), the share of the block
+period it uses, and the largest sample-to-sample jump at block boundaries
+(clicks) relative to the source's own largest step. --realtime also runs
+the engine's continuous path on a paced simulated device and reports its
+late blocks.
+
+Usage:
+    python3 tests/benchmark_binaural_block.py
+    python3 tests/benchmark_binaural_block.py --block 480 --rate 48000 --realtime
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from audio_mixer import AudioMixer
+from layer3_guide.spatial_audio.binaural_engine import (
+    BinauralBlockRenderer, BinauralEngine, generate_continuous_tone, render_binaural,
+)
+
+
+def run(render, mono, block, sweep_deg):
+    times, out = [], []
+    n_blocks = len(mono) // block
+    for k in range(n_blocks):
+        azimuth = -180.0 + sweep_deg * k / n_blocks
+        t0 = time.perf_counter()
+        out.append(render(mono[k * block:(k + 1) * block], azimuth))
+        times.append((time.perf_counter() - t0) * 1000)
+    out = np.concatenate(out)
+    boundaries = np.arange(block, len(out), block)
+    jumps = np.abs(out[boundaries] - out[boundaries - 1]).max()
+    return np.array(times), jumps
+
+
+def realtime(rate, block, seconds):
+    mixer = AudioMixer(sample_rate=rate, blocksize=block)
+    engine = BinauralEngine(sr=rate)
+    engine._mixer = mixer
+    engine.start_continuous(azimuth_deg=0.0)
+    stop = threading.Event()
+
+    def device():
+        period = block / rate
+        next_t = time.perf_counter()
+        while not stop.is_set():
+            mixer.mix_block(block)
+            next_t += period
+            time.sleep(max(0.0, next_t - time.perf_counter()))
+
+    thread = threading.Thread(target=device, daemon=True)
+    thread.start()
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        engine.update_position((time.perf_counter() - start) * 90.0 % 360 - 180)  # 90 deg/s head turn
+        time.sleep(0.01)
+    stop.set()
+    thread.join()
+    engine.stop_continuous()
+    return engine.get_render_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binaural block renderer vs per-block render_binaural")
+    parser.add_argument("--block", type=int, default=1024)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--sweep", type=float, default=360.0, help="Degrees swept over the run")
+    parser.add_argument("--realtime", action="store_true", help="Also run the engine on a paced simulated device")
+    args = parser.parse_args()
+
+    mono = generate_continuous_tone(args.seconds, 500, args.rate)
+    source_step = np.abs(np.diff(mono)).max()
+    period_ms = args.block / args.rate * 1000
+    renderer = BinauralBlockRenderer(args.rate)
+
+    results = {
+        "old": run(lambda m, az: render_binaural(m, az, 0.0, args.rate), mono, args.block, args.sweep),
+        "block": run(lambda m, az: renderer.process(m, az), mono, args.block, args.sweep),
+    }
+    print(f"\n{args.block}-sample blocks @ {args.rate}Hz (period {period_ms:.1f}ms), {args.sweep:.0f} deg sweep")
+    print(f"{'':>6} {'p50':>8} {'p95':>8} {'max':>8} {'load':>6} {'click':>7}")
+    for name, (times, jump) in results.items():
+        print(f"{name:>6} {np.percentile(times, 50):>6.3f}ms {np.percentile(times, 95):>6.3f}ms "
+              f"{times.max():>6.3f}ms {np.percentile(times, 50) / period_ms:>6.1%} {jump / source_step:>6.2f}x")
+    print(f"  click = largest boundary jump / largest source step; crossfades {renderer.crossfades}")
+
+    if args.realtime:
+        stats = realtime(args.rate, args.block, min(args.seconds, 5.0))
+        print(f"\nEngine on simulated device: {stats['blocks']} blocks, p50 {stats['p50_ms']:.3f}ms "
+              f"p95 {stats['p95_ms']:.3f}ms max {stats['max_ms']:.3f}ms, "
+              f"late {stats['late_blocks']}, underruns {stats['underruns']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Binaural Voice Mixer Benchmark
+
+Renders 1, 8 and 32 simultaneous positioned sources (looping tones
+spread around the head, each slowly orbiting so cues ramp every block)
+through BinauralMixer in device-sized blocks, and compares against the
+old layout of one BinauralBlockRenderer per source.
+
+Reports render time per block (p50/p95/max), the share of the block
+period it uses (load) and the cost per voice. Run on the Pi to check
+the realtime budget; the voice limit in config (spatial_audio.voices)
+should stay where p95 load is well under 50%.
+
+--head also runs a simulated 100Hz IMU turning the head at a constant
+rate while blocks are rendered on a paced device, and reports how far
+the rendered direction of a world-anchored source lags the true head
+(as milliseconds of head motion).
+
+Usage:
+    python3 tests/benchmark_binaural_mixer.py
+    python3 tests/benchmark_binaural_mixer.py --block 480 --rate 48000 --sources 1 8 16 32
+    python3 tests/benchmark_binaural_mixer.py --head --imu-hz 100
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer3_guide.spatial_audio.binaural_engine import BinauralBlockRenderer, generate_continuous_tone
+from layer3_guide.spatial_audio.binaural_mixer import BinauralMixer
+from layer3_guide.spatial_audio.head_tracker import HeadTracker, quaternion_from_euler
+
+
+def azimuths(count, k, n_blocks):
+    return -180.0 + 360.0 * np.arange(count) / count + 90.0 * k / n_blocks
+
+
+def run_mixer(count, tone, rate, block, n_blocks):
+    mixer = BinauralMixer(rate, max_voices=count)
+    voices = [mixer.play(tone, 0.0, loop=True) for _ in range(count)]
+    times = []
+    for k in range(n_blocks):
+        for voice, az in zip(voices, azimuths(count, k, n_blocks)):
+            voice.move(az)
+        t0 = time.perf_counter()
+        mixer.render(block)
+        times.append((time.perf_counter() - t0) * 1000)
+    return np.array(times)
+
+
+def run_separate(count, tone, rate, block, n_blocks):
+    renderers = [BinauralBlockRenderer(rate) for _ in range(count)]
+    times = []
+    for k in range(n_blocks):
+        idx = (k * block + np.arange(block)) % len(tone)
+        t0 = time.perf_counter()
+        out = np.zeros((block, 2))
+        for renderer, az in zip(renderers, azimuths(count, k, n_blocks)):
+            out += renderer.process(tone[idx], az)
+        times.append((time.perf_counter() - t0) * 1000)
+    return np.array(times)
+
+
+def head_lag(rate, block, seconds, imu_hz, turn_dps):
+    tracker = HeadTracker()
+    start = time.perf_counter()
+    stop = threading.Event()
+
+    def imu():
+        period = 1.0 / imu_hz
+        next_t = time.perf_counter()
+        while not stop.is_set():
+            t = time.perf_counter()
+            tracker.push(quaternion_from_euler(turn_dps * (t - start)), t=t)
+            next_t += period
+            time.sleep(max(0.0, next_t - time.perf_counter()))
+
+    thread = threading.Thread(target=imu, daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    lags = []
+    period = block / rate
+    next_t = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        when = time.perf_counter() + period / 2          # Middle of the block being rendered
+        az, _ = tracker.project_angles(np.array([0.0]), np.array([0.0]), t=when)
+        true_az = -(turn_dps * (when - start) + 180.0) % 360.0 - 180.0
+        error = (az[0] - true_az + 180.0) % 360.0 - 180.0
+        lags.append(abs(error) / turn_dps * 1000)
+        next_t += period
+        time.sleep(max(0.0, next_t - time.perf_counter()))
+    stop.set()
+    thread.join()
+    return np.array(lags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binaural voice mixer: render cost vs source count")
+    parser.add_argument("--block", type=int, default=1024)
+    parser.add_argument("--rate", type=int, default=48000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--sources", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--head", action="store_true", help="Also measure head-turn-to-audio lag")
+    parser.add_argument("--imu-hz", type=float, default=100.0)
+    parser.add_argument("--turn", type=float, default=180.0, help="Head turn rate (deg/s)")
+    args = parser.parse_args()
+
+    tone = generate_continuous_tone(2.0, 500, args.rate)
+    period_ms = args.block / args.rate * 1000
+    n_blocks = int(args.seconds * args.rate / args.block)
+
+    print(f"\n{args.block}-sample blocks @ {args.rate}Hz (period {period_ms:.1f}ms), {n_blocks} blocks")
+    print(f"{'sources':>8} {'':>9} {'p50':>8} {'p95':>8} {'max':>8} {'load':>6} {'/voice':>8}")
+    for count in args.sources:
+        for name, run in (("mixer", run_mixer), ("separate", run_separate)):
+            times = run(count, tone, args.rate, args.block, n_blocks)
+            p50, p95 = np.percentile(times, 50), np.percentile(times, 95)
+            print(f"{count:>8} {name:>9} {p50:>6.3f}ms {p95:>6.3f}ms {times.max():>6.3f}ms "
+                  f"{p95 / period_ms:>6.1%} {p50 / count:>6.3f}ms")
+
+    if args.head:
+        lags = head_lag(args.rate, args.block, min(args.seconds, 5.0), args.imu_hz, args.turn)
+        print(f"\nHead tracking ({args.imu_hz:.0f}Hz IMU, {args.turn:.0f} deg/s turn): direction lag "
+              f"p50 {np.percentile(lags, 50):.1f}ms p95 {np.percentile(lags, 95):.1f}ms max {lags.max():.1f}ms "
+              f"(+ output device latency)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Keyword Spotter FA/FR Benchmark
+
+Runs the keyword spotter over a labelled set of recorded segments and
+reports, per command and over a threshold sweep:
+- false reject rate (FR): recordings of a command not recognized as it
+- false accept rate (FA): other recordings (other commands, open queries,
+  noise) accepted as that command
+- spotting latency p50/p95
+- share of segments that would skip STT
+
+Test set layout (16 kHz mono 16-bit WAV, recorded separately from the
+enrollment templates):
+    <test-dir>/<label>/*.wav   command recordings (label = template folder)
+    <test-dir>/_other/*.wav    open queries (must pass to STT)
+    <test-dir>/_noise/*.wav    coughs, street noise, chatter (must not be accepted)
+
+Status - NOT MEASURED YET:
+    There is no FA/FR table for this spotter. No labelled command
+    recordings exist in the repo, and the spotter has not been run on the
+    Pi 5, so on-device command latency is not measured either. The only
+    measured number is spotting compute time on x86 (one Xeon core, 24
+    templates, synthetic voiced "words" as in tests/test_keyword_spotter.py):
+    p50 7.4ms, p95 8.2ms. End-to-end command latency also includes the VAD
+    end-of-speech silence and the command handler, which this script does
+    not time. Record the test set, run this on the Pi and replace this note
+    with the table.
+
+Usage:
+    python3 tests/benchmark_keyword_spotter.py --templates data/kws --test-dir recordings/kws_test
+    python3 tests/benchmark_keyword_spotter.py --templates data/kws --test-dir recordings/kws_test --thresholds 0.25 0.3 0.35 0.4
+    python3 tests/benchmark_keyword_spotter.py --templates data/kws --test-dir recordings/kws_test --export kws_results.json
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer1_reflex.keyword_spotter import DEFAULT_COMMANDS, NOISE, KeywordSpotter, load_wav
+
+
+def load_test_set(test_dir: str, labels) -> List[Dict]:
+    samples = []
+    for folder in sorted(Path(test_dir).iterdir()):
+        if not folder.is_dir():
+            continue
+        if folder.name not in labels and folder.name not in ("_other", "_noise"):
+            print(f"   skipping {folder.name}/: not a configured command")
+            continue
+        for path in sorted(folder.glob("*.wav")):
+            samples.append({"file": f"{folder.name}/{path.name}", "truth": folder.name,
+                            "audio": load_wav(path)})
+    return samples
+
+
+def decide(result, threshold: float, margin: float) -> Optional[str]:
+    """Accepted label at this operating point (None = passed to STT / dropped)."""
+    if not result.scores:  # Noise or long open query: never matched
+        return None
+    ranked = sorted(result.scores.items(), key=lambda item: item[1])
+    label, best = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else np.inf
+    if best < threshold and runner_up - best >= margin:
+        return label
+    return None
+
+
+def rates(rows, labels, threshold: float, margin: float) -> Dict[str, Dict[str, float]]:
+    table = {}
+    for label in labels:
+        positives = [r for r in rows if r["truth"] == label]
+        negatives = [r for r in rows if r["truth"] != label]
+        fr = sum(decide(r["result"], threshold, margin) != label for r in positives)
+        fa = sum(decide(r["result"], threshold, margin) == label for r in negatives)
+        table[label] = {
+            "positives": len(positives),
+            "negatives": len(negatives),
+            "fr": fr / len(positives) if positives else float("nan"),
+            "fa": fa / len(negatives) if negatives else float("nan"),
+        }
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword spotter false accept / false reject benchmark")
+    parser.add_argument("--templates", required=True, help="Enrollment dir (<label>/*.wav)")
+    parser.add_argument("--test-dir", required=True, help="Labelled test recordings")
+    parser.add_argument("--threshold", type=float, default=0.35)
+    parser.add_argument("--margin", type=float, default=0.03)
+    parser.add_argument("--thresholds", type=float, nargs="+",
+                        default=[0.2, 0.25, 0.3, 0.35, 0.4, 0.45], help="Sweep for the FA/FR trade-off")
+    parser.add_argument("--max-command-s", type=float, default=2.0)
+    parser.add_argument("--min-voiced-ratio", type=float, default=0.15)
+    parser.add_argument("--export", help="Write per-file results to JSON")
+    args = parser.parse_args()
+
+    # Threshold / margin are applied offline so one pass serves the whole sweep
+    spotter = KeywordSpotter(DEFAULT_COMMANDS, threshold=np.inf, margin=0.0,
+                             max_command_s=args.max_command_s, min_voiced_ratio=args.min_voiced_ratio)
+    if not spotter.load_templates(args.templates):
+        print(f"No templates in {args.templates}")
+        return 1
+    labels = [label for label in DEFAULT_COMMANDS if (Path(args.templates) / label).is_dir()]
+
+    samples = load_test_set(args.test_dir, labels)
+    if not samples:
+        print(f"No test recordings in {args.test_dir}")
+        return 1
+    rows = []
+    for sample in samples:
+        rows.append({"file": sample["file"], "truth": sample["truth"], "result": spotter.spot(sample["audio"])})
+    latencies = np.array([r["result"].elapsed_ms for r in rows])
+    print(f"\n{len(rows)} test segments, {spotter.n_templates} templates, labels {labels}")
+    print(f"Spotting latency: p50 {np.percentile(latencies, 50):.1f}ms, "
+          f"p95 {np.percentile(latencies, 95):.1f}ms, max {latencies.max():.1f}ms")
+
+    table = rates(rows, labels, args.threshold, args.margin)
+    print(f"\nOperating point: threshold {args.threshold}, margin {args.margin}")
+    print(f"{'Command':<14} {'Pos':>5} {'Neg':>5} {'FR':>8} {'FA':>8}")
+    print("-" * 44)
+    for label, r in table.items():
+        print(f"{label:<14} {r['positives']:>5} {r['negatives']:>5} {r['fr']:>7.1%} {r['fa']:>7.1%}")
+
+    noise_rows = [r for r in rows if r["truth"] == "_noise"]
+    if noise_rows:
+        dropped = sum(r["result"].kind == NOISE for r in noise_rows)
+        print(f"\nNoise segments dropped before STT: {dropped}/{len(noise_rows)}")
+    skipped = sum(r["result"].kind == NOISE or decide(r["result"], args.threshold, args.margin) is not None
+                  for r in rows)
+    print(f"Segments skipping STT: {skipped}/{len(rows)} ({skipped / len(rows):.0%})")
+
+    print(f"\n{'Threshold':>9} {'mean FR':>9} {'mean FA':>9}")
+    print("-" * 30)
+    for threshold in args.thresholds:
+        sweep = rates(rows, labels, threshold, args.margin)
+        print(f"{threshold:>9.2f} {np.nanmean([r['fr'] for r in sweep.values()]):>8.1%} "
+              f"{np.nanmean([r['fa'] for r in sweep.values()]):>8.1%}")
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump([{
+                "file": r["file"], "truth": r["truth"], "kind": r["result"].kind,
+                "accepted": decide(r["result"], args.threshold, args.margin),
+                "distance": r["result"].distance, "margin": r["result"].margin,
+                "voiced_ratio": r["result"].voiced_ratio, "elapsed_ms": r["result"].elapsed_ms,
+            } for r in rows], f, indent=2, default=float)
+        print(f"\nResults written to {args.export}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Route Geometry Benchmark
+
+Builds a long walking route (default 10k points) and compares:
+- decode:  the old per-character polyline decoder vs the vectorized one
+           (as an array, and as the (lat, lng) list decode_polyline returns)
+- prepare: RouteGeometry + RouteMatcher build, once per fetched / loaded route
+- tick:    the old per-tick work (haversine + bearing to the waypoint and
+           to the destination, turn look-ahead with haversine) vs the new
+           lookups (ENU projection, vector_to, turn_due), and the map-match
+           (match_xy) that supplies progress along the route
+
+Ticks replay a simulated 1Hz walk along the whole route with GPS noise.
+
+Usage:
+    python3 tests/benchmark_route_geometry.py
+    python3 tests/benchmark_route_geometry.py --points 50000 --ticks 5000
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import gc
+import logging
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer3_guide.navigation_engine import Waypoint, bearing_between, decode_polyline, haversine_distance
+from layer3_guide.route_geometry import RouteGeometry, decode_polyline_array, encode_polyline
+from layer3_guide.route_matcher import RouteMatcher
+
+logging.getLogger().setLevel(logging.WARNING)
+
+M_PER_DEG = 111_195.0
+
+
+def reference_decode(encoded):
+    """The per-character decoder the navigation engine used before."""
+    points, index, lat, lng = [], 0, 0, 0
+    while index < len(encoded):
+        shift = result = 0
+        while True:
+            b = ord(encoded[index]) - 63
+            index += 1
+            result |= (b & 0x1F) << shift
+            shift += 5
+            if b < 0x20:
+                break
+        lat += (~(result >> 1) if (result & 1) else (result >> 1))
+        shift = result = 0
+        while True:
+            b = ord(encoded[index]) - 63
+            index += 1
+            result |= (b & 0x1F) << shift
+            shift += 5
+            if b < 0x20:
+                break
+        lng += (~(result >> 1) if (result & 1) else (result >> 1))
+        points.append((lat / 1e5, lng / 1e5))
+    return points
+
+
+def make_route(n, seed):
+    """Street-like walk: 8m steps, a turn every ~15 points."""
+    rng = random.Random(seed)
+    lat, lng, heading = 1.3521, 103.8198, 0.0
+    waypoints = []
+    for i in range(n):
+        turn = i > 0 and i % 15 == 0
+        if turn:
+            heading += rng.choice([-90.0, 90.0])
+        waypoints.append(Waypoint(round(lat, 5), round(lng, 5), is_turn=turn,
+                                  maneuver="turn-left" if turn else "",
+                                  instruction="Cross the road" if i % 97 == 0 else ""))
+        lat += 8.0 * math.cos(math.radians(heading)) / M_PER_DEG
+        lng += 8.0 * math.sin(math.radians(heading)) / (M_PER_DEG * math.cos(math.radians(lat)))
+    return waypoints
+
+
+def walk_fixes(waypoints, ticks, seed):
+    """1.4m/s fixes along the first part of the route, 4m GPS noise."""
+    rng = random.Random(seed)
+    fixes, i, s = [], 0, 0.0
+    while len(fixes) < ticks and i < len(waypoints) - 1:
+        a, b = waypoints[i], waypoints[i + 1]
+        seg = haversine_distance(a.lat, a.lng, b.lat, b.lng)
+        if s > seg:
+            s -= seg
+            i += 1
+            continue
+        u = s / seg if seg else 0.0
+        fixes.append((a.lat + (b.lat - a.lat) * u + rng.gauss(0, 4.0) / M_PER_DEG,
+                      a.lng + (b.lng - a.lng) * u + rng.gauss(0, 4.0) / M_PER_DEG, i + 1))
+        s += 1.4
+    return fixes
+
+
+def old_tick(waypoints, idx, lat, lng, announced):
+    wp = waypoints[idx]
+    dist = haversine_distance(lat, lng, wp.lat, wp.lng)
+    bearing = bearing_between(lat, lng, wp.lat, wp.lng)
+    for i in range(idx, min(idx + 3, len(waypoints))):
+        t = waypoints[i]
+        if t.is_turn and i not in announced and haversine_distance(lat, lng, t.lat, t.lng) < 25.0:
+            announced.add(i)
+            break
+    final = waypoints[-1]
+    return dist, bearing, haversine_distance(lat, lng, final.lat, final.lng)
+
+
+def new_tick(geometry, idx, x, y, progress_m, announced):
+    dist, bearing = geometry.vector_to(idx, x, y)
+    turn = geometry.turn_due(idx, progress_m)
+    if turn >= 0:
+        announced.add(turn)
+    return dist, bearing, geometry.vector_to(-1, x, y)[0]
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+        gc.enable()
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Route geometry benchmark")
+    parser.add_argument("--points", type=int, default=10_000, help="Route points")
+    parser.add_argument("--ticks", type=int, default=2000, help="Nav ticks to replay")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats (best time reported)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    waypoints = make_route(args.points, args.seed)
+    encoded = encode_polyline((w.lat, w.lng) for w in waypoints)
+
+    old_decode_ms, old_points = timed(lambda: reference_decode(encoded), args.repeat)
+    array_decode_ms, _ = timed(lambda: decode_polyline_array(encoded), args.repeat)
+    new_decode_ms, new_points = timed(lambda: decode_polyline(encoded), args.repeat)
+    if old_points != new_points:
+        print("Vectorized decoder disagrees with the reference decoder")
+        return 1
+
+    geometry_ms, geometry = timed(lambda: RouteGeometry.from_waypoints(waypoints, 25.0, {"cross", "road"}),
+                                  args.repeat)
+    matcher_ms, _ = timed(lambda: RouteMatcher(geometry), args.repeat)
+
+    fixes = walk_fixes(waypoints, args.ticks, args.seed)
+    old_announced, new_announced = set(), set()
+    t0 = time.perf_counter()
+    for lat, lng, idx in fixes:
+        old_tick(waypoints, idx, lat, lng, old_announced)
+    old_tick_us = (time.perf_counter() - t0) / len(fixes) * 1e6
+
+    matcher, progress = RouteMatcher(geometry), []
+    t0 = time.perf_counter()
+    for lat, lng, _ in fixes:
+        x, y = (float(v) for v in geometry.to_xy(lat, lng))
+        progress.append((x, y, matcher.match_xy(x, y, now=0.0).progress_m))
+    match_us = (time.perf_counter() - t0) / len(fixes) * 1e6
+
+    t0 = time.perf_counter()
+    for (lat, lng, idx), (_, _, progress_m) in zip(fixes, progress):
+        x, y = (float(v) for v in geometry.to_xy(lat, lng))
+        new_tick(geometry, idx, x, y, progress_m, new_announced)
+    new_tick_us = (time.perf_counter() - t0) / len(fixes) * 1e6
+
+    print(f"\nRoute: {args.points} points, {geometry.total_m / 1000:.1f}km, "
+          f"{int(geometry.is_turn.sum())} turns, {len(encoded)} polyline chars")
+    print(f"{'decode (per-char)':>24} {old_decode_ms:>9.2f}ms")
+    print(f"{'decode (vectorized)':>24} {array_decode_ms:>9.2f}ms  ({old_decode_ms / array_decode_ms:.1f}x, array)")
+    print(f"{'decode_polyline()':>24} {new_decode_ms:>9.2f}ms  ({old_decode_ms / new_decode_ms:.1f}x, list of tuples)")
+    print(f"{'RouteGeometry build':>24} {geometry_ms:>9.2f}ms  (once per route)")
+    print(f"{'RouteMatcher build':>24} {matcher_ms:>9.2f}ms  (once per route)")
+    print(f"\n{len(fixes)} ticks:")
+    print(f"{'old tick (trig)':>24} {old_tick_us:>9.1f}us  ({len(old_announced)} turns announced)")
+    print(f"{'new tick (lookups)':>24} {new_tick_us:>9.1f}us  ({len(new_announced)} turns announced)")
+    print(f"{'map-match (match_xy)':>24} {match_us:>9.1f}us  (window around progress, O(log n))")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
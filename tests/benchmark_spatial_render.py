@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Offline Spatial Audio Render Benchmark
+
+Runs the scripted spatial audio scenarios (offline_render.SCENARIOS) on
+a virtual clock with no audio device: BinauralEngine sweeps, proximity
+alerts and beacon approaches, the manager with a head turn, and a full
+voice load. For each scenario prints every localization / timing check
+(ITD, ILD, IACC, onset counts) and the audio callback CPU time per block
+against the real-time budget.
+
+Exits non-zero if any check fails, so it can gate CI or a Pi image build
+(tests/test_spatial_render.py runs the same checks under pytest). --out
+writes one WAV per scenario to listen back to.
+
+Usage:
+    python3 tests/benchmark_spatial_render.py
+    python3 tests/benchmark_spatial_render.py --block 256 --max-load 0.3 --out /tmp/renders
+    python3 tests/benchmark_spatial_render.py --scenarios engine_sweep full_load
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer3_guide.spatial_audio.offline_render import SCENARIOS, run_scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline spatial audio render benchmark")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--rate", type=int, default=48000)
+    parser.add_argument("--block", type=int, default=480, help="Frames per callback")
+    parser.add_argument("--max-voices", type=int, default=16)
+    parser.add_argument("--max-load", type=float, default=0.5,
+                        help="Fail if p95 callback time exceeds this share of the block period")
+    parser.add_argument("--out", type=Path, help="Directory for one WAV per scenario")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)   # Package import enables INFO
+    if args.out:
+        args.out.mkdir(parents=True, exist_ok=True)
+
+    print(f"Offline render: {args.rate}Hz, {args.block}-frame blocks "
+          f"({args.block / args.rate * 1000:.1f}ms budget), {args.max_voices} voices\n")
+    failures = 0
+    for name in args.scenarios:
+        checks, stats = run_scenario(
+            name,
+            max_load=args.max_load,
+            wav_path=str(args.out / f"{name}.wav") if args.out else None,
+            sample_rate=args.rate,
+            blocksize=args.block,
+            voices={"max_voices": args.max_voices},
+        )
+        print(f"{name}  (p50 {stats['p50_ms']:.2f}ms, p95 {stats['p95_ms']:.2f}ms, max {stats['max_ms']:.2f}ms, "
+              f"{stats['realtime_factor']:.0f}x real time)")
+        for check in checks:
+            print(f"  {'PASS' if check.passed else 'FAIL'}  {check.name:<45} {check.detail}")
+            failures += not check.passed
+        print()
+
+    print("All checks passed" if not failures else f"{failures} check(s) FAILED")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
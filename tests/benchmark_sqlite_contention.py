@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - SQLite Contention Benchmark
+
+Simulates the on-device database load while walking with voice active:
+- Detection thread: store_detection() inserts at ~30 Hz (Layer 1 learner)
+- Voice thread: add_turn() inserts + LIKE search over conversation history
+- Nav thread: find_nearest_stop() bounding-box lookups on bus_stops
+
+Each workload runs against the same database file twice: once with the old
+ad-hoc pattern (sqlite3.connect per call, commit per write) and once through
+the shared access layer (single writer with group commit + read pool).
+Reports p50/p95/max latency per operation and "database is locked" errors.
+
+Usage:
+    python3 tests/benchmark_sqlite_contention.py
+    python3 tests/benchmark_sqlite_contention.py --duration 20 --rate-scale 4
+    python3 tests/benchmark_sqlite_contention.py --mode shared --export results.json
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer4_memory.sqlite_access import get_database  # noqa: E402
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS detections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, device_id TEXT,
+        layer TEXT, class_name TEXT, confidence REAL, bbox_x1 REAL, bbox_y1 REAL,
+        bbox_x2 REAL, bbox_y2 REAL, synced INTEGER DEFAULT 0)""",
+    """CREATE TABLE IF NOT EXISTS conversations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT, timestamp REAL,
+        role TEXT, content TEXT, query_type TEXT)""",
+    """CREATE TABLE IF NOT EXISTS bus_stops (
+        code TEXT PRIMARY KEY, description TEXT, road_name TEXT,
+        latitude REAL, longitude REAL)""",
+    """CREATE INDEX IF NOT EXISTS idx_bus_stops_geo
+        ON bus_stops(latitude, longitude, code, description, road_name)""",
+]
+
+CLASSES = ["person", "car", "bicycle", "chair", "cup", "bottle", "wallet", "keys"]
+WORDS = ["where", "did", "I", "leave", "my", "wallet", "keys", "what", "is", "ahead", "bus", "stop"]
+
+DETECTION_SQL = """INSERT INTO detections
+    (timestamp, device_id, layer, class_name, confidence, bbox_x1, bbox_y1, bbox_x2, bbox_y2)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+TURN_SQL = "INSERT INTO conversations (session_id, timestamp, role, content, query_type) VALUES (?, ?, ?, ?, ?)"
+SEARCH_SQL = """SELECT content, timestamp FROM conversations
+    WHERE content LIKE ? ORDER BY timestamp DESC LIMIT 5"""
+NEAREST_SQL = """SELECT code, description, road_name, latitude, longitude FROM bus_stops
+    WHERE latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?"""
+
+
+def seed_database(path: str, stops: int):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    rng = random.Random(0)
+    conn.executemany(
+        "INSERT OR REPLACE INTO bus_stops VALUES (?, ?, ?, ?, ?)",
+        [
+            (f"{i:05d}", f"Stop {i}", f"Road {i % 200}",
+             1.25 + rng.random() * 0.2, 103.6 + rng.random() * 0.4)
+            for i in range(stops)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+class AdHocBackend:
+    """Pre-refactor pattern: a fresh connection and commit for every call."""
+
+    name = "ad-hoc"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, sql, params):
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def read(self, sql, params):
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def close(self):
+        pass
+
+
+class SharedBackend:
+    """Shared access layer: single writer thread + pooled readers."""
+
+    name = "shared"
+
+    def __init__(self, path: str):
+        self.db = get_database(path)
+
+    def write(self, sql, params):
+        self.db.execute(sql, params)
+
+    def read(self, sql, params):
+        return self.db.query(sql, params)
+
+    def close(self):
+        stats = self.db.get_stats()
+        print(f"    writer: {stats['writes']} writes in {stats['batches']} commits "
+              f"(avg batch {stats['avg_batch']}, max {stats['max_batch']}), "
+              f"queue high water {stats['queue_high_water']}")
+        self.db.release()
+
+
+def run_workload(backend, duration: float, rate_scale: float) -> Dict[str, Dict[str, float]]:
+    latencies: Dict[str, List[float]] = {op: [] for op in ("detection_write", "turn_write", "history_search", "nearest_stop")}
+    errors: Dict[str, int] = {op: 0 for op in latencies}
+    stop = threading.Event()
+    lock = threading.Lock()
+
+    def timed(op, fn, *args):
+        start = time.perf_counter()
+        try:
+            fn(*args)
+        except sqlite3.OperationalError:
+            with lock:
+                errors[op] += 1
+            return
+        with lock:
+            latencies[op].append((time.perf_counter() - start) * 1000)
+
+    def paced(interval, body):
+        interval /= rate_scale
+        next_tick = time.perf_counter()
+        while not stop.is_set():
+            body()
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    rng = random.Random(1)
+
+    def detection():
+        timed("detection_write", backend.write, DETECTION_SQL, (
+            time.strftime("%Y-%m-%dT%H:%M:%S"), "rpi5", "layer1", rng.choice(CLASSES),
+            rng.random(), 10.0, 20.0, 110.0, 220.0,
+        ))
+
+    def voice():
+        text = " ".join(rng.choice(WORDS) for _ in range(12))
+        timed("turn_write", backend.write, TURN_SQL, ("bench", time.time(), "user", text, "chat"))
+        timed("history_search", backend.read, SEARCH_SQL, (f"%{rng.choice(CLASSES)}%",))
+
+    def nav():
+        lat, lng = 1.25 + rng.random() * 0.2, 103.6 + rng.random() * 0.4
+        d = 0.0045  # ~500 m
+        timed("nearest_stop", backend.read, NEAREST_SQL, (lat - d, lat + d, lng - d, lng + d))
+
+    threads = [
+        threading.Thread(target=paced, args=(1 / 30, detection), daemon=True),
+        threading.Thread(target=paced, args=(0.25, voice), daemon=True),
+        threading.Thread(target=paced, args=(0.1, nav), daemon=True),
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout=10)
+
+    results = {}
+    for op, values in latencies.items():
+        arr = np.array(values) if values else np.zeros(1)
+        results[op] = {
+            "count": len(values),
+            "p50_ms": round(float(np.percentile(arr, 50)), 3),
+            "p95_ms": round(float(np.percentile(arr, 95)), 3),
+            "max_ms": round(float(arr.max()), 3),
+            "locked_errors": errors[op],
+        }
+    return results
+
+
+def print_results(name: str, results: Dict[str, Dict[str, float]]):
+    print(f"\n  {name}")
+    print(f"    {'operation':<18}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'locked':>8}")
+    for op, r in results.items():
+        print(f"    {op:<18}{r['count']:>8}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+              f"{r['max_ms']:>10.3f}{r['locked_errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite contention under nav/voice/detection load")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per backend")
+    parser.add_argument("--rate-scale", type=float, default=1.0, help="Multiply all workload rates")
+    parser.add_argument("--stops", type=int, default=5000, help="Bus stops to seed")
+    parser.add_argument("--mode", choices=["both", "adhoc", "shared"], default="both")
+    parser.add_argument("--export", type=str, help="Export results to JSON file")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("SQLite contention benchmark")
+    print(f"duration={args.duration}s rate_scale={args.rate_scale} stops={args.stops}")
+    print("=" * 70)
+
+    backends = {"adhoc": AdHocBackend, "shared": SharedBackend}
+    selected = ["adhoc", "shared"] if args.mode == "both" else [args.mode]
+    all_results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for key in selected:
+            path = os.path.join(tmp, f"{key}.db")
+            seed_database(path, args.stops)
+            backend = backends[key](path)
+            results = run_workload(backend, args.duration, args.rate_scale)
+            print_results(backend.name, results)
+            backend.close()
+            all_results[backend.name] = results
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump(all_results, f, indent=2)
+        print(f"\nResults exported to {args.export}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Streaming STT Latency Benchmark
+
+Measures end-of-speech -> final transcript latency for:
+- batch:     current path, WhisperSTT.transcribe() on the whole segment after
+             the VAD end event
+- streaming: StreamingTranscriber fed 32ms chunks at real-time pace while the
+             user "speaks", then finish() at the VAD end event
+
+Each utterance is followed by the VAD min-silence tail (the VAD only fires
+its end event after that much silence), so both paths see the same audio.
+Reports p50/p95 latency and how often streaming needed no decode after
+end of speech.
+
+Usage:
+    python3 tests/benchmark_streaming_stt.py --audio-dir recordings/
+    python3 tests/benchmark_streaming_stt.py --audio-dir recordings/ --model tiny --step-ms 600
+    python3 tests/benchmark_streaming_stt.py --audio-dir recordings/ --fast --export results.json
+
+WAV files must be 16 kHz mono (16-bit PCM).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import json
+import sys
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer1_reflex.streaming_stt import StreamingTranscriber
+from layer1_reflex.whisper_handler import WhisperSTT
+
+SAMPLE_RATE = 16000
+CHUNK = 512  # 32ms, same as VADHandler
+
+
+def load_wav(path: Path) -> np.ndarray:
+    with wave.open(str(path), "rb") as wf:
+        if wf.getframerate() != SAMPLE_RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected 16 kHz mono 16-bit PCM")
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    return data.astype(np.float32) / 32768.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def run_batch(stt: WhisperSTT, audio: np.ndarray) -> Dict:
+    start = time.perf_counter()
+    text = stt.transcribe(audio) or ""
+    return {"latency_ms": (time.perf_counter() - start) * 1000, "text": text}
+
+
+def run_streaming(stt: WhisperSTT, audio: np.ndarray, tail_s: float, args) -> Dict:
+    stream = StreamingTranscriber(
+        decode_fn=stt.transcribe_window,
+        step_s=args.step_ms / 1000.0,
+        min_first_s=args.step_ms / 1000.0,
+        max_window_s=args.max_window_s,
+        overlap_s=args.overlap_s,
+    )
+    chunk_s = CHUNK / SAMPLE_RATE
+    t0 = time.perf_counter()
+    for i, pos in enumerate(range(0, len(audio), CHUNK)):
+        stream.feed(audio[pos:pos + CHUNK])
+        if not args.fast:
+            # Real-time pacing: the microphone delivers one chunk every 32ms
+            delay = t0 + (i + 1) * chunk_s - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    start = time.perf_counter()  # VAD end event
+    final = stream.finish(silence_tail_s=tail_s)
+    return {
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "text": final.text,
+        "reused": stream.final_reused,
+        "partials": stream.partial_decodes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming vs batch STT latency benchmark")
+    parser.add_argument("--audio-dir", required=True, help="Directory of 16 kHz mono WAV utterances")
+    parser.add_argument("--model", default="base", help="Whisper model size")
+    parser.add_argument("--silence-ms", type=int, default=500, help="VAD min silence (end-event delay)")
+    parser.add_argument("--step-ms", type=int, default=800, help="Streaming decode step")
+    parser.add_argument("--max-window-s", type=float, default=12.0)
+    parser.add_argument("--overlap-s", type=float, default=3.0)
+    parser.add_argument("--fast", action="store_true", help="Feed audio as fast as possible (no pacing)")
+    parser.add_argument("--export", help="Write per-utterance results to JSON")
+    args = parser.parse_args()
+
+    files = sorted(Path(args.audio_dir).glob("*.wav"))
+    if not files:
+        print(f"No WAV files in {args.audio_dir}")
+        return 1
+
+    stt = WhisperSTT(model_size=args.model)
+    if not stt.load_model():
+        print("Failed to load Whisper model")
+        return 1
+
+    tail_s = args.silence_ms / 1000.0
+    tail = np.zeros(int(tail_s * SAMPLE_RATE), dtype=np.float32)
+    results = []
+    print(f"\n{'File':<28} {'Audio':>6} {'Batch':>9} {'Stream':>9} {'Reused':>7}")
+    print("-" * 64)
+    for path in files:
+        audio = np.concatenate([load_wav(path), tail])
+        batch = run_batch(stt, audio)
+        streaming = run_streaming(stt, audio, tail_s, args)
+        results.append({"file": path.name, "audio_s": len(audio) / SAMPLE_RATE,
+                        "batch": batch, "streaming": streaming})
+        print(f"{path.name[:28]:<28} {len(audio) / SAMPLE_RATE:>5.1f}s "
+              f"{batch['latency_ms']:>7.0f}ms {streaming['latency_ms']:>7.0f}ms "
+              f"{'yes' if streaming['reused'] else 'no':>7}")
+        if batch["text"].strip().lower() != streaming["text"].strip().lower():
+            print(f"   batch:     {batch['text']}")
+            print(f"   streaming: {streaming['text']}")
+
+    batch_ms = [r["batch"]["latency_ms"] for r in results]
+    stream_ms = [r["streaming"]["latency_ms"] for r in results]
+    reused = sum(r["streaming"]["reused"] for r in results)
+    print("\nEnd-of-speech -> final transcript")
+    print(f"   batch:     p50 {percentile(batch_ms, 50):7.0f}ms   p95 {percentile(batch_ms, 95):7.0f}ms")
+    print(f"   streaming: p50 {percentile(stream_ms, 50):7.0f}ms   p95 {percentile(stream_ms, 95):7.0f}ms")
+    print(f"   streaming finals with no decode after speech end: {reused}/{len(results)}")
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.export}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
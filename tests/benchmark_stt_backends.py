@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Local STT Backend Benchmark
+
+Transcribes a fixed set of recorded utterances with each local STT backend
+and reports, per backend:
+- load time (incl. warm-up decode)
+- latency p50/p95 per utterance
+- real-time factor (decode time / audio duration, < 1.0 = faster than real time)
+- WER against reference transcripts
+- temperature fallbacks (faster-whisper only)
+
+Each WAV needs a reference transcript next to it with the same name and a
+.txt extension (e.g. utt01.wav + utt01.txt). Run the same set after any
+model / backend / decoding change so the numbers stay comparable.
+
+Usage:
+    python3 tests/benchmark_stt_backends.py --audio-dir recordings/
+    python3 tests/benchmark_stt_backends.py --audio-dir recordings/ --backends faster_whisper --compute-type int8 float32
+    python3 tests/benchmark_stt_backends.py --audio-dir recordings/ --beam-size 5 --temperatures 0.0 0.4 0.8
+    python3 tests/benchmark_stt_backends.py --audio-dir recordings/ --export stt_results.json
+
+WAV files must be 16 kHz mono (16-bit PCM).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import json
+import sys
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer1_reflex.stt_backends import DecodeSettings, create_stt_backend, word_error_rate
+
+SAMPLE_RATE = 16000
+
+
+def load_wav(path: Path) -> np.ndarray:
+    with wave.open(str(path), "rb") as wf:
+        if wf.getframerate() != SAMPLE_RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected 16 kHz mono 16-bit PCM")
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    return data.astype(np.float32) / 32768.0
+
+
+def load_dataset(audio_dir: str) -> List[Tuple[str, np.ndarray, str]]:
+    dataset = []
+    for path in sorted(Path(audio_dir).glob("*.wav")):
+        ref_path = path.with_suffix(".txt")
+        if not ref_path.exists():
+            print(f"   skipping {path.name}: no {ref_path.name}")
+            continue
+        dataset.append((path.name, load_wav(path), ref_path.read_text().strip()))
+    return dataset
+
+
+def run_backend(label: str, backend: str, dataset, args, compute_type: str) -> Dict:
+    decode = DecodeSettings(beam_size=args.beam_size, temperatures=tuple(args.temperatures))
+    try:
+        stt = create_stt_backend(backend, model_size=args.model, decode=decode,
+                                 compute_type=compute_type, cpu_threads=args.threads)
+    except ImportError as e:
+        print(f"   {label}: {e}, skipped")
+        return {}
+    if stt.name != backend:
+        print(f"   {label}: backend not available, skipped")
+        return {}
+
+    start = time.perf_counter()
+    if not stt.load_model():
+        print(f"   {label}: model failed to load, skipped")
+        return {}
+    load_s = time.perf_counter() - start
+
+    rows = []
+    errors = words = 0
+    for name, audio, reference in dataset:
+        start = time.perf_counter()
+        text = stt.transcribe(audio, log_latency=False) or ""
+        latency_ms = (time.perf_counter() - start) * 1000
+        wer = word_error_rate(reference, text)
+        n_words = len(reference.split())
+        errors += wer * n_words
+        words += n_words
+        rows.append({"file": name, "latency_ms": latency_ms,
+                     "rtf": latency_ms / 1000 / (len(audio) / SAMPLE_RATE),
+                     "wer": wer, "text": text, "reference": reference})
+        if args.verbose and wer > 0:
+            print(f"   {label} {name}: '{text}' (ref '{reference}')")
+
+    latencies = [r["latency_ms"] for r in rows]
+    stats = stt.get_stats()
+    stt.unload_model()
+    return {
+        "label": label,
+        "load_s": load_s,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "rtf": float(np.mean([r["rtf"] for r in rows])),
+        "wer": errors / words if words else 0.0,
+        "fallbacks": stats.get("fallbacks", "-"),
+        "utterances": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local STT backend latency / RTF / WER benchmark")
+    parser.add_argument("--audio-dir", required=True, help="WAV utterances with .txt references")
+    parser.add_argument("--backends", nargs="+", default=["whisper", "faster_whisper"])
+    parser.add_argument("--model", default="base", help="Whisper model size")
+    parser.add_argument("--compute-type", nargs="+", default=["int8"],
+                        help="faster-whisper weight types to compare")
+    parser.add_argument("--threads", type=int, default=4, help="faster-whisper CPU threads")
+    parser.add_argument("--beam-size", type=int, default=1)
+    parser.add_argument("--temperatures", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--verbose", action="store_true", help="Print mistranscribed utterances")
+    parser.add_argument("--export", help="Write per-utterance results to JSON")
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.audio_dir)
+    if not dataset:
+        print(f"No WAV + .txt pairs in {args.audio_dir}")
+        return 1
+    total_audio = sum(len(audio) for _, audio, _ in dataset) / SAMPLE_RATE
+    print(f"\n{len(dataset)} utterances, {total_audio:.1f}s audio, model '{args.model}', "
+          f"beam {args.beam_size}, temperatures {args.temperatures}")
+
+    results = []
+    for backend in args.backends:
+        compute_types = args.compute_type if backend == "faster_whisper" else ["fp32"]
+        for compute_type in compute_types:
+            label = backend if backend == "whisper" else f"{backend}/{compute_type}"
+            print(f"   running {label}...")
+            result = run_backend(label, backend, dataset, args, compute_type)
+            if result:
+                results.append(result)
+
+    print(f"\n{'Backend':<24} {'Load':>7} {'p50':>9} {'p95':>9} {'RTF':>6} {'WER':>7} {'Fallbk':>7}")
+    print("-" * 74)
+    for r in results:
+        print(f"{r['label']:<24} {r['load_s']:>6.1f}s {r['p50_ms']:>7.0f}ms {r['p95_ms']:>7.0f}ms "
+              f"{r['rtf']:>6.2f} {r['wer']:>6.1%} {str(r['fallbacks']):>7}")
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.export}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
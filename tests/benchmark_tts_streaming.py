@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - Kokoro Time-To-First-Audio Benchmark
+
+Compares, for 50 / 300 / 1000-character responses:
+- batch:     generate_speech() on the full text (the old path; first audio
+             can only start after the whole response is rendered)
+- streaming: generate_speech_streaming() clause by clause into a player
+             (first audio = first clause in the player)
+
+Audio goes to a null sink by default so the numbers are synthesis only;
+--play sends the streaming run to the real StreamingAudioPlayer.
+
+Usage:
+    python3 tests/benchmark_tts_streaming.py
+    python3 tests/benchmark_tts_streaming.py --runs 5 --voice af_bella
+    python3 tests/benchmark_tts_streaming.py --play
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer1_reflex.kokoro_handler import KOKORO_AVAILABLE, KokoroTTS
+from layer1_reflex.tts_streaming import StreamingSynthesizer, split_clauses
+
+BASE_TEXT = (
+    "Your destination is about three hundred meters ahead on the left, past the bakery. "
+    "Keep walking straight along the pavement, which is wide and mostly clear, "
+    "although there is a row of bicycles parked near the corner. "
+    "In about eighty meters you will reach a signalised crossing; wait for the beeping "
+    "before you cross, because cars turn left here quite often. "
+    "After the crossing, the entrance is the second door, with two steps up and a handrail on the right. "
+)
+
+
+def make_text(n_chars: int) -> str:
+    text = (BASE_TEXT * (n_chars // len(BASE_TEXT) + 1))[:n_chars]
+    return text.rsplit(" ", 1)[0].rstrip(",;") + "."
+
+
+class NullSink:
+    def add_audio_chunk(self, data: bytes):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kokoro batch vs streaming time-to-first-audio")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[50, 300, 1000])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--voice", default=None)
+    parser.add_argument("--play", action="store_true", help="Stream into the real audio player")
+    args = parser.parse_args()
+
+    if not KOKORO_AVAILABLE:
+        print("kokoro_onnx not installed")
+        return 1
+    kokoro = KokoroTTS()
+    if not kokoro.load_pipeline():
+        print("Kokoro pipeline failed to load")
+        return 1
+    kokoro.generate_speech("Warm up.", log_latency=False)
+
+    sink = NullSink()
+    if args.play:
+        from layer2_thinker.streaming_audio_player import StreamingAudioPlayer
+        sink = StreamingAudioPlayer(sample_rate=24000, blocksize=1200, silence_timeout=60.0)
+    synth = StreamingSynthesizer(lambda t: kokoro.generate_speech_streaming(t, voice=args.voice), sink)
+
+    print(f"\n{'Chars':>6} {'Clauses':>8} {'Audio':>7} {'Batch TTFA':>11} {'Stream TTFA':>12} {'Stream total':>13}")
+    print("-" * 62)
+    for n_chars in args.lengths:
+        text = make_text(n_chars)
+        batch, stream, total = [], [], []
+        audio_s = 0.0
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            audio = kokoro.generate_speech(text, voice=args.voice, log_latency=False)
+            batch.append((time.perf_counter() - start) * 1000)
+            audio_s = len(audio) / 24000 if audio is not None else 0.0
+
+            result = synth.speak(text, wait=args.play)
+            stream.append(result.ttfa_ms)
+            total.append(result.synth_ms)
+        print(f"{len(text):>6} {len(split_clauses(text)):>8} {audio_s:>6.1f}s "
+              f"{np.median(batch):>9.0f}ms {np.median(stream):>10.0f}ms {np.median(total):>11.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Project Cortex v2.0 - VAD Capture Path Benchmark
+
+Replays synthetic microphone audio (48 kHz int16, speech bursts separated by
+silence) through two capture paths and measures the work done per callback
+and per VAD chunk, WITHOUT the Silero model (energy gate stands in for VAD):
+
+- legacy: astype(float32) + linspace/interp resample + Queue, padding list
+  trimmed with pop(0), speech list np.concatenate'd at segment end
+- ring:   PolyphaseResampler + AudioRingBuffer + SpeechCapture (views)
+
+Reports callback time p50/p95/max, allocated bytes per second and the number
+of allocating calls per second (tracemalloc peak above baseline). Transients
+under --alloc-floor bytes are ufunc/iterator bookkeeping (~1.4 KB for
+np.take), not audio buffers, and are not counted. Also reports the overrun
+counter when the consumer is stalled for --stall-ms.
+
+Usage:
+    python3 tests/benchmark_vad_capture.py
+    python3 tests/benchmark_vad_capture.py --seconds 120 --device-rate 44100
+    python3 tests/benchmark_vad_capture.py --stall-ms 2500
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0 - YIA 2026
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from queue import Queue
+
+import numpy as np
+
+# Add rpi5 to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rpi5"))
+
+from layer1_reflex.audio_ring import AudioRingBuffer, LatencyRing, PolyphaseResampler, SpeechCapture
+
+VAD_RATE = 16000
+CHUNK = 512
+PADDING_CHUNKS = 6
+ENERGY_GATE = 0.02
+
+
+def synth_audio(rate: int, seconds: float) -> np.ndarray:
+    """Speech-like bursts (1-3s of modulated tones) separated by 0.5-1.5s of noise."""
+    rng = np.random.default_rng(7)
+    parts = []
+    total = 0
+    while total < seconds * rate:
+        n = int(rng.uniform(1.0, 3.0) * rate)
+        t = np.arange(n) / rate
+        burst = 0.3 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+        gap = 0.003 * rng.standard_normal(int(rng.uniform(0.5, 1.5) * rate))
+        parts += [burst, gap]
+        total += n + len(gap)
+    return (np.concatenate(parts)[:int(seconds * rate)] * 32767).astype(np.int16)
+
+
+def is_voiced(chunk: np.ndarray) -> bool:
+    """Energy gate standing in for Silero (np.dot: no temporary array)."""
+    return float(np.dot(chunk, chunk)) / len(chunk) > ENERGY_GATE ** 2
+
+
+class AllocMeter:
+    """Counts calls whose tracemalloc peak exceeds the baseline by more than a floor."""
+
+    def __init__(self, floor: int):
+        self.floor = floor
+        self.bytes = 0
+        self.calls = 0
+
+    def measure(self, fn, *args):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = fn(*args)
+        transient = tracemalloc.get_traced_memory()[1] - base
+        if transient > self.floor:
+            self.bytes += transient
+            self.calls += 1
+        return result
+
+
+def run_legacy(pcm_blocks, ratio, meter, timer):
+    queue = Queue()
+    padding, speech, segments = [], [], 0
+
+    def callback(block):
+        chunk = np.frombuffer(block.tobytes(), dtype=np.int16).astype(np.float32) / 32768.0
+        if ratio > 1.01:
+            target_len = int(len(chunk) / ratio)
+            indices = np.linspace(0, len(chunk) - 1, target_len)
+            chunk = np.interp(indices, np.arange(len(chunk)), chunk).astype(np.float32)
+        queue.put(chunk)
+
+    def process(chunk):
+        nonlocal speech, segments
+        padding.append(chunk)
+        if len(padding) > PADDING_CHUNKS:
+            padding.pop(0)
+        active = is_voiced(chunk)
+        if active and not speech:
+            speech.extend(padding)
+        elif not active and speech:
+            np.concatenate(speech)
+            segments += 1
+            speech = []
+        if speech:
+            speech.append(chunk)
+
+    for block in pcm_blocks:
+        start = time.perf_counter()
+        meter.measure(callback, block)
+        timer.record((time.perf_counter() - start) * 1000)
+        while not queue.empty():
+            meter.measure(process, queue.get())
+    return segments, 0
+
+
+def run_ring(pcm_blocks, device_rate, block, meter, timer, stall_chunks):
+    resampler = PolyphaseResampler(device_rate, VAD_RATE, max_block=block)
+    ring = AudioRingBuffer(2 * VAD_RATE)
+    capture = SpeechCapture(capacity=30 * VAD_RATE + PADDING_CHUNKS * CHUNK, padding=PADDING_CHUNKS * CHUNK)
+    segments = 0
+
+    def callback(block_pcm):
+        ring.write(resampler.process(np.frombuffer(block_pcm.data, dtype=np.int16)))
+
+    def process():
+        nonlocal segments
+        chunk = capture.next_chunk(CHUNK)
+        ring.read_into(chunk)
+        active = is_voiced(chunk)
+        if active and not capture.in_segment:
+            capture.begin_segment(PADDING_CHUNKS * CHUNK)
+        elif not active and capture.in_segment:
+            capture.end_segment()
+            segments += 1
+
+    for i, block_pcm in enumerate(pcm_blocks):
+        start = time.perf_counter()
+        meter.measure(callback, block_pcm)
+        timer.record((time.perf_counter() - start) * 1000)
+        if stall_chunks and 100 <= i < 100 + stall_chunks:
+            continue  # Consumer stalled (e.g. CPU contention): ring fills up
+        while ring.available >= CHUNK:
+            meter.measure(process)
+    return segments, ring.overruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAD capture path allocation/latency benchmark")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Audio duration to replay")
+    parser.add_argument("--device-rate", type=int, default=48000, help="Microphone sample rate")
+    parser.add_argument("--stall-ms", type=int, default=0, help="Stall the ring consumer once for this long")
+    parser.add_argument("--alloc-floor", type=int, default=2048, help="Ignore transient allocations below this (bytes)")
+    args = parser.parse_args()
+
+    ratio = args.device_rate / VAD_RATE
+    probe = PolyphaseResampler(args.device_rate, VAD_RATE, max_block=1)
+    block = probe.preferred_block(int(CHUNK * ratio))
+    pcm = synth_audio(args.device_rate, args.seconds)
+    blocks = [pcm[i:i + block] for i in range(0, len(pcm) - block + 1, block)]
+    stall_chunks = int(args.stall_ms / (block / args.device_rate * 1000))
+
+    print(f"\nReplaying {args.seconds:.0f}s at {args.device_rate} Hz "
+          f"({len(blocks)} callbacks of {block} samples)")
+    print(f"\n{'Path':<8} {'cb p50':>8} {'cb p95':>8} {'cb max':>8} {'alloc KB/s':>11} "
+          f"{'allocs/s':>9} {'segments':>9} {'overruns':>9}")
+    print("-" * 78)
+
+    tracemalloc.start()
+    for name in ("legacy", "ring"):
+        meter = AllocMeter(args.alloc_floor)
+        timer = LatencyRing(len(blocks))
+        if name == "legacy":
+            segments, overruns = run_legacy(blocks, ratio, meter, timer)
+        else:
+            segments, overruns = run_ring(blocks, args.device_rate, block, meter, timer, stall_chunks)
+        summary = timer.summary()
+        print(f"{name:<8} {summary['p50_ms']:>6.3f}ms {summary['p95_ms']:>6.3f}ms "
+              f"{summary['max_ms']:>6.3f}ms {meter.bytes / 1024 / args.seconds:>11.1f} "
+              f"{meter.calls / args.seconds:>9.1f} {segments:>9} {overruns:>9}")
+    tracemalloc.stop()
+    print("\nCallback times include tracemalloc overhead; compare paths relative to each other.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
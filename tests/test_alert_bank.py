@@ -0,0 +1,99 @@
+"""
+Unit tests for the pre-rendered alert bank: build and reuse of the
+memory-mapped file, rebuild on clip changes, azimuth/urgency lookup and
+triggering on the mixer safety channel with trigger-to-sound metrics.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import os
+import wave
+
+import numpy as np
+import pytest
+
+import alert_bank
+from alert_bank import AlertBank, URGENCIES
+from audio_mixer import AudioMixer
+
+
+def _write_clip(path, seconds=0.3, rate=24000, freq=300):
+    t = np.arange(int(rate * seconds)) / rate
+    pcm = (np.sin(2 * np.pi * freq * t) * 12000).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm.tobytes())
+    return str(path)
+
+
+@pytest.fixture
+def clips(tmp_path):
+    return {"wall": _write_clip(tmp_path / "wall.wav"),
+            "curb": _write_clip(tmp_path / "curb.wav", seconds=0.2, freq=500)}
+
+
+def test_build_renders_every_sound_urgency_and_azimuth(tmp_path, clips):
+    bank = AlertBank(str(tmp_path / "bank"), clips, sample_rate=48000, azimuth_step=45)
+    assert bank.build()
+
+    assert set(bank._index) == {(s, u) for s in ["curb", "wall", "chirp", "tone"] for u in URGENCIES}
+    wall = bank.get("wall", 0.0, "warning")
+    assert wall.shape == (int(0.3 * 48000), 2) and wall.dtype == np.int16
+    assert isinstance(bank._pcm, np.memmap)
+    assert bank.get("stairs_up") is None and bank.get("wall", urgency="panic") is None
+
+
+def test_lookup_snaps_to_grid_and_keeps_direction(tmp_path, clips):
+    bank = AlertBank(str(tmp_path / "bank"), clips, azimuth_step=30)
+    bank.build()
+
+    right = bank.get("chirp", 80.0, "critical").astype(np.float64)   # Snaps to 90
+    left = bank.get("chirp", -95.0, "critical").astype(np.float64)   # Snaps to 270 (= -90)
+    assert np.abs(right[:, 1]).sum() > 2 * np.abs(right[:, 0]).sum()
+    assert np.abs(left[:, 0]).sum() > 2 * np.abs(left[:, 1]).sum()
+    assert np.array_equal(bank.get("chirp", 89.0, "critical"), bank.get("chirp", 91.0, "critical"))
+
+    notice = np.abs(bank.get("wall", 0.0, "notice").astype(np.float64)).max()
+    critical = np.abs(bank.get("wall", 0.0, "critical").astype(np.float64)).max()
+    assert critical > notice
+
+
+def test_bank_is_reused_until_clips_change(tmp_path, clips):
+    AlertBank(str(tmp_path / "bank"), clips).build()
+    pcm_path = tmp_path / "bank" / "alert_bank.pcm"
+    built = pcm_path.stat().st_mtime_ns
+
+    bank = AlertBank(str(tmp_path / "bank"), clips)
+    assert bank.build() and pcm_path.stat().st_mtime_ns == built
+
+    _write_clip(clips["wall"], seconds=0.5)
+    stamp = os.stat(clips["wall"]).st_mtime + 5
+    os.utime(clips["wall"], (stamp, stamp))
+    bank = AlertBank(str(tmp_path / "bank"), clips)
+    assert bank.build()
+    assert len(bank.get("wall")) == int(0.5 * 48000)
+
+
+def test_trigger_enqueues_on_safety_channel_and_measures_latency(tmp_path, clips, monkeypatch):
+    mixer = AudioMixer(blocksize=480)
+    bank = AlertBank(str(tmp_path / "bank"), clips)
+    bank.build()
+
+    monkeypatch.setattr(alert_bank, "get_mixer", lambda: None)
+    assert bank.trigger("wall", 90.0) is None and bank.misses == 1
+
+    monkeypatch.setattr(alert_bank, "get_mixer", lambda: mixer)
+    speech = mixer.play("speech", np.full(48000, 0.1, dtype=np.float32), 48000)
+    tone = bank.trigger_at("tone", (2.0, 0.0, -2.0), "warning")             # 45 deg right
+    voice = bank.trigger("wall", 45.0, "warning", preempt=False)           # Queued behind the tone
+    for _ in range(60):                         # 0.2s tone + 0.3s clip
+        mixer.mix_block(480)
+
+    assert tone.done and voice.done and voice.started > tone.started
+    assert speech.position == 10 * 480              # Paused under the alerts, resumed after
+    stats = bank.get_stats()
+    assert stats["ready"] and stats["triggers"] == 2
+    assert bank.trigger_to_sound.count == 2 and stats["trigger_to_sound_p50_ms"] >= 0
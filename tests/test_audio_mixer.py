@@ -0,0 +1,142 @@
+"""
+Unit tests for the audio mixer: ingress sample-rate conversion, safety
+preemption of speech (pause and resume), ducking ramps (applied in place),
+channel flush, continuous sources, onset metrics and the stream-player
+adapter.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import numpy as np
+import pytest
+
+from audio_mixer import AudioMixer, MixerStreamPlayer, to_stereo_float
+
+BLOCK = 480
+
+
+def _const(value, seconds, rate=48000):
+    return np.full(int(rate * seconds), value, dtype=np.float32)
+
+
+def _run(mixer, blocks):
+    return np.concatenate([mixer.mix_block(BLOCK).copy() for _ in range(blocks)])
+
+
+def test_ingress_converts_rate_channels_and_format():
+    pcm = (np.sin(2 * np.pi * 440 * np.arange(2400) / 24000) * 16000).astype(np.int16)
+    out = to_stereo_float(pcm, 24000, 48000)
+    assert out.shape == (4800, 2) and out.dtype == np.float32
+    assert np.array_equal(out[:, 0], out[:, 1])
+    assert np.abs(out).max() == pytest.approx(16000 / 32768, rel=0.02)
+
+    stereo = np.stack([np.ones(441), -np.ones(441)], axis=1).astype(np.float32)
+    out = to_stereo_float(stereo, 44100, 48000)
+    assert out.shape == (480, 2)
+    assert out[100:400, 0].mean() == pytest.approx(1.0, abs=0.01)
+    assert out[100:400, 1].mean() == pytest.approx(-1.0, abs=0.01)
+
+
+def test_safety_pauses_speech_which_resumes_where_it_left_off():
+    mixer = AudioMixer(blocksize=BLOCK)
+    speech = mixer.play("speech", _const(0.2, 0.1), 48000)      # 10 blocks
+    _run(mixer, 3)
+    alert = mixer.play("safety", _const(0.5, 0.05), 48000)      # 5 blocks
+    out = _run(mixer, 5)
+
+    assert np.allclose(out, 0.5)         # Speech silent under the alert
+    assert speech.position == 3 * BLOCK  # ...and held in place
+    assert alert.done
+
+    out = _run(mixer, 7)
+    assert speech.done
+    assert out[-1, 0] == pytest.approx(0.2)
+    assert mixer.get_stats()["safety"]["count"] == 1
+
+
+def test_lower_channels_duck_with_a_ramp_and_recover():
+    mixer = AudioMixer(blocksize=BLOCK, attack_ms=20, release_ms=100)
+    mixer.set_source("beacon", lambda frames: np.full((frames, 2), 0.5, dtype=np.float32))
+    gain = mixer._channels["beacon"].config.gain
+    assert _run(mixer, 1)[-1, 0] == pytest.approx(0.5 * gain)
+
+    mixer.play("safety", np.zeros(BLOCK * 10, dtype=np.float32), 48000)
+    out = _run(mixer, 10)
+    levels = out[::BLOCK, 0] / 0.5
+    assert np.all(np.diff(levels) <= 1e-6)                 # Monotonic fade, no step
+    assert levels[-1] == pytest.approx(gain * 0.25, abs=1e-3)  # Settled at duck gain
+
+    out = _run(mixer, 20)                                  # Release over ~100ms
+    assert out[-1, 0] == pytest.approx(0.5 * gain, abs=1e-3)
+
+
+def test_ramps_are_applied_in_place_into_reused_buffers():
+    mixer = AudioMixer(blocksize=BLOCK, attack_ms=20)
+    mixer.play("beacon", _const(0.5, 0.1), 48000)
+    mixer.play("safety", np.zeros(BLOCK * 4, dtype=np.float32), 48000)
+    buffers = (mixer._out, mixer._scratch, mixer._ramp)
+    ch = mixer._channels["beacon"]
+    start = ch.level
+    out = mixer.mix_block(BLOCK)
+    ramp = np.linspace(start, ch.level, BLOCK, dtype=np.float32)
+    assert ch.level < start
+    assert np.allclose(out[:, 0], 0.5 * ramp, atol=1e-6)   # Same ramp np.linspace gives
+    _run(mixer, 3)
+    assert all(a is b for a, b in zip(buffers, (mixer._out, mixer._scratch, mixer._ramp)))
+
+
+def test_preempt_flushes_the_channel():
+    mixer = AudioMixer(blocksize=BLOCK)
+    old = mixer.play("speech", _const(0.1, 0.1), 48000)
+    queued = mixer.play("speech", _const(0.1, 0.1), 48000)
+    _run(mixer, 2)
+    new = mixer.play("speech", _const(0.3, 0.02), 48000, preempt=True)
+    out = _run(mixer, 2)
+
+    assert old.done and queued.done and queued.started is None
+    assert new.done and np.allclose(out, 0.3)
+    assert not mixer.is_active("speech")
+
+
+def test_stop_releases_waiters_of_pending_clips():
+    mixer = AudioMixer(blocksize=BLOCK)
+    assert mixer.start(offline=True)
+    playing = mixer.play("speech", _const(0.2, 0.1), 48000)
+    queued = mixer.play("speech", _const(0.2, 0.1), 48000)
+    beacon = mixer.play("beacon", _const(0.2, 0.1), 48000)
+    _run(mixer, 2)
+    mixer.stop()
+    assert all(p.wait(timeout=0) for p in (playing, queued, beacon))
+    assert not mixer.is_active("speech") and not mixer.is_active("beacon")
+
+    late = mixer.play("speech", _const(0.2, 0.1), 48000)     # Not running: nothing will play it
+    mixer.flush("speech")
+    assert late.wait(timeout=0)
+
+
+def test_output_is_clipped_and_source_errors_are_contained():
+    mixer = AudioMixer(blocksize=BLOCK)
+
+    def broken(frames):
+        raise RuntimeError("boom")
+
+    mixer.set_source("ambient", broken)
+    mixer.play("safety", _const(0.9, 0.01), 48000)
+    mixer.play("safety", _const(0.9, 0.01), 48000)
+    mixer.play("beacon", _const(0.9, 0.01), 48000)
+    out = mixer.mix_block(BLOCK)
+    assert out.max() <= 1.0
+    with pytest.raises(ValueError):
+        mixer.play("unknown", _const(0.1, 0.01), 48000)
+
+
+def test_stream_player_adapter_feeds_a_channel():
+    mixer = AudioMixer(blocksize=BLOCK)
+    player = MixerStreamPlayer(mixer, "gemini", sample_rate=24000)
+    player.add_audio_chunk((np.ones(1200, dtype=np.int16) * 8192).tobytes())
+    assert not player.is_queue_empty
+
+    out = _run(mixer, 5)
+    assert out[1200, 0] == pytest.approx(0.25, abs=0.01)  # Past the resampler's filter delay
+    assert player.is_queue_empty and player.wait_drained(timeout=0.1)
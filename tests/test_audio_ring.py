@@ -0,0 +1,121 @@
+"""
+Unit tests for the allocation-free VAD capture path (ring buffer, polyphase
+resampler, contiguous speech capture).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from layer1_reflex.audio_ring import AudioRingBuffer, LatencyRing, PolyphaseResampler, SpeechCapture
+
+
+def _tone(freq, rate, seconds=1.0, amplitude=0.5):
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t) * 32767).astype(np.int16)
+
+
+def test_ring_wraps_and_counts_overruns():
+    ring = AudioRingBuffer(1000)
+    out = np.zeros(300, dtype=np.float32)
+    for i in range(10):
+        assert ring.write(np.full(300, i, dtype=np.float32))
+        assert ring.read_into(out)
+        assert np.all(out == i)
+    assert not ring.read_into(out)
+
+    assert ring.write(np.zeros(900, dtype=np.float32))
+    assert not ring.write(np.zeros(200, dtype=np.float32))
+    assert ring.overruns == 1 and ring.dropped_samples == 200
+    assert ring.high_water == 900
+
+
+@pytest.mark.parametrize("rate", [48000, 44100, 32000])
+def test_resampler_is_seamless_across_chunks(rate):
+    pcm = _tone(440, rate, seconds=0.5)
+    whole = PolyphaseResampler(rate, 16000, max_block=len(pcm)).process(pcm).copy()
+
+    resampler = PolyphaseResampler(rate, 16000, max_block=4096)
+    block = resampler.preferred_block(int(512 * rate / 16000))
+    chunked = np.concatenate([
+        resampler.process(pcm[i:i + block]).copy() for i in range(0, len(pcm) - block + 1, block)
+    ])
+
+    assert np.allclose(chunked, whole[:len(chunked)], atol=1e-5)
+    assert resampler.uncached_blocks == 0
+
+
+def test_resampler_passes_speech_band_and_rejects_aliases():
+    def rms(freq):
+        out = PolyphaseResampler(48000, 16000, max_block=48000).process(_tone(freq, 48000))
+        return np.sqrt(np.mean(out[2000:] ** 2))
+
+    assert rms(1000) == pytest.approx(0.5 / np.sqrt(2), rel=0.01)
+    # 10 kHz would fold to 6 kHz at 16 kHz without the anti-alias filter
+    assert rms(10000) < rms(1000) * 1e-3
+
+
+def test_steady_state_does_not_allocate():
+    resampler = PolyphaseResampler(48000, 16000, max_block=1536)
+    ring = AudioRingBuffer(32000)
+    capture = SpeechCapture(capacity=16000 * 5, padding=3200)
+    pcm = _tone(300, 48000, seconds=0.032 * 3)[:1536]
+
+    def cycle():
+        ring.write(resampler.process(pcm))
+        ring.read_into(capture.next_chunk(512))
+
+    for _ in range(10):  # Warm-up builds the cached pattern
+        cycle()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(200):
+        cycle()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Only small Python objects (slice views), never chunk-sized arrays (2 KB+)
+    assert peak - base < 2048
+
+
+def test_speech_segment_is_a_contiguous_view_with_padding():
+    capture = SpeechCapture(capacity=4096, padding=256)
+    for i in range(4):
+        capture.next_chunk(128)[:] = i
+    padded = capture.begin_segment(256)
+    assert list(padded[::128]) == [2, 3]
+    for i in range(4, 7):
+        capture.next_chunk(128)[:] = i
+
+    segment = capture.end_segment()
+    assert np.shares_memory(segment, padded)
+    assert list(segment[::128]) == [2, 3, 4, 5, 6]
+
+    # Writing continues in another buffer; the handed-out view is untouched
+    for _ in range(40):
+        capture.next_chunk(128)[:] = -1
+    assert list(segment[::128]) == [2, 3, 4, 5, 6]
+
+
+def test_capture_compacts_outside_speech_and_rejects_overflow_in_speech():
+    capture = SpeechCapture(capacity=1024, padding=256)
+    for i in range(20):
+        capture.next_chunk(128)[:] = i
+    assert list(capture.begin_segment(256)[::128]) == [18, 19]
+
+    with pytest.raises(BufferError):
+        for _ in range(10):
+            capture.next_chunk(128)
+
+
+def test_latency_ring_summary():
+    ring = LatencyRing(size=4)
+    for value in [1, 2, 3, 4, 100]:
+        ring.record(value)
+    assert ring.count == 5
+    assert ring.summary()["max_ms"] == 100
+    assert len(ring.values()) == 4
@@ -0,0 +1,133 @@
+"""
+Unit tests for the multi-source binaural mixer: voice limit and priority
+stealing, click-free envelopes, direction cues matching the single-source
+renderer, one-shot completion, and the engine / object-cue routing.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import numpy as np
+from scipy.io import wavfile
+
+from layer3_guide.spatial_audio import binaural_mixer
+from layer3_guide.spatial_audio.binaural_engine import (
+    BinauralBlockRenderer, BinauralEngine, generate_chirp, generate_continuous_tone, get_hrtf_table,
+)
+from layer3_guide.spatial_audio.binaural_mixer import VOICE_PRIORITY, BinauralMixer
+from layer3_guide.spatial_audio.object_sounds import ObjectSoundMapper, SoundProfile
+
+SR = 48000
+TONE = generate_continuous_tone(1.0, 500, SR)
+
+
+def _render(mixer, blocks, frames=1024):
+    out = [mixer.render(frames) for _ in range(blocks)]
+    return np.concatenate([np.zeros((frames, 2), np.float32) if b is None else b for b in out])
+
+
+def test_voice_limit_steals_lowest_priority_oldest_first():
+    mixer = BinauralMixer(SR, max_voices=2)
+    first = mixer.play(TONE, -60, priority="object", loop=True)
+    second = mixer.play(TONE, 60, priority="object", loop=True)
+    _render(mixer, 2)
+
+    alert = mixer.play(TONE, 0, priority="safety", loop=True)
+    _render(mixer, 2)                                   # Stolen voice fades out (10ms)
+    assert first.stolen and first.done and not second.done
+    assert mixer.active_voices == 2 and mixer.steals == 1
+
+    beacon = mixer.play(TONE, 30, priority="beacon", loop=True)
+    cue = mixer.play(TONE, 90, priority="object", loop=True)
+    _render(mixer, 2)
+    assert second.stolen and not beacon.done
+    assert cue.rejected and cue.done                    # Every live voice outranks it
+    assert not alert.done and mixer.get_stats()["rejections"] == 1
+
+
+def test_envelopes_fade_in_and_out_without_clicks():
+    mixer = BinauralMixer(SR, attack_ms=5.0, release_ms=50.0)
+    voice = mixer.play(TONE, 45, loop=True)
+    out = _render(mixer, 4)
+    step = np.abs(np.diff(TONE)).max()
+    assert np.abs(out[:48]).max() < 0.05                # Starts from silence
+    voice.move(-45)                                     # Cues ramp across the block
+    voice.set_gain(0.3)
+    voice.stop()
+    out = np.concatenate([out, _render(mixer, 6)])
+    assert np.abs(np.diff(out, axis=0)).max() <= step * 1.05
+    assert voice.done and mixer.active_voices == 0
+    assert mixer.render(1024) is None
+
+
+def test_static_voice_matches_single_source_renderer():
+    mixer = BinauralMixer(SR)
+    mixer.play(TONE, 70, attack_ms=0.0, loop=True)
+    out = _render(mixer, 20)
+    ref = BinauralBlockRenderer(SR).process(np.tile(TONE, 2)[:len(out)], 70)
+    assert np.allclose(out, ref, atol=1e-6)
+    assert np.abs(out[:, 1]).sum() > 2 * np.abs(out[:, 0]).sum()
+
+    # Voices sum: left + right sources give both ears
+    mixer = BinauralMixer(SR)
+    mixer.play(TONE, -90, attack_ms=0.0, loop=True)
+    mixer.play(TONE, 90, attack_ms=0.0, loop=True)
+    both = _render(mixer, 8)
+    assert np.isclose(np.abs(both[:, 0]).sum(), np.abs(both[:, 1]).sum(), rtol=0.02)
+
+
+def test_one_shots_complete_and_engine_routes_through_voices():
+    mixer = BinauralMixer(SR)
+    voice = mixer.play(generate_chirp(0.1, sr=SR), 30)
+    _render(mixer, 6)                                   # 4800 samples + delay tail
+    assert voice.done and voice.wait(0) and mixer.active_voices == 0
+
+    engine = BinauralEngine(sr=SR)
+    engine.voices = mixer
+    assert engine.start()
+    engine.play_at_nonblocking(-30.0, priority="safety")
+    engine.start_continuous(azimuth_deg=90.0)
+    mixer.render(1024)
+    assert mixer.peak_voices == 1 and "continuous" in mixer._buses
+    engine.stop_continuous()
+    assert "continuous" not in mixer._buses
+    assert engine.get_render_stats()["voices"]["blocks"] == 7
+
+
+def test_object_cues_play_as_voices(tmp_path):
+    (tmp_path / "objects").mkdir()
+    wavfile.write(tmp_path / "objects" / "cue.wav", 16000, (TONE[:8000] * 20000).astype(np.int16))
+    mixer = BinauralMixer(SR)
+    mapper = ObjectSoundMapper(assets_path=str(tmp_path), voices=mixer,
+                               custom_sounds={"dog": SoundProfile("objects/cue.wav", volume=0.5, loop=False)})
+
+    voice = mapper.play_object_sound("dog", position=(2.0, 0.0, -2.0))
+    assert voice is not None and voice.priority == VOICE_PRIORITY["object"]
+    assert len(voice.audio) == 8000 * 3                 # Resampled to the mixer rate
+    assert voice.azimuth == 45.0 and voice.distance_gain < 1.0
+    voice.set_position((-2.0, 0.0, -2.0))               # Same call the tracker makes on a Source
+    assert voice.azimuth == -45.0
+    _render(mixer, 30)
+    assert mapper.cleanup_finished() == 1
+
+
+def test_start_adopts_the_audio_mixer_rate(monkeypatch):
+    class FakeMixer:
+        sample_rate = 48000
+        source = None
+
+        def set_source(self, channel, fn):
+            self.source = (channel, fn)
+
+    fake = FakeMixer()
+    monkeypatch.setattr(binaural_mixer, "shared_mixer", lambda: fake)
+    mixer = BinauralMixer(44100)
+    assert mixer.start()
+    assert fake.source == ("beacon", mixer.render)
+    assert mixer.sr == 48000 and mixer.table is get_hrtf_table(48000)
+
+    # A 0.5s one-shot lasts 0.5s of output at the mixer's rate, not 44.1/48 of it
+    mixer.play(generate_continuous_tone(0.5, 500, 48000), 30)
+    out = _render(mixer, 30)
+    audible = np.flatnonzero(np.abs(out).max(axis=1) > 1e-4)
+    assert abs(audible[-1] - audible[0] - 24000) < 600
@@ -0,0 +1,154 @@
+"""
+Unit tests for the bulk sync protocol (columnar payloads, idempotent retries,
+adaptive interval) against the local mock endpoint.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import json
+
+import pytest
+
+from layer4_memory.bulk_sync import (
+    AdaptiveSyncInterval,
+    MockBulkSyncServer,
+    build_envelope,
+    decode_tables,
+    decompress_payload,
+    encode_tables,
+)
+from layer4_memory.hybrid_memory_manager import HybridMemoryManager
+
+
+def _detection(i):
+    return {
+        'layer': 'guardian' if i % 3 else 'learner',
+        'class_name': ['person', 'car', 'chair', 'cup'][i % 4],
+        'confidence': 0.5 + (i % 50) / 100,
+        'bbox_x1': 0.1234567, 'bbox_y1': 0.2, 'bbox_x2': 0.3, 'bbox_y2': 0.4,
+        'bbox_area': 0.04,
+        'detection_mode': 'prompt_free',
+        'source': 'base',
+    }
+
+
+@pytest.fixture
+def server():
+    mock = MockBulkSyncServer().start()
+    yield mock
+    mock.stop()
+
+
+@pytest.fixture
+def manager(tmp_path, server):
+    mm = HybridMemoryManager(
+        supabase_url="",
+        supabase_key="test-key",
+        device_id="test-device-001",
+        local_db_path=str(tmp_path / "cortex.db"),
+        local_cache_size=1000,
+        bulk_sync=True,
+        bulk_sync_url=server.url,
+    )
+    yield mm
+    mm.cleanup()
+
+
+def test_columnar_roundtrip():
+    rows = [{**_detection(i), 'ts': 1000.0 + i * 0.1} for i in range(20)]
+    payload = encode_tables({'detections': rows}, device_id="dev")
+    cols = payload['tables']['detections']['cols']
+
+    assert cols['class_name']['dict'] == ['person', 'car', 'chair', 'cup']
+    assert cols['bbox_x1'][0] == 0.1235
+    assert cols['ts'][:3] == [0, 100, 200]
+
+    decoded = decode_tables(json.loads(json.dumps(payload)))['detections']
+    assert [r['class_name'] for r in decoded] == [r['class_name'] for r in rows]
+    assert decoded[5]['ts'] == pytest.approx(1000.5, abs=1e-3)
+    assert decoded[0]['device_id'] == "dev"
+
+
+def test_idempotency_key_is_content_derived():
+    items = [{'table': 'detections', 'ts': 1000.0 + i, 'data': _detection(i)} for i in range(5)]
+    assert build_envelope(items, "dev").key == build_envelope(list(items), "dev").key
+    assert build_envelope(items[:4], "dev").key != build_envelope(items, "dev").key
+
+
+def test_payload_is_much_smaller_than_json_rows():
+    items = [{'table': 'detections', 'ts': 1000.0 + i * 0.03,
+              'data': {**_detection(i), 'device_id': 'dev'}} for i in range(500)]
+    envelope = build_envelope(items, "dev")
+    naive = len(json.dumps([{**item['data'], 'created_at': '2026-01-08T12:00:00.000000'}
+                            for item in items]).encode())
+    assert len(envelope.body) < naive / 10
+    assert len(decode_tables(decompress_payload(envelope.body))['detections']) == 500
+
+
+def test_adaptive_interval():
+    policy = AdaptiveSyncInterval(base_interval=60, min_interval=10, max_interval=300, target_rows=500)
+    assert policy.next_interval(0) == 300
+    assert policy.next_interval(5000) == 10
+    assert policy.next_interval(100) == 60
+
+    policy.record_success(rtt_ms=2500)  # Slow cellular link
+    assert policy.next_interval(100) > 60
+    assert policy.next_interval(100, level=1) == 300  # ConnectivityLevel.OFFLINE
+
+    backoff = AdaptiveSyncInterval(base_interval=60, min_interval=10, max_interval=300, target_rows=500)
+    backoff.record_failure()
+    backoff.record_failure()
+    assert backoff.next_interval(100) == 240
+
+
+@pytest.mark.asyncio
+async def test_one_request_carries_every_table(manager, server):
+    for i in range(30):
+        manager.store_detection(_detection(i))
+    await manager.store_query("what is ahead", "what is ahead", "layer2", 0.9, tier_used="gemini_live")
+    await manager.store_system_log("ERROR", "layer1", "camera timeout", latency_ms=120)
+    await manager.update_device_heartbeat("cortex", battery_percent=80, active_layers=["layer0"])
+
+    assert await manager.sync_now()
+
+    assert server.requests == 1
+    assert len(server.rows['detections']) == 30
+    assert server.rows['queries'][0]['tier_used'] == "gemini_live"
+    assert server.rows['system_logs'][0]['message'] == "camera timeout"
+    assert server.rows['heartbeats'][0]['active_layers'] == ["layer0"]
+    assert manager.upload_queue == []
+    assert manager.get_stats()['unsynced_rows'] == 0
+    assert manager.get_bulk_sync_stats()['rows_per_request'] == 33
+
+
+@pytest.mark.asyncio
+async def test_failed_payload_is_resent_with_same_key(manager, server):
+    for i in range(10):
+        manager.store_detection(_detection(i))
+    server.fail_next = 1
+    assert not await manager.sync_now()
+    assert len(manager.upload_queue) == 10
+    failed_key = manager._pending_envelope.key
+
+    # Rows queued during the outage wait for the next payload
+    manager.store_detection(_detection(99))
+    assert await manager.sync_now()
+    assert list(server.keys) == [failed_key]
+    assert len(server.rows['detections']) == 10
+
+    assert await manager.sync_now()
+    assert len(server.rows['detections']) == 11
+    assert manager.upload_queue == []
+
+
+@pytest.mark.asyncio
+async def test_lost_ack_does_not_duplicate_rows(manager, server):
+    for i in range(10):
+        manager.store_detection(_detection(i))
+    server.drop_ack_next = 1
+
+    assert await manager.sync_now()
+    assert server.duplicates == 1
+    assert len(server.rows['detections']) == 10
+    assert manager.get_bulk_sync_stats()['duplicates'] == 1
@@ -0,0 +1,141 @@
+"""
+Unit tests for FrameStore (content-addressed memory image storage).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import io
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from layer4_memory.frame_store import FrameStore, compute_dhash
+
+
+def _frame(seed: int, size=(640, 480)) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 255, (size[1] // 16, size[0] // 16, 3), dtype=np.uint8)
+    return Image.fromarray(arr).resize(size, Image.NEAREST)
+
+
+@pytest.fixture
+def store(tmp_path):
+    fs = FrameStore(root_dir=str(tmp_path / "frames"), thumb_size=64)
+    yield fs
+    fs.close()
+
+
+def test_put_returns_path_and_writes_both_tiers(store):
+    path = store.put(_frame(1))
+    assert path is not None
+    assert store.flush()
+    key = store.key_for_path(path)
+    assert os.path.exists(path)
+    assert store.thumb_path(key).exists()
+    assert store.get_stats()["written"] == 1
+
+
+def test_near_duplicate_resolves_to_existing_path(store):
+    img = _frame(2)
+    noisy = np.asarray(img).astype(np.int16) + np.random.default_rng(0).integers(-3, 4, (480, 640, 3))
+    noisy = Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+    first = store.put(img)
+    second = store.put(noisy)
+    third = store.put(_frame(3))
+
+    assert first == second
+    assert third != first
+    assert store.flush()
+    assert store.get_stats()["deduped"] == 1
+    assert store.get_stats()["frames"] == 2
+
+
+def test_get_jpeg_respects_max_side(store):
+    path = store.put(_frame(4))
+    assert store.flush()
+
+    full = Image.open(io.BytesIO(store.get_jpeg(path)))
+    small = Image.open(io.BytesIO(store.get_jpeg(path, max_side=200)))
+    thumb = Image.open(io.BytesIO(store.get_jpeg(path, max_side=64)))
+
+    assert full.size == (640, 480)
+    assert max(small.size) == 200
+    assert max(thumb.size) == 64
+    assert full.format == "JPEG"
+
+
+def test_get_jpeg_serves_pending_frame(tmp_path):
+    fs = FrameStore(root_dir=str(tmp_path / "frames"))
+    try:
+        path = fs.put(_frame(5))
+        data = fs.get_jpeg(path, max_side=100)  # May still be queued
+        assert data is not None and data[:2] == b"\xff\xd8"
+    finally:
+        fs.close()
+
+
+def test_full_tier_evicted_under_budget_but_thumb_kept(tmp_path):
+    fs = FrameStore(root_dir=str(tmp_path / "frames"), max_full_bytes=1, thumb_size=64)
+    try:
+        path = fs.put(_frame(6))
+        assert fs.flush()
+        key = fs.key_for_path(path)
+        assert not fs.full_path(key).exists()
+        assert fs.thumb_path(key).exists()
+        assert fs.get_stats()["full_evicted"] == 1
+        # Recall still works from the thumbnail tier
+        assert fs.get_jpeg(path, max_side=512) is not None
+    finally:
+        fs.close()
+
+
+def test_index_survives_restart(tmp_path):
+    root = str(tmp_path / "frames")
+    fs = FrameStore(root_dir=root)
+    path = fs.put(_frame(7))
+    fs.close()
+
+    reopened = FrameStore(root_dir=root)
+    try:
+        assert reopened.put(_frame(7)) == path
+        assert reopened.get_stats()["deduped"] == 1
+    finally:
+        reopened.close()
+
+
+def test_dhash_is_stable_under_resize():
+    img = _frame(8)
+    assert compute_dhash(img) == compute_dhash(img.resize((320, 240)))
+
+
+def test_rewrite_keeps_created_at(tmp_path):
+    fs = FrameStore(root_dir=str(tmp_path / "frames"))
+    try:
+        path = fs.put(_frame(8))
+        assert fs.flush()
+        key = fs.key_for_path(path)
+        created, accessed = fs.db.query("SELECT created_at, last_access FROM frames WHERE key = ?", (key,))[0]
+
+        os.remove(path)                          # Full tier gone: the next sighting rewrites it
+        assert fs.put(_frame(8)) == path and fs.flush()
+        assert os.path.exists(path)
+        row = fs.db.query("SELECT created_at, last_access FROM frames WHERE key = ?", (key,))[0]
+        assert row[0] == created and row[1] >= accessed
+    finally:
+        fs.close()
+
+
+def test_conversation_manager_close_drains_queued_frames(tmp_path, monkeypatch):
+    from conversation_manager import ConversationManager
+
+    monkeypatch.chdir(tmp_path)
+    manager = ConversationManager(db_path=str(tmp_path / "memory.db"),
+                                  config={"memory_images_dir": str(tmp_path / "frames")})
+    paths = [manager.save_image(_frame(seed)) for seed in range(20, 26)]
+    manager.close()
+    assert manager.frame_store is None
+    assert all(os.path.exists(p) for p in paths)
@@ -0,0 +1,104 @@
+"""
+Unit tests for the precomputed HRTF parameter table: agreement with the
+Woodworth model on and between grid points, azimuth wrap-around,
+ready-made filter sections, the batched API, measured-HRIR rendering and
+the shared per-rate table behind render_binaural().
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import numpy as np
+import pytest
+from scipy import signal as sig
+
+from layer3_guide.spatial_audio import binaural_engine as be
+from layer3_guide.spatial_audio.binaural_engine import (
+    HRTFTable, compute_azimuth_elevation, compute_binaural_params, render_binaural,
+)
+
+SR = 48000
+
+
+@pytest.fixture(scope="module")
+def table():
+    return HRTFTable(SR, az_step=5.0, el_step=10.0)
+
+
+def test_lookup_matches_model_on_and_between_grid_points(table):
+    for az, el in [(0, 0), (45, 0), (-90, 0), (135, 20), (-150, -30), (180, 0)]:
+        p, q = table.lookup(az, el), compute_binaural_params(az, el)
+        assert p.itd_s == pytest.approx(q.itd_s, abs=1e-9)
+        assert p.ild_left_db == pytest.approx(q.ild_left_db, abs=1e-6)
+        assert p.shadow_cutoff_hz == pytest.approx(q.shadow_cutoff_hz, abs=1e-3)
+
+    for az, el in [(37.3, 12.0), (-61.8, -4.5), (178.9, 3.0), (-179.6, 41.0)]:
+        p, q = table.lookup(az, el), compute_binaural_params(az, el)
+        assert p.itd_s == pytest.approx(q.itd_s, abs=5e-6)             # < 0.25 sample at 48kHz
+        assert p.ild_right_db == pytest.approx(q.ild_right_db, abs=0.1)
+        assert p.shadow_cutoff_hz == pytest.approx(q.shadow_cutoff_hz, rel=0.03)
+
+    assert table.lookup(-200.0).itd_s == pytest.approx(table.lookup(160.0).itd_s)
+    assert table.lookup(90.0).itd_samples == round(compute_binaural_params(90.0).itd_s * SR)
+
+
+def test_shadow_sections_are_ready_made(table):
+    expected = sig.butter(2, compute_binaural_params(60.0).shadow_cutoff_hz, btype='low', fs=SR, output='sos')
+    assert np.allclose(table.sos(61.0), expected)                       # Nearest grid point (60)
+    assert np.allclose(table.sos(-61.0), expected)                      # Same shadow, other side
+
+
+def test_batched_lookup_matches_scalar_lookups(table):
+    rng = np.random.default_rng(3)
+    az, el = rng.uniform(-180, 180, 32), rng.uniform(-60, 60, 32)
+    batch = table.lookup_batch(az, el)
+    for k in range(32):
+        p = table.lookup(az[k], el[k])
+        assert batch["itd_s"][k] == pytest.approx(p.itd_s)
+        assert batch["gain"][k, 0] == pytest.approx(10 ** (p.ild_left_db / 20))
+        far = batch["far_ear"][k]
+        assert np.allclose(batch["sos"][k, far], table.sos(az[k], el[k]))
+        assert np.allclose(batch["sos"][k, 1 - far], be._IDENTITY_SOS)
+    assert "hrir" not in batch
+
+    positions = rng.uniform(-3, 3, (8, 3))
+    by_position = table.lookup_positions(positions)
+    for k, (x, y, z) in enumerate(positions):
+        az_k, el_k = compute_azimuth_elevation(x, y, z)
+        assert by_position["itd_s"][k] == pytest.approx(table.lookup(az_k, el_k).itd_s)
+
+
+def test_measured_hrirs_replace_the_model():
+    table = HRTFTable(SR, az_step=30.0, el_step=30.0)
+    # Synthetic "measurements" at 44.1kHz: far ear delayed 20 taps and halved
+    az = np.array([-90.0, 0.0, 90.0])
+    hrirs = np.zeros((3, 2, 64))
+    hrirs[:, :, 0] = 1.0
+    hrirs[0, 1, 0], hrirs[0, 1, 20] = 0.0, 0.5
+    hrirs[2, 0, 0], hrirs[2, 0, 20] = 0.0, 0.5
+    table.set_hrirs(hrirs, az, np.zeros(3), 44100)
+
+    assert table.hrir.shape[-1] == int(np.ceil(64 * 48000 / 44100))
+    assert table.signature["sofa"] is not None
+    impulse = np.zeros(256)
+    impulse[0] = 1.0
+    right = render_binaural(impulse, 90.0, 0.0, SR, table=table)
+    assert np.argmax(np.abs(right[:, 1])) < np.argmax(np.abs(right[:, 0]))
+    assert np.abs(right[:, 1]).max() > 1.5 * np.abs(right[:, 0]).max()
+    assert table.lookup_batch(np.array([90.0]), np.array([0.0]))["hrir"].shape == (1,) + table.hrir.shape[2:]
+
+
+def test_render_binaural_uses_shared_table(monkeypatch):
+    monkeypatch.setattr(be, "_hrtf_tables", {})
+    mono = be.generate_chirp(0.1, sr=SR)
+    stereo = render_binaural(mono, 90.0, 0.0, SR)
+    table = be._hrtf_tables[SR]
+    assert be.get_hrtf_table(SR) is table
+    assert np.allclose(stereo, render_binaural(mono, 90.0, 0.0, SR, table=table))
+    assert np.abs(stereo[:, 1]).sum() > 2 * np.abs(stereo[:, 0]).sum()
+
+    be.configure_hrtf({"az_step": 10.0})
+    try:
+        assert be.get_hrtf_table(SR).az_step == 10.0
+    finally:
+        be.configure_hrtf({"az_step": 5.0})
@@ -0,0 +1,151 @@
+"""
+Unit tests for the keyword spotter: noise gate, template matching with
+time-stretched / pitch-shifted repetitions, rejection of unknown words
+and long open queries, WAV template loading, and "repeat" after the
+wake phrase replaying the last answer rather than the "Yes?" reply.
+
+The "words" are synthetic voiced signals (a pitched harmonic source
+through a sequence of vowel-like formant settings), enough to exercise
+the MFCC + DTW path without recorded speech.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import asyncio
+import wave
+
+import numpy as np
+import pytest
+
+from layer1_reflex.keyword_spotter import (
+    COMMAND,
+    NOISE,
+    PASS,
+    WAKE,
+    KeywordSpotter,
+    create_keyword_spotter,
+)
+
+SR = 16000
+
+# (F1, F2) per "syllable"
+WORDS = {
+    "stop": [(700, 1200), (500, 900)],
+    "where_am_i": [(300, 2300), (700, 1700), (750, 1100)],
+    "repeat": [(300, 2200), (600, 1900), (300, 2300)],
+    "wake": [(650, 1700), (450, 2000)],
+    "unknown": [(400, 800), (800, 1300), (350, 2100)],
+}
+
+
+def _word(formants, stretch=1.0, f0=130.0, seed=0, syllable_s=0.25):
+    """Harmonic source shaped by two formant peaks per syllable."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for f1, f2 in formants:
+        n = int(syllable_s * stretch * SR)
+        t = np.arange(n) / SR
+        sig = np.zeros(n)
+        for k in range(1, int(3500 / f0)):
+            f = k * f0
+            gain = np.exp(-((f - f1) / 150) ** 2) + 0.7 * np.exp(-((f - f2) / 200) ** 2) + 0.02
+            sig += gain * np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi))
+        parts.append(sig * np.hanning(n) ** 0.3)
+    audio = np.concatenate(parts)
+    audio += rng.normal(0, 0.002, len(audio))
+    return (0.3 * audio / np.abs(audio).max()).astype(np.float32)
+
+
+@pytest.fixture
+def spotter():
+    kws = KeywordSpotter(threshold=0.35, margin=0.03)
+    for label in ("stop", "where_am_i", "repeat", "wake"):
+        for i, (stretch, f0) in enumerate([(1.0, 120.0), (1.15, 140.0)]):
+            kws.add_template(label, _word(WORDS[label], stretch, f0, seed=i))
+    return kws
+
+
+def test_unvoiced_noise_is_dropped(spotter):
+    rng = np.random.default_rng(1)
+    assert spotter.spot((0.2 * rng.normal(size=SR)).astype(np.float32)).kind == NOISE
+    clicks = np.zeros(SR, dtype=np.float32)
+    clicks[::4000] = 0.9
+    assert spotter.spot(clicks).kind == NOISE
+
+
+def test_commands_match_despite_tempo_and_pitch(spotter):
+    for label, text in (("stop", "stop"), ("where_am_i", "where am i"), ("repeat", "repeat")):
+        result = spotter.spot(_word(WORDS[label], stretch=0.9, f0=160.0, seed=7))
+        assert result.kind == COMMAND, (label, result.scores)
+        assert result.label == label and result.text == text
+    assert spotter.spot(_word(WORDS["wake"], stretch=1.1, f0=110.0, seed=9)).kind == WAKE
+
+
+def test_unknown_word_and_long_query_pass_to_stt(spotter):
+    unknown = spotter.spot(_word(WORDS["unknown"], seed=3))
+    assert unknown.kind == PASS
+
+    # A long utterance is never matched, even if it starts with a command
+    long_query = np.concatenate([_word(WORDS["stop"]), _word(WORDS["unknown"], stretch=3.0)])
+    result = spotter.spot(long_query)
+    assert result.kind == PASS and result.label is None
+
+    stats = spotter.get_stats()
+    assert stats[PASS] == 2 and stats["templates"] == 8
+
+
+def test_unknown_label_is_rejected():
+    with pytest.raises(ValueError):
+        KeywordSpotter().add_template("jump", np.zeros(SR, dtype=np.float32))
+
+
+def test_templates_load_from_wav_folders(tmp_path):
+    folder = tmp_path / "stop"
+    folder.mkdir()
+    with wave.open(str(folder / "stop_01.wav"), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes((_word(WORDS["stop"]) * 32767).astype(np.int16).tobytes())
+
+    assert create_keyword_spotter({"enabled": False}) is None
+    kws = create_keyword_spotter({"enabled": True, "templates_dir": str(tmp_path),
+                                  "commands": {"stop": "stop", "repeat": "repeat"}})
+    assert kws.n_templates == 1
+    assert kws.spot(_word(WORDS["stop"], stretch=1.1, seed=5)).kind == COMMAND
+
+
+def test_repeat_after_the_wake_phrase_replays_the_last_answer(monkeypatch, tmp_path):
+    try:
+        from rpi5 import tts_router
+    except (ImportError, SyntaxError) as e:           # rpi5/__init__ imports main.py and its dependencies
+        pytest.skip(f"rpi5 package not importable here: {e}")
+
+    spoken = []
+
+    async def engine(text, play_audio, save_path):
+        spoken.append(text)
+        return True, b"RIFF", 100.0, None
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tts_router.TTSRouter, "_instance", None)
+    router = tts_router.TTSRouter(audio_output_dir=str(tmp_path / "audio"))
+    router._speak_cartesia = router._speak_gemini = router._speak_kokoro = engine
+    answer = "There is a door two meters ahead."
+
+    async def repeat():
+        # What main does for the "repeat" command
+        if router.last_spoken:
+            await router.speak_async(router.last_spoken)
+
+    async def run():
+        await router.speak_async("Yes?", engine_override="kokoro")    # Wake phrase on its own
+        await repeat()                                                 # Nothing answered yet
+        await router.speak_async(answer, remember=True)
+        await router.speak_async("Turn left in 20 meters.")            # Navigation announcement
+        await router.speak_async("Yes?", engine_override="kokoro")
+        await repeat()
+
+    asyncio.run(run())
+    assert spoken == ["Yes?", answer, "Turn left in 20 meters.", "Yes?", answer]
@@ -1,5 +1,5 @@
 """
-Phase 1 tests: wall hum parameter mapping and restart behavior.
+Phase 1 tests: wall hum parameter mapping and publishing to the oscillator bank.
 
 Author: Haziq (@IRSPlays)
 Project: Cortex v2.0
@@ -23,10 +23,11 @@ def test_update_from_depth_generates_left_hum_params_for_near_wall():
 
     calls = {"count": 0}
 
-    def _fake_restart():
+    def _fake_start():
         calls["count"] += 1
+        return False
 
-    m._restart_hum_thread = _fake_restart
+    m._hum.start = _fake_start
 
     # All regions far by default (3m), then make left region near (0.5m)
     depth = np.full((30, 30), 3.0, dtype=np.float32)
@@ -35,6 +36,7 @@ def test_update_from_depth_generates_left_hum_params_for_near_wall():
     m.update_from_depth(depth)
 
     assert calls["count"] == 1
+    assert m._hum.updates == 1
     assert "left" in m._hum_params
     freq, left_gain, right_gain = m._hum_params["left"]
 
@@ -48,19 +50,22 @@ def test_update_from_depth_clears_params_when_far():
 
     calls = {"count": 0}
 
-    def _fake_restart():
+    def _fake_start():
         calls["count"] += 1
+        return True
 
-    m._restart_hum_thread = _fake_restart
+    m._hum.start = _fake_start
 
     # First call creates params
     near = np.full((30, 30), 1.0, dtype=np.float32)
     m.update_from_depth(near)
     assert calls["count"] == 1
 
-    # Second call removes params (all far)
+    # Second call removes params (all far): published as silence, nothing restarted
     far = np.full((30, 30), 3.0, dtype=np.float32)
     m.update_from_depth(far)
 
-    assert calls["count"] == 2
+    assert calls["count"] == 1
+    assert m._hum.updates == 2
     assert m._hum_params == {}
+    assert not m._hum._params[:, 1:].any()
@@ -0,0 +1,127 @@
+"""
+Unit tests for batched bbox -> 3D position conversion: one bboxes_to_3d
+call per frame matches per-detection bbox_to_3d, depth distances win over
+size / area estimates, and the fixed-capacity smoothing history evicts
+stale and least recently seen tracks so memory stays flat over a long walk.
+Ids repeated within one batch smooth in row order, like per-detection calls.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import random
+import tracemalloc
+
+import pytest
+
+from layer3_guide.spatial_audio.position_calculator import PositionCalculator
+
+
+def _frame(rng, ids):
+    boxes, classes = [], []
+    for _ in ids:
+        x1, y1 = rng.uniform(0, 1700), rng.uniform(0, 900)
+        boxes.append((x1, y1, x1 + rng.uniform(20, 600), y1 + rng.uniform(20, 400)))
+        classes.append(rng.choice(["person", "chair", "car", None, "unknown"]))
+    return boxes, classes
+
+
+def test_batch_matches_per_detection_calls():
+    rng = random.Random(3)
+    single, batch = PositionCalculator(), PositionCalculator()
+    for frame in range(30):
+        ids = [f"track_{k}" for k in rng.sample(range(8), 4)]
+        boxes, classes = _frame(rng, ids)
+        depths = [None, 2.5, 0.0, None]
+        expected = [single.bbox_to_3d(b, c, i, hailo_distance_m=d)
+                    for b, c, i, d in zip(boxes, classes, ids, depths)]
+        got = batch.bboxes_to_3d(boxes, classes, ids, depths, now=frame / 15)
+        for a, b in zip(expected, got):
+            assert b.as_tuple() == pytest.approx(a.as_tuple())
+            assert b.distance_meters == pytest.approx(a.distance_meters)
+    assert batch.bboxes_to_3d([]) == []
+
+
+def test_repeated_ids_in_a_batch_match_per_detection_calls():
+    box = (860, 340, 1060, 740)
+    calc = PositionCalculator()
+    first, second = calc.bboxes_to_3d([box, box], ["person", "person"], ["person_3_1"] * 2, [3.0, 3.0], now=0.0)
+    assert first.distance_meters == pytest.approx(3.0) and second.distance_meters == pytest.approx(3.0)
+
+    # Grid ids collide: repeats blend with the row before them, not a stale slot
+    rng = random.Random(5)
+    single, batch = PositionCalculator(), PositionCalculator()
+    for frame in range(40):
+        ids = [rng.choice(["a", "b", "c"]) for _ in range(4)]
+        boxes, classes = _frame(rng, ids)
+        depths = [rng.choice([None, 2.0, 4.5]) for _ in ids]
+        expected = [single.bbox_to_3d(b, c, i, hailo_distance_m=d)
+                    for b, c, i, d in zip(boxes, classes, ids, depths)]
+        got = batch.bboxes_to_3d(boxes, classes, ids, depths, now=frame / 15)
+        for a, b in zip(expected, got):
+            assert b.as_tuple() == pytest.approx(a.as_tuple())
+            assert b.distance_meters == pytest.approx(a.distance_meters)
+
+
+def test_depth_distance_preferred_over_size_and_area():
+    calc = PositionCalculator()
+    bbox = (860, 340, 1060, 740)                # ~0.8m for a person by size
+    by_depth, by_size = calc.bboxes_to_3d([bbox, bbox], ["person", "person"],
+                                          distances_m=[4.2, None], apply_smoothing=False)
+    assert by_depth.distance_meters == pytest.approx(4.2) and by_depth.z == pytest.approx(-4.2)
+    assert by_size.distance_meters < 2.0
+    assert calc.bboxes_to_3d([bbox], distances_m=[99.0])[0].distance_meters == calc.max_distance
+
+
+def test_stale_and_lru_eviction():
+    calc = PositionCalculator(history_capacity=4, history_timeout_s=2.0)
+    box = [(100, 100, 300, 400)]
+    calc.bboxes_to_3d(box, object_ids=["a"], now=0.0)
+    moved = calc.bboxes_to_3d([(1500, 100, 1700, 400)], object_ids=["a"], now=1.0)[0]
+    assert moved.x < 0                          # Smoothed: still pulled toward the old (left) spot
+    calc.bboxes_to_3d([(1500, 100, 1700, 400)], object_ids=["b"], now=1.0)
+
+    # 'a' unseen for longer than the timeout: restarts unsmoothed
+    fresh = calc.bboxes_to_3d([(1500, 100, 1700, 400)], object_ids=["a"], now=3.5)[0]
+    assert fresh.x > 0 and calc.evictions == 2 and calc.tracked_count == 1
+
+    # Full: the least recently seen track outside the current frame makes room
+    for k, t in enumerate([4.0, 4.1, 4.2]):
+        calc.bboxes_to_3d(box, object_ids=[f"n{k}"], now=t)
+    calc.bboxes_to_3d(box * 2, object_ids=["n0", "new"], now=4.3)
+    assert calc.tracked_count == 4 and "a" not in calc._slots and "n0" in calc._slots
+
+    calc.clear_object_history("new")
+    assert calc.tracked_count == 3
+    calc.clear_all_history()
+    assert calc.tracked_count == 0
+
+
+def test_memory_flat_over_multi_hour_walk():
+    """2 hours at 2 FPS (detection batches): tracks flicker in and out and new ids keep appearing."""
+    rng = random.Random(7)
+    calc = PositionCalculator(history_capacity=64, history_timeout_s=2.0)
+    fps, next_id, live = 2, 0, []
+
+    def walk(frames, start):
+        nonlocal next_id, live
+        for f in range(frames):
+            live = [i for i in live if rng.random() > 0.05]       # Objects leave / flicker away
+            while len(live) < rng.randint(2, 10):
+                live.append(next_id)
+                next_id += 1
+            visible = [f"obj_{i}" for i in live if rng.random() > 0.2]
+            boxes, classes = _frame(rng, visible)
+            calc.bboxes_to_3d(boxes, classes, visible, now=(start + f) / fps)
+
+    walk(10 * 60 * fps, 0)                      # Warm up: 10 minutes
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    walk(110 * 60 * fps, 10 * 60 * fps)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    assert next_id > 3000                       # Far more ids than history slots
+    assert calc.tracked_count <= 64 and len(calc._slots) == calc.tracked_count
+    assert growth < 64 * 1024
@@ -0,0 +1,147 @@
+"""
+Unit tests for precomputed route geometry: the vectorized polyline decoder,
+segment lengths / bearings against the haversine helpers, turn angles and
+announcement triggers, and route preparation for transit walking legs.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from layer3_guide.navigation_engine import (
+    LegType, NavRoute, NavigationEngine, RouteLeg, Waypoint,
+    bearing_between, decode_polyline, haversine_distance,
+)
+from layer3_guide.route_geometry import RouteGeometry, decode_polyline_array, encode_polyline
+
+LAT0, LNG0 = 1.3521, 103.8198
+
+
+def _reference_decode(encoded):
+    """The original per-character decoder."""
+    points, index, lat, lng = [], 0, 0, 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                b = ord(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if (result & 1) else (result >> 1))
+        lat += deltas[0]
+        lng += deltas[1]
+        points.append((lat / 1e5, lng / 1e5))
+    return points
+
+
+def _walk(n, seed, step_m=8.0):
+    """Random walk of n (lat, lng) points with steps up to step_m."""
+    rng = random.Random(seed)
+    lat, lng, points = LAT0, LNG0, []
+    for _ in range(n):
+        points.append((round(lat, 5), round(lng, 5)))
+        lat += rng.uniform(-step_m, step_m) / 111_195.0
+        lng += rng.uniform(-step_m, step_m) / 111_195.0
+    return points
+
+
+def test_decode_matches_google_example_and_reference():
+    assert decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@") == pytest.approx(
+        [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)])
+    assert decode_polyline("") == []
+
+    points = _walk(2000, seed=1)
+    encoded = encode_polyline(points)
+    assert decode_polyline(encoded) == _reference_decode(encoded)
+    assert np.allclose(decode_polyline_array(encoded), points, atol=1e-9)
+
+    with pytest.raises(ValueError):
+        decode_polyline_array(encoded[:-1])
+
+
+def test_segments_match_haversine_and_bearing():
+    points = _walk(300, seed=2)
+    geometry = RouteGeometry(points)
+    for i in range(0, 299, 7):
+        (lat1, lng1), (lat2, lng2) = points[i], points[i + 1]
+        assert geometry.seg_m[i] == pytest.approx(haversine_distance(lat1, lng1, lat2, lng2), rel=1e-3, abs=1e-3)
+        if geometry.seg_m[i] > 1.0:
+            diff = (geometry.seg_bearing_deg[i] - bearing_between(lat1, lng1, lat2, lng2) + 180) % 360 - 180
+            assert abs(diff) < 0.1
+    assert geometry.cum_m[-1] == geometry.total_m == pytest.approx(geometry.seg_m.sum())
+
+    # Per-tick vector to a point matches the trig helpers within a few mm
+    lat, lng = LAT0 + 0.0004, LNG0 - 0.0003
+    x, y = (float(v) for v in geometry.to_xy(lat, lng))
+    dist, bearing = geometry.vector_to(150, x, y)
+    assert dist == pytest.approx(haversine_distance(lat, lng, *points[150]), abs=0.05)
+    assert bearing == pytest.approx(bearing_between(lat, lng, *points[150]), abs=0.1)
+    assert geometry.to_latlng(x, y) == pytest.approx((lat, lng))
+
+
+def test_turn_angles_and_announcement_triggers():
+    # 100m north, right turn, 100m east, left turn, 100m north (points every 10m)
+    north = [(0.0, 10.0 * k) for k in range(11)]
+    east = [(10.0 * k, 100.0) for k in range(1, 11)]
+    north2 = [(100.0, 100.0 + 10.0 * k) for k in range(1, 11)]
+    m_per_deg = math.radians(1.0) * 6371000.0
+    xy = north + east + north2
+    points = [(LAT0 + y / m_per_deg, LNG0 + x / (m_per_deg * math.cos(math.radians(LAT0)))) for x, y in xy]
+    flags = [i in (10, 20) for i in range(len(points))]
+    geometry = RouteGeometry(points, turn_flags=flags, crossing_flags=[i == 20 for i in range(len(points))],
+                             announce_distance_m=25.0)
+
+    assert geometry.turn_deg[10] == pytest.approx(90.0, abs=0.01)
+    assert geometry.turn_deg[20] == pytest.approx(-90.0, abs=0.01)
+    assert np.abs(np.delete(geometry.turn_deg, [10, 20])).max() < 0.01
+    assert list(geometry.next_turn[[0, 10, 11, 20, 21]]) == [10, 10, 20, 20, -1]
+    assert geometry.is_crossing[20] and geometry.is_crossing.sum() == 1
+
+    assert geometry.turn_due(8, 70.0) == -1       # 30m out
+    assert geometry.turn_due(8, 76.0) == 10       # Within 25m
+    assert geometry.turn_due(12, 180.0) == 20
+    assert geometry.turn_due(21, 290.0) == -1     # No turns left
+
+
+def test_single_point_and_degenerate_routes():
+    geometry = RouteGeometry([(LAT0, LNG0)])
+    assert geometry.num_points == 1 and geometry.total_m == 0.0
+    assert geometry.vector_to(-1, 3.0, 4.0)[0] == pytest.approx(5.0)
+    # Repeated points keep the previous bearing instead of 0 (north)
+    geometry = RouteGeometry([(LAT0, LNG0), (LAT0, LNG0 + 1e-4), (LAT0, LNG0 + 1e-4), (LAT0, LNG0 + 2e-4)])
+    assert list(np.round(geometry.seg_bearing_deg)) == [90, 90, 90]
+    assert not geometry.turn_deg.any()
+    with pytest.raises(ValueError):
+        RouteGeometry([])
+
+
+def test_engine_prepares_route_and_walking_legs(tmp_path):
+    engine = NavigationEngine(cache_db_path=str(tmp_path / "nav_cache.db"))
+    walk = [Waypoint(lat, lng, instruction="Cross the road" if i == 3 else "", is_turn=i == 5, maneuver="turn-left")
+            for i, (lat, lng) in enumerate(_walk(10, seed=3))]
+    route = NavRoute(origin="home", destination="Orchard Road, Singapore", waypoints=walk, is_transit=True,
+                     legs=[RouteLeg(leg_type=LegType.WALKING, waypoints=walk[:6]),
+                           RouteLeg(leg_type=LegType.BUS)])
+
+    prepared = engine._prepare_route(route)
+    assert prepared is route and route.geometry.num_points == 10
+    assert route.legs[0].geometry.waypoints is route.legs[0].waypoints
+    assert route.legs[1].geometry is None
+    assert route.geometry.is_crossing[3] and route.geometry.is_turn[5]
+    geometry = route.geometry
+    assert engine._prepare_route(route).geometry is geometry      # Built once
+
+    engine.route = route
+    engine._leg_geometry = route.legs[0].geometry
+    assert engine._active_geometry() is route.legs[0].geometry
+    engine._leg_geometry = None
+    assert engine._active_geometry() is geometry
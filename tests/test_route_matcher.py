@@ -0,0 +1,232 @@
+"""
+Unit tests for route map-matching: progress along the route from noisy
+1Hz GPS traces, off-route detection with hysteresis after a missed turn,
+out-and-back routes, bounded per-tick work on long routes, and reroutes
+that reuse a cached route instead of fetching.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import asyncio
+import math
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from layer3_guide.navigation_engine import NavMode, NavRoute, NavState, NavigationEngine, Waypoint
+from layer3_guide.route_geometry import EARTH_RADIUS_M, RouteGeometry
+from layer3_guide.route_matcher import RouteMatcher
+
+LAT0, LNG0 = 1.3521, 103.8198
+M_PER_DEG = math.radians(1.0) * EARTH_RADIUS_M
+
+
+def _latlng(east_m, north_m):
+    return (LAT0 + north_m / M_PER_DEG,
+            LNG0 + east_m / (M_PER_DEG * math.cos(math.radians(LAT0))))
+
+
+def _polyline(corners, spacing_m=20.0):
+    """Route points every spacing_m along straight legs between (east, north) corners."""
+    points = [corners[0]]
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:]):
+        n = max(1, int(math.ceil(math.hypot(x1 - x0, y1 - y0) / spacing_m)))
+        points += [(x0 + (x1 - x0) * k / n, y0 + (y1 - y0) * k / n) for k in range(1, n + 1)]
+    return points
+
+
+def _trace(path, seed, speed=1.4, noise_m=5.0, hz=1.0):
+    """GPS trace walking (east, north) path: [(t, lat, lng)] with Gaussian position noise."""
+    rng = random.Random(seed)
+    fixes, t, step = [], 0.0, speed / hz
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        s = 0.0
+        while s < length:
+            u = s / length
+            fixes.append((t, *_latlng(x0 + (x1 - x0) * u + rng.gauss(0, noise_m),
+                                      y0 + (y1 - y0) * u + rng.gauss(0, noise_m))))
+            s += step
+            t += 1.0 / hz
+    return fixes
+
+
+# 200m north, turn right, 150m east
+ROUTE = _polyline([(0, 0), (0, 200), (150, 200)])
+
+
+def _matcher(points=ROUTE):
+    return RouteMatcher([_latlng(x, y) for x, y in points])
+
+
+def test_following_the_route_tracks_progress():
+    matcher = _matcher()
+    assert matcher.total_m == pytest.approx(350.0)
+    matches = [matcher.match(lat, lng, now=t) for t, lat, lng in _trace([(0, 0), (0, 200), (150, 200)], seed=1)]
+
+    assert not any(m.off_route for m in matches)
+    assert max(m.cross_track_m for m in matches) < 25.0
+    assert matches[-1].progress_m == pytest.approx(350.0, abs=10.0)
+    # Progress wobbles back by GPS noise (5m per axis, worst at the corner), never jumps
+    assert min(b.progress_m - a.progress_m for a, b in zip(matches, matches[1:])) > -40.0
+    assert matches[len(matches) // 2].waypoint_idx in range(9, 13)
+
+
+def test_missed_turn_goes_off_route_after_confirmation():
+    matcher = _matcher()
+    # Walks straight on past the corner instead of turning right
+    matches = [matcher.match(lat, lng, now=t) for t, lat, lng in _trace([(0, 0), (0, 320)], seed=2)]
+    first_off = next(i for i, m in enumerate(matches) if m.off_route)
+    # ~30m past the corner before the error builds, plus the confirmation time
+    assert matches[first_off].cross_track_m > RouteMatcher.OFF_ROUTE_ENTER_M
+    assert 200 + 30 < first_off * 1.4 < 200 + 30 + 1.4 * (RouteMatcher.OFF_ROUTE_CONFIRM_S + 8)
+    assert all(m.off_route for m in matches[first_off:])
+    assert matcher.progress_m < 240.0              # Progress froze near the corner
+
+    # Walk back to the corner and take the turn: back on route below the exit threshold
+    for t, lat, lng in _trace([(0, 320), (0, 200), (100, 200)], seed=3, noise_m=2.0):
+        m = matcher.match(lat, lng, now=1000 + t)
+    assert not m.off_route and m.progress_m == pytest.approx(300.0, abs=10.0)
+
+
+def test_brief_excursions_and_jitter_do_not_flap():
+    matcher = _matcher()
+    now = 0.0
+    for k in range(60):
+        # Cross-track error swinging 20..40m, and never above ENTER for the confirmation time
+        offset = 40.0 if k % 5 == 0 else 20.0
+        m = matcher.match(*_latlng(offset, 5.0 + k), now=now)
+        assert not m.off_route
+        now += 1.0
+    # A 3s step onto the far side of a road is ignored
+    for k in range(3):
+        assert not matcher.match(*_latlng(-45.0, 70.0), now=now + k).off_route
+    assert not matcher.match(*_latlng(2.0, 72.0), now=now + 3).off_route
+
+
+def test_out_and_back_route_follows_the_right_pass():
+    # North 150m to a shop and back along the same pavement
+    matcher = _matcher(_polyline([(0, 0), (0, 150), (1, 0)]))
+    matches = [matcher.match(lat, lng, now=t)
+               for t, lat, lng in _trace([(0, 0), (0, 150), (1, 0)], seed=4, noise_m=3.0)]
+    assert matches[len(matches) // 4].progress_m < 150.0
+    assert matches[-3].progress_m > 260.0
+    assert not any(m.off_route for m in matches)
+
+
+def test_starting_mid_route_reacquires_through_the_grid():
+    matcher = _matcher()
+    m = matcher.match(*_latlng(3.0, 180.0), now=0.0)
+    assert m.progress_m == pytest.approx(180.0, abs=1.0) and m.cross_track_m == pytest.approx(3.0, abs=0.1)
+    assert matcher.locate(*_latlng(400.0, 400.0)) is None
+    assert matcher.locate(*_latlng(100.0, 205.0)).progress_m == pytest.approx(300.0, abs=1.0)
+
+
+def test_per_tick_work_does_not_grow_with_route_length():
+    def max_candidates(points):
+        matcher = _matcher(points)
+        project, sizes = matcher._project, []
+
+        def counting(x, y, segments):
+            sizes.append(len(segments))
+            return project(x, y, segments)
+
+        matcher._project = counting
+        for t, lat, lng in _trace(points[:40], seed=5):
+            matcher.match(lat, lng, now=t)
+        return max(sizes)
+
+    zigzag = [(i % 2 * 40.0, i * 10.0) for i in range(1000)]
+    short = max_candidates(_polyline(zigzag[:20], spacing_m=5.0))   # ~160 segments
+    long = max_candidates(_polyline(zigzag, spacing_m=5.0))         # ~8k segments
+    assert long == short and long < 100
+
+
+def _engine(tmp_path):
+    engine = NavigationEngine(cache_db_path=str(tmp_path / "nav_cache.db"))
+    fetched = []
+
+    def fetch_route(origin, destination):
+        fetched.append((origin, destination))
+        return NavRoute(origin=origin, destination=destination,
+                        waypoints=[Waypoint(*_latlng(x, y)) for x, y in _polyline([(0, 320), (150, 200)])])
+
+    engine.fetch_route = fetch_route
+    return engine, fetched
+
+
+def test_reroute_reuses_a_cached_route_that_passes_the_user(tmp_path):
+    engine, fetched = _engine(tmp_path)
+    # Cached earlier: the route along the next street over, to the same destination
+    parallel = NavRoute(origin="home", destination="Orchard Road, Singapore",
+                        waypoints=[Waypoint(*_latlng(x, y)) for x, y in _polyline([(60, 0), (60, 200), (150, 200)])])
+    engine._cache_route(parallel)
+    engine._cache_db.flush()
+    engine.route = NavRoute(origin="home", destination="Orchard Road, Singapore",
+                            waypoints=[Waypoint(*_latlng(x, y)) for x, y in ROUTE])
+
+    assert asyncio.run(engine._reroute(_latlng(62.0, 100.0)))
+    assert fetched == []
+    assert engine.route.waypoints[0].lat == pytest.approx(parallel.waypoints[0].lat)
+    assert engine.current_waypoint_idx == 6                 # Picks up 100m along it
+    assert engine._matcher.progress_m == pytest.approx(100.0, abs=1.0)
+
+    # Nothing cached passes here: one Directions request from the current position
+    assert asyncio.run(engine._reroute(_latlng(0.0, 320.0)))
+    assert len(fetched) == 1 and fetched[0][1] == "Orchard Road, Singapore"
+    assert engine.current_waypoint_idx == 0
+
+
+def test_waypoint_index_resyncs_to_matched_progress(tmp_path):
+    engine, _ = _engine(tmp_path)
+    geometry = RouteGeometry.from_waypoints([Waypoint(*_latlng(x, y)) for x, y in ROUTE])
+    matcher = engine._route_matcher(geometry)
+    assert engine._route_matcher(geometry) is matcher       # Built once per route
+
+    engine.current_waypoint_idx = 2                         # Missed the arrivals on the way
+    engine._resync_waypoint(matcher.match(*_latlng(1.0, 130.0), now=0.0))
+    assert engine.current_waypoint_idx == 7
+
+    engine.current_waypoint_idx = 15                        # Jitter ran the index ahead
+    engine._resync_waypoint(matcher.match(*_latlng(1.0, 135.0), now=1.0))
+    assert engine.current_waypoint_idx == 7
+
+    engine.current_waypoint_idx = 8                         # Normal arrival slack: left alone
+    engine._resync_waypoint(matcher.match(*_latlng(1.0, 138.0), now=2.0))
+    assert engine.current_waypoint_idx == 8
+
+
+def test_riding_a_vehicle_on_a_walking_route_does_not_reroute(tmp_path, monkeypatch):
+    monkeypatch.setattr(RouteMatcher, "OFF_ROUTE_CONFIRM_S", 0.0)
+    engine, fetched = _engine(tmp_path)
+    spoken = []
+
+    async def speak(text, **slots):
+        spoken.append(text)
+
+    engine._speak = speak
+    engine.NAV_LOOP_HZ = 100
+    engine.route = NavRoute(origin="home", destination="Orchard Road, Singapore",
+                            waypoints=[Waypoint(*_latlng(x, y)) for x, y in ROUTE])
+    # On a bus along the next main road, 300m from the walking route
+    fix = SimpleNamespace(latitude=_latlng(300.0, 100.0)[0], longitude=_latlng(300.0, 100.0)[1],
+                          accuracy=5.0, speed_kmh=40.0, heading=0.0)
+    engine.gps = SimpleNamespace(get_fix=lambda: fix)
+
+    async def run(seconds):
+        engine.state, engine._running = NavState.NAVIGATING, True
+        loop = asyncio.ensure_future(engine._navigation_loop())
+        await asyncio.sleep(seconds)
+        engine._running = False
+        await loop
+
+    asyncio.run(run(0.3))
+    assert engine.mode == NavMode.TRANSIT
+    assert spoken == ["You're on a vehicle. I'll track your progress."] and fetched == []
+
+    # Off the vehicle and still away from the route: now it is off route
+    fix.speed_kmh = 4.0
+    asyncio.run(run(0.3))
+    assert "You're off the route. Finding a new way." in spoken and len(fetched) == 1
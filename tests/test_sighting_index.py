@@ -0,0 +1,116 @@
+"""
+Unit tests for SightingIndex (spatio-temporal object recall).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+from collections import namedtuple
+
+import pytest
+
+from layer4_memory.sighting_index import SightingIndex, normalize_object_name
+
+Fix = namedtuple("Fix", "latitude longitude")
+FRAME = (480, 640, 3)
+HOME = Fix(1.3521, 103.8198)
+
+
+def _det(cls, x_center, conf=0.8, distance=None):
+    det = {"class": cls, "confidence": conf, "bbox": [x_center - 20, 200, x_center + 20, 260]}
+    if distance is not None:
+        det["distance_m"] = distance
+    return det
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SightingIndex(db_path=str(tmp_path / "cortex.db"), hfov_deg=100.0)
+
+
+def test_consecutive_frames_merge_into_one_track(index):
+    for i in range(10):
+        index.record([_det("wallet", 100)], FRAME, gps_fix=HOME, heading=0.0, timestamp=1000.0 + i * 0.1)
+    sightings = index.last_sightings("wallet")
+    assert len(sightings) == 1
+    assert sightings[0].frames == 10
+    assert sightings[0].start_ts == pytest.approx(1000.0)
+    assert sightings[0].end_ts == pytest.approx(1000.9)
+
+
+def test_gap_starts_new_track(index):
+    index.record([_det("cup", 320)], FRAME, timestamp=1000.0)
+    index.record([_det("cup", 320)], FRAME, timestamp=1010.0)
+    assert len(index.last_sightings("cup", limit=5)) == 2
+
+
+def test_low_confidence_ignored(index):
+    index.record([_det("wallet", 320, conf=0.1)], FRAME, timestamp=1000.0)
+    assert index.last_sightings("wallet") == []
+
+
+def test_answer_uses_current_heading(index):
+    # Object at image centre while facing north (0°); user now faces east (90°)
+    index.record([_det("wallet", 320)], FRAME, heading=0.0, timestamp=1000.0)
+    answer = index.answer_recall("wallet", current_heading=90.0, now=1240.0)
+    assert answer == "You last saw your wallet 4 minutes ago, to your left."
+
+
+def test_answer_without_imu_uses_bearing_at_sighting(index):
+    index.record([_det("keys", 600, distance=0.8)], FRAME, timestamp=1000.0)
+    answer = index.answer_recall("my keys", now=1030.0)
+    assert answer.startswith("You last saw your keys just now")
+    assert "it was slightly to your right" in answer
+    assert "within arm's reach" in answer
+
+
+def test_defers_when_empty_stale_or_ambiguous(index):
+    assert index.answer_recall("wallet", now=1000.0) is None
+
+    index.record([_det("bottle", 320)], FRAME, heading=0.0, timestamp=1000.0)
+    assert index.answer_recall("bottle", now=1000.0 + 7 * 3600) is None
+
+    # Two recent sightings in opposite directions
+    index.record([_det("laptop", 320)], FRAME, heading=0.0, timestamp=2000.0)
+    index.record([_det("laptop", 320)], FRAME, heading=180.0, timestamp=2010.0)
+    assert index.answer_recall("laptop", current_heading=0.0, now=2020.0) is None
+    assert index.deferred_answers == 3
+
+
+def test_near_query_uses_rtree(index):
+    far = Fix(HOME.latitude + 0.01, HOME.longitude)  # ~1.1 km north
+    index.record([_det("handbag", 320)], FRAME, gps_fix=HOME, timestamp=1000.0)
+    index.record([_det("handbag", 320)], FRAME, gps_fix=far, timestamp=1100.0)
+
+    near_home = index.last_sightings("handbag", near=(HOME.latitude, HOME.longitude), radius_m=50)
+    assert len(near_home) == 1
+    assert near_home[0].end_ts == pytest.approx(1000.0)
+    assert len(index.last_sightings("handbag", limit=5)) == 2
+
+
+def test_time_range_query(index):
+    index.record([_det("cup", 320)], FRAME, timestamp=1000.0)
+    index.record([_det("chair", 320)], FRAME, timestamp=5000.0)
+    classes = [s.class_name for s in index.sightings_between(900.0, 1100.0)]
+    assert classes == ["cup"]
+
+
+def test_recall_query_uses_covering_index(index):
+    plan = " ".join(
+        row[3] for row in index.db.query(
+            "EXPLAIN QUERY PLAN SELECT * FROM sightings WHERE class_name = ? "
+            "AND end_ts >= ? ORDER BY end_ts DESC LIMIT 3",
+            ("wallet", 0.0),
+        )
+    )
+    assert "COVERING INDEX idx_sightings_recall" in plan
+
+
+@pytest.mark.parametrize("spoken,label", [
+    ("my wallet", "wallet"),
+    ("phone", "cell phone"),
+    ("bottles", "bottle"),
+    ("keys", "keys"),
+])
+def test_normalize_object_name(spoken, label):
+    assert normalize_object_name(spoken) == label
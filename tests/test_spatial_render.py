@@ -0,0 +1,73 @@
+"""
+Unit tests for the offline spatial audio render harness: interaural cue
+measurement on signals with known ITD / ILD, and every scripted scenario
+(localization, alert / beacon timing, head tracking, real-time budget)
+rendered on the virtual clock. A failing check here is a spatial audio
+regression.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import numpy as np
+import pytest
+
+from audio_mixer import get_mixer
+from layer3_guide.spatial_audio.binaural_mixer import BinauralMixer
+from layer3_guide.spatial_audio.offline_render import (
+    SCENARIOS, OfflineRender, binaural_cues, count_onsets, lateral_angle, run_scenario,
+)
+
+SR = 48000
+
+
+def test_cues_of_a_known_delay_and_level_difference():
+    noise = np.random.default_rng(0).standard_normal(SR // 2)
+    delay = 24                                           # 500us, right ear leads
+    stereo = np.stack([np.concatenate([np.zeros(delay), noise[:-delay]]) * 0.5, noise], axis=1)
+    cues = binaural_cues(stereo, SR)
+    assert cues.itd_us == pytest.approx(500.0, abs=5.0)
+    assert cues.ild_db == pytest.approx(20 * np.log10(2.0), abs=0.1)
+    assert cues.iacc > 0.99
+    assert lateral_angle(cues.itd_us, SR) > 30.0
+
+    decorrelated = np.random.default_rng(1).standard_normal((SR // 2, 2))
+    assert binaural_cues(decorrelated, SR).iacc < 0.1
+    assert binaural_cues(np.stack([noise, np.zeros_like(noise)], axis=1), SR).ild_db == -100.0
+
+    clicks = np.zeros((SR, 2))
+    clicks[[1000, 20000, 30000]] = 0.5
+    assert count_onsets(clicks, SR) == 3
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_scenario_passes_every_check(name):
+    checks, stats = run_scenario(name)
+    failed = [f"{c.name}: {c.detail}" for c in checks if not c.passed]
+    assert not failed, failed
+    # An overrun is one block whose callback CPU time (thread_time) exceeds the
+    # block period: isolated spikes such as first-block warm-up or a GC pass.
+    # Sustained load is held by run_scenario's p95 budget check in every scenario.
+    assert stats["blocks"] > 0 and stats["overruns"] <= 0.01 * stats["blocks"]
+
+
+def test_render_restores_process_mixers_and_writes_wav(tmp_path):
+    with OfflineRender(blocksize=256) as render:
+        assert get_mixer() is render.mixer
+        render.at(0.05, lambda: render.voices.play(np.ones(480) * 0.5, 90.0, attack_ms=0.0))
+        render.run(0.2)
+        assert render.clock() == pytest.approx(0.2, abs=256 / SR)
+        render.write_wav(str(tmp_path / "out.wav"))
+    assert get_mixer() is None
+    assert (tmp_path / "out.wav").stat().st_size > 0.2 * SR * 4
+
+
+def test_voice_mixer_adopts_the_output_rate():
+    with OfflineRender() as render:
+        voices = BinauralMixer(44100)                    # BinauralEngine's default rate
+        assert voices.start() and voices.sr == render.sample_rate
+        voices.play(np.ones(voices.sr // 10) * 0.5, 90.0, attack_ms=0.0)   # 100ms at the rate it reports
+        render.run(0.2)
+        voices.stop()
+    assert count_onsets(render.audio, SR) == 1
+    assert np.count_nonzero(np.abs(render.audio[:, 1]) > 0.1) == pytest.approx(4800, abs=100)
@@ -0,0 +1,146 @@
+"""
+Unit tests for SpeculativeRouter (route prediction on stable partial
+transcripts, prefetch commit/cancel, misprediction and saved-latency stats).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import asyncio
+import re
+import threading
+import time
+
+import pytest
+
+from layer1_reflex.streaming_stt import PartialTranscript
+from layer3_guide.router import IntentRouter
+from layer3_guide.speculative_router import RECALL, VISION, SpeculativeRouter
+
+
+def _search_object(text):
+    match = re.search(r"where (?:is|are) (?:my |the )?(.+)", text.lower())
+    return match.group(1).strip() if match else None
+
+
+def _partial(stable, unstable="", revision=2):
+    return PartialTranscript(stable=stable, unstable=unstable, revision=revision)
+
+
+@pytest.fixture
+def spec_router():
+    router = SpeculativeRouter(IntentRouter(), search_object_fn=_search_object)
+    calls = []
+
+    def frame(spec):
+        calls.append(("frame", spec.key))
+        time.sleep(0.05)
+        return {"frame": "bgr", "pil": "rgb", "jpeg": b"jpeg"}
+
+    def recall(spec):
+        calls.append(("recall", spec.key))
+        return [f"hit:{spec.key}"]
+
+    router.register_prefetch(VISION, "frame", frame)
+    router.register_prefetch(RECALL, "frame", frame)
+    router.register_prefetch(RECALL, "visual_recall", recall)
+    router.calls = calls
+    yield router
+    router.shutdown()
+
+
+def test_route_classification_is_unchanged():
+    router = IntentRouter()
+    assert router.route("describe the scene") == "layer2"
+    assert router.classify("describe the scene") == ("layer2", "thinker")
+    assert router.classify("what is the capital of france") == ("layer2", "default")
+    assert router.classify("navigate to the library") == ("layer3", "guide")
+    assert router.classify("um") == ("ignore", "filler")
+    assert router.route_with_flags("read the sign", quiet=True)["query_type"] == "analysis_ocr"
+
+
+def test_confident_vision_prefix_is_prefetched_and_committed(spec_router):
+    spec_router.on_partial(_partial("describe the", "see"))
+    spec_router.on_partial(_partial("describe the scene", "in"))
+    time.sleep(0.1)
+
+    prefetched = spec_router.resolve("describe the scene in front of me")
+
+    assert prefetched is not None and prefetched.route == VISION
+    assert prefetched.get("frame")["jpeg"] == b"jpeg"
+    assert spec_router.calls == [("frame", "layer2")]  # Not restarted for the longer partial
+    stats = spec_router.get_stats()[VISION]
+    assert stats["hits"] == 1 and stats["mispredictions"] == 0
+    assert stats["saved_ms"] >= 40
+
+
+def test_default_route_is_never_speculated(spec_router):
+    spec_router.on_partial(_partial("what is the capital", "of"))
+    assert spec_router.resolve("what is the capital of france") is None
+    assert spec_router.calls == []
+
+
+def test_misprediction_is_cancelled_and_counted(spec_router):
+    spec_router.on_partial(_partial("describe the", "way"))
+    time.sleep(0.1)
+
+    # Final text routes to navigation, so nothing is committed
+    assert spec_router.resolve("describe the way, no, navigate to the library") is None
+    stats = spec_router.get_stats()[VISION]
+    assert stats["mispredictions"] == 1 and stats["hits"] == 0
+    assert stats["wasted_ms"] > 0
+
+
+def test_recall_key_must_match_final_object(spec_router):
+    spec_router.on_partial(_partial("where is my red", "bag"))
+    spec_router.on_partial(_partial("where is my red bag"))
+    time.sleep(0.1)
+
+    prefetched = spec_router.resolve("where is my red bag")
+    assert prefetched.route == RECALL and prefetched.key == "red bag"
+    assert prefetched.get("visual_recall") == ["hit:red bag"]
+    # The 'red' speculation was replaced once the object name grew
+    assert spec_router.get_stats()[RECALL]["mispredictions"] == 1
+
+
+def test_new_utterance_abandons_leftover_speculation(spec_router):
+    spec_router.on_partial(_partial("describe the", "room"))
+    spec_router.on_partial(_partial("", "hello", revision=1))  # Next utterance starts
+    assert spec_router.resolve("hello") is None
+    assert spec_router.get_stats()[VISION]["abandoned"] == 1
+
+
+def test_cancelled_speculation_skips_queued_prefetch():
+    router = SpeculativeRouter(IntentRouter(), max_workers=1)
+    release = threading.Event()
+    ran = []
+    router.register_prefetch(VISION, "slow", lambda spec: release.wait(1))
+    router.register_prefetch(VISION, "queued", lambda spec: ran.append(spec.key))
+
+    router.on_partial(_partial("describe the", "x"))
+    assert router.resolve("navigate home") is None
+    release.set()
+    router.shutdown()
+    time.sleep(0.05)
+    assert ran == []
+
+
+def test_get_async_awaits_the_prefetch_without_blocking_the_loop(spec_router):
+    spec_router.on_partial(_partial("describe the scene", "in"))
+    prefetched = spec_router.resolve("describe the scene in front of me")
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    async def run():
+        task = asyncio.create_task(ticker())
+        result = await prefetched.get_async("frame")      # Prefetch still has ~50ms to go
+        task.cancel()
+        return result
+
+    assert asyncio.run(run())["jpeg"] == b"jpeg"
+    assert len(ticks) >= 4                                 # Loop kept running meanwhile
+    assert asyncio.run(prefetched.get_async("missing")) is None
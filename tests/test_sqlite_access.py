@@ -0,0 +1,118 @@
+"""
+Unit tests for the shared SQLite access layer (single writer, read pool).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from layer4_memory.sqlite_access import get_database
+
+
+def _create_items(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = get_database(str(tmp_path / "test.db"))
+    database.transaction(_create_items)
+    yield database
+    database.release()
+
+
+def test_execute_waits_for_commit_and_reads_see_it(db):
+    result = db.execute("INSERT INTO items (name) VALUES (?)", ("wallet",))
+    assert result.lastrowid == 1
+    row = db.query_one("SELECT name FROM items WHERE id = ?", (1,))
+    assert row["name"] == "wallet"
+
+
+def test_concurrent_writers_are_group_committed(db):
+    def writer(n):
+        for i in range(50):
+            db.execute("INSERT INTO items (name) VALUES (?)", (f"t{n}-{i}",))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert db.query_one("SELECT COUNT(*) FROM items")[0] == 400
+    stats = db.get_stats()
+    assert stats["write_errors"] == 0
+    assert stats["batches"] < stats["writes"]
+
+
+def test_failing_op_does_not_roll_back_batch_neighbours(db):
+    db.execute("INSERT INTO items (name) VALUES (?)", ("dup",))
+    ok_1 = db.execute("INSERT INTO items (name) VALUES (?)", ("a",), wait=False)
+    bad = db.execute("INSERT INTO items (name) VALUES (?)", ("dup",), wait=False)
+    ok_2 = db.execute("INSERT INTO items (name) VALUES (?)", ("b",), wait=False)
+
+    assert ok_1.result(timeout=5).rowcount == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        bad.result(timeout=5)
+    assert ok_2.result(timeout=5).rowcount == 1
+    names = {r["name"] for r in db.query("SELECT name FROM items")}
+    assert names == {"dup", "a", "b"}
+
+
+def test_transaction_is_atomic_and_reentrant(db):
+    def insert_pair(conn):
+        conn.execute("INSERT INTO items (name) VALUES (?)", ("left",))
+        # Nested calls from inside a transaction fn run inline
+        db.execute("INSERT INTO items (name) VALUES (?)", ("right",))
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    assert db.transaction(insert_pair) == 2
+
+    def fails(conn):
+        conn.execute("INSERT INTO items (name) VALUES (?)", ("ghost",))
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        db.transaction(fails)
+    assert db.query_one("SELECT COUNT(*) FROM items WHERE name = 'ghost'")[0] == 0
+
+
+def test_readers_are_read_only_and_pooled(db):
+    with db.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items (name) VALUES ('x')")
+    for _ in range(20):
+        db.query("SELECT * FROM items")
+    assert db.get_stats()["read_connections"] == 1
+
+
+def test_registry_shares_and_refcounts(tmp_path):
+    path = str(tmp_path / "shared.db")
+    first = get_database(path)
+    second = get_database(path)
+    assert first is second
+
+    first.release()
+    assert not second.closed
+    second.release()
+    assert second.closed
+    assert get_database(path) is not first
+
+
+def test_memory_database_is_private_and_visible_to_readers():
+    one = get_database(":memory:")
+    two = get_database(":memory:")
+    try:
+        assert one is not two
+        one.transaction(_create_items)
+        one.execute("INSERT INTO items (name) VALUES (?)", ("cup",))
+        assert one.query_one("SELECT name FROM items")[0] == "cup"
+        with pytest.raises(sqlite3.OperationalError):
+            two.query("SELECT * FROM items")
+    finally:
+        one.release()
+        two.release()
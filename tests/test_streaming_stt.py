@@ -0,0 +1,106 @@
+"""
+Unit tests for StreamingTranscriber (partial transcripts, stability markers,
+window sliding and finalization after the VAD end event).
+
+Uses a deterministic fake decoder: every WORD_S of audio carries one word id
+as its sample value, and a word only partly covered by the window is returned
+truncated (like Whisper guessing a cut-off word).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import numpy as np
+
+from layer1_reflex.streaming_stt import StreamingTranscriber
+
+SR = 16000
+WORD_S = 0.25
+WORDS = [f"word{i:02d}" for i in range(60)]
+
+
+def _speech(n_words, silence_s=0.0):
+    word_len = int(WORD_S * SR)
+    audio = np.repeat(np.arange(1, n_words + 1, dtype=np.float32) / 1000.0, word_len)
+    return np.concatenate([audio, np.zeros(int(silence_s * SR), dtype=np.float32)])
+
+
+class FakeDecoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, audio, prompt):
+        self.calls.append((len(audio), prompt))
+        ids = np.rint(audio * 1000).astype(int)
+        runs = [run for run in np.split(ids, np.flatnonzero(np.diff(ids)) + 1) if run[0] != 0]
+        words = [WORDS[run[0] - 1] for run in runs]
+        # The last word may be cut off by the end of the window
+        if runs and ids[-1] != 0 and len(runs[-1]) < WORD_S * SR:
+            words[-1] = words[-1][:2]
+        return " ".join(words)
+
+
+def _feed(transcriber, audio, chunk=512):
+    for i in range(0, len(audio), chunk):
+        transcriber.feed(audio[i:i + chunk])
+        if transcriber._worker is not None:
+            transcriber._worker.join()
+
+
+def test_partials_are_emitted_and_stable_text_is_never_revised():
+    partials = []
+    stt = StreamingTranscriber(FakeDecoder(), step_s=0.5, min_first_s=0.5, on_partial=partials.append)
+    _feed(stt, _speech(12))
+    final = stt.finish()
+
+    assert len(partials) > 3
+    stables = [p.stable for p in partials]
+    for earlier, later in zip(stables, stables[1:]):
+        assert later.startswith(earlier)
+    assert any(p.unstable for p in partials[:-1])
+    assert final.is_final and final.stability == 1.0
+    assert final.text == " ".join(WORDS[:12])
+
+
+def test_finish_reuses_last_hypothesis_when_tail_is_silence():
+    decoder = FakeDecoder()
+    stt = StreamingTranscriber(decoder, step_s=0.8, min_first_s=0.8)
+    _feed(stt, _speech(10, silence_s=0.9))  # Last partial decode lands in the silence
+    calls = len(decoder.calls)
+
+    final = stt.finish(silence_tail_s=0.9)
+
+    assert stt.final_reused
+    assert final.decode_ms == 0.0
+    assert len(decoder.calls) == calls
+    assert final.text == " ".join(WORDS[:10])
+
+
+def test_finish_decodes_remaining_audio_when_speech_continued():
+    stt = StreamingTranscriber(FakeDecoder(), step_s=0.8, min_first_s=0.8)
+    _feed(stt, _speech(7, silence_s=0.1))  # 1.85s: last partial at 1.6s misses a word
+
+    final = stt.finish(silence_tail_s=0.1)
+
+    assert not stt.final_reused
+    assert final.text == " ".join(WORDS[:7])
+
+
+def test_long_utterance_slides_window_without_duplicates():
+    decoder = FakeDecoder()
+    stt = StreamingTranscriber(decoder, step_s=0.5, min_first_s=0.5, max_window_s=4.0, overlap_s=1.5)
+    _feed(stt, _speech(48, silence_s=0.5))  # 12.5s of audio, 4s windows
+
+    final = stt.finish(silence_tail_s=0.5)
+
+    assert final.text == " ".join(WORDS[:48])
+    assert max(n for n, _ in decoder.calls) <= 4.0 * SR
+    # Committed words are passed to the decoder as context after a slide
+    assert any(prompt for _, prompt in decoder.calls)
+
+
+def test_utterance_longer_than_buffer_is_truncated():
+    stt = StreamingTranscriber(FakeDecoder(), max_utterance_s=1.0)
+    _feed(stt, _speech(8))
+    assert len(stt.audio) == SR
+    assert stt.finish().text.split()[:3] == WORDS[:3]
@@ -0,0 +1,133 @@
+"""
+Unit tests for the pluggable STT backends: decode settings, the
+faster-whisper backend (against a fake CTranslate2 model), the warm STT
+worker queue and the WER metric.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from layer1_reflex.stt_backends import (
+    DecodeSettings,
+    FasterWhisperSTT,
+    STTWorker,
+    create_stt_backend,
+    word_error_rate,
+)
+
+
+def test_decode_settings_from_config():
+    decode = DecodeSettings.from_config({"beam_size": 5, "temperatures": [0, 0.4, 0.8]})
+    assert decode.beam_size == 5
+    assert decode.temperatures == (0.0, 0.4, 0.8)
+    assert decode.logprob_threshold == DecodeSettings().logprob_threshold
+
+    assert DecodeSettings.from_config({"temperatures": 0.2}).temperatures == (0.2,)
+    assert DecodeSettings.from_config(None) == DecodeSettings()
+
+
+class FakeWhisperModel:
+    def __init__(self, segments):
+        self.segments = segments
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        return iter(self.segments), SimpleNamespace(duration=len(audio) / 16000)
+
+
+def _segment(text, temperature=0.0, no_speech_prob=0.1):
+    return SimpleNamespace(text=text, temperature=temperature, no_speech_prob=no_speech_prob)
+
+
+def test_faster_whisper_passes_decode_settings_and_counts_fallbacks():
+    stt = FasterWhisperSTT(decode=DecodeSettings(beam_size=3, temperatures=(0.0, 0.5)))
+    stt.model = FakeWhisperModel([_segment(" turn left"), _segment(" at the door", temperature=0.5)])
+
+    assert stt.transcribe(np.zeros(32000, dtype=np.float32), log_latency=False) == "turn left at the door"
+    call = stt.model.calls[0]
+    assert call["beam_size"] == 3
+    assert call["temperature"] == [0.0, 0.5]
+    assert call["vad_filter"] is False
+    assert stt.fallbacks == 1
+    assert stt.get_stats()["count"] == 1
+
+
+def test_faster_whisper_window_decode_is_greedy_and_drops_noise():
+    stt = FasterWhisperSTT(decode=DecodeSettings(beam_size=5, temperatures=(0.0, 0.4)))
+    stt.model = FakeWhisperModel([_segment(" what is"), _segment(" [noise]", no_speech_prob=0.95)])
+
+    assert stt.transcribe_window(np.zeros(16000, dtype=np.float32), prompt="hey") == "what is"
+    call = stt.model.calls[0]
+    assert call["beam_size"] == 1 and call["temperature"] == [0.0]
+    assert call["initial_prompt"] == "hey"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_stt_backend("vosk")
+
+
+def test_worker_queues_segments_while_busy():
+    release = threading.Event()
+    done = threading.Event()
+    seen = []
+
+    def handler(job):
+        if not seen:
+            release.wait(2.0)  # First segment is still being transcribed
+        seen.append(job.context)
+        if len(seen) == 3:
+            done.set()
+
+    worker = STTWorker(handler, max_queue=4)
+    worker.start()
+    for i in range(3):
+        assert worker.submit(np.zeros(10, dtype=np.float32), i)
+    release.set()
+    assert done.wait(2.0)
+    worker.stop()
+
+    assert seen == [0, 1, 2]
+    stats = worker.get_stats()
+    assert stats["dropped"] == 0 and stats["processed"] == 3
+
+
+def test_worker_drops_oldest_waiting_job_when_full():
+    release = threading.Event()
+    started = threading.Event()
+    seen, dropped = [], []
+
+    def handler(job):
+        started.set()
+        release.wait(2.0)
+        seen.append(job.context)
+
+    worker = STTWorker(handler, max_queue=2, on_drop=lambda job: dropped.append(job.context))
+    worker.start()
+    worker.submit(np.zeros(10, dtype=np.float32), "a")
+    assert started.wait(2.0)  # "a" is running, the next two wait
+    worker.submit(np.zeros(10, dtype=np.float32), "b")
+    worker.submit(np.zeros(10, dtype=np.float32), "c")
+    assert not worker.submit(np.zeros(10, dtype=np.float32), "d")
+    release.set()
+    while worker.pending or worker.busy:
+        threading.Event().wait(0.01)
+    worker.stop()
+
+    assert dropped == ["b"]
+    assert seen == ["a", "c", "d"]
+    assert worker.dropped == 1
+
+
+def test_word_error_rate():
+    assert word_error_rate("Turn left at the door.", "turn left at the door") == 0.0
+    assert word_error_rate("turn left at the door", "turn right at door") == pytest.approx(2 / 5)
+    assert word_error_rate("stop", "stop stop now") == pytest.approx(2.0)
+    assert word_error_rate("", "") == 0.0
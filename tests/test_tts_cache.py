@@ -0,0 +1,89 @@
+"""
+Unit tests for the TTS phrase cache: key normalization, memory LRU
+budget, the disk tier (persistence, budget, corrupt entries), template
+fragments and hit / saved-time metrics.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import numpy as np
+import pytest
+
+from tts_cache import CachedAudio, TTSCache, join_fragments, template_literals, template_parts
+
+
+def _audio(n=2400, value=1, synth_ms=100.0, rate=24000):
+    return CachedAudio(np.full(n, value, dtype=np.int16), rate, synth_ms)
+
+
+def test_key_normalizes_text_voice_and_speed():
+    a = TTSCache.key("kokoro", "af_alloy", 1.0, "  Camera’s working   again. ")
+    b = TTSCache.key("kokoro", "af_alloy", 1.0000001, "Camera's working again.")
+    assert a == b
+    assert TTSCache.key("kokoro", "af_bella", 1.0, "x") != TTSCache.key("kokoro", "af_alloy", 1.0, "x")
+    assert TTSCache.key("gemini", None, None, "x") == ("gemini", "default", 1.0, "x")
+
+
+def test_memory_lru_respects_budget_and_counts_hits():
+    cache = TTSCache(memory_mb=0.01, disk_dir=None)  # ~10 KB = two 4.8 KB entries
+    keys = [TTSCache.key("kokoro", "v", 1.0, f"phrase {i}") for i in range(3)]
+    cache.put(keys[0], _audio())
+    cache.put(keys[1], _audio())
+    assert cache.get(keys[0]) is not None     # keys[0] is now most recent
+    cache.put(keys[2], _audio())              # evicts keys[1]
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+    stats = cache.get_stats()
+    assert stats["hits_memory"] == 2 and stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert stats["saved_synth_ms"] == 200
+    assert stats["memory_entries"] == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    key = TTSCache.key("cartesia", "katie", 1.0, "Navigation stopped.")
+    TTSCache(disk_dir=str(tmp_path)).put(key, _audio(value=7, synth_ms=450.0))
+
+    cache = TTSCache(disk_dir=str(tmp_path))
+    assert key in cache
+    hit = cache.get(key)
+    assert hit is not None and hit.pcm[0] == 7 and hit.sample_rate == 24000
+    assert cache.get_stats()["hits_disk"] == 1
+    assert cache.get(key) is not None  # Promoted to memory
+    assert cache.get_stats()["hits_memory"] == 1
+    assert cache.get_stats()["saved_synth_ms"] == 900
+
+
+def test_disk_budget_evicts_least_recently_used(tmp_path):
+    cache = TTSCache(disk_dir=str(tmp_path), disk_mb=0.1)  # ~100 KB, entries are ~48 KB
+    keys = [TTSCache.key("kokoro", "v", 1.0, f"phrase {i}") for i in range(3)]
+    for key in keys:
+        cache.put(key, _audio(n=24000))
+
+    assert cache.disk_usage() <= 0.1 * 1024 * 1024
+    fresh = TTSCache(disk_dir=str(tmp_path))
+    assert fresh.get(keys[0]) is None and fresh.get(keys[2]) is not None
+
+
+def test_corrupt_disk_entry_is_a_miss(tmp_path):
+    cache = TTSCache(disk_dir=str(tmp_path))
+    key = TTSCache.key("kokoro", "v", 1.0, "hello")
+    cache._path(key).write_bytes(b"not an npz")
+    assert cache.get(key) is None
+    assert not cache._path(key).exists()
+
+
+def test_template_fragments_and_join():
+    parts = template_parts("Bus {service} arrives in {minutes} minutes.", {"service": 190, "minutes": 4})
+    assert parts == ["Bus", "190", "arrives in", "4", "minutes."]
+    assert template_parts("Approaching {stop}. Prepare to alight.", {"stop": "Orchard"}) == [
+        "Approaching", "Orchard.", "Prepare to alight."]
+    assert template_literals("Approaching {stop}. Prepare to alight.") == ["Approaching", "Prepare to alight."]
+
+    joined = join_fragments([_audio(n=100, value=1, synth_ms=50), _audio(n=200, value=2, synth_ms=70)], gap_ms=10)
+    assert len(joined.pcm) == 100 + 240 + 200
+    assert joined.synth_ms == 120
+    with pytest.raises(ValueError):
+        join_fragments([_audio(rate=24000), _audio(rate=16000)])
@@ -0,0 +1,248 @@
+"""
+Unit tests for latency-aware TTS engine selection: rolling TTFA per
+engine and length bucket, connectivity handling, preference margin,
+hedge rules and the hedged() race between a cloud engine and Kokoro,
+including a Kokoro backup that blocks in synthesis, and per-call engine
+timing when the router speaks concurrently.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+import tts_selector
+from tts_selector import EngineLatencyModel, TTSEngineSelector, create_tts_selector, hedged
+
+ALL = ["cartesia", "gemini", "kokoro"]
+
+
+class FakeLink:
+    def __init__(self, level):
+        self.level = level
+
+
+def test_measurements_replace_priors_per_length_bucket():
+    model = EngineLatencyModel(buckets=(60, 150), min_samples=3)
+    selector = TTSEngineSelector(model)
+    assert selector.select("Wall ahead.", ALL) == "cartesia"          # Priors
+
+    for _ in range(3):
+        model.record("cartesia", 10, 1200)
+    assert model.predict("cartesia", 10) == 1200
+    assert selector.select("Wall ahead.", ALL) == "kokoro"
+    # Long text lives in another bucket and still uses the prior
+    assert model.predict("cartesia", 200) == 350 + 1.5 * 200
+    assert model.get_stats() == {"cartesia": {"<60": 1200}}
+
+
+def test_old_samples_age_out(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tts_selector.time, "monotonic", lambda: now[0])
+    model = EngineLatencyModel(max_age_s=60, min_samples=2)
+    model.record_failure("cartesia", 10, 500)
+    model.record_failure("cartesia", 10, 500)
+    assert model.predict("cartesia", 10) == 2500
+
+    now[0] += 61
+    assert model.predict("cartesia", 10) == 350 + 1.5 * 10              # Back to the prior
+    assert model.get_stats() == {}
+
+
+def test_connectivity_drops_or_penalizes_cloud_engines():
+    link = FakeLink(4)
+    selector = TTSEngineSelector(connectivity=link)
+    assert selector.rank("Stairs ahead.", ALL)[0] == "cartesia"
+
+    link.level = 2                                                       # INTERMITTENT
+    assert selector.predict("cartesia", 13) == 2 * (350 + 1.5 * 13)
+    assert selector.rank("Stairs ahead.", ALL)[0] == "kokoro"
+
+    link.level = 1                                                       # OFFLINE
+    assert selector.rank("Stairs ahead.", ALL) == ["kokoro"]
+    assert selector.select("Stairs ahead.", ["cartesia", "gemini"]) is None
+
+
+def test_preference_margin_and_hedge_rules():
+    model = EngineLatencyModel(min_samples=1)
+    selector = TTSEngineSelector(model, margin_ms=150, hedge_max_chars=40)
+    model.record("cartesia", 10, 400)
+    model.record("kokoro", 10, 300)
+    assert selector.select("Curb ahead.", ALL) == "cartesia"            # 100ms faster is within 2 x margin
+    model.record("kokoro", 10, 50)
+    model.record("kokoro", 10, 50)                                      # Median 50: 350ms faster
+    assert selector.select("Curb ahead.", ALL) == "kokoro"
+
+    assert selector.hedge_deadline("Curb ahead.", "cartesia", ALL, urgent=True) == 0.4
+    assert selector.hedge_deadline("Curb ahead.", "cartesia", ALL, urgent=False) is None
+    assert selector.hedge_deadline("Curb ahead.", "kokoro", ALL, urgent=True) is None
+    assert selector.hedge_deadline("Curb ahead.", "cartesia", ["cartesia"], urgent=True) is None
+    assert selector.hedge_deadline("x" * 41, "cartesia", ALL, urgent=True) is None
+
+    config = create_tts_selector({"hedge_deadline_ms": 250, "length_buckets": [80]})
+    assert config.hedge_deadline_ms == 250 and config.model.buckets == (80,)
+
+
+def _race(primary_s, primary_result, backup_s=0.02, deadline_s=0.05):
+    started = []
+
+    async def engine(name, delay, result):
+        started.append(name)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def run():
+        return await hedged(lambda: engine("primary", primary_s, primary_result),
+                            lambda: engine("backup", backup_s, b"kokoro"), deadline_s)
+
+    return asyncio.run(run()), started
+
+
+def test_hedged_primary_within_deadline_never_starts_backup():
+    outcome, started = _race(0.01, b"cloud")
+    assert outcome == ("primary", b"cloud") and started == ["primary"]
+
+
+def test_hedged_slow_primary_loses_to_backup_and_is_cancelled():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1.0)
+            return b"cloud"
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fast():
+        await asyncio.sleep(0.01)
+        return b"kokoro"
+
+    async def run():
+        outcome = await hedged(slow, fast, 0.05)
+        await asyncio.sleep(0)
+        return outcome
+
+    assert asyncio.run(run()) == ("backup", b"kokoro")
+    assert cancelled == [True]
+
+
+def test_hedged_failed_primary_starts_backup_immediately():
+    outcome, started = _race(0.0, RuntimeError("503"), deadline_s=10.0)
+    assert outcome == ("backup", b"kokoro") and started == ["primary", "backup"]
+
+    outcome, _ = _race(0.0, None, deadline_s=10.0)                      # Empty result = failure
+    assert outcome == ("backup", b"kokoro")
+
+
+def test_hedged_blocking_backup_in_a_thread_does_not_hold_up_a_faster_primary():
+    async def primary():
+        await asyncio.sleep(0.15)
+        return b"cloud"
+
+    async def backup():
+        await asyncio.to_thread(time.sleep, 0.6)      # Kokoro synthesis
+        return b"kokoro"
+
+    async def run():
+        start = time.perf_counter()
+        outcome = await hedged(primary, backup, 0.05)
+        return outcome, time.perf_counter() - start
+
+    outcome, elapsed = asyncio.run(run())
+    assert outcome == ("primary", b"cloud") and elapsed < 0.4
+
+
+def test_hedged_primary_wins_a_tie():
+    async def run():
+        loop = asyncio.get_running_loop()
+        gate = loop.create_future()
+        loop.call_later(0.1, gate.set_result, None)    # Both finish in the same loop iteration
+
+        async def engine(result):
+            await gate
+            return result
+
+        return await hedged(lambda: engine(b"cloud"), lambda: engine(b"kokoro"), 0.05)
+
+    for _ in range(10):
+        assert asyncio.run(run()) == ("primary", b"cloud")
+
+
+def _router_module():
+    try:
+        from rpi5 import tts_router
+    except (ImportError, SyntaxError) as e:           # rpi5/__init__ imports main.py and its dependencies
+        pytest.skip(f"rpi5 package not importable here: {e}")
+    return tts_router
+
+
+def _fresh_router(tts_router, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tts_router.TTSRouter, "_instance", None)
+    return tts_router.TTSRouter(audio_output_dir=str(tmp_path / "audio"))
+
+
+def test_router_hedge_runs_blocking_kokoro_off_the_event_loop(monkeypatch, tmp_path):
+    tts_router = _router_module()
+
+    class BlockingKokoro:
+        def generate_speech(self, text):
+            time.sleep(0.6)
+            return np.zeros(2400, dtype=np.float32)
+
+    async def cartesia(text, play_audio, save_path):
+        await asyncio.sleep(0.15)
+        return True, b"RIFF-cloud", 150.0, None
+
+    monkeypatch.setattr(tts_router, "_get_kokoro_tts", BlockingKokoro)
+    router = _fresh_router(tts_router, monkeypatch, tmp_path)
+    router._speak_cartesia = cartesia
+
+    async def run():
+        start = time.perf_counter()
+        result = await router._speak_hedged("Car approaching on your left", "cartesia", 0.05, False, None)
+        return result, time.perf_counter() - start
+
+    (success, engine, audio, synth_ms), elapsed = asyncio.run(run())
+    assert success and engine == "cartesia" and audio == b"RIFF-cloud" and synth_ms == 150.0
+    assert elapsed < 0.4
+
+
+def test_concurrent_speech_keeps_each_engines_timing(monkeypatch, tmp_path):
+    tts_router = _router_module()
+    from tts_cache import CachedAudio, TTSCache
+
+    wav = tts_router._cached_to_wav(CachedAudio(np.zeros(2400, dtype=np.int16), 24000, 0.0))
+
+    def engine(delay_s, streamed=False):
+        async def speak(text, play_audio, save_path):
+            start = time.perf_counter()
+            await asyncio.sleep(delay_s)
+            synth_ms = (time.perf_counter() - start) * 1000
+            return True, wav, synth_ms, synth_ms / 2 if streamed else None
+        return speak
+
+    router = _fresh_router(tts_router, monkeypatch, tmp_path)
+    router.cache = TTSCache(disk_dir=None)
+    router._speak_cartesia = engine(0.3)
+    router._speak_kokoro = engine(0.05, streamed=True)   # First clause plays halfway through
+    samples = []
+    router.selector.model.record = lambda name, chars, ms: samples.append((name, ms))
+
+    async def run():
+        # Navigation and a safety line overlap; the short one finishes inside the long one
+        await asyncio.gather(router.speak_async("Turn left in 20 meters", False, engine_override="cartesia"),
+                             router.speak_async("Step ahead", False, engine_override="kokoro"))
+
+    asyncio.run(run())
+    ttfa = dict(samples)
+    assert len(samples) == 2 and 280 < ttfa["cartesia"] < 450 and 20 < ttfa["kokoro"] < 100
+    cached = {key[0]: audio.synth_ms for key, audio in router.cache._memory.items()}
+    assert cached == {"cartesia": ttfa["cartesia"], "kokoro": ttfa["kokoro"] * 2}
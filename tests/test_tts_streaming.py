@@ -0,0 +1,86 @@
+"""
+Unit tests for streaming TTS: clause splitting and the clause-by-clause
+synthesizer (time-to-first-audio, ordering, interruption, drain wait).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import time
+
+import numpy as np
+
+from layer1_reflex.tts_streaming import StreamingSynthesizer, split_clauses
+
+LONG_TEXT = (
+    "There is a crossing about twenty meters ahead, the signal is red, and two people are "
+    "waiting on your left. After the crossing the pavement narrows, so keep to the right. "
+    "A bus stop is just past the lamp post. The next bus is in four minutes."
+)
+
+
+def test_split_clauses_keeps_text_and_short_first_clause():
+    clauses = split_clauses(LONG_TEXT, first_max_chars=60, max_chars=120)
+    assert " ".join(clauses) == " ".join(LONG_TEXT.split())
+    assert len(clauses[0]) <= 60
+    assert clauses[0].endswith(",")  # Cut at a clause boundary, not mid-phrase
+    assert all(len(c) <= 120 for c in clauses)
+    # Short trailing sentences are packed together
+    assert any("keep to the right. A bus stop" in c for c in clauses)
+
+
+def test_split_clauses_edge_cases():
+    assert split_clauses("   ") == []
+    assert split_clauses("Stop.") == ["Stop."]
+    words = " ".join(["word"] * 100)  # No punctuation at all
+    clauses = split_clauses(words, first_max_chars=40, max_chars=100)
+    assert len(clauses[0]) <= 40 and all(len(c) <= 100 for c in clauses)
+    assert " ".join(clauses) == words
+
+
+class FakeSink:
+    def __init__(self):
+        self.chunks = []
+        self.drained = False
+
+    def add_audio_chunk(self, data: bytes):
+        self.chunks.append(np.frombuffer(data, dtype=np.int16))
+
+    def wait_drained(self, timeout=60.0):
+        self.drained = True
+        return True
+
+
+def _fake_stream(text):
+    """0.5ms of synthesis per character, 240 samples of audio per character."""
+    for i, clause in enumerate(split_clauses(text, first_max_chars=60)):
+        time.sleep(len(clause) * 0.0005)
+        yield np.full(len(clause) * 240, 0.01 * (i + 1), dtype=np.float32)
+
+
+def test_first_audio_after_first_clause():
+    sink = FakeSink()
+    first = []
+    synth = StreamingSynthesizer(_fake_stream, sink, on_first_audio=lambda: first.append(len(sink.chunks)))
+    result = synth.speak(LONG_TEXT)
+
+    assert first == [1]
+    assert result.chunks == len(sink.chunks) == len(split_clauses(LONG_TEXT, first_max_chars=60))
+    assert result.ttfa_ms < result.synth_ms / 2
+    assert sink.drained
+    # Chunks arrive in order and the full audio is kept for the recording
+    assert [c[0] for c in sink.chunks] == sorted(c[0] for c in sink.chunks)
+    assert len(result.audio) == sum(len(c) for c in sink.chunks)
+    assert result.audio_s == len(result.audio) / 24000
+    assert synth.ttfa.count == 1
+
+
+def test_interrupt_stops_after_current_clause():
+    sink = FakeSink()
+    synth = StreamingSynthesizer(_fake_stream, sink)
+    sink.add_audio_chunk = lambda data, add=sink.add_audio_chunk: (add(data), synth.interrupt())
+    result = synth.speak(LONG_TEXT)
+
+    assert result.interrupted
+    assert len(sink.chunks) == 1
+    assert not sink.drained
@@ -0,0 +1,142 @@
+"""
+Unit tests for VisualMemoryIndex (embedding-based object recall).
+
+Uses a deterministic fake embedder so the tests run without torch or the
+MobileCLIP TorchScript weights.
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from layer4_memory.visual_memory_index import VisualMemoryIndex
+
+DIM = 16
+WORDS = ["wallet", "keys", "phone", "bottle"]
+
+
+class FakeEmbedder:
+    """Maps a word to a one-hot vector; images encode their class via pixel value."""
+
+    dim = DIM
+    supports_images = True
+
+    def load(self):
+        return True
+
+    def encode_text(self, texts):
+        out = np.zeros((len(texts), DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for j, word in enumerate(WORDS):
+                if word in text:
+                    out[i, j] = 1.0
+        return out
+
+    def encode_image(self, images):
+        out = np.zeros((len(images), DIM), dtype=np.float32)
+        for i, img in enumerate(images):
+            out[i, int(img[0, 0, 0]) % DIM] = 1.0
+            out[i, DIM - 1] = 0.1  # Small shared component
+        return out
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = VisualMemoryIndex(
+        index_dir=str(tmp_path / "index"),
+        db_path=str(tmp_path / "cortex.db"),
+        embedder=FakeEmbedder(),
+        initial_capacity=8,
+        crop_interval_s=0.0,
+    )
+    assert idx.start()
+    yield idx
+    idx.stop()
+
+
+def _wait_for(idx, count, timeout=5.0):
+    deadline = time.time() + timeout
+    while idx.get_stats()["vectors"] < count and time.time() < deadline:
+        time.sleep(0.01)
+    assert idx.get_stats()["vectors"] == count
+
+
+def test_search_returns_exact_top_k(index):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((200, DIM)).astype(np.float32)
+    for i, v in enumerate(vectors):
+        index.add_vector(v, kind="frame", image_path=f"img_{i}.jpg")
+
+    query = rng.standard_normal(DIM).astype(np.float32)
+    hits = index.search_vector(query, k=5, min_score=-1.0)
+
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normed @ (query / np.linalg.norm(query))))[:5]
+    assert [h.row_id for h in hits] == list(expected)
+    assert hits[0].score >= hits[-1].score
+
+
+def test_capacity_grows_past_initial(index):
+    for i in range(20):
+        index.add_vector(np.eye(DIM)[i % DIM], kind="frame", image_path=f"{i}.jpg")
+    stats = index.get_stats()
+    assert stats["vectors"] == 20
+    assert stats["capacity"] >= 20
+
+
+def test_text_query_recalls_frame_without_caption(index):
+    wallet_img = np.zeros((64, 64, 3), dtype=np.uint8)  # pixel 0 -> "wallet"
+    keys_img = np.ones((64, 64, 3), dtype=np.uint8)     # pixel 1 -> "keys"
+    index.add_frame(keys_img, "frames/keys.jpg")
+    index.add_frame(wallet_img, "frames/wallet.jpg")
+    _wait_for(index, 2)
+
+    hits = index.search("wallet", k=1)
+    assert len(hits) == 1
+    assert hits[0].image_path == "frames/wallet.jpg"
+    assert hits[0].kind == "frame"
+
+
+def test_layer1_crops_only_and_kind_filter(index):
+    frame = np.full((240, 320, 3), 2, dtype=np.uint8)  # pixel 2 -> "phone"
+    detections = [
+        {"class": "phone", "bbox": [10, 10, 110, 110], "layer": "learner"},
+        {"class": "person", "bbox": [0, 0, 200, 200], "layer": "guardian"},
+        {"class": "tiny", "bbox": [0, 0, 5, 5], "layer": "learner"},
+    ]
+    assert index.add_detections(frame, detections) == 1
+    _wait_for(index, 1)
+
+    assert index.search("phone", kind="frame") == []
+    hits = index.search("phone", kind="crop")
+    assert len(hits) == 1
+    assert hits[0].class_name == "phone"
+    assert hits[0].bbox == [10.0, 10.0, 110.0, 110.0]
+    assert hits[0].image_path and hits[0].image_path.endswith("_phone.jpg")
+
+
+def test_index_persists_across_restart(tmp_path):
+    kwargs = dict(
+        index_dir=str(tmp_path / "index"),
+        db_path=str(tmp_path / "cortex.db"),
+        embedder=FakeEmbedder(),
+        initial_capacity=4,
+    )
+    idx = VisualMemoryIndex(**kwargs)
+    idx.start()
+    for i in range(6):
+        idx.add_vector(np.eye(DIM)[i], kind="frame", image_path=f"{i}.jpg")
+    idx.stop()
+
+    reopened = VisualMemoryIndex(**kwargs)
+    reopened.start()
+    try:
+        assert reopened.get_stats()["vectors"] == 6
+        hits = reopened.search("phone", k=1)  # one-hot index 2
+        assert hits[0].image_path == "2.jpg"
+    finally:
+        reopened.stop()
@@ -0,0 +1,120 @@
+"""
+Unit tests for the voice interaction tracer (spans across threads and
+asyncio hops, parked Gemini Live traces, JSONL log and p50/p95 summary).
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import asyncio
+import time
+
+from voice_trace import VoiceTracer, current_trace, load_traces, summarize, voice_span
+
+
+def _tracer(tmp_path, **kwargs):
+    return VoiceTracer(log_path=str(tmp_path / "traces.jsonl"), **kwargs)
+
+
+def test_spans_follow_the_trace_into_tasks_and_threads(tmp_path):
+    tracer = _tracer(tmp_path)
+    trace = tracer.start("vad")
+    trace.mark("speech_end")
+
+    def synth():
+        with voice_span("tts_synth", engine="kokoro"):
+            time.sleep(0.01)
+        tracer.first_audio("aplay", current_trace())
+
+    async def handler():
+        with voice_span("route") as attrs:
+            attrs["layer"] = "layer2"
+        await asyncio.to_thread(synth)
+
+    with tracer.activate(trace):
+        asyncio.run(handler())
+    tracer.finish(trace)
+
+    assert current_trace() is None
+    record = tracer.recent()[0]
+    names = [s["name"] for s in record["spans"]]
+    assert names == ["route", "tts_synth"]
+    assert record["spans"][0]["attrs"] == {"layer": "layer2"}
+    assert record["attrs"]["audio_source"] == "aplay"
+    assert record["segments"]["first_audio"] >= 10
+    assert record["segments"]["tts_synth"] >= 10
+
+
+def test_voice_span_without_trace_is_a_noop(tmp_path):
+    tracer = _tracer(tmp_path)
+    with voice_span("stt") as attrs:
+        attrs["engine"] = "whisper"
+    tracer.first_audio("aplay")
+    assert tracer.recent() == []
+
+
+def test_parked_trace_is_committed_by_asynchronous_audio(tmp_path):
+    tracer = _tracer(tmp_path)
+    trace = tracer.start("vad")
+    trace.mark("speech_end")
+    trace.expect_audio = True
+    tracer.finish(trace)
+    assert tracer.recent() == []
+
+    tracer.first_audio("gemini_live")  # Audio callback thread, no current trace
+    tracer.first_audio("gemini_live")  # Later chunks are ignored
+
+    records = tracer.recent()
+    assert len(records) == 1
+    assert records[0]["attrs"]["audio_source"] == "gemini_live"
+    assert "first_audio" in records[0]["segments"]
+
+
+def test_parked_trace_times_out(tmp_path):
+    tracer = _tracer(tmp_path, audio_wait_s=0.0)
+    trace = tracer.start("text")
+    trace.expect_audio = True
+    tracer.finish(trace)
+
+    records = tracer.recent()
+    assert records[0]["attrs"]["audio_timeout"] is True
+    assert "first_audio" not in records[0]["segments"]
+
+
+def test_ring_is_bounded_and_log_rotates(tmp_path):
+    tracer = _tracer(tmp_path, ring_size=5, max_log_kb=1)
+    for i in range(40):
+        trace = tracer.start("text")
+        trace.annotate(text=f"query {i}")
+        trace.add_span("stt", trace.t0, trace.t0 + 0.1)
+        tracer.finish(trace)
+
+    assert len(tracer.recent()) == 5
+    assert (tmp_path / "traces.jsonl.1").exists()
+    on_disk = load_traces(str(tmp_path / "traces.jsonl"))
+    assert 5 < len(on_disk) < 40
+    assert on_disk[-1]["attrs"]["text"] == "query 39"
+    assert len(load_traces(str(tmp_path / "traces.jsonl"), last=3)) == 3
+
+
+def test_summary_percentiles_per_segment():
+    records = [{"segments": {"stt": float(ms), "route": 1.0}} for ms in range(1, 101)]
+    summary = summarize(records)
+
+    assert list(summary) == ["stt", "route"]  # Pipeline order
+    assert summary["stt"]["count"] == 100
+    assert abs(summary["stt"]["p50_ms"] - 50.5) < 1e-6
+    assert abs(summary["stt"]["p95_ms"] - 95.05) < 1e-6
+    assert summary["stt"]["max_ms"] == 100.0
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    tracer = _tracer(tmp_path, enabled=False)
+    trace = tracer.start("vad")
+    with tracer.activate(trace):
+        with voice_span("stt"):
+            pass
+    tracer.finish(trace)
+    assert trace is None
+    assert tracer.recent() == []
+    assert not (tmp_path / "traces.jsonl").exists()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the wall hum oscillator bank: click-free glides under
+per-frame parameter jitter, convergence to the published pitch and
+per-ear gains, fade-out to silence, the shared mixer ambient channel,
+start() backoff without an output, and SpatialAudioManager.stop().
+
+Author: Haziq (@IRSPlays)
+Project: Cortex v2.0
+"""
+
+import numpy as np
+
+import audio_mixer
+from layer3_guide.spatial_audio import sound_generator
+from layer3_guide.spatial_audio.manager import SpatialAudioManager
+from layer3_guide.spatial_audio.sound_generator import HumOscillatorBank
+
+SR = 44100
+
+
+def _render(bank, blocks, frames=1024):
+    out = [bank.render(frames) for _ in range(blocks)]
+    return np.concatenate([np.zeros((frames, 2), np.float32) if b is None else b for b in out])
+
+
+def test_jittering_params_glide_without_clicks():
+    bank = HumOscillatorBank(SR)
+    rng = np.random.default_rng(0)
+    blocks = []
+    for _ in range(200):
+        # Depth jitter: new targets before every block (worse than per camera frame)
+        left = rng.uniform(0.3, 0.8)
+        bank.set_params({"left": (rng.uniform(80, 200), left, 0.0),
+                         "center": (rng.uniform(80, 200), 0.3, 0.3)})
+        blocks.append(bank.render(512))
+    out = np.concatenate(blocks)
+    # Largest possible sine step at 200Hz is 2*pi*200/SR per unit gain (~0.0285)
+    bound = 2 * np.pi * 200 / SR * (0.8 + 0.3) * 1.05
+    assert np.abs(np.diff(out, axis=0)).max() < bound
+    assert bank.updates == 200 and bank.blocks == 200
+
+
+def test_converges_to_published_pitch_and_ear_gains():
+    bank = HumOscillatorBank(SR, smoothing_ms=30.0)
+    bank.set_params({"right": (150.0, 0.0, 0.5)})
+    out = _render(bank, 60)[-SR // 2:]
+    assert np.abs(out[:, 0]).max() < 1e-6                   # Right wall: right ear only
+    assert abs(np.abs(out[:, 1]).max() - 0.5) < 1e-3
+    crossings = np.count_nonzero(np.diff(np.signbit(out[:, 1])))
+    assert abs(crossings / 2 / 0.5 - 150.0) < 2.0
+
+
+def test_fades_out_to_silence_and_stops_rendering():
+    bank = HumOscillatorBank(SR, smoothing_ms=30.0)
+    bank.set_params({"center": (100.0, 0.6, 0.6)})
+    _render(bank, 20)
+    bank.set_params({})
+    out = _render(bank, 20)
+    assert np.abs(out[:1024]).max() > 0.1                  # Fades, no cut
+    assert np.abs(np.diff(out, axis=0)).max() < 2 * np.pi * 100 / SR * 0.6 * 1.05
+    assert bank.render(1024) is None
+
+
+def test_plays_on_the_mixer_ambient_channel(monkeypatch):
+    mixer = audio_mixer.AudioMixer(sample_rate=48000, blocksize=1024)
+    monkeypatch.setattr(audio_mixer, "get_mixer", lambda: mixer)
+    bank = HumOscillatorBank(SR)
+    assert bank.start() and bank.running and bank.sample_rate == 48000
+    bank.set_params({"left": (120.0, 0.5, 0.0)})
+    block = None
+    for _ in range(10):
+        block = mixer.mix_block(1024)
+    assert np.abs(block[:, 0]).max() > 0.1 and np.abs(block[:, 1]).max() < 1e-6
+    bank.stop()
+    assert not bank.running
+
+
+def test_failed_start_backs_off_instead_of_retrying_every_frame(monkeypatch):
+    attempts = []
+    monkeypatch.setattr(sound_generator, "shared_mixer", lambda: attempts.append(now))
+    monkeypatch.setattr(sound_generator, "SOUNDDEVICE_AVAILABLE", False)
+    bank = HumOscillatorBank(SR)
+    bank.clock = lambda: now
+
+    # Called per depth frame (~15Hz); retries after 1s, then 2s, then 4s
+    for now in np.arange(0.0, 7.5, 0.05):
+        assert not bank.start()
+    assert attempts == [0.0, 1.0, 3.0, 7.0]
+    assert bank.start_failures == 4
+
+    # Output appears: the next attempt after the backoff attaches
+    mixer = audio_mixer.AudioMixer(sample_rate=48000, blocksize=1024)
+    monkeypatch.setattr(sound_generator, "shared_mixer", lambda: mixer)
+    now = 15.0
+    assert bank.start() and bank.running
+    bank.stop()
+
+
+def test_manager_stop_detaches_the_hum(monkeypatch):
+    mixer = audio_mixer.AudioMixer(sample_rate=48000, blocksize=1024)
+    monkeypatch.setattr(audio_mixer, "get_mixer", lambda: mixer)
+    manager = SpatialAudioManager()
+    depth = np.full((30, 30), 3.0, dtype=np.float32)
+    depth[:, :10] = 0.5
+    manager.update_from_depth(depth)
+    assert manager._hum.running
+
+    manager.stop()
+    assert not manager._hum.running and manager._hum_params == {}